@@ -0,0 +1,168 @@
+import json
+import threading
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from src.traffic_recorder import build_response
+
+# ==========================================
+# 🧪 합성 데이터 + 가짜 브로커 (벤치마크 전용)
+# ==========================================
+
+
+def make_bars(n_days, seed, start_price=100.0):
+    """
+    고정 시드 랜덤워크 일봉 (과거 -> 오늘 오름차순)
+    :return: dict of np.ndarray (Open/High/Low/Close/Volume) + Date(YYYYMMDD 문자열 리스트)
+    """
+    rng = np.random.default_rng(seed)
+    ret = rng.normal(0.0005, 0.02, n_days)
+    close = start_price * np.exp(np.cumsum(ret))
+    open_ = close * (1 + rng.normal(0, 0.005, n_days))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.01, n_days)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.01, n_days)))
+    volume = rng.integers(100_000, 5_000_000, n_days)
+
+    dates = np.datetime64('2020-01-01') + np.arange(n_days)
+    return {
+        "Date": [str(d).replace('-', '') for d in dates],
+        "Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume,
+    }
+
+
+def make_universe(n_symbols, n_days, market="KR"):
+    """종목 n개의 합성 일봉 { code: bars }"""
+    universe = {}
+    for i in range(n_symbols):
+        code = f"{i:06d}" if market == "KR" else f"SYM{i}"
+        universe[code] = make_bars(n_days, seed=i, start_price=10_000 + 100 * i if market == "KR" else 50 + i)
+    return universe
+
+
+def make_targets(universe, market="KR", strategy="SMART_PRO"):
+    """타겟 파일 스키마 그대로 생성"""
+    ratio = round(0.9 / max(len(universe), 1), 6)
+    targets = []
+    for i, code in enumerate(universe):
+        t = {"code": code, "name": f"BENCH{i}", "market": market, "target_ratio": ratio,
+             "strategy": strategy, "setting": {"level": 1 + i % 5}}
+        if market == "US": t["exchange"] = "NASD"
+        targets.append(t)
+    return targets
+
+
+class FakeBrokerSession:
+    """
+    KIS API 흉내 세션 (네트워크 없음)
+    - 잔고: 앞쪽 20% 종목 보유 / 현재가: 마지막 종가 / 주문: 항상 접수 (주문체결조회에는 즉시 전량 체결)
+    """
+
+    def __init__(self, universe, market="KR", bars_per_request=100):
+        self.universe = universe
+        self.market = market
+        self.bars_per_request = bars_per_request
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._odno = 0
+        self.orders = {}   # odno -> (종목, 수량)
+        self._responses = self._build_static_responses()
+
+    def _build_static_responses(self):
+        daily, price, detail = {}, {}, {}
+        n = self.bars_per_request
+        for code, bars in self.universe.items():
+            last = float(bars['Close'][-1])
+            if self.market == "KR":
+                price[code] = json.dumps({"rt_cd": "0", "output": {
+                    "stck_prpr": str(int(last)), "stck_oprc": f"{bars['Open'][-1]:.0f}", "stck_hgpr": f"{bars['High'][-1]:.0f}",
+                    "stck_lwpr": f"{bars['Low'][-1]:.0f}", "acml_vol": str(int(bars['Volume'][-1]))}})
+                rows = [{
+                    "stck_bsop_date": bars['Date'][i], "stck_clpr": f"{bars['Close'][i]:.0f}",
+                    "stck_oprc": f"{bars['Open'][i]:.0f}", "stck_hgpr": f"{bars['High'][i]:.0f}",
+                    "stck_lwpr": f"{bars['Low'][i]:.0f}", "acml_vol": str(int(bars['Volume'][i]))
+                } for i in range(len(bars['Date']) - 1, max(len(bars['Date']) - 1 - n, -1), -1)]
+                daily[code] = json.dumps({"rt_cd": "0", "output": rows})
+            else:
+                price[code] = json.dumps({"rt_cd": "0", "output": {"last": f"{last:.2f}"}})
+                detail[code] = json.dumps({"rt_cd": "0", "output": {
+                    "last": f"{last:.2f}", "open": f"{bars['Open'][-1]:.2f}", "high": f"{bars['High'][-1]:.2f}",
+                    "low": f"{bars['Low'][-1]:.2f}", "tvol": str(int(bars['Volume'][-1]))}})
+                rows = [{
+                    "xymd": bars['Date'][i], "clos": f"{bars['Close'][i]:.2f}",
+                    "open": f"{bars['Open'][i]:.2f}", "high": f"{bars['High'][i]:.2f}",
+                    "low": f"{bars['Low'][i]:.2f}", "tvol": str(int(bars['Volume'][i]))
+                } for i in range(len(bars['Date']) - 1, max(len(bars['Date']) - 1 - n, -1), -1)]
+                daily[code] = json.dumps({"rt_cd": "0", "output2": rows})
+
+        held = list(self.universe)[:max(1, len(self.universe) // 5)]
+        if self.market == "KR":
+            out1 = [{
+                "pdno": c, "prdt_name": c, "hldg_qty": "10", "evlu_pfls_rt": "1.5",
+                "evlu_amt": str(int(self.universe[c]['Close'][-1] * 10)), "evlu_pfls_amt": "1000",
+                "pchs_avg_pric": str(int(self.universe[c]['Close'][-1])), "prpr": str(int(self.universe[c]['Close'][-1])),
+                "rlzt_pfls": "0"
+            } for c in held]
+            balance = json.dumps({"rt_cd": "0", "output1": out1, "output2": [{
+                "prvs_rcdl_excc_amt": "100000000", "tot_evlu_amt": "150000000",
+                "rlzt_pfls": "0", "evlu_pfls_smtl_amt": "0"}]})
+        else:
+            out1 = [{
+                "pdno": c, "prdt_name": c, "ccld_qty_smtl1": "10",
+                "ovrs_now_pric1": f"{self.universe[c]['Close'][-1]:.2f}", "avg_unpr3": f"{self.universe[c]['Close'][-1]:.2f}",
+                "frcr_evlu_amt2": f"{self.universe[c]['Close'][-1] * 10:.2f}", "evlu_pfls_rt1": "1.5"
+            } for c in held]
+            balance = json.dumps({"rt_cd": "0", "output1": out1, "output2": [{
+                "frcr_dncl_amt_2": "100000", "frcr_buy_amt_smtl": "0", "frcr_sll_amt_smtl": "0"}]})
+
+        return {"daily": daily, "price": price, "detail": detail, "balance": balance}
+
+    def _next_odno(self):
+        with self._lock:
+            self._odno += 1
+            return f"{self._odno:010d}"
+
+    def request(self, method, url, params=None, data=None, headers=None, **kwargs):
+        with self._lock: self.calls += 1
+        path = urlsplit(url).path
+        params = params or {}
+        r = self._responses
+
+        if path.endswith("/chk-holiday"):
+            body = json.dumps({"rt_cd": "0", "output": [{"opnd_yn": "Y"}]})
+        elif path.endswith("/inquire-balance-rlz-pl") or path.endswith("/inquire-balance") or path.endswith("/inquire-present-balance"):
+            body = r["balance"]
+        elif path.endswith("/inquire-daily-price"):
+            body = r["daily"].get(params.get("fid_input_iscd"), '{"rt_cd": "1", "msg1": "없음"}')
+        elif path.endswith("/dailyprice"):
+            body = r["daily"].get(params.get("SYMB"), '{"rt_cd": "1", "msg1": "없음"}')
+        elif path.endswith("/inquire-price"):
+            body = r["price"].get(params.get("fid_input_iscd"), '{"rt_cd": "1", "msg1": "없음"}')
+        elif path.endswith("/quotations/price-detail"):
+            body = r["detail"].get(params.get("SYMB"), '{"rt_cd": "1", "msg1": "없음"}')
+        elif path.endswith("/quotations/price"):
+            body = r["price"].get(params.get("SYMB"), '{"rt_cd": "1", "msg1": "없음"}')
+        elif path.endswith("/inquire-nccs"):
+            body = json.dumps({"rt_cd": "0", "output": []})
+        elif path.endswith("/order-cash") or path.endswith("/trading/order"):
+            odno = self._next_odno()
+            order = json.loads(data) if data else {}
+            with self._lock: self.orders[odno] = (order.get("PDNO"), order.get("ORD_QTY", "0"))
+            body = json.dumps({"rt_cd": "0", "output": {"KRX_FWDG_ORD_ORGNO": odno, "ODNO": odno}})
+        elif path.endswith("/inquire-daily-ccld"):
+            with self._lock: orders = list(self.orders.items())
+            body = json.dumps({"rt_cd": "0", "output1": [{
+                "odno": odno, "pdno": code, "ord_qty": qty, "tot_ccld_qty": qty, "rmn_qty": "0", "cnc_cfrm_qty": "0"}
+                for odno, (code, qty) in reversed(orders)]})
+        else:
+            body = json.dumps({"rt_cd": "0", "msg1": "OK", "output": {}})
+        return build_response(200, body, url)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        pass
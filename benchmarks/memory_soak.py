@@ -0,0 +1,79 @@
+import os
+import sys
+import json
+import argparse
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import run_simulation
+from src.memory_monitor import monitor
+
+# ==========================================
+# 🧠 메모리 장기 실행 점검 (가상 시계 시뮬레이션)
+# ==========================================
+# 실제 MainController 를 가상 시계로 한 달 돌리면서 날짜마다 메모리 기록
+# - 추적 할당(tracemalloc) / RSS / 캐시 항목 수
+# - 워밍업 구간(첫 WARMUP_DAYS 일: 일봉/지표/커넥션 준비) 이후 최댓값이 워밍업 직후 대비 허용치 이내면 평탄
+START = "2024-07-01"
+END = "2024-07-31"
+WARMUP_DAYS = 5
+FLAT_TOLERANCE = 0.10          # 워밍업 직후 대비 최대 증가율
+FLAT_FLOOR = 2 * 1024 * 1024   # 작은 값에서의 흔들림 허용 (바이트)
+RESULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def soak(start=START, end=END, trace=True):
+    samples = []
+
+    def on_day(day, controller):
+        sample = monitor.sample()
+        sample["date"] = str(day)
+        samples.append(sample)
+        traced = f"{sample['traced'] / 1024 / 1024:8.1f}MB" if sample['traced'] is not None else "       -"
+        rss = f"{sample['rss'] / 1024 / 1024:8.1f}MB" if sample['rss'] is not None else "       -"
+        caches = sum(sample['caches'].values())
+        print(f"\n   {day} | 추적 {traced} | RSS {rss} | 캐시 항목 {caches:>5}")
+
+    if trace: monitor.start_tracing()
+    try:
+        result = run_simulation.simulate(start, end, on_day=on_day)
+    finally:
+        monitor.stop_tracing()
+    return result, samples
+
+
+def check_flat(samples, key):
+    """워밍업 이후 최댓값 - 워밍업 직후 값 <= 허용치 -> (평탄 여부, 기준, 최대)"""
+    values = [s[key] for s in samples[WARMUP_DAYS:] if s[key] is not None]
+    if len(values) < 2: return True, None, None
+    base, peak = values[0], max(values)
+    return peak - base <= max(base * FLAT_TOLERANCE, FLAT_FLOOR), base, peak
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="가상 시계 한 달 메모리 추이 점검")
+    parser.add_argument("--start", default=START)
+    parser.add_argument("--end", default=END)
+    parser.add_argument("--no-trace", action="store_true", help="tracemalloc 없이 RSS 만 (빠름)")
+    args = parser.parse_args()
+
+    print(f"🧠 [Soak] {args.start} ~ {args.end} 시뮬레이션 메모리 추이")
+    result, samples = soak(args.start, args.end, trace=not args.no_trace)
+
+    ok = True
+    for key in ("traced", "rss"):
+        flat, base, peak = check_flat(samples, key)
+        if base is None: continue
+        print(f"\n   {key:<6} 워밍업 후 {base / 1024 / 1024:.1f}MB -> 최대 {peak / 1024 / 1024:.1f}MB "
+              f"({'✅ 평탄' if flat else '❌ 증가'})")
+        ok = ok and flat
+
+    os.makedirs(RESULT_DIR, exist_ok=True)
+    path = os.path.join(RESULT_DIR, f"soak_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"start": args.start, "end": args.end, "steps": result['steps'], "samples": samples}, f, indent=1)
+    print(f"💾 [Soak] 결과 저장: {path}")
+    sys.exit(0 if ok else 1)
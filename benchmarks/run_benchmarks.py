@@ -0,0 +1,314 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+import contextlib
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+
+# 벤치마크 중에는 텔레그램/매매일지/녹화가 실제 데이터를 건드리지 않도록 격리
+Config.TELEGRAM_TOKEN = None
+Config.TRAFFIC_MODE = None
+Config.TRADE_JOURNAL_PATH = os.path.join(tempfile.mkdtemp(), "bench_journal.db")
+
+from fake_broker import make_universe, make_targets, FakeBrokerSession
+
+# ==========================================
+# ⚙️ 벤치마크 설정
+# ==========================================
+SCALES = [10, 100, 1000]    # 종목 수
+N_DAYS = 250                # 종목당 합성 일봉 수
+REPEAT = 3                  # 반복 횟수 (min/median 사용)
+RESULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+REGRESSION_THRESHOLD = 1.2  # 기준 대비 20% 이상 느려지면 회귀로 판단
+
+
+def _timeit(func, repeat, setup=None):
+    """func(반복마다 새로 준비된 인자)를 repeat번 실행 (출력은 버림, setup 은 반복마다 측정 밖에서 실행)"""
+    times = []
+    with open(os.devnull, "w") as devnull:
+        for _ in range(repeat):
+            with contextlib.redirect_stdout(devnull):
+                if setup: setup()
+                t0 = time.perf_counter()
+                func()
+                times.append(time.perf_counter() - t0)
+    return times
+
+
+def _record(name, scale, times, **extra):
+    ordered = sorted(times)
+    rec = {
+        "name": name, "scale": scale, "repeat": len(times),
+        "min": ordered[0], "median": ordered[len(ordered) // 2], "mean": sum(times) / len(times),
+    }
+    rec.update(extra)
+    print(f"   {name:<40} n={scale:<5} min {rec['min']*1000:>10.2f}ms | median {rec['median']*1000:>10.2f}ms")
+    return rec
+
+
+def _api_rows(bars, n=100):
+    """트레이더 일봉 캐시 형식 (API 응답과 동일하게 최신순)"""
+    last = len(bars['Date'])
+    return [{
+        "Date": bars['Date'][i], "Close": float(bars['Close'][i]), "Open": float(bars['Open'][i]),
+        "High": float(bars['High'][i]), "Low": float(bars['Low'][i]), "Volume": int(bars['Volume'][i])
+    } for i in range(last - 1, max(last - 1 - n, -1), -1)]
+
+
+def _frame(bars):
+    """백테스트 CSV 형식 DataFrame (Date 인덱스)"""
+    df = pd.DataFrame({k: bars[k] for k in ("Open", "High", "Low", "Close", "Volume")})
+    df.index = pd.to_datetime(bars['Date'])
+    df.index.name = 'Date'
+    return df
+
+
+# ==========================================
+# 🧠 지표 / 전략
+# ==========================================
+def bench_live_indicators(universe, scale, repeat):
+    """라이브 트레이더가 실제로 도는 지표 경로: 워밍업 build_day_state (하루 1회) + 시세마다 signal_rows (today_indicators)"""
+    from src import clock
+    from src.traders.kr_trader import KoreaTrader
+    from src.traffic_recorder import OfflineAuthManager
+
+    sub = {c: universe[c] for c in list(universe)[:scale]}
+    clock.install(clock.VirtualClock(datetime(2024, 3, 6, 10, 0)))   # 수요일 10:00
+    try:
+        with contextlib.redirect_stdout(open(os.devnull, "w")):
+            trader = KoreaTrader(OfflineAuthManager())
+        trader.session = FakeBrokerSession(sub, "KR")
+        today = trader.market_today()
+        # 일봉 / 현재가 조회는 측정에서 제외
+        inputs = [(t, trader.fetch_daily(t), trader.fetch_quote(t)) for t in make_targets(sub, "KR")]
+
+        def warmup():
+            for t, data, _ in inputs: trader.build_day_state(t, data, today)
+
+        def signals():
+            for t, _, quote in inputs: trader.signal_rows(t, quote)
+
+        warmup()
+        return [
+            _record("BaseTrader.build_day_state", scale, _timeit(warmup, repeat)),
+            _record("BaseTrader.signal_rows", scale, _timeit(signals, repeat)),
+        ]
+    finally:
+        clock.uninstall()
+
+
+def bench_strategies(universe, scale, repeat):
+    from src import strategy
+    from src.traders.base_trader import BaseTrader
+
+    # 종목당 최근 20일치 (curr, prev) 쌍 - 지표 계산은 측정에서 제외
+    pairs = []
+    for b in list(universe.values())[:scale]:
+        df = BaseTrader.calculate_indicators(None, _api_rows(b))
+        pairs.extend((df.iloc[i], df.iloc[i - 1]) for i in range(len(df) - 20, len(df)))
+
+    results = []
+    for name in sorted(n for n in dir(strategy) if n.startswith("strat_")):
+        func = getattr(strategy, name)
+        setting = {"level": 3}
+
+        def job(func=func):
+            for curr, prev in pairs: func(curr, prev, setting)
+        results.append(_record(f"strategy.{name}", scale, _timeit(job, repeat), calls=len(pairs)))
+    return results
+
+
+def bench_backtest_indicators(universe, scale, repeat):
+    import run_backtest
+    frames = [_frame(b) for b in list(universe.values())[:scale]]
+
+    def job():
+        for df in frames: run_backtest.calculate_indicators(df)
+    return _record("run_backtest.calculate_indicators", scale, _timeit(job, repeat))
+
+
+def bench_backtest_run(universe, scale, repeat):
+    import run_backtest
+
+    workdir = tempfile.mkdtemp(prefix="bench_bt_")
+    os.makedirs(os.path.join(workdir, "history_data_backtest"))
+    portfolio = {}
+    codes = list(universe)[:scale]
+    for i, code in enumerate(codes):
+        _frame(universe[code]).to_csv(os.path.join(workdir, "history_data_backtest", f"{code}.csv"))
+        portfolio[code] = {"name": f"BENCH{i}", "strategy": "SMART_PRO", "ratio": 1.0 / scale, "setting": {"level": 1 + i % 5}}
+
+    saved = (run_backtest.PORTFOLIO, run_backtest.OUTPUT, os.getcwd(), run_backtest.CACHE.enabled)
+    run_backtest.PORTFOLIO = portfolio
+    run_backtest.OUTPUT = "NONE"         # 그래프/파일 출력 제외 (pyplot import 안 함)
+    run_backtest.CACHE.enabled = False   # 반복 측정이 캐시 적중으로 바뀌지 않도록
+    os.chdir(workdir)
+    try:
+        return _record("run_backtest.run", scale, _timeit(run_backtest.run, repeat))
+    finally:
+        run_backtest.PORTFOLIO, run_backtest.OUTPUT = saved[0], saved[1]
+        run_backtest.CACHE.enabled = saved[3]
+        os.chdir(saved[2])
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# ==========================================
+# 🔁 라이브 사이클 (가짜 브로커)
+# ==========================================
+def _bench_trader_cycle(market, universe, scale, repeat):
+    from src import data_manager
+    from src import clock
+    from src.traffic_recorder import OfflineAuthManager
+    if market == "KR":
+        from src.traders import kr_trader as module
+        cls, session_time = module.KoreaTrader, datetime(2024, 3, 6, 10, 0)   # 수요일 10:00
+    else:
+        from src.traders import us_trader as module
+        cls, session_time = module.USTrader, datetime(2024, 3, 6, 23, 45)     # 수요일 23:45
+
+    sub = {c: universe[c] for c in list(universe)[:scale]}
+    target_path = os.path.join(tempfile.mkdtemp(), f"targets_{market.lower()}.json")
+    with open(target_path, "w", encoding="utf-8") as f:
+        json.dump(make_targets(sub, market), f, ensure_ascii=False)
+
+    saved = data_manager.TARGET_FILES[market]
+    data_manager.TARGET_FILES[market] = target_path
+    clock.install(clock.VirtualClock(session_time))
+    try:
+        with contextlib.redirect_stdout(open(os.devnull, "w")):
+            trader = cls(OfflineAuthManager())
+        trader.session = FakeBrokerSession(sub, market)
+
+        def cold():
+            trader.pending_orders = []
+            trader.market_data_cache = {}
+            trader.day_state = {}
+            trader.run()
+
+        def warm():
+            trader.pending_orders = []
+            trader.run()
+
+        name = "KoreaTrader.run" if market == "KR" else "USTrader.run"
+        return [
+            _record(f"{name}[cold]", scale, _timeit(cold, repeat)),
+            _record(f"{name}[warm]", scale, _timeit(warm, repeat)),
+        ]
+    finally:
+        data_manager.TARGET_FILES[market] = saved
+        clock.uninstall()
+
+
+def bench_kr_cycle(universe, scale, repeat):
+    return _bench_trader_cycle("KR", universe, scale, repeat)
+
+
+def bench_us_cycle(universe, scale, repeat):
+    return _bench_trader_cycle("US", make_universe(scale, N_DAYS, "US"), scale, repeat)
+
+
+def bench_telegram_queue(universe, scale, repeat):
+    from src import telegram_bot
+    # 큐 상한(MAX_QUEUE)을 넘기면 버림 경로를 재게 됨 -> 상한 아래로 제한, 반복마다 빈 큐에서 시작
+    n_msgs = min(scale * 100, telegram_bot.MAX_QUEUE // 2)
+    msg = "📊 [Bench] " + "x" * 200
+
+    def job():
+        for _ in range(n_msgs): telegram_bot.send_telegram_msg(msg)
+    dropped = telegram_bot.dropped
+    times = _timeit(job, repeat, setup=telegram_bot.reset_queue)
+    telegram_bot.reset_queue()   # 벤치마크 메시지는 버림 (실제 전송 안 됨)
+    return _record("telegram.send_telegram_msg", scale, times, messages=n_msgs,
+                   msgs_per_sec=n_msgs / min(times), dropped=telegram_bot.dropped - dropped)
+
+
+BENCHMARKS = {
+    "live_indicators": bench_live_indicators,
+    "strategies": bench_strategies,
+    "backtest_indicators": bench_backtest_indicators,
+    "backtest_run": bench_backtest_run,
+    "kr_cycle": bench_kr_cycle,
+    "us_cycle": bench_us_cycle,
+    "telegram_queue": bench_telegram_queue,
+}
+
+
+# ==========================================
+# 💾 저장 / 비교
+# ==========================================
+def _meta():
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                         stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"), "commit": commit,
+        "python": platform.python_version(), "numpy": np.__version__, "pandas": pd.__version__,
+        "machine": platform.machine(), "cpu_count": os.cpu_count(), "n_days": N_DAYS,
+    }
+
+
+def compare(baseline_path, results, threshold=REGRESSION_THRESHOLD):
+    """기준 결과 대비 median 비율 출력, 회귀 항목 리스트 반환"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["name"], r["scale"]): r for r in json.load(f)["results"]}
+
+    regressions = []
+    print(f"\n📈 [Compare] 기준: {baseline_path} (회귀 기준 x{threshold})")
+    for r in results:
+        old = baseline.get((r["name"], r["scale"]))
+        if not old: continue
+        ratio = r["median"] / old["median"] if old["median"] else float("inf")
+        flag = "🚨" if ratio > threshold else ("✅" if ratio < 1 / threshold else "  ")
+        print(f"   {flag} {r['name']:<40} n={r['scale']:<5} x{ratio:.2f}")
+        if ratio > threshold: regressions.append((r["name"], r["scale"], ratio))
+    return regressions
+
+
+def run(selected=None, scales=SCALES, repeat=REPEAT, baseline=None):
+    selected = selected or list(BENCHMARKS)
+    universe = make_universe(max(scales), N_DAYS, "KR")
+    results = []
+
+    print(f"⏱️ [Bench] 시작 (종목 수 {scales}, 일봉 {N_DAYS}일, 반복 {repeat}회)")
+    for key in selected:
+        for scale in scales:
+            out = BENCHMARKS[key](universe, scale, repeat)
+            results.extend(out if isinstance(out, list) else [out])
+
+    os.makedirs(RESULT_DIR, exist_ok=True)
+    path = os.path.join(RESULT_DIR, f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": _meta(), "results": results}, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 [Bench] 결과 저장: {path}")
+
+    if baseline:
+        return compare(baseline, results)
+    return []
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="라이브/백테스트 핫패스 벤치마크")
+    parser.add_argument("--only", nargs="*", choices=list(BENCHMARKS), help="실행할 벤치마크")
+    parser.add_argument("--scales", nargs="*", type=int, default=SCALES)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--compare", help="비교할 기준 결과 JSON")
+    args = parser.parse_args()
+
+    regressions = run(args.only, args.scales, args.repeat, args.compare)
+    sys.exit(1 if regressions else 0)
@@ -10,7 +10,6 @@ class Config:
     # 🇰🇷 한국투자증권 설정 (KR: 실전투자)
     # ==========================================
     KR_MODE = "REAL"  # 한국은 고정
-    print(f"🚀 [모드] 한국 시장 - 실전투자(REAL) 환경으로 시작합니다.")
     KR_APP_KEY = os.getenv("KI_APP_KEY")
     KR_APP_SECRET = os.getenv("KI_APP_SECRET")
     KR_URL_BASE = os.getenv("KI_BASE_URL")
@@ -20,7 +19,6 @@ class Config:
     # 🇺🇸 미국주식 설정 (US: 실전투자)
     # ==========================================
     US_MODE = "REAL"   # 미국은 실전투자 고정
-    print(f"🚨 [주의] 미국 시장 - 실전투자(REAL) 환경으로 시작합니다.")
     # 실전 투자는 보통 .env의 KI_ (Korea Investment) 변수를 사용합니다.
     # .env 파일에 KI_APP_KEY 등이 있는지 꼭 확인하세요!
     US_APP_KEY = os.getenv("KI_APP_KEY")
@@ -34,16 +32,50 @@ class Config:
     HTS_ID = os.getenv("my_htsid")               # HTS ID
     USER_AGENT = os.getenv("my_agent")           # User-Agent
 
-    # 필수값 체크 (키가 비어있으면 에러 발생)
-    if not KR_APP_KEY or not KR_APP_SECRET:
-        print("⚠️ [Warning] 한국(모의) 투자 키가 .env에 없습니다.")
-    
-    if not US_APP_KEY or not US_APP_SECRET:
-        print("⚠️ [Warning] 미국(실전) 투자 키가 .env에 없습니다. (KI_... 변수 확인)")
-
     # 텔레그램 설정
     TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
     TELEGRAM_ID = os.getenv("TELEGRAM_ID")
 
     # 최소 현금 비율 (0.01 = 1%)
-    MIN_CASH_RATIO = 0.01
\ No newline at end of file
+    MIN_CASH_RATIO = 0.01
+
+    # 초당 주문 전송 수 (계좌 모드별, 같은 사이클 주문은 이 안에서 동시 전송)
+    ORDER_TPS = {"REAL": 10, "PAPER": 2}
+
+    # 매매 일지 (SQLite) 경로
+    TRADE_JOURNAL_PATH = "data/trade_journal.db"
+
+    # 로그 (data/logs/bot.jsonl, JSON Lines + 콘솔)
+    # 모듈별 레벨: kr_trader / us_trader / strategy / auth / controller / data / orders ... (DEBUG 면 종목별 상세)
+    LOG_LEVEL = "INFO"
+    LOG_LEVELS = {"kr_trader": "INFO", "us_trader": "INFO", "strategy": "WARNING", "auth": "INFO"}
+    LOG_DIR = "data/logs"
+    LOG_CONSOLE = True
+
+    # 추가 계좌 (멀티 계좌 모드) - 현재가/일봉은 시장별로 종목당 1회만 조회해 계좌들이 공유, 잔고/주문/타겟은 계좌별
+    # 예: {"name": "2", "market": "KR", "env": "KI2", "mode": "REAL", "targets": "data/targets_kr_2.json"}
+    #     -> .env 의 KI2_APP_KEY / KI2_APP_SECRET / KI2_ACCOUNT_NO (KI2_BASE_URL 없으면 기본 계좌 URL)
+    #     -> targets 를 생략하면 기본 계좌 타겟 파일 사용, 매매 일지 market 값은 'KR-2'
+    ACCOUNTS = []
+
+    # 메모리 보고 (kill -USR1 <pid> 또는 텔레그램 /mem), True 면 시작부터 tracemalloc 추적 (/mem trace 로도 시작)
+    MEMORY_TRACE = False
+
+    # API 트래픽 녹화 (RECORD 로 설정하면 data/traffic/ 에 요청/응답 저장)
+    TRAFFIC_MODE = os.getenv("TRAFFIC_MODE")
+    TRAFFIC_DIR = os.getenv("TRAFFIC_DIR", "data/traffic")
+
+    @classmethod
+    def startup_notes(cls):
+        """
+        [기능] 시작 안내 / 필수값 체크 (import 시 출력하지 않음 -> main.py 에서 로그 설정 후 호출)
+        :return: [(레벨, 메시지)]
+        """
+        notes = [("info", f"🚀 [모드] 한국 시장 - 실전투자({cls.KR_MODE}) 환경으로 시작합니다."),
+                 ("info", f"🚨 [주의] 미국 시장 - 실전투자({cls.US_MODE}) 환경으로 시작합니다.")]
+        # 필수값 체크 (키가 비어있으면 경고)
+        if not cls.KR_APP_KEY or not cls.KR_APP_SECRET:
+            notes.append(("warning", "⚠️ [Warning] 한국(모의) 투자 키가 .env에 없습니다."))
+        if not cls.US_APP_KEY or not cls.US_APP_SECRET:
+            notes.append(("warning", "⚠️ [Warning] 미국(실전) 투자 키가 .env에 없습니다. (KI_... 변수 확인)"))
+        return notes
@@ -45,4 +45,10 @@ for item in targets:
     df.to_csv(file_path)
     print(f"   ㄴ 저장 완료: {file_path} ({len(df)} rows)")
 
+# 💱 USD/KRW 환율 (KR+US 통합 백테스트용)
+print(f"📥 [USD/KRW] 환율 데이터 다운로드 중...")
+fx = fdr.DataReader('USD/KRW', start_date, end_date)
+fx.to_csv("history_data_backtest/USDKRW.csv")
+print(f"   ㄴ 저장 완료: history_data_backtest/USDKRW.csv ({len(fx)} rows)")
+
 print("\n✨ 모든 데이터 수집이 완료되었습니다!")
\ No newline at end of file
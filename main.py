@@ -2,10 +2,23 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from config import Config
+from src import logger, memory_monitor
+from src.telegram_bot import start_command_listener
 from src.main_controller import MainController
 
 if __name__ == "__main__":
-    
-    # 2. 컨트롤러 실행
+
+    # 1. 로그 시작 (파일 + 콘솔, 쓰기는 백그라운드 쓰레드)
+    logger.setup()
+    log = logger.get_logger("main")
+    for level, msg in Config.startup_notes():
+        getattr(log, level)(msg)
+
+    # 2. 메모리 보고 (kill -USR1 / 텔레그램 /mem) + 텔레그램 명령 수신
+    memory_monitor.install()
+    start_command_listener()
+
+    # 3. 컨트롤러 실행
     controller = MainController()
     controller.run()
\ No newline at end of file
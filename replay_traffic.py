@@ -0,0 +1,88 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+
+# ==========================================
+# ⚙️ 재생 설정 (명령행 인자로 덮어쓸 수 있음)
+# ==========================================
+# 녹화 방법: .env 에 TRAFFIC_MODE=RECORD 를 넣고 봇 실행 -> data/traffic/*.jsonl.gz 생성
+MARKET = "KR"      # KR / US
+SPEED = 0          # 0 = 지연 없이 최대 속도, 1.0 = 녹화 당시 속도, 10 = 10배속
+CYCLES = 10        # run() 반복 횟수
+
+
+def replay(path, market=MARKET, speed=SPEED, cycles=CYCLES):
+    # 재생 중에는 텔레그램/매매일지가 실제 데이터를 건드리지 않도록 격리
+    Config.TELEGRAM_TOKEN = None
+    Config.TRAFFIC_MODE = None
+    Config.TRADE_JOURNAL_PATH = os.path.join(tempfile.mkdtemp(), "replay_journal.db")
+
+    from src.traffic_recorder import ReplaySession, OfflineAuthManager
+    from src import clock
+    if market == "KR":
+        from src.traders import kr_trader as trader_module
+        trader_cls = trader_module.KoreaTrader
+    else:
+        from src.traders import us_trader as trader_module
+        trader_cls = trader_module.USTrader
+
+    session = ReplaySession(path, speed=speed)
+    # 트레이더 시계를 녹화 시작 시각으로 (sleep 은 speed 배속, 0이면 대기 없음)
+    clock.install(clock.VirtualClock(session.start_time, speed))
+
+    trader = trader_cls(OfflineAuthManager(mode=Config.KR_MODE if market == "KR" else Config.US_MODE))
+    trader.session = session
+
+    # ⏱️ 핫패스 계측 (지표 계산 / 신호 판단)
+    stats = {"signal_rows": [0, 0.0], "get_signal": [0, 0.0]}
+
+    def timed(name, func):
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try: return func(*args, **kwargs)
+            finally:
+                stats[name][0] += 1
+                stats[name][1] += time.perf_counter() - t0
+        return wrapper
+
+    trader.signal_rows = timed("signal_rows", trader.signal_rows)
+    trader_module.get_signal = timed("get_signal", trader_module.get_signal)
+
+    cycle_times = []
+    try:
+        for i in range(cycles):
+            t0 = time.perf_counter()
+            result = trader.run()
+            cycle_times.append(time.perf_counter() - t0)
+            if result == "HOLIDAY": break
+    finally:
+        clock.uninstall()
+
+    print("\n" + "=" * 50)
+    print(f"▶️ [Replay 결과] {market} {len(cycle_times)}사이클 (속도 x{speed or '∞'})")
+    if cycle_times:
+        ordered = sorted(cycle_times)
+        print(f"   run(): 평균 {sum(cycle_times)/len(cycle_times)*1000:.1f}ms | "
+              f"중앙 {ordered[len(ordered)//2]*1000:.1f}ms | 최대 {ordered[-1]*1000:.1f}ms")
+    for name, (count, total) in stats.items():
+        avg = (total / count * 1000) if count else 0
+        print(f"   {name}: {count}회 | 합계 {total*1000:.1f}ms | 평균 {avg:.3f}ms")
+    print(f"   녹화 응답 {session.total}건 | 누락 요청 {session.missed}건")
+    print("=" * 50)
+    return {"cycles": cycle_times, "stats": stats, "missed": session.missed}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="녹화된 API 트래픽으로 트레이더 사이클 재생")
+    parser.add_argument("path", help="녹화 파일 (data/traffic/*.jsonl.gz)")
+    parser.add_argument("--market", default=MARKET, choices=["KR", "US"])
+    parser.add_argument("--speed", type=float, default=SPEED)
+    parser.add_argument("--cycles", type=int, default=CYCLES)
+    args = parser.parse_args()
+    replay(args.path, args.market, args.speed, args.cycles)
@@ -1,108 +1,26 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 import os
 import glob
 import warnings
 import platform
 
-# 경고 무시 및 폰트 설정
+# 경고 무시 (pyplot / 한글 폰트 설정은 화면 출력할 때만 -> _pyplot())
 warnings.filterwarnings('ignore')
-plt.rcParams['axes.unicode_minus'] = False
-
-system_name = platform.system()
-
-if system_name == 'Darwin': # Mac 환경
-    plt.rc('font', family='AppleGothic')
-elif system_name == 'Windows': # Windows 환경
-    plt.rc('font', family='Malgun Gothic')
-else: # Linux 환경 (구글 코랩 등)
-    plt.rc('font', family='NanumGothic')
-
-# 마이너스(-) 부호가 깨지는 현상 방지
-plt.rcParams['axes.unicode_minus'] = False
 
 # ==========================================
-# 1. 전략 함수 정의 (SMART_PRO)
+# 1. 지표 / 엔진 (라이브 트레이더와 동일한 전략 코드 사용)
 # ==========================================
-
-def strat_smart_momentum_pro(curr, prev, setting):
-    """
-    [전략] 스마트 모멘텀 PRO
-    """
-    # 0. 레벨 파싱 (여기서 setting은 {'level': N} 딕셔너리임)
-    level = setting.get('level', 2)
-    
-    # [티어별 스탯 설정]
-    if level == 5: # 🐲 드래곤 (3배 ETF)
-        gap_trigger = 0.01; k_discount = 5.0; vol_ratio = 0.3
-        drop_base = 0.90; drop_tight = 0.95; rsi_hot = 90
-    elif level == 4: # 🥷 어쌔신 (로봇/바이오)
-        gap_trigger = 0.02; k_discount = 3.0; vol_ratio = 0.5
-        drop_base = 0.93; drop_tight = 0.96; rsi_hot = 85
-    elif level == 3: # 🏹 헌터 (2배/테슬라)
-        gap_trigger = 0.02; k_discount = 2.0; vol_ratio = 0.6
-        drop_base = 0.94; drop_tight = 0.97; rsi_hot = 80
-    elif level == 1: # 🛡️ 탱커 (삼성전자)
-        gap_trigger = 0.05; k_discount = 1.0; vol_ratio = 1.0
-        drop_base = 0.97; drop_tight = 0.985; rsi_hot = 75
-    else: # ⚔️ 전사 (Lv 2)
-        gap_trigger = 0.03; k_discount = 1.5; vol_ratio = 0.8
-        drop_base = 0.95; drop_tight = 0.97; rsi_hot = 80
-
-    # 🛡️ [방어] 갭하락 출발 금지
-    gap_start = (curr['Open'] - prev['Close']) / prev['Close']
-    if gap_start < -0.02:
-        if level < 5: return 'none', f"갭하락({gap_start*100:.1f}%)_Pass", 0
-        elif gap_start < -0.04: return 'none', f"폭락출발({gap_start*100:.1f}%)_Pass", 0
-        
-    # 🛡️ [방어] 20일선 우하향 금지
-    sma20_slope = curr['SMA20'] - prev['SMA20']
-    if sma20_slope < 0 and level < 4:
-        return 'none', "20일선_우하향_Pass", 0
-
-    # 🔴 [매도] 가변형 트레일링 스탑
-    current_price = curr['Close']
-    recent_high = curr['High5'] if 'High5' in curr else curr['High']
-    current_rsi = curr.get('RSI', 50)
-    
-    if current_rsi >= rsi_hot:
-        limit_price = recent_high * drop_tight
-        msg_type = f"과열권_조정(-{(1-drop_tight)*100:.1f}%)"
-    else:
-        limit_price = recent_high * drop_base
-        msg_type = f"고점대비하락(-{(1-drop_base)*100:.1f}%)"
-        
-    if current_price < limit_price:
-        return 'sell', f"{msg_type}_청산", 0
-        
-    if current_price < curr['SMA20'] * 0.99:
-        return 'sell', "추세이탈(SMA20)", 0
-
-    # 🟢 [매수] 
-    k = curr.get('NoiseMA20', 0.5)
-    if pd.isna(k): k = 0.5
-    
-    # 갭상승 K 할인 적용
-    if gap_start >= gap_trigger:
-        k = max(0.3, k - (gap_start * k_discount))
-    k = max(0.3, min(0.7, k))
-
-    target_price = curr['Open'] + (prev['Range'] * k)
-    
-    is_bull = current_price > curr['SMA20']
-    is_breakout = current_price > target_price
-    is_vol_ok = curr['Volume'] > prev['Volume'] * vol_ratio
-    
-    if is_breakout and is_bull and is_vol_ok:
-        return 'buy', f"PRO_돌파(Lv.{level}, k={k:.2f})", 0
-
-    return 'none', '', 0
-
-def get_signal(strategy_name, curr, prev, setting):
-    if strategy_name == "SMART_PRO":
-        return strat_smart_momentum_pro(curr, prev, setting)
-    return 'none', '', 0
+from src.indicators import build_backtest_frame, required_indicators
+from src.backtest.engine import to_rows, simulate, summarize
+from src.backtest.walk_forward import walk_forward, LEVELS
+from src.backtest import monte_carlo
+from src.backtest.intraday import simulate_intraday
+from src.backtest.minute_store import MINUTE_DIR
+from src.backtest import cross_market
+from src.backtest.cache import ResultCache, make_key, file_digest, CACHE_DIR
+from src.backtest import report
+from src.backtest import analytics
 
 # ==========================================
 # ⚙️ PORTFOLIO 설정 (전략명 'SMART_PRO'로 통일!)
@@ -152,67 +70,68 @@ PORTFOLIO = {
 INIT_BALANCE = 10000000  
 COMMISSION = 0.002 
 
+# ==========================================
+# 🚶 실행 모드
+# ==========================================
+MODE = "SINGLE"          # SINGLE: 전체 기간 1회 / WALK_FORWARD: 학습-검증 롤링 / MONTE_CARLO: 1회 + 강건성 검증 / INTRADAY: 분봉 체결 / CROSS_MARKET: KR+US 통합 계좌
+WF_TRAIN_DAYS = 180      # 학습 구간 (거래일)
+WF_TEST_DAYS = 60        # 검증 구간 (거래일), 윈도우 이동 간격도 동일
+WF_LEVELS = LEVELS       # SMART_PRO 탐색 레벨
+WF_WORKERS = None        # 병렬 프로세스 수 (None = CPU 수)
+MC_PATHS = 20000         # 몬테카를로 경로 수
+MC_BLOCK = 5             # 부트스트랩 블록 길이 (거래일)
+MC_SEED = 42             # 재현용 시드 (None = 매번 다름)
+INTRADAY_MARKET = "KR"   # 분봉 모드 주문 방식 (KR: 시장가 / US: ±0.5% 지정가), 종목 설정의 'market'이 우선
+INTRADAY_START = None    # 분봉 백테스트 기간 (예: "2025-01-01", None = 전체)
+INTRADAY_END = None
+FX_FILE = cross_market.FX_FILE          # 통합 모드 USD/KRW 환율 CSV (없으면 FX_FALLBACK 고정 환율)
+FX_FALLBACK = cross_market.FX_FALLBACK
+MARKET_COSTS = cross_market.MARKET_COSTS  # 통합 모드 시장별 수수료/세금 (COMMISSION 대신 사용)
+OUTPUT = "SHOW"          # SHOW: 그래프 창 (plt.show) / FILES: REPORT_DIR 에 PNG/HTML/CSV(+Parquet) 저장 (GUI 사용 안 함) / NONE: 출력 안 함
+REPORT_DIR = "backtest_reports"   # FILES 모드 저장 폴더 (실행마다 하위 폴더 생성)
+TRADE_PRINT = "ALL"      # ALL: 체결마다 출력 / SUMMARY: 종목별 요약만 / NONE: 출력 안 함
+PLOT_MAX_POINTS = report.PLOT_MAX_POINTS   # 그래프 최대 점 수 (긴 자산곡선은 min/max decimation)
+CACHE_ENABLED = True     # 결과 캐시 (CSV 내용 + 코드 + 설정이 같으면 지표/결과 재사용)
+CACHE_MAX_MB = 512       # 캐시 폴더 최대 용량 (초과 시 오래 안 쓴 항목부터 삭제)
+
+CACHE = ResultCache(CACHE_DIR, CACHE_MAX_MB * 1024 * 1024, enabled=CACHE_ENABLED)
+
 # ==========================================
 # 🧠 지표 계산
 # ==========================================
-def calculate_indicators(df):
+def calculate_indicators(df, required=None):
     """
-    보조지표 계산 (SMA, RSI, 노이즈, +High5)
+    보조지표 계산 (공용 지표 엔진, PORTFOLIO 전략에 필요한 지표만)
+    - 워밍업 구간(NaN)은 제거, 날짜 인덱스 유지
     """
-    # 데이터가 너무 적으면 계산 불가
-    if len(df) < 20: return pd.DataFrame()
-    
-    df = df.copy()
-    
-    # 1. 이동평균선 (SMA)
-    df['SMA5'] = df['Close'].rolling(window=5).mean()
-    df['SMA20'] = df['Close'].rolling(window=20).mean()
-    df['SMA60'] = df['Close'].rolling(window=60).mean()
-    
-    # 2. 노이즈 (동적 K용)
-    range_size = df['High'] - df['Low']
-    body_size = (df['Open'] - df['Close']).abs()
-    noise = 1 - (body_size / range_size.replace(0, 1))
-    df['NoiseMA20'] = noise.rolling(window=20).mean() # 최근 20일 평균 노이즈
-
-    # 3. 변동성 (Range)
-    df['Range'] = df['High'].shift(1) - df['Low'].shift(1)
-
-    # 4. RSI (14일)
-    delta = df['Close'].diff(1)
-    gain = delta.where(delta > 0, 0)
-    loss = -delta.where(delta < 0, 0)
-    rs = gain.rolling(window=14).mean() / loss.rolling(window=14).mean().replace(0, 1)
-    df['RSI'] = 100 - (100 / (1 + rs))
-
-    # 5. 거래량 이평
-    df['VolMA5'] = df['Volume'].rolling(window=5).mean()
-
-    # ✅ [NEW] 최근 5일간 최고가 (High5) - 가변형 익절 기준
-    # 오늘 포함 과거 5일 중 최고가
-    df['High5'] = df['High'].rolling(window=5).max()
-    df['High5'].fillna(df['High'], inplace=True) # 앞부분 NaN 방지
-
-    # NaN 제거
-    df.dropna(inplace=True)
-    
-    # 🚨 [수정] reset_index를 하지 말고 그대로 리턴해야 날짜 인덱스가 유지됨!
-    return df
+    if required is None:
+        required = required_indicators(c['strategy'] for c in PORTFOLIO.values())
+    return build_backtest_frame(df, required)
+
+def data_digests(codes=None):
+    """종목별 CSV 내용 해시 (캐시 키용)"""
+    codes = PORTFOLIO if codes is None else codes
+    out = {}
+    for code in codes:
+        path = os.path.join("history_data_backtest", f"{code}.csv")
+        if os.path.exists(path): out[code] = file_digest(path)
+    return out
 
 # ==========================================
-# 🚀 백테스트 실행 엔진 (수정완료)
+# 📂 데이터 로딩
 # ==========================================
-def run():
+def load_data(with_indicators=True):
+    """history_data_backtest/*.csv -> { code: 지표 포함 DataFrame } (PORTFOLIO 종목만, with_indicators=False면 원본 일봉)"""
     # 폴더 확인 및 생성
     if not os.path.exists("history_data_backtest"):
         os.makedirs("history_data_backtest")
         print("📁 'history_data_backtest' 폴더를 생성했습니다. 여기에 CSV 파일을 넣어주세요.")
-        return
+        return {}
 
     files = glob.glob("history_data_backtest/*.csv")
     if not files: 
         print("❌ 'history_data_backtest' 폴더에 csv 파일이 없습니다. 파일을 넣고 다시 실행하세요.")
-        return
+        return {}
 
     data_map = {}
     print(f"🔄 데이터 로딩 중... ({len(files)}개 파일)")
@@ -221,133 +140,104 @@ def run():
         code = os.path.basename(f).split('.')[0]
         if code not in PORTFOLIO: continue
         try:
+            if with_indicators and CACHE.enabled:
+                # 지표 프레임 캐시: CSV 내용 + 필요한 지표 조합이 같으면 재사용
+                required = sorted(required_indicators(c['strategy'] for c in PORTFOLIO.values()))
+                key = make_key("frame", file_digest(f), required)
+                df = CACHE.get(key)
+                if df is not None:
+                    data_map[code] = df
+                    continue
             df = pd.read_csv(f, parse_dates=['Date'], index_col='Date')
             df.sort_index(inplace=True) 
             if len(df) < 60: continue
-            df = calculate_indicators(df)
+            if with_indicators:
+                df = calculate_indicators(df)
+                if CACHE.enabled: CACHE.put(key, df)
             data_map[code] = df
         except Exception as e:
             print(f"⚠️ {code} 로드 실패: {e}")
 
     if not data_map: 
         print("❌ 유효한 데이터가 없습니다. PORTFOLIO 설정을 확인하세요.")
-        return
+    return data_map
+
+# ==========================================
+# 📊 결과 출력 (화면 / 파일 / 없음)
+# ==========================================
+def _pyplot():
+    """pyplot 지연 import + 한글 폰트 설정 (SHOW 모드에서만 호출)"""
+    import matplotlib.pyplot as plt
+    system_name = platform.system()
+    if system_name == 'Darwin': # Mac 환경
+        plt.rc('font', family='AppleGothic')
+    elif system_name == 'Windows': # Windows 환경
+        plt.rc('font', family='Malgun Gothic')
+    else: # Linux 환경 (구글 코랩 등)
+        plt.rc('font', family='NanumGothic')
+    # 마이너스(-) 부호가 깨지는 현상 방지
+    plt.rcParams['axes.unicode_minus'] = False
+    return plt
+
+def plot_equity(history, title):
+    plt = _pyplot()
+    res_df = pd.DataFrame(history).set_index('Date')
+    x, y = report.decimate(res_df.index, res_df['TotalAsset'].to_numpy(), PLOT_MAX_POINTS)
+    plt.figure(figsize=(12, 6))
+    plt.plot(x, y, color='red', label='Total Asset')
+    plt.title(title)
+    plt.legend()
+    plt.grid(True, alpha=0.3)
+    plt.show()
+
+def trade_verbose():
+    """simulate(verbose=...) 값 (체결마다 출력할지)"""
+    return TRADE_PRINT == "ALL"
+
+def output_result(history, trades, title, name, summary=None):
+    """성과 분석 + OUTPUT 설정에 따라 매매 요약 + 그래프/파일 출력"""
+    if TRADE_PRINT == "SUMMARY" and trades: report.print_trade_summary(trades)
+    stats = analytics.analyze(history, trades or [], INIT_BALANCE)
+    analytics.report(stats)
+    summary = {**(summary or {}), **analytics.summary_items(stats)}
+    if OUTPUT == "FILES":
+        from datetime import datetime
+        out_dir = os.path.join(REPORT_DIR, f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        paths = report.write_report(history, trades or [], out_dir, title, summary, PLOT_MAX_POINTS)
+        print(f"💾 [Report] {len(paths)}개 파일 저장: {out_dir}")
+    elif OUTPUT == "SHOW":
+        plot_equity(history, title)
+
+# ==========================================
+# 🚀 백테스트 실행 (전체 기간 1회)
+# ==========================================
+def run():
+    data_map = load_data()
+    if not data_map: return
 
     all_dates = sorted(list(set.union(*[set(df.index) for df in data_map.values()])))
-    balance = INIT_BALANCE
-    holdings = {code: 0 for code in PORTFOLIO}
-    avg_price = {code: 0 for code in PORTFOLIO}
-    
-    daily_history = []
-    trade_logs = [] 
+    rows_map = {code: to_rows(df) for code, df in data_map.items()}
 
     print(f"\n🚀 백테스트 시작! (전략: SMART_PRO)")
-    print("-" * 100)
-    print(f"{'날짜':<12} | {'유형':<4} | {'종목명':<10} | {'체결가':>9} | {'수익률/이유'}")
-    print("-" * 100)
-    
-    for i in range(1, len(all_dates)):
-        today = all_dates[i]
-        prev_day = all_dates[i-1]
-        date_str = today.strftime('%Y-%m-%d')
-        
-        current_equity = balance
-        for code, qty in holdings.items():
-            if qty > 0:
-                price = data_map[code].loc[today]['Close'] if today in data_map[code].index else 0
-                if price > 0: current_equity += qty * price
-        
-        daily_log = {'Date': today, 'TotalAsset': current_equity}
-        
-        for code, config in PORTFOLIO.items():
-            if code not in data_map: continue
-            df = data_map[code]
-            if today not in df.index or prev_day not in df.index: continue
-            
-            curr = df.loc[today]
-            prev = df.loc[prev_day]
-            name = config['name']
-            
-            # 🚨 [핵심] get_signal에 setting 전체가 아니라 'config['setting']'을 넘겨야 함!
-            level_setting = config.get('setting', {'level': 2}) 
-            
-            # ----------------------------------------
-            # [A] 매도 (Sell)
-            # ----------------------------------------
-            if holdings[code] > 0:
-                signal, reason, _ = get_signal(config['strategy'], curr, prev, level_setting)
-                
-                if signal == 'sell':
-                    exec_price = curr['Close']
-                    qty = holdings[code]
-                    amount = qty * exec_price
-                    balance += amount * (1 - COMMISSION)
-                    
-                    profit_rate = (exec_price - avg_price[code]) / avg_price[code] * 100
-                    icon = "📈" if profit_rate > 0 else "📉"
-                    
-                    print(f"{date_str} | 🔵 매도 | {name:<10} | {exec_price:>9,.0f} | {icon} {profit_rate:.2f}% ({reason})")
-                    trade_logs.append({'Date': date_str, 'Name': name, 'Type': 'Sell', 'Price': exec_price, 'Profit': profit_rate, 'Reason': reason})
-                    
-                    holdings[code] = 0
-                    avg_price[code] = 0
-
-            # ----------------------------------------
-            # [B] 매수 (Buy)
-            # ----------------------------------------
-            elif holdings[code] == 0:
-                signal, reason, _ = get_signal(config['strategy'], curr, prev, level_setting)
-                
-                if signal == 'buy':
-                    target_ratio = config['ratio']
-                    invest_amt = current_equity * target_ratio
-                    
-                    if balance > invest_amt and invest_amt > 10000:
-                        # 🚨 [중요] 백테스트 엔진에서도 '갭 보정된 K'를 다시 계산해야 정확한 매수가가 나옴
-                        k = curr['NoiseMA20'] if not pd.isna(curr.get('NoiseMA20')) else 0.5
-                        
-                        # (1) 레벨 가져오기
-                        level = level_setting.get('level', 2)
-                        
-                        # (2) 파라미터 세팅 (전략과 동일하게!)
-                        if level == 5:   gap_trigger=0.01; k_discount=5.0
-                        elif level == 4: gap_trigger=0.02; k_discount=3.0
-                        elif level == 3: gap_trigger=0.02; k_discount=2.0
-                        elif level == 1: gap_trigger=0.05; k_discount=1.0
-                        else:            gap_trigger=0.03; k_discount=1.5
-                        
-                        # (3) 갭 보정 적용
-                        gap_start = (curr['Open'] - prev['Close']) / prev['Close']
-                        if gap_start >= gap_trigger:
-                            k = max(0.3, k - (gap_start * k_discount))
-                        k = max(0.3, min(0.7, k))
-                        
-                        # (4) 최종 목표가 계산
-                        target_p = curr['Open'] + (prev['Range'] * k)
-                        buy_price = max(curr['Open'], target_p) # 시가가 목표가보다 높으면 시가 체결
-                        
-                        qty = int(invest_amt / buy_price)
-                        if qty > 0:
-                            cost = qty * buy_price
-                            balance -= cost * (1 + COMMISSION)
-                            holdings[code] = qty
-                            avg_price[code] = buy_price
-                            
-                            print(f"{date_str} | 🔴 매수 | {name:<10} | {buy_price:>9,.0f} | {reason}")
-                            trade_logs.append({'Date': date_str, 'Name': name, 'Type': 'Buy', 'Price': buy_price, 'Profit': 0, 'Reason': reason})
-
-        daily_history.append(daily_log)
-
-    if not daily_history:
+    if trade_verbose():
+        print("-" * 100)
+        print(f"{'날짜':<12} | {'유형':<4} | {'종목명':<10} | {'체결가':>9} | {'수익률/이유'}")
+        print("-" * 100)
+
+    # 같은 데이터 + 코드 + 설정이면 이전 결과 재사용
+    key = make_key("run", data_digests(data_map), PORTFOLIO, INIT_BALANCE, COMMISSION)
+    result = CACHE.get(key)
+    if result is not None:
+        print(f"♻️ [Cache] 동일 입력 결과 재사용 (매매 {len(result['trades'])}건)")
+    else:
+        result = CACHE.put(key, simulate(rows_map, PORTFOLIO, all_dates, INIT_BALANCE, COMMISSION, verbose=trade_verbose()))
+
+    if not result['history']:
         print("❌ 거래 내역이 없습니다.")
         return
 
     # 결과 출력
-    res_df = pd.DataFrame(daily_history).set_index('Date')
-    final = res_df.iloc[-1]['TotalAsset']
-    ret = (final - INIT_BALANCE) / INIT_BALANCE * 100
-    res_df['Peak'] = res_df['TotalAsset'].cummax()
-    mdd = ((res_df['TotalAsset'] - res_df['Peak']) / res_df['Peak'] * 100).min()
+    final, ret, mdd = result['final'], result['return'], result['mdd']
 
     print("\n" + "="*40)
     print(f"💰 최종 자산: {final:,.0f}원")
@@ -355,12 +245,126 @@ def run():
     print(f"💧 MDD: {mdd:.2f}%")
     print("="*40)
     
-    plt.figure(figsize=(12, 6))
-    plt.plot(res_df['TotalAsset'], color='red', label='Total Asset')
-    plt.title(f'Smart Momentum PRO Backtest (Ret: {ret:.2f}%, MDD: {mdd:.2f}%)')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.show()
+    output_result(result['history'], result['trades'], f'Smart Momentum PRO Backtest (Ret: {ret:.2f}%, MDD: {mdd:.2f}%)',
+                  "single", {"최종 자산": f"{final:,.0f}", "수익률": f"{ret:.2f}%", "MDD": f"{mdd:.2f}%"})
+    return result
+
+# ==========================================
+# 🚶 워크포워드 (학습 구간 레벨 최적화 -> 검증 구간 평가)
+# ==========================================
+def run_walk_forward():
+    data_map = load_data()
+    if not data_map: return
+
+    # 지표는 전체 기간으로 1회 계산, 윈도우는 날짜로만 분할
+    all_dates = sorted(list(set.union(*[set(df.index) for df in data_map.values()])))
+    rows_map = {code: to_rows(df) for code, df in data_map.items()}
+
+    print(f"\n🚶 워크포워드 시작! (학습 {WF_TRAIN_DAYS}일 / 검증 {WF_TEST_DAYS}일, 레벨 {list(WF_LEVELS)})")
+    wf = walk_forward(rows_map, PORTFOLIO, all_dates, WF_TRAIN_DAYS, WF_TEST_DAYS,
+                      levels=WF_LEVELS, init_balance=INIT_BALANCE, commission=COMMISSION, workers=WF_WORKERS,
+                      cache=CACHE if CACHE.enabled else None, digests=data_digests(data_map))
+
+    if not wf['history']:
+        print(f"❌ 기간 부족: 거래일 {len(all_dates)}일 < 학습 {WF_TRAIN_DAYS}일 + 검증 1일")
+        return
+
+    print("-" * 100)
+    for w in wf['windows']:
+        levels = ", ".join(f"{PORTFOLIO[c]['name']} Lv.{lv}({r:+.1f}%)" for c, (lv, r) in w['levels'].items())
+        print(f"검증 {w['test'][0]:%Y-%m-%d}~{w['test'][1]:%Y-%m-%d} | "
+              f"수익률 {w['return']:>6.2f}% | MDD {w['mdd']:>6.2f}% | 매매 {len(w['trades'])}건 | {levels}")
+    print("-" * 100)
+
+    final, ret, mdd = summarize(wf['history'], INIT_BALANCE)
+    print("\n" + "="*40)
+    print(f"💰 [OOS] 최종 자산: {final:,.0f}원")
+    print(f"🔥 [OOS] 총 수익률: {ret:.2f}%")
+    print(f"💧 [OOS] MDD: {mdd:.2f}%")
+    print("="*40)
+
+    output_result(wf['history'], [t for w in wf['windows'] for t in w['trades']], f'Walk-Forward OOS (Ret: {ret:.2f}%, MDD: {mdd:.2f}%)',
+                  "walk_forward", {"최종 자산": f"{final:,.0f}", "수익률": f"{ret:.2f}%", "MDD": f"{mdd:.2f}%", "윈도우": len(wf['windows'])})
+    return wf
+
+# ==========================================
+# 🎲 몬테카를로 (매매 순서 셔플 / 일간 수익률 블록 부트스트랩)
+# ==========================================
+def run_monte_carlo():
+    result = run()
+    if not result: return
+
+    mc = monte_carlo.run_monte_carlo(result, n_paths=MC_PATHS, block=MC_BLOCK,
+                                     init_balance=INIT_BALANCE, seed=MC_SEED, workers=WF_WORKERS)
+    monte_carlo.report(mc)
+    return mc
+
+# ==========================================
+# ⏱️ 분봉 체결 시뮬레이션 (history_data_minute/{종목}/{YYYY-MM}.npy)
+# ==========================================
+def run_intraday():
+    daily_map = load_data(with_indicators=False)
+    if not daily_map: return
+
+    print(f"\n⏱️ 분봉 백테스트 시작! (분봉 폴더: {MINUTE_DIR}, 기본 시장: {INTRADAY_MARKET})")
+    result = simulate_intraday(daily_map, PORTFOLIO, INTRADAY_START, INTRADAY_END, market=INTRADAY_MARKET,
+                               init_balance=INIT_BALANCE, commission=COMMISSION, verbose=trade_verbose())
+    if not result['history']:
+        print(f"❌ 분봉 데이터가 없습니다. '{MINUTE_DIR}/{{종목코드}}/YYYY-MM.npy' 를 준비하세요.")
+        return
+
+    stats = result['orders']
+    fills = [t for t in result['trades'] if t['SignalPrice']]
+    slip = [((t['Price'] - t['SignalPrice']) if t['Type'] == 'Buy' else (t['SignalPrice'] - t['Price'])) / t['SignalPrice'] * 10000 for t in fills]
+
+    print("\n" + "="*40)
+    print(f"💰 최종 자산: {result['final']:,.0f}원")
+    print(f"🔥 총 수익률: {result['return']:.2f}%")
+    print(f"💧 MDD: {result['mdd']:.2f}%")
+    print(f"📨 주문 {stats['orders']}건 | 전량 {stats['filled']} | 부분 {stats['partial']} | 미체결 {stats['unfilled']}")
+    if slip: print(f"📏 평균 슬리피지: {np.mean(slip):.1f}bp (신호 시점 가격 대비)")
+    print("="*40)
+
+    output_result(result['history'], result['trades'], f'Intraday Backtest (Ret: {result["return"]:.2f}%, MDD: {result["mdd"]:.2f}%)',
+                  "intraday", {"최종 자산": f"{result['final']:,.0f}", "수익률": f"{result['return']:.2f}%", "MDD": f"{result['mdd']:.2f}%", **stats})
+    return result
+
+# ==========================================
+# 🌏 KR + US 통합 계좌 (원화 기준, 환율 환산)
+# ==========================================
+def run_cross_market():
+    data_map = load_data()
+    if not data_map: return
+
+    fx = cross_market.load_fx(FX_FILE, FX_FALLBACK)
+    print(f"\n🌏 통합 백테스트 시작! (KR+US 원화 단일 계좌)")
+    print("-" * 100)
+    result = cross_market.simulate_cross_market(data_map, PORTFOLIO, fx=fx, init_balance=INIT_BALANCE,
+                                                costs=MARKET_COSTS, fx_fallback=FX_FALLBACK, verbose=trade_verbose())
+    if not result['history']:
+        print("❌ 거래 내역이 없습니다.")
+        return
+
+    print("\n" + "="*40)
+    print(f"💰 최종 자산: {result['final']:,.0f}원")
+    print(f"🔥 총 수익률: {result['return']:.2f}%")
+    print(f"💧 MDD: {result['mdd']:.2f}%")
+    print("="*40)
+    cross_market.report(result)
+
+    output_result(result['history'], result['trades'], f'Cross-Market Backtest (Ret: {result["return"]:.2f}%, MDD: {result["mdd"]:.2f}%)',
+                  "cross_market", {"최종 자산": f"{result['final']:,.0f}", "수익률": f"{result['return']:.2f}%", "MDD": f"{result['mdd']:.2f}%",
+                                   **{f"{m} 손익": f"{v['pnl']:+,.0f}" for m, v in result['markets'].items()}})
+    return result
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    if MODE == "WALK_FORWARD":
+        run_walk_forward()
+    elif MODE == "MONTE_CARLO":
+        run_monte_carlo()
+    elif MODE == "INTRADAY":
+        run_intraday()
+    elif MODE == "CROSS_MARKET":
+        run_cross_market()
+    else:
+        run()
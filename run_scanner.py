@@ -0,0 +1,69 @@
+import os
+import sys
+import json
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src import scanner
+
+# ==========================================
+# ⚙️ 스캐너 설정
+# ==========================================
+# 장 시작 전에 로컬 일봉 저장소 전체를 스캔 -> SMART_PRO 진입 필터 통과 + 최근 성과 상위 종목을
+# 타겟 파일 형식으로 '제안' 파일에 저장 (라이브 타겟 파일은 직접 검토 후 교체)
+DATA_DIR = "history_data_backtest"
+MARKETS = ("KR", "US")
+TOP_N = 10                 # 시장별 제안 종목 수
+TOTAL_RATIO = 0.9          # 제안 종목 비중 합계 (동일 배분)
+MAX_RATIO = 0.2            # 종목당 최대 비중
+PRINT_TOP = 20             # 화면에 출력할 순위 수
+OUTPUT_FILES = {"KR": "data/targets_kr.proposed.json", "US": "data/targets_us.proposed.json"}
+LIVE_FILES = {"KR": "data/targets_kr.json", "US": "data/targets_us.json"}   # 종목명 참고용
+
+
+def known_names(paths=LIVE_FILES):
+    """현재 타겟 파일의 종목명 (저장소에는 종목명이 없으므로)"""
+    names = {}
+    for path in paths.values():
+        if not os.path.exists(path): continue
+        with open(path, encoding="utf-8") as f:
+            names.update({t['code']: t.get('name', t['code']) for t in json.load(f)})
+    return names
+
+
+def print_ranking(market, results, top=PRINT_TOP):
+    passed = [r for r in results if r['passed']]
+    print(f"\n🔭 [{market}] 스캔 {len(results):,}종목 | 필터 통과 {len(passed):,}종목")
+    for i, r in enumerate(passed[:top], 1):
+        print(f"   {i:>2}. {r['code']:<8} Lv{r['level']} | 점수 {r['score']:.2f} | 기대 {r['expectancy_bp']:>+6.1f}bp "
+              f"(돌파 {r['hit_rate'] * 100:>4.0f}%) | 60일 {r['mom60'] * 100:>+6.1f}% | 변동성 {r['vol'] * 100:>5.1f}% | {r['last_date']}")
+    rejected = {}
+    for r in results:
+        for name in r['failed']: rejected[name] = rejected.get(name, 0) + 1
+    if rejected:
+        print("   ⛔ 탈락 사유: " + ", ".join(f"{k} {v}" for k, v in sorted(rejected.items(), key=lambda kv: -kv[1])))
+
+
+def run(data_dir=DATA_DIR, markets=MARKETS, top_n=TOP_N, output_files=OUTPUT_FILES):
+    t0 = time.perf_counter()
+    results = scanner.scan(data_dir, markets)
+    elapsed = time.perf_counter() - t0
+
+    names = known_names()
+    for market in markets:
+        if market not in results:
+            print(f"\n⚠️ [{market}] 저장소에 종목 없음")
+            continue
+        print_ranking(market, results[market])
+        targets = scanner.propose_targets(results[market], names, top_n, TOTAL_RATIO, MAX_RATIO)
+        path = scanner.write_targets(targets, output_files[market])
+        print(f"   💾 제안 {len(targets)}종목 -> {path}")
+
+    total = sum(len(r) for r in results.values())
+    print(f"\n⏱️ [Scan] {total:,}종목 {elapsed:.2f}초")
+    return results
+
+
+if __name__ == "__main__":
+    run()
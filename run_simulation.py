@@ -0,0 +1,145 @@
+import os
+import sys
+import time
+import json
+import tempfile
+import traceback
+import contextlib
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from config import Config
+
+# ==========================================
+# ⚙️ 시뮬레이션 설정
+# ==========================================
+# 실제 MainController / KoreaTrader / USTrader 를 가상 시계 + 가상 브로커(SimBroker)로 과거 구간에 대해 실행
+# - sleep 은 가상 시간만 전진 -> CPU 가 허용하는 만큼 빠르게 진행
+# - 장중/워밍업/보고 구간이 아니면 다음 일정 시각으로 바로 이동 (MainController.next_wakeup, 야간/주말을 60초씩 걷지 않음)
+# - 장중 가격: history_data_minute 분봉이 있으면 분봉, 없으면 일봉 OHLC 경로로 보간
+START = "2024-07-01"           # 시작일 (KST) - 지표 워밍업을 위해 CSV 시작 후 60거래일 이상 지난 날짜
+END = "2024-09-30"             # 종료일 (KST, 이 날 미국장 마감까지 진행)
+STEP_SECONDS = 60              # 컨트롤러 1스텝 최소 가상 시간 (실제 봇의 sleep 보다 짧으면 sleep 기준으로 진행)
+KR_CASH = 10_000_000           # 원화 예수금
+US_CASH = 10_000               # 달러 예수금
+DATA_DIR = "history_data_backtest"
+TARGET_FILES = {"KR": "data/targets_kr.json", "US": "data/targets_us.json"}
+LOG_PATH = None                # 트레이더 출력 저장 경로 (None = 버림, 구조화 로그는 같은 이름 .jsonl)
+
+
+def load_market_data(target_files=TARGET_FILES, data_dir=DATA_DIR):
+    """타겟 종목 CSV -> { 'KR': {code: 일봉 DataFrame}, 'US': {...} } (CSV 없는 종목은 제외)"""
+    daily_map = {}
+    for market, path in target_files.items():
+        with open(path, encoding="utf-8") as f:
+            codes = [t['code'] for t in json.load(f)]
+        daily_map[market] = {}
+        for code in codes:
+            csv = os.path.join(data_dir, f"{code}.csv")
+            if not os.path.exists(csv): continue
+            df = pd.read_csv(csv, parse_dates=['Date'], index_col='Date').sort_index()
+            daily_map[market][code] = df[['Open', 'High', 'Low', 'Close', 'Volume']]
+        missing = len(codes) - len(daily_map[market])
+        print(f"📂 [{market}] {len(daily_map[market])}종목 로드" + (f" (CSV 없음 {missing}종목 제외)" if missing else ""))
+    return daily_map
+
+
+def simulate(start=START, end=END, step_seconds=STEP_SECONDS, kr_cash=KR_CASH, us_cash=US_CASH,
+             data_dir=DATA_DIR, target_files=TARGET_FILES, log_path=LOG_PATH, on_day=None):
+    """
+    [기능] 과거 구간 시뮬레이션
+    :param on_day: 가상 날짜가 바뀔 때마다 호출 (날짜, controller) - 메모리 추이 측정 등
+    :return: { 'history': {시장: [{'Date','TotalAsset'}]}, 'fills', 'final': {시장: (최종, 수익률, MDD)}, 'elapsed', 'steps' }
+    """
+    # 시뮬레이션 중에는 텔레그램/매매일지/녹화가 실제 데이터를 건드리지 않도록 격리
+    Config.TELEGRAM_TOKEN = None
+    Config.TRAFFIC_MODE = None
+    Config.TRADE_JOURNAL_PATH = os.path.join(tempfile.mkdtemp(), "sim_journal.db")
+
+    from src import clock, data_manager, logger
+    from src.main_controller import MainController
+    from src.traffic_recorder import OfflineAuthManager
+    from src.backtest.sim_broker import SimBroker
+    from src.backtest.minute_store import MINUTE_DIR
+    from src.backtest.engine import summarize
+
+    daily_map = load_market_data(target_files, data_dir)
+    broker = SimBroker(daily_map, {"KR": kr_cash, "US": us_cash}, minute_root=MINUTE_DIR)
+
+    begin = datetime.strptime(start, "%Y-%m-%d")
+    finish = datetime.strptime(end, "%Y-%m-%d") + timedelta(days=1, hours=7)   # 마지막 날 미국장 마감 + 결산 보고까지
+    saved_targets = dict(data_manager.TARGET_FILES)
+    data_manager.TARGET_FILES.update(target_files)
+    vclock = clock.install(clock.VirtualClock(begin))
+
+    history = {m: [] for m in daily_map}
+    recorded = {m: set() for m in daily_map}
+    steps = 0
+    t_start = time.perf_counter()
+    log = open(log_path, "w", encoding="utf-8") if log_path else open(os.devnull, "w")
+    if log_path: logger.setup(log_file=os.path.splitext(log_path)[0] + ".jsonl", console=False)
+    try:
+        with contextlib.redirect_stdout(log):
+            controller = MainController(kr_auth=OfflineAuthManager('REAL'), us_auth=OfflineAuthManager('REAL'))
+        controller.kr_trader.session = broker.session("KR")
+        controller.us_trader.session = broker.session("US")
+
+        last_day = None
+        while vclock.now() < finish:
+            t0 = vclock.now()
+            with contextlib.redirect_stdout(log):
+                try:
+                    controller.step()
+                except Exception:
+                    # MainController.run() 과 동일: 에러 기록 후 1분 대기하고 계속
+                    print(f"\n🚨 [Error] {traceback.format_exc()}")
+                    clock.sleep(60)
+            vclock.advance_to(t0 + timedelta(seconds=step_seconds))
+            steps += 1
+
+            # 장 마감 후 시장별 일별 평가금 기록
+            for market in history:
+                date, is_open_day, progress = broker.session_state(market)
+                if is_open_day and progress == 1.0 and date not in recorded[market]:
+                    recorded[market].add(date)
+                    history[market].append({'Date': date, 'TotalAsset': broker.equity(market)})
+
+            if t0.date() != last_day:
+                last_day = t0.date()
+                if on_day: on_day(last_day, controller)
+                print(f"\r⏩ [Sim] {last_day} | KR {broker.equity('KR'):>14,.0f}원 | US ${broker.equity('US'):>11,.2f} | "
+                      f"체결 {len(broker.fills)}건 | {time.perf_counter() - t_start:.1f}s", end='')
+
+            # 할 일 없는 구간 건너뛰기 (일별 평가금 기록 뒤에 이동해야 마감 직후 스텝이 남음)
+            wake = controller.next_wakeup()
+            if wake is not None: vclock.advance_to(min(wake, finish))
+    finally:
+        log.close()
+        logger.shutdown()
+        clock.uninstall()
+        data_manager.TARGET_FILES.clear()
+        data_manager.TARGET_FILES.update(saved_targets)
+
+    elapsed = time.perf_counter() - t_start
+    init = {"KR": kr_cash, "US": us_cash}
+    final = {m: summarize(h, init[m]) if h else (init[m], 0.0, 0.0) for m, h in history.items()}
+    return {'start': start, 'end': end, 'history': history, 'fills': broker.fills, 'final': final,
+            'elapsed': elapsed, 'steps': steps}
+
+
+def report(result):
+    print("\n" + "=" * 60)
+    print(f"🧪 [Simulation 결과] {result['start']} ~ {result['end']} | 스텝 {result['steps']:,}회 | 소요 {result['elapsed']:.1f}초")
+    for market, (final, ret, mdd) in result['final'].items():
+        unit = "원" if market == "KR" else "$"
+        fills = [f for f in result['fills'] if f['market'] == market]
+        buys = sum(1 for f in fills if f['side'] == 'BUY')
+        print(f"   {market}: 최종 {final:,.2f}{unit} | 수익률 {ret:.2f}% | MDD {mdd:.2f}% | 체결 {len(fills)}건 (매수 {buys} / 매도 {len(fills) - buys})")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    report(simulate())
@@ -0,0 +1,92 @@
+import json
+
+import numpy as np
+
+try:
+    import orjson   # 선택 설치 (없으면 표준 json)
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+# =========================================================
+# 📦 [응답 계층] KIS API 응답을 1회만 파싱 + 공통 판정
+# =========================================================
+# - 응답 본문(bytes)을 한 번만 디코딩 (orjson 이 있으면 사용) -> 호출부는 .data 재사용
+# - rt_cd / msg1 / msg_cd 판정을 한 곳에서: ok, token_expired(토큰 만료), market_closed(휴장/장운영 시간 아님)
+# - 알려진 output 배열(일봉)은 필드별 NumPy 배열로 바로 변환 (문자열 -> 숫자 변환을 배열 단위로 1회)
+
+TOKEN_EXPIRED_CODES = ("EGW00123", "EGW00121")   # 만료된 토큰 / 유효하지 않은 토큰
+TOKEN_EXPIRED_WORDS = ("만료",)
+MARKET_CLOSED_WORDS = ("영업일", "휴장", "장운영", "Closed", "Holiday")
+RATE_LIMIT_CODES = ("EGW00201",)   # 초당 거래건수 초과
+
+# 일봉 output 배열 -> 컬럼 (이름: (응답 키, dtype))
+KR_DAILY = {
+    "Date": ("stck_bsop_date", str), "Open": ("stck_oprc", float), "High": ("stck_hgpr", float),
+    "Low": ("stck_lwpr", float), "Close": ("stck_clpr", float), "Volume": ("acml_vol", float),
+}
+US_DAILY = {
+    "Date": ("xymd", str), "Open": ("open", float), "High": ("high", float),
+    "Low": ("low", float), "Close": ("clos", float), "Volume": ("tvol", float),
+}
+
+
+class ApiResponse:
+    """응답 1건 (본문은 생성 시 1회 파싱)"""
+    __slots__ = ("status", "data", "rt_cd", "msg", "msg_cd")
+
+    def __init__(self, status, data):
+        self.status = status
+        self.data = data if isinstance(data, dict) else {}
+        self.rt_cd = self.data.get('rt_cd')
+        self.msg = self.data.get('msg1') or ''
+        self.msg_cd = self.data.get('msg_cd') or ''
+
+    @property
+    def ok(self):
+        return self.status == 200 and self.rt_cd == '0'
+
+    @property
+    def token_expired(self):
+        return self.msg_cd in TOKEN_EXPIRED_CODES or any(w in self.msg for w in TOKEN_EXPIRED_WORDS)
+
+    @property
+    def rate_limited(self):
+        return self.status == 429 or self.msg_cd in RATE_LIMIT_CODES
+
+    @property
+    def server_error(self):
+        """엔드포인트 장애로 볼 응답 (회로 차단기 실패 집계용, 업무 오류는 제외)"""
+        return self.status >= 500 or self.rate_limited
+
+    @property
+    def market_closed(self):
+        return any(w in self.msg for w in MARKET_CLOSED_WORDS)
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+
+def decode(res):
+    """requests.Response -> ApiResponse (JSON 아닌 본문은 빈 응답 + HTTP 상태만)"""
+    try:
+        data = _loads(res.content) if res.content else {}
+    except ValueError:
+        data = {'msg1': f"JSON 파싱 실패 (HTTP {res.status_code})"}
+    return ApiResponse(res.status_code, data)
+
+
+def columns(items, schema):
+    """
+    [기능] output 배열 -> {컬럼: NumPy 배열} (응답 순서 그대로)
+    - 빈 문자열 숫자는 NaN
+    """
+    out = {}
+    for name, (key, dtype) in schema.items():
+        raw = [item.get(key) or ("" if dtype is str else "nan") for item in items]
+        out[name] = np.array(raw) if dtype is str else np.array(raw).astype(dtype)
+    return out
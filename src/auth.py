@@ -3,15 +3,19 @@ import json
 import time
 import os
 from config import Config
+from src.logger import get_logger
+
+log = get_logger("auth")
 
 class AuthManager:
-    def __init__(self,app_key, app_secret, url_base, account_no, mode):
+    def __init__(self,app_key, app_secret, url_base, account_no, mode, name=None):
         self.app_key = app_key
         self.app_secret = app_secret
         self.url_base = url_base
         self.account_no = account_no
         self.mode = mode
-        self.token_path = f"data/token_{self.mode.lower()}.json"
+        # 추가 계좌(멀티 계좌 모드)는 앱키가 다를 수 있으므로 토큰 파일 분리
+        self.token_path = f"data/token_{self.mode.lower()}_{name}.json" if name else f"data/token_{self.mode.lower()}.json"
         self.access_token = None
 
     def get_token(self):
@@ -45,13 +49,13 @@ class AuthManager:
                 with open(self.token_path, 'w') as f:
                     json.dump({"access_token": token, "timestamp": time.time()}, f)
                     
-                print("✅ [Auth] 토큰 갱신 완료")
+                log.info("✅ [Auth] 토큰 갱신 완료")
                 return token
             else:
                 raise Exception(f"토큰 발급 실패: {res.text}")
             
         except Exception as e:
-            print(f"❌ [{self.mode}] 통신 에러: {e}")
+            log.error(f"❌ [{self.mode}] 통신 에러: {e}")
             raise
 
     def get_hashkey(self, datas):
@@ -0,0 +1,238 @@
+import re
+
+import numpy as np
+
+from src.backtest.engine import INIT_BALANCE
+
+# =========================================================
+# 📊 [성과 분석] 자산곡선 + 매매 내역 -> 지표 (NumPy 벡터화)
+# =========================================================
+# - 자산곡선 지표: 수익률 / CAGR / 변동성 / Sharpe / Sortino / MDD / Calmar
+#   -> 1차원(결과 1개) / 2차원(파라미터 스윕 결과 k개 x 일자) 모두 한 번에 계산
+# - 매매 지표: 승률 / Profit Factor / 평균 손익 / 보유기간 / 노출도(포지션 보유 일수 비율) / 회전율
+# - 기여도: 종목별 / 진입 사유별 (PRO_돌파 ...) / 청산 사유별 (추세이탈(SMA20) ...) 실현손익
+#   (사유 문자열의 레벨/k/% 파라미터는 묶어서 집계)
+# - 매매 내역 dict 리스트는 한 번만 컬럼 배열로 바꾸고, 집계는 np.unique + bincount (Python 루프 없음)
+
+PERIODS_PER_YEAR = 252   # 일봉 기준 연환산
+_PARAMS = re.compile(r"\([^)]*[=%.][^)]*\)")   # 사유 문자열의 파라미터 괄호: (Lv.2, k=0.48), (-5.0%)
+
+
+# =========================================================
+# 📈 자산곡선 지표
+# =========================================================
+def equity_array(history):
+    """[{'Date','TotalAsset'}] -> (dates, equity 배열)"""
+    return [h['Date'] for h in history], np.array([h['TotalAsset'] for h in history], dtype=float)
+
+
+def equity_stats(equity, init_balance=INIT_BALANCE, periods=PERIODS_PER_YEAR, rf=0.0):
+    """
+    [기능] 자산곡선 지표 (마지막 축 = 일자)
+    :param equity: (n,) 또는 (k, n) 배열 - 2차원이면 행마다 계산
+    :param init_balance: 시작 자산 (첫날 수익률 기준, 스칼라 또는 (k,))
+    :param rf: 연 무위험 수익률
+    :return: {지표: 스칼라 또는 (k,) 배열} (수익률/변동성/MDD 는 %)
+    """
+    eq = np.asarray(equity, dtype=float)
+    n = eq.shape[-1]
+    init = np.broadcast_to(np.asarray(init_balance, dtype=float), eq.shape[:-1])[..., None]
+    path = np.concatenate((init, eq), axis=-1)          # 시작 자산 포함
+    rets = np.diff(path, axis=-1) / path[..., :-1]
+    excess = rets - rf / periods
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = excess.mean(axis=-1)
+        std = rets.std(axis=-1, ddof=1) if n > 1 else np.zeros(eq.shape[:-1])
+        downside = np.sqrt(np.mean(np.minimum(excess, 0.0) ** 2, axis=-1))
+        total = path[..., -1] / path[..., 0] - 1
+        cagr = np.where(total > -1, (1 + total) ** (periods / max(n, 1)) - 1, -1.0)
+        peak = np.maximum.accumulate(path, axis=-1)
+        mdd = ((path - peak) / peak).min(axis=-1)
+        stats = {
+            'return': total * 100,
+            'cagr': cagr * 100,
+            'volatility': std * np.sqrt(periods) * 100,
+            'sharpe': np.where(std > 0, mean / std * np.sqrt(periods), 0.0),
+            'sortino': np.where(downside > 0, mean / downside * np.sqrt(periods), 0.0),
+            'mdd': mdd * 100,
+            'calmar': np.where(mdd < 0, cagr / -mdd, 0.0),
+        }
+    return {k: (float(v) if np.ndim(v) == 0 else v) for k, v in stats.items()}
+
+
+def sweep_stats(results, init_balance=INIT_BALANCE, periods=PERIODS_PER_YEAR):
+    """
+    [기능] 파라미터 스윕 결과 k개를 (k x 일자) 배열로 쌓아 한 번에 계산
+    - 같은 날짜 구간을 돌린 결과끼리 (길이가 다르면 짧은 쪽은 마지막 값 유지)
+    :param results: [simulate() 결과, ...]
+    :return: {지표: (k,) 배열}
+    """
+    curves = [equity_array(r['history'])[1] for r in results]
+    n = max((len(c) for c in curves), default=0)
+    if n == 0: return {}
+    mat = np.empty((len(curves), n))
+    for i, c in enumerate(curves):
+        if len(c) == 0: c = np.array([init_balance])
+        mat[i, :len(c)] = c
+        mat[i, len(c):] = c[-1]
+    return equity_stats(mat, init_balance, periods)
+
+
+# =========================================================
+# 🧾 매매 지표
+# =========================================================
+def trade_columns(trades):
+    """매매 내역 dict 리스트 -> 컬럼 배열 (집계용, 1회 변환)"""
+    n = len(trades)
+    col = lambda key, default, dtype: np.array([t.get(key, default) for t in trades], dtype=dtype) if n else np.empty(0, dtype=dtype)
+    return {
+        'date': col('Date', '', object).astype(str),
+        'code': col('Code', None, object).astype(str),
+        'name': col('Name', '', object).astype(str),
+        'reason': col('Reason', '', object).astype(str),
+        'is_sell': col('Type', '', object) == 'Sell',
+        'price': col('Price', 0.0, float),
+        'qty': col('Qty', 0, float),
+        'pnl': col('PnL', 0.0, float),
+        'profit': col('Profit', 0.0, float),
+        'fx': col('FX', 1.0, float),   # 통합 계좌 US 매매 (원화 환산)
+    }
+
+
+def _pair_entries(cols):
+    """
+    종목별 정렬 후 한 칸 앞/뒤로 매수-매도 짝 찾기
+    :return: (entry: 매도마다 직전 매수 위치, exit: 매수마다 다음 매매 위치) - 없으면 -1
+    """
+    n = len(cols['code'])
+    entry, exit_ = np.full(n, -1), np.full(n, -1)
+    if n == 0: return entry, exit_
+    order = np.lexsort((np.arange(n), cols['code']))
+    prev = order[:-1]
+    curr = order[1:]
+    same = cols['code'][curr] == cols['code'][prev]
+    ok = cols['is_sell'][curr] & ~cols['is_sell'][prev] & same
+    entry[curr[ok]] = prev[ok]
+    buy = ~cols['is_sell'][prev] & same
+    exit_[prev[buy]] = curr[buy]
+    return entry, exit_
+
+
+def reason_family(reason):
+    """'PRO_돌파(Lv.2, k=0.48)' -> 'PRO_돌파', '추세이탈(SMA20)' 은 그대로"""
+    return _PARAMS.sub("", reason).strip() or reason
+
+
+def _group(keys, pnl, wins, key_func=None):
+    """키별 (건수, 승, 실현손익) - np.unique + bincount (key_func 는 고유값에만 적용)"""
+    if len(keys) == 0: return {}
+    uniq, inv = np.unique(keys, return_inverse=True)
+    if key_func is not None:
+        uniq, remap = np.unique([key_func(k) for k in uniq.tolist()], return_inverse=True)
+        inv = remap[inv]
+    cnt = np.bincount(inv)
+    won = np.bincount(inv, weights=wins)
+    total = np.bincount(inv, weights=pnl)
+    return {k: {'trades': int(c), 'win_rate': w / c * 100, 'pnl': p} for k, c, w, p in zip(uniq.tolist(), cnt, won, total)}
+
+
+def trade_stats(trades, dates=None, equity=None, periods=PERIODS_PER_YEAR):
+    """
+    [기능] 매매 지표 + 기여도
+    :param dates: 자산곡선 날짜 (노출도 계산용, None 이면 생략)
+    :param equity: 자산곡선 배열 (회전율 계산용, None 이면 생략)
+    """
+    cols = trade_columns(trades)
+    sell = cols['is_sell']
+    pnl = cols['pnl'][sell]
+    wins = pnl > 0
+    gross_win, gross_loss = pnl[wins].sum(), -pnl[pnl < 0].sum()
+    entry, exit_ = _pair_entries(cols)
+    sells = np.flatnonzero(sell)
+    paired = sells[entry[sells] >= 0]
+
+    stats = {
+        'trades': int(len(cols['code'])),
+        'closed': int(sell.sum()),
+        'win_rate': float(wins.mean() * 100) if len(pnl) else 0.0,
+        'profit_factor': float(gross_win / gross_loss) if gross_loss > 0 else (float('inf') if gross_win > 0 else 0.0),
+        'avg_win': float(pnl[wins].mean()) if wins.any() else 0.0,
+        'avg_loss': float(pnl[pnl < 0].mean()) if (pnl < 0).any() else 0.0,
+        'expectancy': float(pnl.mean()) if len(pnl) else 0.0,
+        'avg_profit_pct': float(cols['profit'][sell].mean()) if len(pnl) else 0.0,
+    }
+
+    # 종목별 / 청산 사유별 / 진입 사유별 (실현손익 기준)
+    stats['by_symbol'] = _group(cols['name'][sell], pnl, wins)
+    stats['by_exit'] = _group(cols['reason'][sell], pnl, wins, reason_family)
+    entry_reason = np.where(entry[sells] >= 0, cols['reason'][np.maximum(entry[sells], 0)], "(기간 전 진입)")
+    stats['by_entry'] = _group(entry_reason, pnl, wins, reason_family)
+
+    if dates is not None and len(dates):
+        # 보유 구간: 매수일 ~ 매도일(포함) / 같은 종목 다음 매수 전날 (워크포워드 윈도우 경계) / 마지막 날
+        # 날짜 축에 시작 +1, 끝 다음 날 -1 -> 누적합 > 0 인 날 = 노출
+        day_keys = np.array([str(d)[:10] for d in dates])
+        pos = np.searchsorted(day_keys, np.array([d[:10] for d in cols['date']], dtype=str))
+        pos = np.minimum(pos, len(day_keys) - 1)
+        buys = np.flatnonzero(~sell)
+        nxt = exit_[buys]
+        end = np.where(nxt < 0, len(day_keys), np.where(sell[nxt], pos[nxt] + 1, pos[nxt]))
+        delta = np.zeros(len(day_keys) + 1)
+        np.add.at(delta, pos[buys], 1)
+        np.add.at(delta, end, -1)
+        open_positions = np.cumsum(delta)[:-1]
+        stats['exposure'] = float((open_positions > 0).mean() * 100)
+        if len(paired):
+            stats['avg_hold_days'] = float(np.mean(pos[paired] - pos[entry[paired]]))
+
+    if equity is not None and len(equity):
+        notional = np.abs(cols['qty'] * cols['price'] * cols['fx']).sum()
+        years = len(equity) / periods
+        stats['turnover'] = float(notional / np.mean(equity) / max(years, 1e-9))   # 연환산 (배)
+    return stats
+
+
+# =========================================================
+# 🧮 통합
+# =========================================================
+def analyze(history, trades, init_balance=INIT_BALANCE, periods=PERIODS_PER_YEAR):
+    """simulate() 결과 1개 -> {'equity': 자산곡선 지표, 'trades': 매매 지표}"""
+    dates, equity = equity_array(history)
+    if len(equity) == 0: return {'equity': {}, 'trades': trade_stats(trades)}
+    return {'equity': equity_stats(equity, init_balance, periods),
+            'trades': trade_stats(trades, dates, equity, periods)}
+
+
+def summary_items(analysis):
+    """리포트 요약용 {라벨: 문자열}"""
+    e, t = analysis['equity'], analysis['trades']
+    items = {}
+    if e:
+        items.update({"CAGR": f"{e['cagr']:.2f}%", "Sharpe": f"{e['sharpe']:.2f}", "Sortino": f"{e['sortino']:.2f}",
+                      "Calmar": f"{e['calmar']:.2f}"})
+    items.update({"승률": f"{t['win_rate']:.1f}%", "Profit Factor": f"{t['profit_factor']:.2f}"})
+    if 'exposure' in t: items["노출도"] = f"{t['exposure']:.1f}%"
+    if 'turnover' in t: items["회전율"] = f"{t['turnover']:.1f}x/년"
+    return items
+
+
+def report(analysis, top=10):
+    """성과 지표 + 기여도 출력"""
+    e, t = analysis['equity'], analysis['trades']
+    print("\n📊 [성과 분석]")
+    if e:
+        print(f"   CAGR {e['cagr']:>+7.2f}% | 변동성 {e['volatility']:>6.2f}% | Sharpe {e['sharpe']:>5.2f} | "
+              f"Sortino {e['sortino']:>5.2f} | Calmar {e['calmar']:>5.2f}")
+    line = (f"   매매 {t['trades']}건 (청산 {t['closed']}) | 승률 {t['win_rate']:.1f}% | PF {t['profit_factor']:.2f} | "
+            f"평균 익 {t['avg_win']:+,.0f} / 손 {t['avg_loss']:+,.0f}")
+    if 'exposure' in t: line += f" | 노출 {t['exposure']:.1f}%"
+    if 'turnover' in t: line += f" | 회전율 {t['turnover']:.1f}x/년"
+    if 'avg_hold_days' in t: line += f" | 평균 보유 {t['avg_hold_days']:.1f}일"
+    print(line)
+    for title, key in (("종목별", 'by_symbol'), ("진입 사유별", 'by_entry'), ("청산 사유별", 'by_exit')):
+        groups = sorted(t[key].items(), key=lambda kv: -kv[1]['pnl'])[:top]
+        if not groups: continue
+        print(f"   [{title}]")
+        for name, g in groups:
+            print(f"      {name:<16} | {g['trades']:>3}건 | 승률 {g['win_rate']:>5.1f}% | 손익 {g['pnl']:>+15,.0f}")
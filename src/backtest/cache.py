@@ -0,0 +1,177 @@
+import os
+import ast
+import json
+import pickle
+import hashlib
+import tempfile
+
+# =========================================================
+# 🗄️ [백테스트 캐시] 입력 내용 해시 -> 결과 (로컬 디스크, LRU)
+# =========================================================
+# - 키 = 입력 CSV 내용 해시 + 지표/전략/엔진 코드 해시 (시작 모듈 + 가져오는 프로젝트 모듈 전부) + 파라미터
+#   -> 데이터나 코드가 바뀌면 키가 달라져 자동으로 재계산 (무효화 로직 불필요)
+# - 저장 대상: 종목별 지표 프레임, 종목 단독 시뮬레이션(워크포워드 레벨 탐색), 전체 실행 결과
+# - 파일 1개 = 항목 1개 (pickle), 읽을 때 mtime 갱신 -> 용량 초과 시 오래 안 쓴 것부터 삭제
+# - 여러 프로세스(워크포워드 워커)가 동시에 써도 임시 파일 + os.replace 로 원자적 저장
+
+CACHE_DIR = ".backtest_cache"
+MAX_BYTES = 512 * 1024 * 1024
+
+# 결과에 영향을 주는 코드의 시작 모듈 (이 모듈들이 import 하는 src 모듈까지 따라가서 해시 -> 커널 등 추가 모듈 누락 방지)
+CODE_MODULES = ("src.indicators", "src.strategy", "src.backtest.engine", "src.backtest.walk_forward")
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_digests = {}   # path -> (size, mtime_ns, digest)
+_code_version = None
+
+
+def _module_file(name):
+    """모듈 이름 -> 프로젝트 안 소스 경로 (ROOT 기준, 프로젝트 모듈이 아니면 None)"""
+    rel = name.replace(".", "/")
+    for candidate in (f"{rel}.py", f"{rel}/__init__.py"):
+        if os.path.isfile(os.path.join(ROOT, candidate)): return candidate
+    return None
+
+
+def code_files(modules=CODE_MODULES):
+    """시작 모듈 + 그 모듈들이 (함수 안 지연 import 포함) 가져오는 src 모듈 소스 경로 전부"""
+    found, todo = set(), [m for m in modules]
+    while todo:
+        rel = _module_file(todo.pop())
+        if rel is None or rel in found: continue
+        found.add(rel)
+        with open(os.path.join(ROOT, rel), encoding="utf-8") as f:
+            tree = ast.parse(f.read(), rel)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                todo.extend(a.name for a in node.names if a.name.startswith("src"))
+            elif isinstance(node, ast.ImportFrom) and node.module and node.module.startswith("src") and not node.level:
+                todo.append(node.module)
+                todo.extend(f"{node.module}.{a.name}" for a in node.names)   # from src import kernels
+    return sorted(found)
+
+
+def file_digest(path):
+    """파일 내용 해시 (크기/수정시각이 같으면 프로세스 내 재사용)"""
+    st = os.stat(path)
+    memo = _digests.get(path)
+    if memo and memo[0] == st.st_size and memo[1] == st.st_mtime_ns: return memo[2]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""): h.update(chunk)
+    digest = h.hexdigest()
+    _digests[path] = (st.st_size, st.st_mtime_ns, digest)
+    return digest
+
+
+def code_version():
+    """지표/전략/엔진 (+ 가져오는 모듈) 소스 해시"""
+    global _code_version
+    if _code_version is None:
+        h = hashlib.sha256()
+        for rel in code_files():
+            h.update(rel.encode())
+            h.update(file_digest(os.path.join(ROOT, rel)).encode())
+        _code_version = h.hexdigest()[:16]
+    return _code_version
+
+
+def make_key(kind, *parts):
+    """kind + 파라미터(JSON 직렬화 가능) -> 해시 키"""
+    payload = json.dumps([kind, code_version(), parts], sort_keys=True, default=str, ensure_ascii=False)
+    return f"{kind}-{hashlib.sha256(payload.encode()).hexdigest()[:40]}"
+
+
+class ResultCache:
+    """
+    디스크 결과 캐시
+    :param root: 저장 폴더
+    :param max_bytes: 최대 용량 (초과 시 LRU 삭제)
+    :param enabled: False면 항상 계산 (읽기/쓰기 안 함)
+    """
+
+    def __init__(self, root=CACHE_DIR, max_bytes=MAX_BYTES, enabled=True):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._size = None   # 폴더 용량 추정치 (put 마다 전체 스캔하지 않도록)
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:key.index('-') + 3], key + ".pkl")
+
+    def get(self, key):
+        """있으면 값, 없으면 None (읽은 항목은 최근 사용으로 표시)"""
+        if not self.enabled: return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            os.utime(path)
+            self.hits += 1
+            return value
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️ [Cache] 손상된 항목 삭제: {key} ({e})")
+            try: os.remove(path)
+            except OSError: pass
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        if not self.enabled: return value
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp): os.remove(tmp)
+            raise
+        if self._size is None: self._size = self._scan()[1]
+        else: self._size += os.path.getsize(path)
+        if self._size > self.max_bytes: self.evict()
+        return value
+
+    def get_or_compute(self, key, func):
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, func())
+        return value
+
+    def _scan(self):
+        entries, total = [], 0
+        for folder, _, files in os.walk(self.root):
+            for name in files:
+                if not name.endswith(".pkl"): continue
+                path = os.path.join(folder, name)
+                try: st = os.stat(path)
+                except OSError: continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+        return entries, total
+
+    def evict(self):
+        """용량 초과 시 mtime 오래된 항목부터 삭제 (다른 프로세스가 쓴 항목 포함)"""
+        entries, total = self._scan()
+        removed = 0
+        if total > self.max_bytes:
+            for _, size, path in sorted(entries):
+                try: os.remove(path)
+                except OSError: continue
+                total -= size
+                removed += 1
+                if total <= self.max_bytes: break
+        self._size = total
+        return removed
+
+    def clear(self):
+        for _, _, path in self._scan()[0]: os.remove(path)
+        self._size = 0
+
+    def __repr__(self):
+        return f"ResultCache({self.root!r}, hit {self.hits} / miss {self.misses})"
@@ -0,0 +1,200 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.strategy import get_signal
+from src.backtest.engine import summarize, buy_fill_price, INIT_BALANCE
+
+# =========================================================
+# 🌏 [통합 백테스트] KR + US 한 계좌 (원화 기준)
+# =========================================================
+# - KRX / 미국 거래일을 하나의 날짜 타임라인으로 병합 (같은 날짜면 KR 장 -> US 장 순서, 실제 시간 순서와 동일)
+# - 종목별 지표는 자기 거래일 기준으로 1회만 계산 (전일 = 그 종목의 직전 거래일)
+#   -> 날짜별로 그날 거래한 종목만 순회하므로 시장을 추가해도 종목 수만큼만 늘어남
+# - 미국 종목: 매매/평가 시 해당 날짜 환율(USD/KRW)로 원화 환산, 환율이 없는 날은 직전 값 사용
+# - 시장별 수수료/세금 모델 + 시장별 손익 기여도 (미국은 주가 효과 / 환율 효과 분리)
+
+FX_FILE = "history_data_backtest/USDKRW.csv"   # Date, Close (get_history_data.py 로 수집)
+FX_FALLBACK = 1350.0                            # 환율 파일이 없을 때 고정 환율
+
+# 시장별 비용 (비율): 매수/매도 수수료 + 매도 시 세금
+MARKET_COSTS = {
+    "KR": {"buy": 0.00015, "sell": 0.00015, "sell_tax": 0.0018},    # 증권거래세+농특세
+    "US": {"buy": 0.0025, "sell": 0.0025, "sell_tax": 0.0000278},   # SEC fee
+}
+MIN_ORDER_KRW = 10000   # 최소 주문 금액 (engine.simulate 와 동일)
+
+
+def market_of(code, config=None):
+    """종목 설정의 'market' 우선, 없으면 6자리 숫자 코드 = KR / 그 외 = US"""
+    if config and config.get('market'): return config['market']
+    return "KR" if code.isdigit() and len(code) == 6 else "US"
+
+
+def load_fx(path=FX_FILE, fallback=FX_FALLBACK):
+    """USD/KRW 일별 환율 Series (없으면 None -> fallback 고정 환율 사용)"""
+    if not path or not os.path.exists(path):
+        print(f"⚠️ [FX] 환율 파일 없음 ({path}) -> 고정 환율 {fallback:,.1f}원 사용")
+        return None
+    fx = pd.read_csv(path, parse_dates=['Date'], index_col='Date')['Close'].sort_index()
+    return fx[fx > 0].dropna()
+
+
+def fx_on(dates, fx=None, fallback=FX_FALLBACK):
+    """타임라인 날짜별 환율 배열 (직전 값으로 채움, 시작 전 구간은 첫 값)"""
+    if fx is None or fx.empty: return np.full(len(dates), float(fallback))
+    aligned = fx.reindex(fx.index.union(dates)).ffill().bfill().reindex(dates)
+    return aligned.to_numpy(dtype=float)
+
+
+class _Book:
+    """종목 1개의 지표 행 + 포지션"""
+
+    def __init__(self, code, config, frame):
+        self.code = code
+        self.config = config
+        self.name = config['name']
+        self.market = market_of(code, config)
+        self.rows = frame.to_dict('records')            # t -> {컬럼: 값}
+        self.close = frame['Close'].to_numpy(dtype=float)
+        self.dates = frame.index
+        self.qty = 0
+        self.avg_price = 0.0      # 현지 통화
+        self.cost_basis = 0.0     # 원화, 비용 포함 매수금액
+        self.last_close = 0.0     # 현지 통화, 마지막 종가 (휴장일 평가용)
+
+
+def simulate_cross_market(frames, portfolio, fx=None, init_balance=INIT_BALANCE, costs=None,
+                          fx_fallback=FX_FALLBACK, start=None, end=None, verbose=False):
+    """
+    [기능] KR + US 통합 포트폴리오 백테스트 (원화 단일 계좌)
+    :param frames: { code: 지표 포함 DataFrame } (run_backtest.load_data 결과, KR/US 혼합)
+    :param fx: USD/KRW Series (None = fx_fallback 고정)
+    :param costs: 시장별 비용 (None = MARKET_COSTS)
+    :return: engine.simulate 형식 + 'markets' (시장별 기여도), 'fx'
+    """
+    costs = costs or MARKET_COSTS
+    books = [_Book(code, portfolio[code], frames[code]) for code in portfolio if code in frames and len(frames[code]) > 1]
+    markets = sorted({b.market for b in books})
+
+    # 1. 병합 타임라인 + 날짜별 이벤트 (그날 거래한 종목, 종목 내 위치)
+    timeline = pd.DatetimeIndex(sorted(set().union(*[set(b.dates) for b in books]))) if books else pd.DatetimeIndex([])
+    if start is not None: timeline = timeline[timeline >= pd.Timestamp(start)]
+    if end is not None: timeline = timeline[timeline <= pd.Timestamp(end)]
+    order = {m: k for k, m in enumerate(("KR", "US"))}
+    events = {}
+    for b in sorted(books, key=lambda b: order.get(b.market, 9)):
+        pos = timeline.get_indexer(b.dates)
+        for t, i in enumerate(pos):
+            if i >= 0: events.setdefault(i, []).append((b, t))
+    rates = fx_on(timeline, fx, fx_fallback)
+
+    balance = init_balance
+    daily_history, trade_logs = [], []
+    # 시장별 누적: 매매 현금흐름(원화) / 비용 / 거래 수, US는 달러 기준 손익도 추적 (환율 효과 분리용)
+    flow = {m: 0.0 for m in markets}
+    paid = {m: 0.0 for m in markets}
+    n_trades = {m: 0 for m in markets}
+    usd_flow = 0.0
+    usd_pnl_prev = 0.0
+    local_effect = 0.0
+    attribution = []
+
+    for i, today in enumerate(timeline):
+        rate = rates[i]
+        date_str = today.strftime('%Y-%m-%d')
+        todays = events.get(i, [])
+
+        # 종가 갱신 전 평가 (engine.simulate 와 동일하게 당일 종가로 평가, 휴장 종목은 마지막 종가)
+        for b, t in todays: b.last_close = b.close[t]
+        value = {m: 0.0 for m in markets}
+        for b in books:
+            if b.qty: value[b.market] += b.qty * b.last_close * (rate if b.market == "US" else 1.0)
+        current_equity = balance + sum(value.values())
+
+        for b, t in todays:
+            if t == 0: continue
+            curr, prev = b.rows[t], b.rows[t - 1]
+            fx_mult = rate if b.market == "US" else 1.0
+            c = costs[b.market]
+            level_setting = b.config.get('setting', {'level': 2})
+
+            if b.qty > 0:
+                signal, reason, _ = get_signal(b.config['strategy'], curr, prev, level_setting)
+                if signal != 'sell': continue
+                exec_price = curr['Close']
+                gross = b.qty * exec_price * fx_mult
+                fee = gross * (c['sell'] + c['sell_tax'])
+                balance += gross - fee
+                flow[b.market] += gross - fee
+                paid[b.market] += fee
+                n_trades[b.market] += 1
+                if b.market == "US": usd_flow += b.qty * exec_price * (1 - c['sell'] - c['sell_tax'])
+
+                profit_rate = (exec_price - b.avg_price) / b.avg_price * 100
+                pnl = gross - fee - b.cost_basis
+                if verbose:
+                    icon = "📈" if profit_rate > 0 else "📉"
+                    print(f"{date_str} | {b.market} | 🔵 매도 | {b.name:<10} | {exec_price:>11,.2f} | {icon} {profit_rate:.2f}% ({reason})")
+                trade_logs.append({'Date': date_str, 'Name': b.name, 'Type': 'Sell', 'Price': exec_price, 'Profit': profit_rate,
+                                   'Reason': reason, 'Code': b.code, 'Qty': b.qty, 'PnL': pnl, 'Market': b.market, 'FX': fx_mult})
+                value[b.market] -= b.qty * exec_price * fx_mult
+                b.qty, b.avg_price, b.cost_basis = 0, 0.0, 0.0
+
+            else:
+                buy_price = buy_fill_price(b.config['strategy'], curr, prev, level_setting)
+                signal, reason, _ = get_signal(b.config['strategy'], curr, prev, level_setting, entry_price=buy_price)
+                if signal != 'buy': continue
+                invest_amt = current_equity * b.config['ratio']
+                if not (balance > invest_amt and invest_amt > MIN_ORDER_KRW): continue
+
+                qty = int(invest_amt / fx_mult / buy_price)
+                if qty <= 0: continue
+
+                gross = qty * buy_price * fx_mult
+                fee = gross * c['buy']
+                balance -= gross + fee
+                flow[b.market] -= gross + fee
+                paid[b.market] += fee
+                n_trades[b.market] += 1
+                if b.market == "US": usd_flow -= qty * buy_price * (1 + c['buy'])
+                b.qty, b.avg_price, b.cost_basis = qty, buy_price, gross + fee
+                value[b.market] += qty * b.last_close * fx_mult
+
+                if verbose: print(f"{date_str} | {b.market} | 🔴 매수 | {b.name:<10} | {buy_price:>11,.2f} | {reason}")
+                trade_logs.append({'Date': date_str, 'Name': b.name, 'Type': 'Buy', 'Price': buy_price, 'Profit': 0,
+                                   'Reason': reason, 'Code': b.code, 'Qty': qty, 'PnL': 0, 'Market': b.market, 'FX': fx_mult})
+
+        daily_history.append({'Date': today, 'TotalAsset': current_equity})
+
+        # 장 마감 기준 시장별 누적 손익 (원화) = 보유 평가액 + 매매 현금흐름
+        pnl = {m: value[m] + flow[m] for m in markets}
+        if "US" in markets:
+            usd_pnl = sum(b.qty * b.last_close for b in books if b.market == "US") + usd_flow
+            local_effect += (usd_pnl - usd_pnl_prev) * rate   # 주가 효과: 달러 손익 변화분을 그날 환율로 환산
+            usd_pnl_prev = usd_pnl
+            pnl["US_FX"] = pnl["US"] - local_effect
+        attribution.append({'Date': today, **pnl})
+
+    final, ret, mdd = summarize(daily_history, init_balance)
+    last = attribution[-1] if attribution else {}
+    summary = {m: {'pnl': last.get(m, 0.0), 'contribution': last.get(m, 0.0) / init_balance * 100,
+                   'costs': paid[m], 'trades': n_trades[m]} for m in markets}
+    if "US" in summary:
+        summary["US"]['fx_effect'] = last.get("US_FX", 0.0)
+        summary["US"]['price_effect'] = last.get("US", 0.0) - last.get("US_FX", 0.0)
+    return {'history': daily_history, 'trades': trade_logs, 'final': final, 'return': ret, 'mdd': mdd,
+            'markets': summary, 'attribution': attribution, 'fx': rates}
+
+
+def report(result):
+    """시장별 기여도 출력"""
+    print("\n🌏 [시장별 기여도] (원화 기준)")
+    for m, s in result['markets'].items():
+        line = f"   {m}: 손익 {s['pnl']:>+14,.0f}원 | 기여 {s['contribution']:>+7.2f}%p | 비용 {s['costs']:>11,.0f}원 | 매매 {s['trades']}건"
+        if 'fx_effect' in s:
+            line += f" | 주가 {s['price_effect']:>+12,.0f}원 / 환율 {s['fx_effect']:>+11,.0f}원"
+        print(line)
+    if len(result['fx']):
+        print(f"   💱 환율 {result['fx'][0]:,.1f} -> {result['fx'][-1]:,.1f}원")
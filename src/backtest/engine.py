@@ -0,0 +1,139 @@
+import numpy as np
+
+from src.strategy import get_signal, smart_pro_target_price
+
+# =========================================================
+# ⚙️ [백테스트 엔진] 일봉 시뮬레이션 루프
+# =========================================================
+# - run_backtest.run() / 워크포워드 공용
+# - 종목별 데이터는 {날짜: {컬럼: 값}} dict (DataFrame.loc 보다 훨씬 빠름)
+# - 지표는 전체 기간으로 한 번만 계산해두고, 구간은 날짜 리스트로만 잘라서 사용
+
+INIT_BALANCE = 10000000
+COMMISSION = 0.002
+
+
+def to_rows(df):
+    """지표 포함 DataFrame -> {날짜: {컬럼: 값}}"""
+    return df.to_dict('index')
+
+
+def buy_fill_price(strategy_name, curr, prev, setting):
+    """
+    일봉 매수 체결가
+    - SMART_PRO: 장중 목표가 돌파 시점 체결 = max(시가, 목표가) (갭 보정된 K 로 목표가 계산)
+    - 그 외: 종가
+    추격 매수 제한 같은 장중 필터도 종가가 아니라 이 가격으로 판단 (get_signal entry_price)
+    """
+    if strategy_name == "SMART_PRO":
+        target_p, _ = smart_pro_target_price(curr, prev, setting.get('level', 2))
+        return max(curr['Open'], target_p)  # 시가가 목표가보다 높으면 시가 체결
+    return curr['Close']
+
+
+def summarize(history, init_balance=INIT_BALANCE):
+    """
+    자산 곡선 요약
+    :param history: [{'Date', 'TotalAsset'}, ...]
+    :return: (최종자산, 수익률%, MDD%)
+    """
+    if not history: return init_balance, 0.0, 0.0
+    equity = np.array([h['TotalAsset'] for h in history], dtype=float)
+    peak = np.maximum.accumulate(equity)
+    ret = (equity[-1] - init_balance) / init_balance * 100
+    mdd = ((equity - peak) / peak * 100).min()
+    return equity[-1], ret, mdd
+
+
+def simulate(rows_map, portfolio, dates, init_balance=INIT_BALANCE, commission=COMMISSION, verbose=False):
+    """
+    [기능] 포트폴리오 일봉 백테스트
+    :param rows_map: { code: {날짜: {컬럼: 값}} }
+    :param portfolio: { code: {'name', 'strategy', 'ratio', 'setting'} }
+    :param dates: 시뮬레이션 날짜 (오름차순, 첫 날은 전일 데이터로만 사용)
+    :param verbose: True면 체결 내역 출력
+    :return: {'history', 'trades', 'final', 'return', 'mdd'}
+    """
+    balance = init_balance
+    holdings = {code: 0 for code in portfolio}
+    avg_price = {code: 0 for code in portfolio}
+    cost_basis = {code: 0 for code in portfolio}  # 수수료 포함 매수금액 (PnL 계산용)
+
+    daily_history = []
+    trade_logs = []
+
+    for i in range(1, len(dates)):
+        today = dates[i]
+        prev_day = dates[i-1]
+        date_str = today.strftime('%Y-%m-%d')
+
+        current_equity = balance
+        for code, qty in holdings.items():
+            if qty > 0:
+                row = rows_map[code].get(today)
+                price = row['Close'] if row is not None else 0
+                if price > 0: current_equity += qty * price
+
+        daily_log = {'Date': today, 'TotalAsset': current_equity}
+
+        for code, config in portfolio.items():
+            rows = rows_map.get(code)
+            if rows is None: continue
+            curr = rows.get(today)
+            prev = rows.get(prev_day)
+            if curr is None or prev is None: continue
+
+            name = config['name']
+            level_setting = config.get('setting', {'level': 2})
+
+            # ----------------------------------------
+            # [A] 매도 (Sell)
+            # ----------------------------------------
+            if holdings[code] > 0:
+                signal, reason, _ = get_signal(config['strategy'], curr, prev, level_setting)
+
+                if signal == 'sell':
+                    exec_price = curr['Close']
+                    qty = holdings[code]
+                    amount = qty * exec_price
+                    balance += amount * (1 - commission)
+
+                    profit_rate = (exec_price - avg_price[code]) / avg_price[code] * 100
+                    pnl = amount * (1 - commission) - cost_basis[code]
+                    icon = "📈" if profit_rate > 0 else "📉"
+
+                    if verbose: print(f"{date_str} | 🔵 매도 | {name:<10} | {exec_price:>9,.0f} | {icon} {profit_rate:.2f}% ({reason})")
+                    trade_logs.append({'Date': date_str, 'Name': name, 'Type': 'Sell', 'Price': exec_price, 'Profit': profit_rate, 'Reason': reason,
+                                       'Code': code, 'Qty': qty, 'PnL': pnl})
+
+                    holdings[code] = 0
+                    avg_price[code] = 0
+                    cost_basis[code] = 0
+
+            # ----------------------------------------
+            # [B] 매수 (Buy)
+            # ----------------------------------------
+            elif holdings[code] == 0:
+                buy_price = buy_fill_price(config['strategy'], curr, prev, level_setting)
+                signal, reason, _ = get_signal(config['strategy'], curr, prev, level_setting, entry_price=buy_price)
+
+                if signal == 'buy':
+                    invest_amt = current_equity * config['ratio']
+
+                    if balance > invest_amt and invest_amt > 10000:
+                        qty = int(invest_amt / buy_price)
+                        if qty > 0:
+                            cost = qty * buy_price
+                            balance -= cost * (1 + commission)
+                            holdings[code] = qty
+                            avg_price[code] = buy_price
+                            cost_basis[code] = cost * (1 + commission)
+
+                            if verbose: print(f"{date_str} | 🔴 매수 | {name:<10} | {buy_price:>9,.0f} | {reason}")
+                            trade_logs.append({'Date': date_str, 'Name': name, 'Type': 'Buy', 'Price': buy_price, 'Profit': 0, 'Reason': reason,
+                                               'Code': code, 'Qty': qty, 'PnL': 0})
+
+        daily_history.append(daily_log)
+
+    final, ret, mdd = summarize(daily_history, init_balance)
+    return {'history': daily_history, 'trades': trade_logs, 'final': final, 'return': ret, 'mdd': mdd}
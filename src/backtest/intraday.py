@@ -0,0 +1,239 @@
+import numpy as np
+import pandas as pd
+
+from src.strategy import get_signal
+from src.indicators import PRICE_COLUMNS, compute_indicators, prior_state, today_indicators, required_indicators
+from src.backtest.engine import summarize, INIT_BALANCE, COMMISSION
+from src.backtest.minute_store import MinuteReader, MINUTE_DIR
+
+# =========================================================
+# ⏱️ [분봉 백테스트] 라이브 루프의 주문/체결 흐름 재현
+# =========================================================
+# - 매 분봉 종가 = 라이브 사이클의 현재가 -> 오늘 봉(고가/저가/누적거래량) 갱신 후 get_signal
+# - 주문: US는 현재가 ±0.5% 지정가 (USTrader.send_order), KR은 시장가 (KoreaTrader.send_order)
+# - 체결: 주문 다음 분봉부터 ORDER_TIMEOUT 초 동안, 가격이 닿은 분봉에서 거래량의 PARTICIPATION 만큼씩 (부분 체결)
+# - 타임아웃이 지나면 남은 수량 취소 (check_pending_orders 와 동일), 장 마감 시에도 취소
+# - 분봉은 종목-월 파일을 메모리 매핑해 하루치씩 스트리밍
+
+LIMIT_OFFSET = {"US": 0.005, "KR": None}   # None = 시장가
+ORDER_TIMEOUT = 60                         # 초
+PARTICIPATION = 0.1                        # 분봉 거래량 중 내 주문이 가져갈 수 있는 비율
+
+
+class _MinuteRow:
+    """분 단위 지표 배열의 i번째 행 (strategy 함수가 dict처럼 읽음, dict 생성 비용 없음)"""
+    __slots__ = ("cols", "i")
+
+    def __init__(self, cols, i):
+        self.cols = cols
+        self.i = i
+
+    def __getitem__(self, key):
+        v = self.cols[key]
+        return v[self.i] if isinstance(v, np.ndarray) else v
+
+    def __contains__(self, key):
+        return key in self.cols
+
+    def get(self, key, default=None):
+        return self[key] if key in self.cols else default
+
+
+def _limit_price(side, price, offset):
+    if offset is None: return None
+    return round(price * (1 + offset), 2) if side == 'BUY' else round(price * (1 - offset), 2)
+
+
+class _Symbol:
+    """종목별 일봉 상태 + 분봉 리더"""
+
+    def __init__(self, code, config, daily_df, root, required, limit_offset):
+        self.code = code
+        self.config = config
+        self.name = config['name']
+        self.limit_offset = limit_offset
+        self.dates = {d: t for t, d in enumerate(daily_df.index)}
+        cols = {c: daily_df[c].to_numpy(dtype=float) for c in PRICE_COLUMNS}
+        self.state = prior_state(cols, required)
+        self.daily = compute_indicators(cols, required)
+        self.daily.update(cols)
+        self.reader = MinuteReader(root, code)
+
+        self.qty = 0
+        self.avg_price = 0.0
+        self.cost_basis = 0.0
+        self.last_price = 0.0
+        self.order = None
+
+    def prev_row(self, t):
+        return {k: v[t - 1] for k, v in self.daily.items()}
+
+    def minute_cols(self, t, bars):
+        """하루 분봉 -> 분 단위 '오늘 봉' + 지표 배열"""
+        high = np.maximum.accumulate(bars["high"])
+        low = np.minimum.accumulate(bars["low"])
+        close = np.asarray(bars["close"])
+        volume = np.cumsum(bars["volume"])
+        open_ = float(bars["open"][0])
+        cols = today_indicators(self.state, t, open_, high, low, close, volume)
+        cols.update({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume})
+        return cols
+
+
+def simulate_intraday(daily_map, portfolio, start=None, end=None, market="US", root=MINUTE_DIR,
+                      init_balance=INIT_BALANCE, commission=COMMISSION, limit_offset="auto",
+                      timeout=ORDER_TIMEOUT, participation=PARTICIPATION, verbose=False):
+    """
+    [기능] 분봉 기반 포트폴리오 백테스트
+    :param daily_map: { code: 일봉 DataFrame (Date 인덱스, OHLCV) } - 지표 워밍업용 전체 기간
+    :param portfolio: run_backtest.PORTFOLIO 형식
+    :param market: 종목 설정에 'market' 이 없을 때 사용할 시장 (주문 방식 결정)
+    :param limit_offset: 'auto' = 시장별 기본값, None = 시장가
+    :return: engine.simulate 형식 + 'orders' 통계
+    """
+    def offset_for(config):
+        if limit_offset != "auto": return limit_offset
+        return LIMIT_OFFSET.get(config.get('market', market))
+
+    timeout_min = max(1, int(np.ceil(timeout / 60)))
+    required = required_indicators(c['strategy'] for c in portfolio.values())
+
+    symbols = [_Symbol(code, portfolio[code], daily_map[code], root, required, offset_for(portfolio[code]))
+               for code in portfolio if code in daily_map]
+    all_dates = sorted(set().union(*[set(df.index) for df in daily_map.values()]))
+    if start is not None: all_dates = [d for d in all_dates if d >= pd.Timestamp(start)]
+    if end is not None: all_dates = [d for d in all_dates if d <= pd.Timestamp(end)]
+
+    cash = init_balance
+    reserved = 0.0          # 미체결 매수 주문 금액 (가용 현금에서 제외)
+    held_value = 0.0        # 보유 평가액 (가격 갱신 시 증분 반영)
+    daily_history, trade_logs = [], []
+    stats = {"orders": 0, "filled": 0, "partial": 0, "unfilled": 0, "bars": 0}
+
+    def close_order(sym, status):
+        nonlocal reserved
+        o = sym.order
+        if o['side'] == 'BUY': reserved -= (o['qty'] - o['filled']) * o['reserve_price']
+        if o['filled'] == 0:
+            stats['unfilled'] += 1
+        else:
+            stats['filled' if o['filled'] == o['qty'] else 'partial'] += 1
+            price = o['value'] / o['filled']
+            log = {'Date': o['date'], 'Time': o['time'], 'Name': sym.name, 'Code': sym.code,
+                   'Type': 'Buy' if o['side'] == 'BUY' else 'Sell', 'Price': price, 'Qty': o['filled'],
+                   'Profit': 0, 'PnL': o.get('pnl', 0), 'Reason': o['reason'], 'Status': status,
+                   'SignalPrice': o['signal_price']}
+            if o['side'] == 'SELL' and o['avg_price']:
+                log['Profit'] = (price - o['avg_price']) / o['avg_price'] * 100
+            trade_logs.append(log)
+            if verbose:
+                icon = "🔴 매수" if o['side'] == 'BUY' else "🔵 매도"
+                print(f"{o['date']} {o['time']} | {icon} | {sym.name:<10} | {price:>9,.2f} x {o['filled']}/{o['qty']} ({status}) | {o['reason']}")
+        sym.order = None
+
+    def try_fill(sym, i, bars):
+        """대기 주문을 i번째 분봉에 체결 시도"""
+        nonlocal cash, reserved, held_value
+        o = sym.order
+        bar_open, bar_high, bar_low = bars["open"][i], bars["high"][i], bars["low"][i]
+        if o['limit'] is None:
+            price = bar_open
+        elif o['side'] == 'BUY':
+            if bar_low > o['limit']: return
+            price = min(bar_open, o['limit'])
+        else:
+            if bar_high < o['limit']: return
+            price = max(bar_open, o['limit'])
+
+        fill = min(o['qty'] - o['filled'], int(bars["volume"][i] * participation))
+        if fill <= 0: return
+
+        if o['side'] == 'BUY':
+            cost = fill * price * (1 + commission)
+            cash -= cost
+            reserved -= fill * o['reserve_price']
+            sym.cost_basis += cost
+            sym.avg_price = (sym.avg_price * sym.qty + price * fill) / (sym.qty + fill)
+            sym.qty += fill
+            held_value += fill * sym.last_price
+        else:
+            proceeds = fill * price * (1 - commission)
+            basis = sym.cost_basis * fill / sym.qty
+            cash += proceeds
+            o['pnl'] = o.get('pnl', 0) + proceeds - basis
+            sym.cost_basis -= basis
+            sym.qty -= fill
+            held_value -= fill * sym.last_price
+            if sym.qty == 0: sym.avg_price = 0.0; sym.cost_basis = 0.0
+
+        o['filled'] += fill
+        o['value'] += fill * price
+        if o['filled'] == o['qty']:
+            close_order(sym, 'FILLED')
+
+    for day in all_dates:
+        # 1. 오늘 분봉 스트리밍 (종목별 현재 월 파일만 매핑)
+        active = []
+        for sym in symbols:
+            t = sym.dates.get(day)
+            if t is None or t == 0: continue
+            bars = sym.reader.day(day)
+            if bars is None or len(bars) == 0: continue
+            active.append((sym, bars, sym.minute_cols(t, bars), sym.prev_row(t)))
+        if not active: continue
+
+        # 2. 분 단위 이벤트 (시각 -> 종목 순)
+        times = np.concatenate([b["time"].astype("i8") for _, b, _, _ in active])
+        owner = np.concatenate([np.full(len(b), k) for k, (_, b, _, _) in enumerate(active)])
+        index = np.concatenate([np.arange(len(b)) for _, b, _, _ in active])
+        order = np.lexsort((owner, times))
+        date_str = day.strftime('%Y-%m-%d')
+        stats['bars'] += len(order)
+
+        for e in order:
+            sym, bars, cols, prev = active[owner[e]]
+            i = index[e]
+            minute = times[e]
+            price = cols["Close"][i]
+            if sym.qty: held_value += sym.qty * (price - sym.last_price)
+            sym.last_price = price
+
+            # (A) 대기 주문: 타임아웃 -> 취소 / 아니면 이번 분봉에 체결 시도
+            if sym.order is not None:
+                if minute >= sym.order['minute'] + timeout_min:
+                    close_order(sym, 'TIMEOUT')
+                else:
+                    try_fill(sym, i, bars)
+                if sym.order is not None: continue
+
+            # (B) 분봉 종가 시점의 신호 판단 (라이브 사이클과 동일)
+            signal, reason, _ = get_signal(sym.config['strategy'], _MinuteRow(cols, i), prev, sym.config.get('setting'))
+            if signal == 'buy':
+                equity = cash + held_value
+                needed = equity * sym.config['ratio'] - sym.qty * price
+                amt = min(needed, cash - reserved)
+                qty = int(amt // price) if amt > 0 else 0
+                if qty <= 0: continue
+                side = 'BUY'
+            elif signal == 'sell' and sym.qty > 0:
+                qty = sym.qty
+                side = 'SELL'
+            else:
+                continue
+
+            limit = _limit_price(side, price, sym.limit_offset)
+            reserve_price = (limit or price) if side == 'BUY' else 0.0
+            reserved += qty * reserve_price
+            stats['orders'] += 1
+            sym.order = {'side': side, 'qty': qty, 'filled': 0, 'value': 0.0, 'limit': limit,
+                         'signal_price': price, 'reserve_price': reserve_price,
+                         'minute': minute + 1, 'date': date_str, 'avg_price': sym.avg_price,
+                         'time': str(bars["time"][i])[11:16], 'reason': reason}
+
+        # 3. 장 마감: 남은 주문 취소, 종가 평가
+        for sym, _, _, _ in active:
+            if sym.order is not None: close_order(sym, 'CLOSE')
+        daily_history.append({'Date': day, 'TotalAsset': cash + held_value})
+
+    final, ret, mdd = summarize(daily_history, init_balance)
+    return {'history': daily_history, 'trades': trade_logs, 'final': final, 'return': ret, 'mdd': mdd, 'orders': stats}
@@ -0,0 +1,110 @@
+import os
+import glob
+
+import numpy as np
+import pandas as pd
+
+# =========================================================
+# 🗄️ [분봉 저장소] 종목-월 단위 .npy (메모리 매핑)
+# =========================================================
+# - 경로: {root}/{code}/{YYYY-MM}.npy
+# - 레코드: time(분 단위 datetime64, 거래소 현지시각) + OHLCV
+# - 읽을 때는 np.load(mmap_mode='r') -> 하루치 구간만 페이지 로딩 (전체를 메모리에 올리지 않음)
+
+MINUTE_DIR = "history_data_minute"
+MINUTE_DTYPE = np.dtype([
+    ("time", "M8[m]"), ("open", "f8"), ("high", "f8"), ("low", "f8"), ("close", "f8"), ("volume", "f8"),
+])
+
+
+def month_path(root, code, month):
+    """month: 'YYYY-MM'"""
+    return os.path.join(root, str(code), f"{month}.npy")
+
+
+def write_minute_bars(root, code, df):
+    """
+    [기능] 분봉 DataFrame 저장 (월별 파일로 분할, 기존 파일과 시각 기준 병합)
+    :param df: DatetimeIndex + Open/High/Low/Close/Volume
+    :return: 저장한 월 리스트
+    """
+    if df.empty: return []
+    df = df.sort_index()
+    times = df.index.values.astype("M8[m]")
+    months = times.astype("M8[M]")
+
+    folder = os.path.join(root, str(code))
+    if not os.path.exists(folder): os.makedirs(folder)
+
+    saved = []
+    for month in np.unique(months):
+        sel = months == month
+        rec = np.empty(int(sel.sum()), dtype=MINUTE_DTYPE)
+        rec["time"] = times[sel]
+        for col, field in (("Open", "open"), ("High", "high"), ("Low", "low"), ("Close", "close"), ("Volume", "volume")):
+            rec[field] = df[col].to_numpy(dtype=float)[sel]
+
+        path = month_path(root, code, str(month))
+        if os.path.exists(path):
+            rec = np.concatenate((np.load(path), rec))
+        # 같은 시각은 나중 데이터 우선
+        _, keep = np.unique(rec["time"][::-1], return_index=True)
+        rec = rec[::-1][keep]
+
+        np.save(path, rec)
+        saved.append(str(month))
+    return saved
+
+
+def import_csv(path, code, root=MINUTE_DIR):
+    """CSV(Datetime, Open, High, Low, Close, Volume) -> 월별 .npy"""
+    df = pd.read_csv(path, parse_dates=[0], index_col=0)
+    return write_minute_bars(root, code, df)
+
+
+def available_codes(root=MINUTE_DIR):
+    """분봉 파일이 있는 종목 코드 목록"""
+    return sorted({os.path.basename(os.path.dirname(p)) for p in glob.glob(os.path.join(root, "*", "*.npy"))})
+
+
+class MinuteReader:
+    """
+    종목 1개의 분봉 읽기 (현재 월 파일 1개만 매핑 유지)
+    - 날짜 오름차순으로 day() 를 호출하면 월이 바뀔 때만 파일을 다시 엶
+    """
+
+    def __init__(self, root, code):
+        self.root = root
+        self.code = str(code)
+        self._month = None
+        self._data = None
+        self._days = None      # 월 내 날짜별 시작 위치
+        self._bounds = None
+
+    def _open(self, month):
+        self._month = month
+        path = month_path(self.root, self.code, month)
+        if not os.path.exists(path):
+            self._data = None
+            return
+        self._data = np.load(path, mmap_mode="r")
+        days = self._data["time"].astype("M8[D]")
+        self._days, self._bounds = np.unique(days, return_index=True)
+        self._bounds = np.append(self._bounds, len(days))
+
+    def day(self, date):
+        """
+        :param date: 날짜 (Timestamp/datetime/np.datetime64)
+        :return: 해당 날짜 분봉 (mmap 구조체 배열 view) 또는 None
+        """
+        d = np.datetime64(pd.Timestamp(date).date(), "D")
+        month = str(d.astype("M8[M]"))
+        if month != self._month: self._open(month)
+        if self._data is None: return None
+
+        i = np.searchsorted(self._days, d)
+        if i >= len(self._days) or self._days[i] != d: return None
+        return self._data[self._bounds[i]:self._bounds[i + 1]]
+
+    def months(self):
+        return sorted(os.path.basename(p)[:-4] for p in glob.glob(os.path.join(self.root, self.code, "*.npy")))
@@ -0,0 +1,139 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.backtest.engine import INIT_BALANCE
+
+# =========================================================
+# 🎲 [몬테카를로] 백테스트 결과 강건성 검증
+# =========================================================
+# - 매매 순서 셔플: 청산 손익(PnL) 순서만 무작위로 섞음
+#   (합계는 같으므로 최종자산은 동일, MDD / 최장 낙폭기간 분포 확인용)
+# - 블록 부트스트랩: 일간 수익률을 block일 단위로 복원 추출해 새 자산곡선 생성
+#   (변동성 군집을 유지한 채 최종자산 / MDD / 낙폭기간 분포 확인)
+# - 경로 수만 개를 NumPy 2차원 배열(경로 x 일)로 한 번에 계산, 청크 단위로 프로세스 분산
+
+N_PATHS = 20000
+BLOCK = 5              # 부트스트랩 블록 길이 (거래일)
+CHUNK = 2000           # 프로세스 작업 1건당 경로 수 (메모리: CHUNK x 일수 x 8바이트)
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+# =========================================================
+# 🧮 경로 지표 (벡터화)
+# =========================================================
+def path_metrics(equity):
+    """
+    [기능] 자산곡선 배열의 경로별 지표
+    :param equity: (경로 수, 기간+1) - 첫 열은 시작 자산
+    :return: {'final', 'mdd'(%), 'longest_dd'(기간 수)}
+    """
+    peak = np.maximum.accumulate(equity, axis=1)
+    mdd = ((equity - peak) / peak).min(axis=1) * 100
+
+    # 최장 낙폭기간: 마지막 고점 갱신 이후 경과 기간의 최대값
+    steps = np.arange(equity.shape[1])
+    last_peak = np.maximum.accumulate(np.where(equity >= peak, steps, 0), axis=1)
+    longest = (steps - last_peak).max(axis=1)
+
+    return {'final': equity[:, -1], 'mdd': mdd, 'longest_dd': longest}
+
+
+def _shuffle_chunk(pnls, init_balance, n_paths, seed):
+    rng = np.random.default_rng(seed)
+    paths = rng.permuted(np.broadcast_to(pnls, (n_paths, len(pnls))), axis=1)
+    equity = np.empty((n_paths, len(pnls) + 1))
+    equity[:, 0] = init_balance
+    np.cumsum(paths, axis=1, out=equity[:, 1:])
+    equity[:, 1:] += init_balance
+    return path_metrics(equity)
+
+
+def _bootstrap_chunk(returns, init_balance, n_paths, seed, block):
+    rng = np.random.default_rng(seed)
+    n = len(returns)
+    n_blocks = -(-n // block)
+
+    # 순환 블록 부트스트랩: 블록 시작점만 뽑고 인덱스는 브로드캐스팅으로 생성
+    starts = rng.integers(0, n, size=(n_paths, n_blocks))
+    idx = ((starts[:, :, None] + np.arange(block)) % n).reshape(n_paths, -1)[:, :n]
+
+    equity = np.empty((n_paths, n + 1))
+    equity[:, 0] = init_balance
+    np.cumprod(1 + returns[idx], axis=1, out=equity[:, 1:])
+    equity[:, 1:] *= init_balance
+    return path_metrics(equity)
+
+
+def _run_chunks(func, args, n_paths, seed_seq, workers):
+    """경로를 CHUNK 단위로 나눠 실행 (청크마다 독립 시드 -> 프로세스 수와 무관하게 같은 결과)"""
+    sizes = [CHUNK] * (n_paths // CHUNK) + ([n_paths % CHUNK] if n_paths % CHUNK else [])
+    seeds = seed_seq.spawn(len(sizes))
+    jobs = [(*args[:2], size, s, *args[2:]) for size, s in zip(sizes, seeds)]
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        parts = [func(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(func, *zip(*jobs)))
+    return {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+
+
+# =========================================================
+# 🚀 실행
+# =========================================================
+def trade_returns(result):
+    """백테스트 결과 -> 청산 손익 배열 (원)"""
+    return np.array([t['PnL'] for t in result['trades'] if t['Type'] == 'Sell'], dtype=float)
+
+
+def daily_returns(result, init_balance=INIT_BALANCE):
+    """백테스트 결과 -> 일간 수익률 배열"""
+    equity = np.array([init_balance] + [h['TotalAsset'] for h in result['history']], dtype=float)
+    return equity[1:] / equity[:-1] - 1
+
+
+def run_monte_carlo(result, n_paths=N_PATHS, block=BLOCK, init_balance=INIT_BALANCE, seed=None, workers=None):
+    """
+    [기능] 매매 순서 셔플 + 일간 수익률 블록 부트스트랩
+    :param result: engine.simulate() / run_backtest.run() 결과
+    :param seed: 재현용 시드 (None 이면 매번 다름)
+    :return: {'shuffle': 지표 배열 dict 또는 None, 'bootstrap': ..., 'actual': 원래 결과 지표}
+    """
+    pnls = trade_returns(result)
+    rets = daily_returns(result, init_balance)
+    actual_equity = np.array([[init_balance] + [h['TotalAsset'] for h in result['history']]], dtype=float)
+    actual = {k: v[0] for k, v in path_metrics(actual_equity).items()}
+
+    seeds = np.random.SeedSequence(seed).spawn(2)
+    shuffle = _run_chunks(_shuffle_chunk, (pnls, init_balance), n_paths, seeds[0], workers) if len(pnls) > 1 else None
+    bootstrap = _run_chunks(_bootstrap_chunk, (rets, init_balance, block), n_paths, seeds[1], workers) if len(rets) > 1 else None
+
+    return {'shuffle': shuffle, 'bootstrap': bootstrap, 'actual': actual,
+            'n_paths': n_paths, 'n_trades': len(pnls), 'n_days': len(rets), 'init_balance': init_balance}
+
+
+def report(mc):
+    """몬테카를로 결과 분위수 출력"""
+    init_balance = mc['init_balance']
+    actual = mc['actual']
+    print("\n" + "=" * 70)
+    print(f"🎲 [Monte Carlo] {mc['n_paths']:,}경로 | 청산 {mc['n_trades']}건 | {mc['n_days']}거래일")
+    print(f"   실제: 수익률 {(actual['final'] / init_balance - 1) * 100:.2f}% | "
+          f"MDD {actual['mdd']:.2f}% | 최장 낙폭 {actual['longest_dd']}일")
+
+    for label, key, unit in (("매매 순서 셔플", 'shuffle', "건"), ("블록 부트스트랩", 'bootstrap', "일")):
+        dist = mc[key]
+        if dist is None:
+            print(f"\n   [{label}] 데이터 부족 - 생략")
+            continue
+        ret = (dist['final'] / init_balance - 1) * 100
+        print(f"\n   [{label}]\n   {'':<12} " + " | ".join(f"{'p' + str(p):>6}" for p in PERCENTILES))
+        print(f"   {'수익률(%)':<12} " + " | ".join(f"{v:6.1f}" for v in np.percentile(ret, PERCENTILES)))
+        print(f"   {'MDD(%)':<12} " + " | ".join(f"{v:6.1f}" for v in np.percentile(dist['mdd'], PERCENTILES)))
+        print(f"   {f'최장낙폭({unit})':<12} " + " | ".join(f"{v:6.0f}" for v in np.percentile(dist['longest_dd'], PERCENTILES)))
+        if key == 'bootstrap':
+            print(f"   손실 확률: {(ret < 0).mean() * 100:.1f}% | 실제 MDD보다 나쁠 확률: {(dist['mdd'] < actual['mdd']).mean() * 100:.1f}%")
+    print("=" * 70)
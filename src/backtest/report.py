@@ -0,0 +1,138 @@
+import os
+import io
+import base64
+import html
+import importlib.util
+
+import numpy as np
+import pandas as pd
+
+# =========================================================
+# 📝 [리포트] 헤드리스 결과 출력 (파일 저장 / 매매 요약)
+# =========================================================
+# - 자산곡선 + 낙폭(drawdown) 그림은 matplotlib.figure.Figure 로 직접 그림 (pyplot / GUI 백엔드 사용 안 함)
+# - 긴 자산곡선은 구간별 최소/최대만 남겨 decimate (모양과 MDD 지점은 그대로 유지)
+# - 표 데이터는 CSV, pyarrow 가 설치돼 있으면 Parquet 도 함께 저장
+# - HTML 은 PNG 를 내장한 단일 파일 (요약 + 매매표)
+
+PLOT_MAX_POINTS = 2000   # 그림에 그릴 최대 점 수
+
+
+def has_parquet():
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def equity_frame(history):
+    """[{'Date','TotalAsset'}] -> Date 인덱스 DataFrame (TotalAsset, Drawdown%)"""
+    df = pd.DataFrame(history).set_index('Date')
+    peak = df['TotalAsset'].cummax()
+    df['Drawdown'] = (df['TotalAsset'] - peak) / peak * 100
+    return df
+
+
+def decimate(index, values, max_points=PLOT_MAX_POINTS):
+    """
+    [기능] 구간별 min/max decimation
+    - 점이 max_points 보다 많으면 max_points/2 개 구간으로 나눠 구간마다 최소/최대 점만 남김 (시간 순서 유지)
+    :return: (index, values) 줄어든 배열
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n <= max_points or max_points < 4: return index, values
+
+    buckets = max_points // 2
+    edges = np.linspace(0, n, buckets + 1).astype(int)
+    keep = [0, n - 1]
+    for a, b in zip(edges[:-1], edges[1:]):
+        if b <= a: continue
+        seg = values[a:b]
+        keep.append(a + int(np.argmin(seg)))
+        keep.append(a + int(np.argmax(seg)))
+    keep = np.unique(keep)
+    return index[keep], values[keep]
+
+
+def render_png(history, title, max_points=PLOT_MAX_POINTS):
+    """자산곡선 + 낙폭 PNG bytes (pyplot 없이 Agg 캔버스)"""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    eq = equity_frame(history)
+    x1, y1 = decimate(eq.index, eq['TotalAsset'].to_numpy(), max_points)
+    x2, y2 = decimate(eq.index, eq['Drawdown'].to_numpy(), max_points)
+
+    fig = Figure(figsize=(12, 7))
+    FigureCanvasAgg(fig)
+    ax1, ax2 = fig.subplots(2, 1, sharex=True, gridspec_kw={'height_ratios': [3, 1]})
+    ax1.plot(x1, y1, color='red', label='Total Asset')
+    ax1.set_title(title)
+    ax1.legend()
+    ax1.grid(True, alpha=0.3)
+    ax2.fill_between(x2, y2, 0, color='steelblue', alpha=0.4)
+    ax2.set_ylabel('Drawdown %')
+    ax2.grid(True, alpha=0.3)
+    fig.tight_layout()
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=100)
+    return buf.getvalue()
+
+
+def _save_table(df, path_no_ext, index=True):
+    paths = [path_no_ext + ".csv"]
+    df.to_csv(paths[0], index=index, encoding='utf-8-sig')
+    if has_parquet():
+        paths.append(path_no_ext + ".parquet")
+        df.to_parquet(paths[1], index=index)
+    return paths
+
+
+def write_report(history, trades, out_dir, title, summary=None, max_points=PLOT_MAX_POINTS):
+    """
+    [기능] 결과 파일 저장
+    - equity.csv(.parquet): 날짜별 자산/낙폭 (전체 해상도)
+    - trades.csv(.parquet): 매매 내역
+    - equity.png: 자산곡선 + 낙폭 (decimated)
+    - report.html: 요약 + 그림 + 매매표
+    :param summary: { 라벨: 값 } 요약 항목 (HTML 상단)
+    :return: 저장한 파일 경로 리스트
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    eq = equity_frame(history)
+    paths += _save_table(eq, os.path.join(out_dir, "equity"))
+    trade_df = pd.DataFrame(trades)
+    paths += _save_table(trade_df, os.path.join(out_dir, "trades"), index=False)
+
+    png = render_png(history, title, max_points)
+    png_path = os.path.join(out_dir, "equity.png")
+    with open(png_path, "wb") as f: f.write(png)
+    paths.append(png_path)
+
+    rows = "".join(f"<tr><th>{html.escape(str(k))}</th><td>{html.escape(str(v))}</td></tr>" for k, v in (summary or {}).items())
+    table = trade_df.to_html(index=False, float_format=lambda v: f"{v:,.2f}", border=0) if len(trade_df) else "<p>매매 없음</p>"
+    doc = f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{html.escape(title)}</title>
+<style>body{{font-family:sans-serif;margin:24px}}table{{border-collapse:collapse;font-size:13px}}
+th,td{{padding:3px 8px;border-bottom:1px solid #ddd;text-align:right}}</style></head>
+<body><h2>{html.escape(title)}</h2><table>{rows}</table>
+<img src="data:image/png;base64,{base64.b64encode(png).decode()}" style="max-width:100%">
+<h3>매매 내역 ({len(trade_df)}건)</h3>{table}</body></html>"""
+    html_path = os.path.join(out_dir, "report.html")
+    with open(html_path, "w", encoding="utf-8") as f: f.write(doc)
+    paths.append(html_path)
+    return paths
+
+
+def print_trade_summary(trades):
+    """종목별 매매 요약 (매매 건수 / 승률 / 실현손익)"""
+    sells = [t for t in trades if t['Type'] == 'Sell']
+    print(f"\n🧾 [매매 요약] 총 {len(trades)}건 (매수 {len(trades) - len(sells)} / 매도 {len(sells)})")
+    by_name = {}
+    for t in sells:
+        s = by_name.setdefault(t['Name'], [0, 0, 0.0])
+        s[0] += 1
+        s[1] += t['Profit'] > 0
+        s[2] += t.get('PnL', 0)
+    for name, (n, wins, pnl) in sorted(by_name.items(), key=lambda kv: -kv[1][2]):
+        print(f"   {name:<12} | 청산 {n:>3}건 | 승률 {wins / n * 100:>5.1f}% | 실현손익 {pnl:>+15,.0f}")
@@ -0,0 +1,431 @@
+import json
+import threading
+from datetime import datetime, time as dtime
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from src import clock
+from src.traffic_recorder import build_response
+from src.backtest.engine import COMMISSION
+from src.backtest.minute_store import MinuteReader
+
+# =========================================================
+# 🏦 [가상 브로커] 과거 데이터로 KIS API 응답 생성
+# =========================================================
+# - 실제 트레이더(KoreaTrader / USTrader) 세션 자리에 끼워 넣음 (session.request/get/post 그대로)
+# - 시각은 src.clock (가상 시계) 기준 -> 장중 가격은 분봉(있으면) 또는 일봉 OHLC 경로로 보간
+#   (시가 -> 고가/저가 -> 저가/고가 -> 종가, 양봉이면 저가를 먼저 찍는 경로)
+# - KR: 시장가 즉시 체결 / US: 지정가 - 현재가가 닿으면 체결, 아니면 미체결로 남음 (취소 가능)
+# - 당일 주문 내역(체결/잔량/취소 수량)은 KR 주문체결조회(inquire-daily-ccld)로 응답
+# - 잔고/예수금/평가금은 체결 내역으로 직접 계산
+
+SESSIONS = {
+    "KR": {"tz": pytz.timezone('Asia/Seoul'), "open": dtime(9, 0), "close": dtime(15, 30)},
+    "US": {"tz": pytz.timezone('America/New_York'), "open": dtime(9, 30), "close": dtime(16, 0)},
+}
+DAILY_ROWS = 100  # 일봉 API 1회 응답 개수 (실제 API와 동일)
+
+
+def _error(msg):
+    return {"rt_cd": "1", "msg1": msg}
+
+
+class _Instrument:
+    """종목 1개의 일봉 + 장중 가격 경로"""
+
+    def __init__(self, code, df, minute_root=None):
+        self.code = code
+        self.dates = df.index
+        self.open = df['Open'].to_numpy(dtype=float)
+        self.high = df['High'].to_numpy(dtype=float)
+        self.low = df['Low'].to_numpy(dtype=float)
+        self.close = df['Close'].to_numpy(dtype=float)
+        self.volume = df['Volume'].to_numpy(dtype=float)
+        self.date_str = [d.strftime('%Y%m%d') for d in self.dates]
+        self.reader = MinuteReader(minute_root, code) if minute_root else None
+        self._day_cache = (None, None)
+        self._located = (None, None)
+
+    def index_of(self, date):
+        """date 이하 마지막 거래일 위치 (없으면 -1)"""
+        return self.locate(date)[0]
+
+    def locate(self, date):
+        """date 이하 마지막 거래일 (위치, 날짜) - 같은 날짜 반복 조회(요청마다)는 캐시"""
+        cached_date, found = self._located
+        if cached_date is date or (cached_date is not None and cached_date == date): return found
+        t = int(self.dates.searchsorted(date, side='right')) - 1
+        found = (t, self.dates[t] if t >= 0 else None)
+        self._located = (date, found)
+        return found
+
+    def _path(self, t, date):
+        """t일 장중 경로: (경과비율 배열, 가격 배열, 누적 고가, 누적 저가)"""
+        if self._day_cache[0] == t: return self._day_cache[1]
+
+        bars = self.reader.day(date) if self.reader else None
+        if bars is not None and len(bars):
+            n = len(bars)
+            frac = np.arange(1, n + 1) / n
+            price = np.asarray(bars["close"], dtype=float)
+            path = (frac, price, np.maximum.accumulate(bars["high"]), np.minimum.accumulate(bars["low"]))
+        else:
+            o, h, l, c = self.open[t], self.high[t], self.low[t], self.close[t]
+            mid = (l, h) if c >= o else (h, l)
+            frac = np.array([0.0, 1 / 3, 2 / 3, 1.0])
+            price = np.array([o, mid[0], mid[1], c])
+            path = (frac, price, None, None)
+
+        self._day_cache = (t, path)
+        return path
+
+    def quote(self, t, date, progress):
+        """
+        t일 장중 progress(0~1) 시점의 (현재가, 고가, 저가, 누적거래량)
+        progress None = 장 시작 전 (전일 종가)
+        """
+        if progress is None:
+            c = self.close[t - 1] if t > 0 else self.open[t]
+            return c, c, c, 0.0
+        if progress >= 1.0:
+            return self.close[t], self.high[t], self.low[t], self.volume[t]
+
+        frac, price, run_high, run_low = self._path(t, date)
+        if run_high is not None:
+            i = max(0, int(np.searchsorted(frac, progress, side='right')) - 1)
+            return price[i], run_high[i], run_low[i], self.volume[t] * progress
+
+        c = float(np.interp(progress, frac, price))
+        passed = price[frac <= progress]
+        return c, max(passed.max(), c), min(passed.min(), c), self.volume[t] * progress
+
+
+class SimBroker:
+    """
+    시장별 계좌 + 과거 시세로 동작하는 가상 브로커
+    :param daily_map: { 'KR': {code: 일봉 DataFrame}, 'US': {...} }
+    :param cash: { 'KR': 원화 예수금, 'US': 달러 예수금 }
+    """
+
+    def __init__(self, daily_map, cash, minute_root=None, commission=COMMISSION):
+        self.commission = commission
+        self.instruments = {m: {c: _Instrument(c, df, minute_root) for c, df in codes.items()} for m, codes in daily_map.items()}
+        self.calendars = {m: pd.DatetimeIndex(sorted(set().union(*[set(df.index) for df in codes.values()]))) if codes else pd.DatetimeIndex([])
+                          for m, codes in daily_map.items()}
+        self.cash = dict(cash)
+        self.positions = {m: {} for m in daily_map}   # code -> {'qty', 'cost'}
+        self.open_orders = {m: {} for m in daily_map} # odno -> order (US 지정가 미체결)
+        self.day_orders = {m: {} for m in daily_map}  # odno -> order (당일 주문 내역, 날짜가 바뀌면 비움)
+        self.fills = []
+        self._odno = 0
+        self._session_cache = {}  # market -> (현지 시각, session_state 결과)
+        self._lock = threading.RLock()
+
+    # -----------------------------------------------------
+    # 🕰️ 시장 시간
+    # -----------------------------------------------------
+    def session_state(self, market):
+        """
+        현재 가상 시각 기준 시장 상태
+        :return: (현지 날짜 Timestamp, 거래일 여부, 진행률) - 진행률 None = 장 전, 1.0 = 장 마감 후
+        """
+        spec = SESSIONS[market]
+        local = clock.now(spec["tz"])
+        cached = self._session_cache.get(market)
+        if cached is not None and cached[0] is local: return cached[1]  # 가상 시계는 같은 시각이면 같은 객체
+        date = pd.Timestamp(local.date())
+        is_open_day = date in self.calendars.get(market, ())
+
+        minutes = local.hour * 60 + local.minute + local.second / 60
+        start = spec["open"].hour * 60 + spec["open"].minute
+        end = spec["close"].hour * 60 + spec["close"].minute
+        if minutes < start: progress = None
+        elif minutes >= end: progress = 1.0
+        else: progress = (minutes - start) / (end - start)
+        self._session_cache[market] = (local, (date, is_open_day, progress))
+        return date, is_open_day, progress
+
+    def _quote(self, market, code):
+        inst = self.instruments.get(market, {}).get(code)
+        if inst is None: return None, None, -1, None
+        date, is_open_day, progress = self.session_state(market)
+        t, day = inst.locate(date)
+        if t < 0: return None, None, -1, None
+        if not is_open_day or day != date:
+            progress = 1.0  # 휴장일/데이터 없는 날: 마지막 거래일 종가
+        q = inst.quote(t, day, progress)
+        return inst, q, t, progress
+
+    def price(self, market, code):
+        _, q, _, _ = self._quote(market, code)
+        if q is None: return None
+        return float(round(q[0])) if market == "KR" else float(q[0])   # KR 호가는 원 단위
+
+    def quote_fields(self, market, code):
+        """현재가 API 용 (현재가, 시가, 고가, 저가, 누적거래량) - 장 시작 전이면 전일 종가로 채움"""
+        inst, q, t, progress = self._quote(market, code)
+        if q is None: return None
+        c, h, l, v = q
+        o = inst.open[t] if progress is not None else c
+        if market == "KR": c = float(round(c))
+        return c, o, h, l, v
+
+    def equity(self, market):
+        """예수금 + 보유 평가액 (현재 가상 시각 기준)"""
+        with self._lock:
+            value = self.cash[market]
+            for code, pos in self.positions[market].items():
+                p = self.price(market, code)
+                if p: value += pos['qty'] * p
+            return value
+
+    def session(self, market):
+        return SimSession(self, market)
+
+    # -----------------------------------------------------
+    # 📈 시세
+    # -----------------------------------------------------
+    def daily_rows(self, market, code):
+        """일봉 API 응답 (최신순, 오늘은 장중 값)"""
+        inst, q, t, progress = self._quote(market, code)
+        if inst is None: return None
+        rows = []
+        last = t if progress is not None else t - 1   # 장 시작 전이면 오늘 봉 없음
+        for i in range(last, max(last - DAILY_ROWS, -1), -1):
+            if i == t and progress is not None and progress < 1.0:
+                c, h, l, v = q
+                o = inst.open[i]
+            else:
+                o, h, l, c, v = inst.open[i], inst.high[i], inst.low[i], inst.close[i], inst.volume[i]
+            rows.append((inst.date_str[i], o, h, l, c, v))
+        return rows
+
+    # -----------------------------------------------------
+    # 🧾 주문 / 체결
+    # -----------------------------------------------------
+    def _next_odno(self):
+        self._odno += 1
+        return f"{self._odno:010d}"
+
+    def _fill(self, market, code, side, qty, price, odno):
+        pos = self.positions[market].setdefault(code, {'qty': 0, 'cost': 0.0})
+        if side == 'BUY':
+            self.cash[market] -= qty * price * (1 + self.commission)
+            pos['cost'] += qty * price
+            pos['qty'] += qty
+        else:
+            self.cash[market] += qty * price * (1 - self.commission)
+            pos['cost'] -= pos['cost'] * qty / pos['qty']
+            pos['qty'] -= qty
+            if pos['qty'] == 0: del self.positions[market][code]
+        self.fills.append({'time': clock.now(), 'market': market, 'code': code, 'side': side,
+                           'qty': qty, 'price': price, 'odno': odno})
+
+    def submit(self, market, code, side, qty, limit=None):
+        """주문 접수 -> (응답 dict)"""
+        with self._lock:
+            _, is_open_day, progress = self.session_state(market)
+            if not is_open_day:
+                return _error("영업일이 아닙니다 (휴장)")
+            if progress is None or progress >= 1.0:
+                return _error("장운영시간이 아닙니다")
+
+            price = self.price(market, code)
+            if price is None: return _error("종목 정보 없음")
+            if qty <= 0: return _error("주문수량 오류")
+
+            held = self.positions[market].get(code, {}).get('qty', 0)
+            if side == 'SELL' and qty > held:
+                return _error("매도가능수량을 초과하였습니다")
+            check_price = limit if (limit and side == 'BUY') else price
+            if side == 'BUY' and qty * check_price * (1 + self.commission) > self.cash[market]:
+                return _error("주문가능금액을 초과하였습니다")
+
+            odno = self._next_odno()
+            today = clock.now(SESSIONS[market]["tz"]).strftime('%Y%m%d')
+            order = {'odno': odno, 'code': code, 'side': side, 'qty': qty, 'limit': limit,
+                     'date': today, 'filled': 0, 'canceled': 0}
+            book = self.day_orders[market]
+            if book and next(iter(book.values()))['date'] != today: book.clear()
+            book[odno] = order
+            if not self._try_fill(market, order, price):
+                self.open_orders[market][odno] = order
+            return {"rt_cd": "0", "msg1": "주문 전송 완료", "output": {"KRX_FWDG_ORD_ORGNO": odno, "ODNO": odno}}
+
+    def _try_fill(self, market, order, price):
+        limit = order['limit']
+        if limit is not None:
+            if order['side'] == 'BUY' and price > limit: return False
+            if order['side'] == 'SELL' and price < limit: return False
+        self._fill(market, order['code'], order['side'], order['qty'], price, order['odno'])
+        order['filled'] = order['qty']
+        return True
+
+    def match_open_orders(self, market):
+        """미체결 지정가 주문을 현재가로 재확인"""
+        if not self.open_orders[market]: return  # 요청마다 호출 -> 미체결이 없으면 시장 상태 계산 생략
+        with self._lock:
+            _, is_open_day, progress = self.session_state(market)
+            if not is_open_day or progress is None or progress >= 1.0: return
+            for odno, order in list(self.open_orders[market].items()):
+                price = self.price(market, order['code'])
+                if price is not None and self._try_fill(market, order, price):
+                    del self.open_orders[market][odno]
+
+    def cancel(self, market, odno):
+        with self._lock:
+            order = self.open_orders[market].pop(odno, None)
+            if order is None:
+                return _error("취소 가능한 주문이 없습니다 (체결 완료)")
+            order['canceled'] = order['qty'] - order['filled']
+            return {"rt_cd": "0", "msg1": "취소 완료", "output": {"ODNO": odno}}
+
+    # -----------------------------------------------------
+    # 💰 잔고
+    # -----------------------------------------------------
+    def holdings_rows(self, market):
+        rows = []
+        for code, pos in self.positions[market].items():
+            price = self.price(market, code) or 0.0
+            avg = pos['cost'] / pos['qty']
+            eval_amt = pos['qty'] * price
+            rows.append((code, pos['qty'], price, avg, eval_amt, (price - avg) / avg * 100 if avg else 0.0, eval_amt - pos['cost']))
+        return rows
+
+
+class SimSession:
+    """트레이더 session 자리에 들어가는 requests 호환 객체 (시장 1개)"""
+
+    def __init__(self, broker, market):
+        self.broker = broker
+        self.market = market
+        self.calls = 0
+
+    def request(self, method, url, params=None, data=None, headers=None, **kwargs):
+        self.calls += 1
+        path = urlsplit(url).path
+        params = params or {}
+        body = json.loads(data) if isinstance(data, str) and data else {}
+        tr_id = (headers or {}).get("tr_id", "")
+        b = self.broker
+        b.match_open_orders(self.market)
+
+        if self.market == "KR":
+            out = self._kr(path, params, body, tr_id)
+        else:
+            out = self._us(path, params, body, tr_id)
+        return build_response(200, json.dumps(out, ensure_ascii=False), url)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        pass
+
+    # -----------------------------------------------------
+    # 🇰🇷 국내
+    # -----------------------------------------------------
+    def _kr(self, path, params, body, tr_id):
+        b = self.broker
+        if path.endswith("/chk-holiday"):
+            date = pd.Timestamp(datetime.strptime(params.get("BASS_DT"), "%Y%m%d"))
+            return {"rt_cd": "0", "output": [{"opnd_yn": "Y" if date in b.calendars["KR"] else "N"}]}
+
+        if path.endswith("/inquire-price"):
+            q = b.quote_fields("KR", params.get("fid_input_iscd"))
+            if q is None: return _error("종목 정보 없음")
+            c, o, h, l, v = q
+            return {"rt_cd": "0", "output": {"stck_prpr": str(int(round(c))), "stck_oprc": f"{o:.0f}",
+                                             "stck_hgpr": f"{h:.0f}", "stck_lwpr": f"{l:.0f}", "acml_vol": str(int(v))}}
+
+        if path.endswith("/inquire-daily-price"):
+            rows = b.daily_rows("KR", params.get("fid_input_iscd"))
+            if not rows: return _error("조회 결과 없음")
+            return {"rt_cd": "0", "output": [{
+                "stck_bsop_date": d, "stck_oprc": f"{o:.0f}", "stck_hgpr": f"{h:.0f}",
+                "stck_lwpr": f"{l:.0f}", "stck_clpr": f"{c:.0f}", "acml_vol": str(int(v))} for d, o, h, l, c, v in rows]}
+
+        if path.endswith("/order-cash"):
+            side = 'BUY' if tr_id.endswith("0012U") else 'SELL'
+            return b.submit("KR", body.get("PDNO"), side, int(body.get("ORD_QTY", 0)))
+
+        if path.endswith("/order-rvsecncl"):
+            return b.cancel("KR", body.get("ORGN_ODNO"))
+
+        if path.endswith("/inquire-daily-ccld"):
+            with b._lock:
+                orders = [o for o in b.day_orders["KR"].values() if o['date'] >= params.get("INQR_STRT_DT", "")]
+            return {"rt_cd": "0", "output1": [{
+                "odno": o['odno'], "pdno": o['code'], "ord_qty": str(o['qty']), "tot_ccld_qty": str(o['filled']),
+                "rmn_qty": str(o['qty'] - o['filled'] - o['canceled']), "cnc_cfrm_qty": str(o['canceled'])}
+                for o in reversed(list(orders))]}
+
+        if path.endswith("/inquire-balance-rlz-pl") or path.endswith("/inquire-balance"):
+            with b._lock:
+                rows = b.holdings_rows("KR")
+                cash = b.cash["KR"]
+            stock = sum(r[4] for r in rows)
+            profit = sum(r[6] for r in rows)
+            return {"rt_cd": "0", "output1": [{
+                "pdno": code, "prdt_name": code, "hldg_qty": str(qty), "prpr": f"{price:.0f}",
+                "pchs_avg_pric": f"{avg:.2f}", "evlu_amt": f"{ev:.0f}", "evlu_pfls_rt": f"{rate:.2f}",
+                "evlu_pfls_amt": f"{pnl:.0f}", "rlzt_pfls": "0"} for code, qty, price, avg, ev, rate, pnl in rows],
+                "output2": [{"prvs_rcdl_excc_amt": f"{cash:.0f}", "dnca_tot_amt": f"{cash:.0f}",
+                             "tot_evlu_amt": f"{cash + stock:.0f}", "evlu_pfls_smtl_amt": f"{profit:.0f}",
+                             "rlzt_pfls": "0", "rlzt_pfls_amt": "0", "asst_icdc_amt": "0"}]}
+
+        return {"rt_cd": "0", "msg1": "OK", "output": {}}
+
+    # -----------------------------------------------------
+    # 🇺🇸 해외
+    # -----------------------------------------------------
+    def _us(self, path, params, body, tr_id):
+        b = self.broker
+        if path.endswith("/quotations/price"):
+            price = b.price("US", params.get("SYMB"))
+            if price is None: return _error("종목 정보 없음")
+            return {"rt_cd": "0", "output": {"last": f"{price:.4f}"}}
+
+        if path.endswith("/quotations/price-detail"):
+            q = b.quote_fields("US", params.get("SYMB"))
+            if q is None: return _error("종목 정보 없음")
+            c, o, h, l, v = q
+            return {"rt_cd": "0", "output": {"last": f"{c:.4f}", "open": f"{o:.4f}", "high": f"{h:.4f}",
+                                             "low": f"{l:.4f}", "tvol": str(int(v))}}
+
+        if path.endswith("/dailyprice"):
+            rows = b.daily_rows("US", params.get("SYMB"))
+            if not rows: return _error("조회 결과 없음")
+            return {"rt_cd": "0", "output2": [{
+                "xymd": d, "open": f"{o:.4f}", "high": f"{h:.4f}", "low": f"{l:.4f}",
+                "clos": f"{c:.4f}", "tvol": str(int(v))} for d, o, h, l, c, v in rows]}
+
+        if path.endswith("/trading/order"):
+            side = 'BUY' if tr_id.endswith("1002U") else 'SELL'
+            return b.submit("US", body.get("PDNO"), side, int(body.get("ORD_QTY", 0)), float(body.get("OVRS_ORD_UNPR", 0)) or None)
+
+        if path.endswith("/order-rvsecncl"):
+            return b.cancel("US", body.get("ORGN_ODNO"))
+
+        if path.endswith("/inquire-nccs"):
+            with b._lock:
+                orders = list(b.open_orders["US"].values())
+            return {"rt_cd": "0", "output": [{"odno": o['odno'], "pdno": o['code'], "ord_qty": str(o['qty']), "ccld_qty": "0"} for o in orders]}
+
+        if path.endswith("/inquire-present-balance"):
+            with b._lock:
+                rows = b.holdings_rows("US")
+                cash = b.cash["US"]
+            return {"rt_cd": "0", "output1": [{
+                "pdno": code, "prdt_name": code, "ccld_qty_smtl1": str(qty), "ovrs_now_pric1": f"{price:.4f}",
+                "avg_unpr3": f"{avg:.4f}", "frcr_evlu_amt2": f"{ev:.2f}", "evlu_pfls_rt1": f"{rate:.2f}"}
+                for code, qty, price, avg, ev, rate, pnl in rows],
+                "output2": [{"frcr_dncl_amt_2": f"{cash:.2f}", "frcr_buy_amt_smtl": "0", "frcr_sll_amt_smtl": "0"}]}
+
+        return {"rt_cd": "0", "msg1": "OK", "output": {}}
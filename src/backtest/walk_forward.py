@@ -0,0 +1,142 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from src.backtest.engine import simulate, INIT_BALANCE, COMMISSION
+from src.backtest.cache import make_key
+
+# =========================================================
+# 🚶 [워크포워드] 학습 구간 최적화 -> 다음 구간 검증
+# =========================================================
+# - 날짜를 [학습 train_days | 검증 test_days] 롤링 윈도우로 분할
+# - 학습 구간에서 SMART_PRO 종목별 level 최적화 (단독 시뮬레이션 수익률 기준)
+# - 검증 구간은 최적 level 포트폴리오로 평가, 검증 구간만 이어 붙인 게 OOS 성과
+# - 윈도우 단위로 프로세스 풀에서 병렬 실행 (지표 rows 는 워커당 1회만 전달)
+# - cache + digests(종목별 CSV 해시)를 주면 종목 단독 시뮬레이션 결과를 디스크 캐시에서 재사용
+
+LEVELS = (1, 2, 3, 4, 5)
+
+# 워커 프로세스 공유 데이터 (initializer 에서 1회 세팅)
+_ctx = {}
+
+
+def make_windows(n_dates, train_days, test_days, step_days=None):
+    """
+    [기능] 롤링 윈도우 인덱스 생성
+    :return: [(train_start, train_end, test_end), ...] (dates[train_start:train_end] 학습, dates[train_end:test_end] 검증)
+    """
+    step_days = step_days or test_days
+    windows = []
+    start = 0
+    while start + train_days < n_dates:
+        train_end = start + train_days
+        windows.append((start, train_end, min(train_end + test_days, n_dates)))
+        start += step_days
+    return windows
+
+
+def _simulate_single(code, rows, trial, dates, init_balance, commission, cache=None, digest=None):
+    """종목 단독 시뮬레이션 (cache 있으면 CSV 해시 + 설정 + 기간 키로 재사용)"""
+    def compute():
+        res = simulate({code: rows}, trial, dates, init_balance, commission)
+        return {'trades': res['trades'], 'return': res['return'], 'mdd': res['mdd']}
+
+    if cache is None or digest is None: return compute()
+    columns = sorted(next(iter(rows.values()), {}))   # 지표 구성이 달라도 다른 키
+    key = make_key("trial", digest, columns, trial, str(dates[0]), str(dates[-1]), len(dates), init_balance, commission)
+    return cache.get_or_compute(key, compute)
+
+
+def optimize_levels(rows_map, portfolio, dates, levels=LEVELS, init_balance=INIT_BALANCE, commission=COMMISSION,
+                    cache=None, digests=None):
+    """
+    [기능] SMART_PRO 종목별 최적 level 탐색 (종목 단독으로 level마다 시뮬레이션)
+    :param cache: ResultCache (None = 캐시 안 씀)
+    :param digests: { code: CSV 내용 해시 } (캐시 키용)
+    :return: { code: (best_level, best_return%) }
+    """
+    digests = digests or {}
+    best = {}
+    for code, config in portfolio.items():
+        if config.get('strategy') != "SMART_PRO" or code not in rows_map: continue
+        for level in levels:
+            trial = {code: dict(config, setting=dict(config.get('setting', {}), level=level))}
+            res = _simulate_single(code, rows_map[code], trial, dates, init_balance, commission, cache, digests.get(code))
+            # 수익률 우선, 같으면 MDD 작은 쪽
+            score = (res['return'], res['mdd'])
+            if code not in best or score > best[code][2]:
+                best[code] = (level, res['return'], score)
+    return {code: (level, ret) for code, (level, ret, _) in best.items()}
+
+
+def apply_levels(portfolio, chosen):
+    """최적 level 을 반영한 포트폴리오 사본"""
+    out = {}
+    for code, config in portfolio.items():
+        if code in chosen:
+            config = dict(config, setting=dict(config.get('setting', {}), level=chosen[code][0]))
+        out[code] = config
+    return out
+
+
+def _init_worker(rows_map, portfolio, dates, levels, init_balance, commission, cache=None, digests=None):
+    _ctx.update(rows_map=rows_map, portfolio=portfolio, dates=dates, levels=levels,
+                init_balance=init_balance, commission=commission, cache=cache, digests=digests)
+
+
+def _run_window(window):
+    train_start, train_end, test_end = window
+    rows_map, dates = _ctx['rows_map'], _ctx['dates']
+    init_balance, commission = _ctx['init_balance'], _ctx['commission']
+
+    chosen = optimize_levels(rows_map, _ctx['portfolio'], dates[train_start:train_end],
+                             _ctx['levels'], init_balance, commission, _ctx['cache'], _ctx['digests'])
+    tuned = apply_levels(_ctx['portfolio'], chosen)
+
+    # 검증 첫날도 전일 데이터가 필요하므로 학습 마지막 날부터 전달
+    test = simulate(rows_map, tuned, dates[train_end - 1:test_end], init_balance, commission)
+    return {
+        'train': (dates[train_start], dates[train_end - 1]),
+        'test': (dates[train_end], dates[test_end - 1]),
+        'levels': chosen,
+        'history': test['history'], 'trades': test['trades'],
+        'return': test['return'], 'mdd': test['mdd'],
+    }
+
+
+def stitch(results, init_balance=INIT_BALANCE):
+    """
+    검증 구간 자산곡선 이어 붙이기 (각 구간 수익률을 복리로 연결)
+    - 구간 종료 시 보유 포지션은 종가 평가액으로 넘어감
+    """
+    history = []
+    base = init_balance
+    for r in results:
+        scale = base / init_balance
+        history.extend({'Date': h['Date'], 'TotalAsset': h['TotalAsset'] * scale} for h in r['history'])
+        if r['history']: base = history[-1]['TotalAsset']
+    return history
+
+
+def walk_forward(rows_map, portfolio, dates, train_days, test_days, step_days=None,
+                 levels=LEVELS, init_balance=INIT_BALANCE, commission=COMMISSION, workers=None,
+                 cache=None, digests=None):
+    """
+    [기능] 워크포워드 실행
+    :param rows_map: { code: {날짜: {컬럼: 값}} } (전체 기간 지표 계산 완료)
+    :param workers: 프로세스 수 (None = CPU 수, 1 = 단일 프로세스)
+    :param cache / digests: 레벨 탐색 결과 캐시 (optimize_levels 참고)
+    :return: {'windows': [...], 'history': OOS 자산곡선}
+    """
+    windows = make_windows(len(dates), train_days, test_days, step_days)
+    if not windows: return {'windows': [], 'history': []}
+
+    workers = min(workers or os.cpu_count() or 1, len(windows))
+    initargs = (rows_map, portfolio, dates, tuple(levels), init_balance, commission, cache, digests)
+    if workers <= 1:
+        _init_worker(*initargs)
+        results = [_run_window(w) for w in windows]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+            results = list(pool.map(_run_window, windows))
+
+    return {'windows': results, 'history': stitch(results, init_balance)}
@@ -0,0 +1,154 @@
+import threading
+
+from src import clock
+
+# =========================================================
+# 🧯 [회로 차단기] 엔드포인트별 상태 추적 + 적응형 백오프
+# =========================================================
+# - 연속 실패(네트워크 예외 / HTTP 5xx / 초당 호출 초과) 가 fail_limit 에 닿으면 OPEN
+#   -> 백오프 시간 동안 호출 없이 즉시 실패 (캐시 허용 엔드포인트는 최근 정상 응답 사용)
+# - 백오프가 끝나면 HALF_OPEN: 시험 호출 1건만 통과 -> 성공 시 CLOSED, 실패 시 백오프 2배로 다시 OPEN
+# - 업무 오류 (잔고 부족, 휴장 등 rt_cd != '0') 는 서버는 정상이므로 실패로 세지 않음
+# - 주문 엔드포인트는 더 엄격: 실패 2회에 차단, 긴 백오프, 캐시 없음 (세션 자동 재시도도 조회만 적용)
+
+CLOSED, OPEN, HALF_OPEN = "CLOSED", "OPEN", "HALF_OPEN"
+CIRCUIT_OPEN = "CIRCUIT_OPEN"  # 차단 중 응답의 msg_cd
+
+# 엔드포인트 종류별 정책 (stale_ttl: 차단 중 최근 정상 응답을 대신 쓸 수 있는 시간, 0 = 사용 안 함)
+POLICIES = {
+    "order":   {"fail_limit": 2, "base_backoff": 30, "max_backoff": 600, "stale_ttl": 0},
+    "balance": {"fail_limit": 3, "base_backoff": 5,  "max_backoff": 120, "stale_ttl": 60},
+    "daily":   {"fail_limit": 3, "base_backoff": 5,  "max_backoff": 300, "stale_ttl": 6 * 3600},
+    "quote":   {"fail_limit": 3, "base_backoff": 2,  "max_backoff": 60,  "stale_ttl": 0},
+    "default": {"fail_limit": 3, "base_backoff": 5,  "max_backoff": 120, "stale_ttl": 0},
+}
+RATE_LIMIT_BACKOFF = 1  # 초당 호출 초과로 열린 경우 첫 백오프 (TPS 창이 1초)
+
+# 경로 -> 종류 (앞에서부터 먼저 맞는 것)
+ENDPOINT_KINDS = (
+    ("/trading/order", "order"),   # order-cash / order / order-rvsecncl
+    ("balance", "balance"),        # inquire-balance / inquire-balance-rlz-pl / inquire-present-balance
+    ("ccld", "balance"),           # inquire-daily-ccld (주문체결조회 - 계좌 조회라 잔고와 같은 정책)
+    ("daily", "daily"),            # inquire-daily-price / dailyprice
+    ("/quotations/", "quote"),
+)
+
+
+def endpoint_kind(path):
+    for pattern, kind in ENDPOINT_KINDS:
+        if pattern in path: return kind
+    return "default"
+
+
+class CircuitBreaker:
+    """엔드포인트 1개 (경로 단위)"""
+
+    def __init__(self, path, kind=None):
+        self.path = path
+        self.kind = kind or endpoint_kind(path)
+        self.policy = POLICIES[self.kind]
+        self.state = CLOSED
+        self.fails = 0          # 연속 실패 수
+        self.trips = 0          # 연속 차단 횟수 (백오프 배수)
+        self.open_until = 0.0
+        self.probing = False    # HALF_OPEN 시험 호출 진행 중
+        self.cache = {}         # cache_key -> (저장 시각, 정상 응답)
+        self.stats = {"calls": 0, "failures": 0, "rate_limited": 0, "rejected": 0, "opened": 0, "stale_served": 0}
+        self.last_error = ""
+        self._lock = threading.Lock()  # 일봉 병렬 조회 쓰레드 공유
+
+    def allow(self):
+        """호출해도 되는지 (False 면 이번 호출은 보내지 않음)"""
+        with self._lock:
+            if self.state == OPEN and clock.time() >= self.open_until:
+                self.state, self.probing = HALF_OPEN, False
+            if self.state == CLOSED or (self.state == HALF_OPEN and not self.probing):
+                if self.state == HALF_OPEN: self.probing = True
+                self.stats["calls"] += 1
+                return True
+            self.stats["rejected"] += 1
+            return False
+
+    def retry_in(self):
+        return max(0.0, self.open_until - clock.time())
+
+    def record_success(self):
+        with self._lock:
+            self.state, self.fails, self.trips, self.probing = CLOSED, 0, 0, False
+
+    def record_failure(self, error, rate_limited=False):
+        """:return: 이번 실패로 회로가 열렸으면 True"""
+        with self._lock:
+            self.stats["failures"] += 1
+            if rate_limited: self.stats["rate_limited"] += 1
+            self.last_error = str(error)[:120]
+            self.fails += 1
+            if self.state != HALF_OPEN and self.fails < self.policy["fail_limit"]:
+                return False
+
+            # 🔴 차단 (HALF_OPEN 시험 실패 포함) -> 백오프 2배씩
+            base = RATE_LIMIT_BACKOFF if rate_limited and self.trips == 0 else self.policy["base_backoff"]
+            backoff = min(self.policy["max_backoff"], base * 2 ** self.trips)
+            self.trips += 1
+            self.state, self.probing, self.fails = OPEN, False, 0
+            self.open_until = clock.time() + backoff
+            self.stats["opened"] += 1
+            return True
+
+    def store(self, key, response):
+        if self.policy["stale_ttl"]:
+            self.cache[key] = (clock.time(), response)
+
+    def prune(self):
+        """오래된 캐시 응답 삭제 (stale_ttl 이 지나면 다시 쓰지 않음)"""
+        now = clock.time()
+        for key in [k for k, (saved, _) in self.cache.items() if now - saved > self.policy["stale_ttl"]]:
+            self.cache.pop(key, None)
+
+    def cached(self, key):
+        """차단 중 대신 쓸 최근 정상 응답 (없거나 오래됐으면 None) -> (응답, 경과 초)"""
+        entry = self.cache.get(key)
+        if entry is None: return None
+        age = clock.time() - entry[0]
+        if age > self.policy["stale_ttl"]: return None
+        self.stats["stale_served"] += 1
+        return entry[1], age
+
+    def snapshot(self):
+        return {"kind": self.kind, "state": self.state, "fails": self.fails, "trips": self.trips,
+                "retry_in": round(self.retry_in(), 1) if self.state == OPEN else 0,
+                "last_error": self.last_error, **self.stats}
+
+
+class CircuitBreakers:
+    """트레이더별 엔드포인트 차단기 모음 (경로 -> CircuitBreaker)"""
+
+    def __init__(self):
+        self.breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        breaker = self.breakers.get(path)
+        if breaker is None:
+            with self._lock:
+                breaker = self.breakers.setdefault(path, CircuitBreaker(path))
+        return breaker
+
+    def drop_cached(self, key):
+        for breaker in self.breakers.values():
+            breaker.cache.pop(key, None)
+
+    def prune(self):
+        for breaker in list(self.breakers.values()):
+            breaker.prune()
+
+    def cached_entries(self):
+        """{경로: 캐시 dict} (메모리 보고용)"""
+        return {path: b.cache for path, b in self.breakers.items() if b.cache}
+
+    def snapshot(self):
+        """{경로: 상태/통계} (메트릭 보고용)"""
+        return {path: b.snapshot() for path, b in self.breakers.items()}
+
+    def unhealthy(self):
+        return [b for b in self.breakers.values() if b.state != CLOSED]
@@ -0,0 +1,82 @@
+import time as _time
+from datetime import datetime, timedelta
+
+import pytz
+
+# =========================================================
+# 🕰️ [시계] 트레이더/컨트롤러 공용 시간 소스
+# =========================================================
+# - 평소에는 실제 시계 (datetime.now / time.time / time.sleep 그대로)
+# - 시뮬레이션/재생 시 install(VirtualClock(...)) 으로 가상 시계로 교체
+#   -> sleep 은 가상 시간만 전진 (실제로 기다리지 않음)
+# 봇 코드의 기준 시간대는 서버 로컬 시간 = 한국시간(KST)
+
+KST = pytz.timezone('Asia/Seoul')
+
+_virtual = None
+
+
+class VirtualClock:
+    """
+    가상 시계 (KST 기준 naive datetime 으로 보관)
+    :param start: 시작 시각 (KST naive datetime)
+    :param speed: 0 = sleep 즉시 반환, 10 = sleep 시간을 1/10로 실제 대기 (재생 속도 재현용)
+    """
+
+    def __init__(self, start, speed=0):
+        self._now = start
+        self.speed = speed
+        self._views = (start, {})  # (기준 시각, {시간대: aware datetime / 'ts': timestamp}) - 시각이 바뀌면 새로 계산
+
+    def _view(self, key):
+        # 시뮬레이션은 같은 가상 시각에 now(tz)/time() 을 수십 번 호출 -> pytz 변환은 시각당 1회
+        now = self._now
+        stamp, views = self._views
+        if stamp is not now:
+            views = {}
+            self._views = (now, views)
+        value = views.get(key)
+        if value is None:
+            aware = KST.localize(now)
+            value = views[key] = aware.timestamp() if key == 'ts' else aware.astimezone(key)
+        return value
+
+    def now(self, tz=None):
+        if tz is None: return self._now
+        return self._view(tz)
+
+    def time(self):
+        return self._view('ts')
+
+    def sleep(self, seconds):
+        if seconds <= 0: return
+        if self.speed: _time.sleep(seconds / self.speed)
+        self._now += timedelta(seconds=seconds)
+
+    def advance_to(self, when):
+        """when 까지 시간 이동 (과거로는 돌아가지 않음)"""
+        if when > self._now: self._now = when
+
+
+def install(clock):
+    """가상 시계 사용 시작 (None 이면 실제 시계로 복귀)"""
+    global _virtual
+    _virtual = clock
+    return clock
+
+
+def uninstall():
+    install(None)
+
+
+def now(tz=None):
+    return _virtual.now(tz) if _virtual is not None else datetime.now(tz)
+
+
+def time():
+    return _virtual.time() if _virtual is not None else _time.time()
+
+
+def sleep(seconds):
+    if _virtual is not None: _virtual.sleep(seconds)
+    else: _time.sleep(seconds)
@@ -1,35 +1,160 @@
+import copy
 import json
 import os
+import threading
+import weakref
 
-def load_target_stocks(market_type="KR"):
+from src.logger import get_logger
+
+log = get_logger("data")
+
+# =========================================================
+# ⚙️ [설정] 타겟 파일 경로 및 스키마
+# =========================================================
+TARGET_FILES = {
+    "KR": "data/targets_kr.json",
+    "US": "data/targets_us.json",
+}
+# 멀티 계좌 모드: 추가 계좌는 'KR-이름' 키로 등록 (MainController), 검증/기본 파일은 앞쪽 시장 기준
+
+# 필수 필드 (code, 비중, 전략, 전략 세팅)
+REQUIRED_FIELDS = ("code", "target_ratio", "strategy", "setting")
+
+# 시장별 캐시 { 'KR': snapshot }
+# snapshot = { 'targets', 'target_map', 'codes', 'total_ratio', 'version', 'stamp' }
+_target_cache = {}
+_listeners = {}   # 시장 키 -> [약한 참조] (트레이더가 사라지면 자동 제외)
+_lock = threading.RLock()
+
+
+def _validate_targets(raw, market_type):
     """
-    [기능] 타겟 종목 리스트 로드
-    :param market_type: "KR" (한국) or "US" (미국)
-    :return: 타겟 리스트 (List[Dict])
+    [기능] 타겟 스키마 검증 (파일이 바뀌었을 때 1회만 실행)
+    - 필수 필드가 없거나 타입이 잘못된 항목은 경고 후 제외
+    :return: 검증된 타겟 리스트
     """
+    if not isinstance(raw, list):
+        raise ValueError("타겟 파일 최상위는 리스트여야 합니다.")
+
     targets = []
-    
-    # 1. 파일 경로 설정
-    if market_type == "KR":
-        file_path = "data/targets_kr.json"
-    else:
-        file_path = "data/targets_us.json"
-
-    # 2. 파일 읽기
-    if os.path.exists(file_path):
+    seen = set()
+    for idx, item in enumerate(raw):
+        if not isinstance(item, dict):
+            log.warning(f"⚠️ [{market_type}] {idx}번 항목이 객체가 아닙니다. (제외)")
+            continue
+
+        missing = [k for k in REQUIRED_FIELDS if k not in item]
+        if missing:
+            log.warning(f"⚠️ [{market_type}] {item.get('code', idx)} 필수 필드 누락: {missing} (제외)")
+            continue
+
+        code = str(item['code'])
+        ratio = item['target_ratio']
+        if isinstance(ratio, bool) or not isinstance(ratio, (int, float)) or ratio < 0:
+            log.warning(f"⚠️ [{market_type}] {code} target_ratio 값 오류: {ratio} (제외)")
+            continue
+        if not isinstance(item['strategy'], str) or not isinstance(item['setting'], dict):
+            log.warning(f"⚠️ [{market_type}] {code} strategy/setting 형식 오류 (제외)")
+            continue
+        if code in seen:
+            log.warning(f"⚠️ [{market_type}] {code} 중복 항목 (뒤쪽 항목 제외)")
+            continue
+
+        seen.add(code)
+        item['code'] = code
+        item['target_ratio'] = float(ratio)
+        item.setdefault('name', code)
+
+        # 미국 종목의 경우 market 태그 강제 주입
+        if market_type == "US":
+            item['market'] = 'US'
+
+        targets.append(item)
+
+    return targets
+
+
+def _build_snapshot(targets, stamp, version):
+    """파생 조회 테이블(코드→타겟, 전체 비중)을 미리 계산"""
+    target_map = {t['code']: t for t in targets}
+    return {
+        "targets": targets,
+        "target_map": target_map,
+        "codes": frozenset(target_map),
+        "total_ratio": sum(t['target_ratio'] for t in targets),
+        "version": version,
+        "stamp": stamp,
+    }
+
+
+def register_target_listener(market_type, callback):
+    """
+    [기능] 타겟 파일 변경 알림 등록
+    :param callback: callback(old_snapshot, new_snapshot) - 최초 로드 시 old_snapshot은 None
+    - 바운드 메서드는 약한 참조로 보관 -> 리스너 때문에 트레이더가 살아남지 않음 (시뮬레이션/리플레이 반복 생성)
+    """
+    ref = weakref.WeakMethod(callback) if hasattr(callback, '__self__') else (lambda: callback)
+    with _lock:
+        refs = [r for r in _listeners.get(market_type, []) if r() is not None]
+        refs.append(ref)
+        _listeners[market_type] = refs
+
+
+def get_target_snapshot(market_type="KR"):
+    """
+    [기능] 타겟 스냅샷 조회 (mtime/size가 바뀐 경우에만 다시 파싱)
+    :param market_type: "KR" / "US" 또는 추가 계좌 키 "KR-이름"
+    :return: snapshot dict (파일이 없거나 최초 로드 실패 시 빈 스냅샷)
+    """
+    market = market_type.split("-")[0]
+    file_path = TARGET_FILES.get(market_type) or TARGET_FILES.get(market, TARGET_FILES["US"])
+
+    try:
+        st = os.stat(file_path)
+        stamp = (file_path, st.st_mtime_ns, st.st_size)
+    except OSError:
+        stamp = None
+
+    with _lock:
+        cached = _target_cache.get(market_type)
+        if cached is not None and cached['stamp'] == stamp:
+            return cached
+
+        if stamp is None:
+            log.warning(f"⚠️ {file_path} 파일이 없습니다.")
+            snapshot = _build_snapshot([], None, (cached['version'] + 1) if cached else 1)
+        else:
+            try:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    targets = _validate_targets(json.load(f), market)
+            except Exception as e:
+                log.warning(f"⚠️ {market_type} 타겟 파일 로드 실패: {e}")
+                if cached is not None and cached['targets']:
+                    # 편집 중 깨진 파일이면 마지막 정상 버전 유지 (stamp 갱신으로 재파싱 방지)
+                    cached['stamp'] = stamp
+                    return cached
+                targets = []
+
+            snapshot = _build_snapshot(targets, stamp, (cached['version'] + 1) if cached else 1)
+            log.info(f"📂 [{market_type}] 타겟 {len(targets)}개 로드 완료 (v{snapshot['version']})")
+
+        _target_cache[market_type] = snapshot
+        listeners = [cb for cb in (r() for r in _listeners.get(market_type, [])) if cb is not None]
+
+    # 🔔 변경 알림 (락 밖에서 호출)
+    for callback in listeners:
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                targets = json.load(f)
-                
-                # 미국 종목의 경우 market 태그 강제 주입
-                if market_type == "US":
-                    for item in targets:
-                        item['market'] = 'US'
-                        
-                print(f"📂 [{market_type}] 타겟 {len(targets)}개 로드 완료")
+            callback(cached, snapshot)
         except Exception as e:
-            print(f"⚠️ {market_type} 타겟 파일 로드 실패: {e}")
-    else:
-        print(f"⚠️ {file_path} 파일이 없습니다.")
+            log.warning(f"⚠️ [{market_type}] 타겟 변경 알림 실패: {e}")
+
+    return snapshot
+
 
-    return targets
\ No newline at end of file
+def load_target_stocks(market_type="KR"):
+    """
+    [기능] 타겟 종목 리스트 로드 (캐시 사용)
+    :param market_type: "KR" (한국) or "US" (미국)
+    :return: 타겟 리스트 (List[Dict]) - 복사본 (고쳐도 모든 트레이더/계좌가 공유하는 캐시는 그대로)
+    """
+    return copy.deepcopy(get_target_snapshot(market_type)['targets'])
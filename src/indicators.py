@@ -0,0 +1,327 @@
+import math
+from functools import lru_cache
+
+import numpy as np
+
+from src import kernels
+
+# =========================================================
+# 📐 [지표 엔진] 라이브 트레이더 / 백테스트 공용
+# =========================================================
+# - 전략이 필요로 하는 지표만 계산 (SMART_PRO만 쓰면 MACD/EMA/SMA60 생략)
+# - 계산은 NumPy 배열 기준, 결과는 기존과 같은 컬럼명의 DataFrame
+#   (pandas 는 DataFrame 래퍼 함수 안에서만 import -> 라이브 매매 경로는 pandas 없이 시작)
+# - 수식은 기존 pandas 버전(rolling/ewm)과 동일
+# - 배열은 마지막 축이 시간 -> 1차원(종목 1개)이든 2차원(종목 x 일자)이든 같은 함수로 계산
+
+PRICE_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+# 출력 컬럼 순서 (기존 calculate_indicators 순서 유지)
+ALL_INDICATORS = (
+    "SMA5", "SMA20", "SMA60", "Noise", "NoiseMA20",
+    "EMA12", "EMA26", "MACD", "Signal", "RSI", "Range", "High5", "VolMA5",
+)
+
+# 지표 간 의존성 (MACD -> EMA12/EMA26, Signal -> MACD ...)
+_DEPENDS = {
+    "NoiseMA20": ("Noise",),
+    "MACD": ("EMA12", "EMA26"),
+    "Signal": ("MACD",),
+}
+
+# 전략별 필요 지표
+STRATEGY_INDICATORS = {
+    "SMART_PRO": ("SMA20", "NoiseMA20", "RSI", "Range", "High5"),
+    "SMART_MOMENTUM": ("SMA20", "NoiseMA20", "RSI", "Range", "High5"),
+    "VOLATILITY_BREAKOUT": ("Range",),
+    "MACD_RSI_OPTIMIZED": ("SMA60", "MACD", "Signal", "RSI"),
+    "MACD_RSI": ("MACD", "Signal", "RSI"),
+}
+DEFAULT_STRATEGY = "MACD_RSI"  # get_signal 기본 분기와 동일
+
+
+def _resolve(names):
+    """의존 지표까지 포함한 전체 계산 목록"""
+    resolved = set()
+    stack = list(names)
+    while stack:
+        name = stack.pop()
+        if name in resolved: continue
+        if name not in ALL_INDICATORS:
+            raise ValueError(f"알 수 없는 지표: {name}")
+        resolved.add(name)
+        stack.extend(_DEPENDS.get(name, ()))
+    return frozenset(resolved)
+
+
+@lru_cache(maxsize=256)
+def _required_for(strategies, extra):
+    names = set(extra)
+    for s in strategies:
+        names.update(STRATEGY_INDICATORS.get(s, STRATEGY_INDICATORS[DEFAULT_STRATEGY]))
+    return _resolve(names)
+
+
+def required_indicators(strategies, extra=()):
+    """
+    [기능] 전략 목록에 필요한 지표 집합
+    :param strategies: 전략 이름 (문자열 1개 또는 iterable)
+    :param extra: 로그/리포트용으로 추가로 필요한 지표
+    """
+    if isinstance(strategies, str) or strategies is None:
+        strategies = (strategies,)
+    return _required_for(tuple(sorted(set(strategies), key=str)), tuple(sorted(extra)))
+
+
+# =========================================================
+# 🧮 기본 연산 (NumPy)
+# =========================================================
+def rolling_mean(x, window, ws=None):
+    """pandas rolling(window).mean() 과 동일 (앞쪽 window-1개 NaN, 윈도우 내 NaN 있으면 NaN)"""
+    return kernels.window_mean(x, window, ws=ws)
+
+
+def rolling_max(x, window, ws=None):
+    """pandas rolling(window).max() 과 동일"""
+    return kernels.window_max(x, window, ws=ws)
+
+
+def ewm_mean(x, span):
+    """pandas ewm(span=span).mean() (adjust=True) 과 동일 (마지막 축 기준)"""
+    x = np.asarray(x, dtype=float)
+    n = x.shape[-1]
+    if n == 0: return np.empty(x.shape)
+    decay = 1.0 - 2.0 / (span + 1.0)
+
+    # 닫힌 형태: y_t = Σ decay^(t-j) x_j / Σ decay^(t-j)  (지수 오버플로 없는 길이에서만)
+    if n * -math.log(decay) < 600:
+        j = np.arange(n)
+        num = decay ** j * np.cumsum(x * decay ** -j, axis=-1)
+        den = (1.0 - decay ** (j + 1)) / (1.0 - decay)
+        return num / den
+
+    out = np.empty(x.shape)
+    num = np.zeros(x.shape[:-1])
+    den = 0.0
+    for i in range(n):
+        num = x[..., i] + decay * num
+        den = 1.0 + decay * den
+        out[..., i] = num / den
+    return out
+
+
+def compute_indicators(cols, required=None, ws=None):
+    """
+    [기능] 가격 배열로 지표 계산
+    :param cols: {'Open','High','Low','Close','Volume'} -> np.ndarray (과거 -> 오늘 오름차순, 2차원이면 종목 x 일자)
+    :param required: 지표 이름 집합 (None 이면 전체)
+    :param ws: kernels.Workspace (반복 호출 시 임시 버퍼 재사용)
+    :return: {지표명: np.ndarray}
+    """
+    need = _resolve(ALL_INDICATORS if required is None else required)
+    close, high, low, open_ = cols['Close'], cols['High'], cols['Low'], cols['Open']
+    out = {}
+
+    # 1. 이동평균선 (SMA)
+    if "SMA5" in need: out["SMA5"] = rolling_mean(close, 5, ws)
+    if "SMA20" in need: out["SMA20"] = rolling_mean(close, 20, ws)
+    if "SMA60" in need: out["SMA60"] = rolling_mean(close, 60, ws)
+
+    # 2. 노이즈 비율 (동적 K)
+    if "Noise" in need:
+        range_size = high - low
+        out["Noise"] = 1 - np.abs(open_ - close) / np.where(range_size == 0, 1, range_size)
+    if "NoiseMA20" in need: out["NoiseMA20"] = rolling_mean(out["Noise"], 20, ws)
+
+    # 3. MACD
+    if "EMA12" in need: out["EMA12"] = ewm_mean(close, 12)
+    if "EMA26" in need: out["EMA26"] = ewm_mean(close, 26)
+    if "MACD" in need: out["MACD"] = out["EMA12"] - out["EMA26"]
+    if "Signal" in need: out["Signal"] = ewm_mean(out["MACD"], 9)
+
+    # 4. RSI (첫날 delta는 0으로 취급 - pandas where 결과와 동일)
+    if "RSI" in need:
+        delta = np.empty(close.shape)
+        delta[..., 0] = np.nan
+        delta[..., 1:] = np.diff(close, axis=-1)
+        gain = np.where(delta > 0, delta, 0.0)
+        loss = np.where(delta < 0, -delta, 0.0)
+        loss_mean = rolling_mean(loss, 14, ws)
+        rs = rolling_mean(gain, 14, ws) / np.where(loss_mean == 0, 1, loss_mean)  # div 0 방지
+        out["RSI"] = 100 - (100 / (1 + rs))
+
+    # 5. 변동성 (전일 Range)
+    if "Range" in need:
+        rng = np.full(close.shape, np.nan)
+        rng[..., 1:] = high[..., :-1] - low[..., :-1]
+        out["Range"] = rng
+
+    # 6. 5일 최고가 (앞부분은 당일 고가)
+    if "High5" in need:
+        h5 = rolling_max(high, 5, ws)
+        out["High5"] = np.where(np.isnan(h5), high, h5)
+
+    # 7. 거래량 이평
+    if "VolMA5" in need: out["VolMA5"] = rolling_mean(cols['Volume'].astype(float), 5, ws)
+
+    return out
+
+
+# =========================================================
+# 🧱 DataFrame 래퍼
+# =========================================================
+def _attach(df, required):
+    cols = {c: df[c].to_numpy(dtype=float) for c in PRICE_COLUMNS}
+    computed = compute_indicators(cols, required)
+    for name in ALL_INDICATORS:
+        if name in computed: df[name] = computed[name]
+    return df
+
+
+def build_indicator_frame(data, required=None):
+    """
+    [라이브] API 일봉 리스트 -> 지표 포함 DataFrame (날짜 오름차순)
+    :param data: [{'Date','Open','High','Low','Close','Volume'}, ...] (정렬 무관)
+    """
+    import pandas as pd
+
+    if not data: return pd.DataFrame()
+
+    df = pd.DataFrame(data)
+
+    # 날짜 오름차순 정렬 (과거 -> 오늘)
+    if df.iloc[0]['Date'] > df.iloc[-1]['Date']:
+        df = df.iloc[::-1].reset_index(drop=True)
+    else:
+        df = df.sort_values(by="Date").reset_index(drop=True)
+
+    return _attach(df, required)
+
+
+def build_backtest_frame(df, required=None, min_rows=20, warmup=60):
+    """
+    [백테스트] Date 인덱스 DataFrame -> 지표 포함 DataFrame
+    - 지표 워밍업 구간(앞쪽 warmup-1일 + NaN)은 제거, 날짜 인덱스 유지
+    - warmup=60: 계산하는 지표와 무관하게 기존(SMA60 기준)과 같은 시작일 유지
+    """
+    import pandas as pd
+
+    if len(df) < min_rows: return pd.DataFrame()
+
+    df = _attach(df.copy(), required)
+    check = [c for c in PRICE_COLUMNS + ALL_INDICATORS if c in df.columns]
+    return df.iloc[max(warmup - 1, 0):].dropna(subset=check)
+
+
+# =========================================================
+# ⏱️ 장중 지표 (오늘 봉만 바뀌는 경우 O(1) 갱신)
+# =========================================================
+# 라이브는 매 사이클 '오늘 봉(Close/High/Low/Volume)'만 바꿔서 전체 지표를 다시 계산함
+# -> 어제까지의 합계/EMA 상태를 미리 만들어두면 오늘 값은 덧셈 몇 번으로 끝남
+# (분봉 백테스트에서 분 단위 배열로 한 번에 계산, 결과는 compute_indicators 와 동일)
+
+def _ema_state(x, span):
+    """ewm_mean 의 (분자, 분모) 상태 - y_t = num_t / den_t"""
+    decay = 1.0 - 2.0 / (span + 1.0)
+    den = (1.0 - decay ** (np.arange(len(x)) + 1)) / (1.0 - decay)
+    return ewm_mean(x, span) * den, den, decay
+
+
+def prior_state(cols, required=None):
+    """
+    [기능] 일봉 배열 -> 날짜별 '전일까지' 누적 상태 (today_indicators 입력)
+    :param cols: compute_indicators 와 동일 (과거 -> 오늘 오름차순)
+    """
+    need = _resolve(ALL_INDICATORS if required is None else required)
+    close, high, low = cols['Close'], cols['High'], cols['Low']
+    zero = np.zeros(1)
+    state = {'need': need, 'close': close, 'high': high, 'low': low}
+
+    csum = np.concatenate((zero, np.cumsum(close)))
+    state['close_csum'] = csum
+
+    if "NoiseMA20" in need:
+        range_size = high - low
+        noise = 1 - np.abs(cols['Open'] - close) / np.where(range_size == 0, 1, range_size)
+        state['noise_csum'] = np.concatenate((zero, np.cumsum(noise)))
+
+    if "RSI" in need:
+        delta = np.concatenate((zero, np.diff(close)))
+        state['gain_csum'] = np.concatenate((zero, np.cumsum(np.where(delta > 0, delta, 0.0))))
+        state['loss_csum'] = np.concatenate((zero, np.cumsum(np.where(delta < 0, -delta, 0.0))))
+
+    if "VolMA5" in need:
+        state['vol_csum'] = np.concatenate((zero, np.cumsum(cols['Volume'].astype(float))))
+
+    if need & {"EMA12", "EMA26", "MACD", "Signal"}:
+        state['ema12'] = _ema_state(close, 12)
+        state['ema26'] = _ema_state(close, 26)
+        if "Signal" in need:
+            macd = ewm_mean(close, 12) - ewm_mean(close, 26)
+            state['signal'] = _ema_state(macd, 9)
+    return state
+
+
+def _window_prior(csum, t, window):
+    """오늘(t) 포함 window 구간 중 전일까지의 합 (부족하면 None)"""
+    if t < window - 1: return None
+    return csum[t] - csum[t - window + 1]
+
+
+def _ema_today(ema, t, x):
+    num, den, decay = ema
+    if t == 0: return x + 0.0
+    return (x + decay * num[t - 1]) / (1.0 + decay * den[t - 1])
+
+
+def today_indicators(state, t, open_, high, low, close, volume):
+    """
+    [기능] t일의 장중 값(스칼라 또는 분 단위 배열)으로 t일 지표 계산
+    :param open_: 당일 시가 / high, low: 장중 누적 고가/저가 / close: 현재가 / volume: 누적 거래량
+    :return: {지표명: 값 또는 배열} - compute_indicators(...)[name][t] 와 동일
+    """
+    need = state['need']
+    close = np.asarray(close, dtype=float)
+    nan = np.full(close.shape, np.nan)
+    out = {}
+
+    for name, window in (("SMA5", 5), ("SMA20", 20), ("SMA60", 60)):
+        if name in need:
+            prior = _window_prior(state['close_csum'], t, window)
+            out[name] = nan if prior is None else (prior + close) / window
+
+    if "Noise" in need or "NoiseMA20" in need:
+        range_size = np.asarray(high - low, dtype=float)
+        noise = 1 - np.abs(open_ - close) / np.where(range_size == 0, 1, range_size)
+        if "Noise" in need: out["Noise"] = noise
+        if "NoiseMA20" in need:
+            prior = _window_prior(state['noise_csum'], t, 20)
+            out["NoiseMA20"] = nan if prior is None else (prior + noise) / 20
+
+    if need & {"EMA12", "EMA26", "MACD", "Signal"}:
+        ema12, ema26 = _ema_today(state['ema12'], t, close), _ema_today(state['ema26'], t, close)
+        if "EMA12" in need: out["EMA12"] = ema12
+        if "EMA26" in need: out["EMA26"] = ema26
+        if "MACD" in need: out["MACD"] = ema12 - ema26
+        if "Signal" in need: out["Signal"] = _ema_today(state['signal'], t, ema12 - ema26)
+
+    if "RSI" in need:
+        if t < 13:
+            out["RSI"] = nan
+        else:
+            delta = close - state['close'][t - 1] if t > 0 else np.zeros(close.shape)
+            gain = (_window_prior(state['gain_csum'], t, 14) + np.where(delta > 0, delta, 0.0)) / 14
+            loss = (_window_prior(state['loss_csum'], t, 14) + np.where(delta < 0, -delta, 0.0)) / 14
+            out["RSI"] = 100 - (100 / (1 + gain / np.where(loss == 0, 1, loss)))
+
+    if "Range" in need:
+        out["Range"] = np.full(close.shape, state['high'][t - 1] - state['low'][t - 1]) if t > 0 else nan
+
+    if "High5" in need:
+        out["High5"] = np.maximum(state['high'][t - 4:t].max(), high) if t >= 4 else high + 0.0
+
+    if "VolMA5" in need:
+        prior = _window_prior(state['vol_csum'], t, 5)
+        out["VolMA5"] = nan if prior is None else (prior + volume) / 5
+
+    return out
@@ -0,0 +1,132 @@
+import numpy as np
+
+# =========================================================
+# 🧵 [슬라이딩 윈도우 커널] 합 / 평균 / 최대 / 최소 - O(n), 버퍼 재사용
+# =========================================================
+# - 마지막 축(시간) 기준 -> 1차원(종목 1개) / 2차원(종목 x 일자) 모두 한 번에 계산
+# - 결과는 pandas rolling(window).sum/mean/max/min (min_periods=window) 과 같음
+#   (앞쪽 window-1개 NaN, 윈도우 안에 NaN 이 하나라도 있으면 NaN)
+# - 합/평균: 누적합 차분 / 최대/최소: van Herk-Gil-Werman (블록 단위 앞/뒤 누적 최대를 합침)
+#   -> 윈도우 길이와 무관하게 원소당 연산 수 고정, 종목 루프 없음
+# - out / ws 를 넘기면 임시 배열을 새로 만들지 않음 (같은 모양으로 반복 호출하는 경로용)
+
+
+class Workspace:
+    """
+    커널 임시 버퍼 보관소 (이름 + 모양 + dtype 별로 1개씩 재사용)
+    - 매 사이클 같은 크기로 지표를 다시 계산하는 라이브 루프 / 스캐너에서 생성 후 계속 전달
+    """
+
+    def __init__(self):
+        self._bufs = {}
+
+    def get(self, name, shape, dtype=float):
+        key = (name, shape, dtype)
+        buf = self._bufs.get(key)
+        if buf is None:
+            buf = self._bufs[key] = np.empty(shape, dtype=dtype)
+        return buf
+
+    def clear(self):
+        self._bufs.clear()
+
+
+def _prepare(x, window, out):
+    x = np.asarray(x, dtype=float)
+    if window < 1: raise ValueError(f"window 는 1 이상이어야 합니다: {window}")
+    if out is None: out = np.empty(x.shape)
+    elif out.shape != x.shape: raise ValueError(f"out 모양 불일치: {out.shape} != {x.shape}")
+    return x, out
+
+
+def _buffers(ws):
+    return ws if ws is not None else Workspace()
+
+
+def _mask_nan_windows(nan, window, out, ws):
+    """윈도우 안에 NaN 이 있는 위치를 NaN 으로"""
+    n = nan.shape[-1]
+    cnt = ws.get('nan_csum', nan.shape[:-1] + (n + 1,), np.int64)
+    cnt[..., 0] = 0
+    np.cumsum(nan, axis=-1, out=cnt[..., 1:])
+    bad = ws.get('nan_window', nan.shape[:-1] + (n - window + 1,), np.int64)
+    np.subtract(cnt[..., window:], cnt[..., :-window], out=bad)
+    out[..., window - 1:][bad > 0] = np.nan
+
+
+def window_sum(x, window, out=None, ws=None):
+    """rolling(window).sum() - 마지막 축 기준"""
+    x, out = _prepare(x, window, out)
+    n = x.shape[-1]
+    if n < window:
+        out[...] = np.nan
+        return out
+    out[..., :window - 1] = np.nan
+    ws = _buffers(ws)
+
+    nan = ws.get('isnan', x.shape, bool)
+    np.isnan(x, out=nan)
+    has_nan = nan.any()
+    src = x
+    if has_nan:
+        # NaN 이 누적합 전체를 오염시키지 않도록 0으로 바꿔서 더하고, NaN 낀 윈도우는 나중에 NaN 처리
+        src = ws.get('clean', x.shape)
+        np.copyto(src, x)
+        np.copyto(src, 0.0, where=nan)
+
+    csum = ws.get('csum', x.shape[:-1] + (n + 1,))
+    csum[..., 0] = 0.0
+    np.cumsum(src, axis=-1, out=csum[..., 1:])
+    np.subtract(csum[..., window:], csum[..., :-window], out=out[..., window - 1:])
+    if has_nan: _mask_nan_windows(nan, window, out, ws)
+    return out
+
+
+def window_mean(x, window, out=None, ws=None):
+    """rolling(window).mean() - 마지막 축 기준"""
+    out = window_sum(x, window, out, ws)
+    out /= window
+    return out
+
+
+def _window_extreme(x, window, out, ws, ufunc):
+    """van Herk-Gil-Werman: 길이 window 블록마다 앞->뒤 / 뒤->앞 누적 극값, 윈도우 = 뒤쪽누적[i] ⊕ 앞쪽누적[i+w-1]"""
+    x, out = _prepare(x, window, out)
+    n = x.shape[-1]
+    if n < window:
+        out[...] = np.nan
+        return out
+    out[..., :window - 1] = np.nan
+    if window == 1:
+        np.copyto(out, x)
+        return out
+    ws = _buffers(ws)
+
+    # 블록 경계를 맞추기 위해 끝을 NaN 으로 채운 (…, 블록수, window) 모양 버퍼 사용
+    blocks = -(-n // window)
+    padded = blocks * window
+    lead = x.shape[:-1]
+    fwd = ws.get('vh_fwd', lead + (padded,))
+    bwd = ws.get('vh_bwd', lead + (padded,))
+    fwd[..., :n] = x
+    fwd[..., n:] = np.nan
+    np.copyto(bwd, fwd)
+
+    f3 = fwd.reshape(lead + (blocks, window))
+    b3 = bwd.reshape(lead + (blocks, window))
+    ufunc.accumulate(f3, axis=-1, out=f3)
+    b_rev = b3[..., ::-1]
+    ufunc.accumulate(b_rev, axis=-1, out=b_rev)
+
+    ufunc(bwd[..., :n - window + 1], fwd[..., window - 1:n], out=out[..., window - 1:])
+    return out
+
+
+def window_max(x, window, out=None, ws=None):
+    """rolling(window).max() - 마지막 축 기준 (NaN 이 낀 윈도우는 NaN)"""
+    return _window_extreme(x, window, out, ws, np.maximum)
+
+
+def window_min(x, window, out=None, ws=None):
+    """rolling(window).min() - 마지막 축 기준 (NaN 이 낀 윈도우는 NaN)"""
+    return _window_extreme(x, window, out, ws, np.minimum)
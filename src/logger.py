@@ -0,0 +1,150 @@
+import os
+import sys
+import json
+import queue
+import atexit
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from config import Config
+from src import clock
+
+# =========================================================
+# 📝 [로그] 비동기 구조화 로그 (print 대체)
+# =========================================================
+# - 호출 쓰레드는 레코드를 큐에 넣기만 함 -> 파일/콘솔 쓰기는 리스너 쓰레드 (매매 루프 지연 없음)
+# - 파일: JSON Lines (ts/level/module/msg + extra 'data' 필드), 크기 기준 로테이션
+# - 콘솔: 기존 print 와 같은 메시지 한 줄 (Config.LOG_CONSOLE)
+# - 모듈별 레벨: Config.LOG_LEVELS {'kr_trader': 'INFO', 'strategy': 'WARNING', ...}
+# - 반복 메시지: extra={'rate_key': 키} 를 붙이면 같은 키는 REPEAT_WINDOW 초에 1번만 (생략 건수는 다음 로그에 표시)
+# - setup() 전에는 NullHandler 만 있음 -> 시뮬레이션/벤치마크/테스트에서는 출력 없음
+#   종목별 상세(DEBUG)는 레벨이 꺼져 있으면 isEnabledFor 비교 1번으로 끝남 (%-인자 사용, f-string 금지)
+
+ROOT = "bot"
+LOG_DIR = "data/logs"
+LOG_FILE = "bot.jsonl"
+MAX_BYTES = 10 * 1024 * 1024
+BACKUP_COUNT = 5
+REPEAT_WINDOW = 60
+MAX_REPEAT_KEYS = 1000  # 반복 억제 키 상한 (넘으면 창이 지난 키 정리)
+DEFAULT_LEVELS = {"kr_trader": "INFO", "us_trader": "INFO", "strategy": "WARNING", "auth": "INFO"}
+
+_root = logging.getLogger(ROOT)
+_root.addHandler(logging.NullHandler())
+_root.propagate = False
+_listener = None
+
+
+def get_logger(name):
+    """모듈 로거 (bot.<name>) - 레벨은 Config.LOG_LEVELS 로 조정"""
+    return logging.getLogger(f"{ROOT}.{name}")
+
+
+class RateLimitFilter(logging.Filter):
+    """extra rate_key 가 있는 레코드는 (로거, 키) 별로 window 초에 1번만 통과"""
+
+    def __init__(self, window=REPEAT_WINDOW):
+        super().__init__()
+        self.window = window
+        self.seen = {}   # (로거, 키) -> [마지막 통과 시각, 생략 건수]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        key = getattr(record, 'rate_key', None)
+        if key is None: return True
+        window = getattr(record, 'rate_window', self.window)
+        now = clock.time()
+        with self._lock:
+            entry = self.seen.get((record.name, key))
+            if entry is not None and now - entry[0] < window:
+                entry[1] += 1
+                return False
+            record.suppressed = entry[1] if entry else 0
+            self.seen[(record.name, key)] = [now, 0]
+            if len(self.seen) > MAX_REPEAT_KEYS:
+                self.seen = {k: v for k, v in self.seen.items() if now - v[0] < window}
+        return True
+
+
+class _ClockStamp(logging.Filter):
+    """봇 시계 기준 시각 (시뮬레이션이면 가상 시각) - 호출 쓰레드에서 기록"""
+
+    def filter(self, record):
+        record.ts = clock.now().isoformat(timespec="milliseconds")
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {"ts": getattr(record, 'ts', None), "level": record.levelname,
+                 "module": record.name[len(ROOT) + 1:], "msg": record.getMessage().strip()}
+        data = getattr(record, 'data', None)
+        if data: entry.update(data)
+        if getattr(record, 'suppressed', 0): entry["suppressed"] = record.suppressed
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class ConsoleFormatter(logging.Formatter):
+    def format(self, record):
+        msg = record.getMessage()
+        if getattr(record, 'suppressed', 0): msg += f" (반복 {record.suppressed}건 생략)"
+        return msg
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """쓰는 시점의 sys.stdout 사용 (redirect_stdout 과 호환)"""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def setup(log_dir=None, console=None, levels=None, log_file=None):
+    """
+    [기능] 로그 시작 (프로세스당 1회, main.py / 시뮬레이션에서 호출)
+    :param log_file: JSON Lines 파일 경로 (None 이면 log_dir/bot.jsonl)
+    :param console: 콘솔 출력 여부 (None 이면 Config.LOG_CONSOLE)
+    """
+    global _listener
+    if _listener is not None: return _listener
+
+    path = log_file or os.path.join(log_dir or getattr(Config, 'LOG_DIR', LOG_DIR), LOG_FILE)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    file_handler = RotatingFileHandler(path, maxBytes=getattr(Config, 'LOG_MAX_BYTES', MAX_BYTES),
+                                       backupCount=getattr(Config, 'LOG_BACKUP_COUNT', BACKUP_COUNT), encoding="utf-8")
+    file_handler.setFormatter(JsonFormatter())
+    handlers = [file_handler]
+    if console if console is not None else getattr(Config, 'LOG_CONSOLE', True):
+        console_handler = _StdoutHandler()
+        console_handler.setFormatter(ConsoleFormatter())
+        handlers.append(console_handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(getattr(Config, 'LOG_REPEAT_WINDOW', REPEAT_WINDOW)))
+    queue_handler.addFilter(_ClockStamp())
+
+    _root.handlers = [queue_handler]
+    _root.setLevel(getattr(Config, 'LOG_LEVEL', "INFO"))
+    for name, level in {**DEFAULT_LEVELS, **(levels or getattr(Config, 'LOG_LEVELS', {}))}.items():
+        get_logger(name).setLevel(level)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown)
+    return _listener
+
+
+def shutdown():
+    """남은 로그를 모두 쓰고 종료 (이후에는 다시 출력 없음)"""
+    global _listener
+    if _listener is None: return
+    _listener.stop()
+    for handler in _listener.handlers: handler.close()
+    _listener = None
+    _root.handlers = [logging.NullHandler()]
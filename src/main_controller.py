@@ -1,17 +1,64 @@
-import time
+import os
 import traceback
-from datetime import datetime
+from datetime import timedelta
 import pytz
 from config import Config
 from src.auth import AuthManager
+from src import data_manager
+from src.market_data import MarketDataHub
 from src.traders.kr_trader import KoreaTrader
 from src.traders.us_trader import USTrader
 from src.telegram_bot import send_telegram_msg
+from src import clock, memory_monitor
+from src.logger import get_logger
+
+log = get_logger("controller")
+
+TRADER_CLASSES = {"KR": KoreaTrader, "US": USTrader}
+
+
+def account_auth(account):
+    """
+    추가 계좌 설정 -> AuthManager
+    - 'auth' 가 있으면 그대로 사용 (시뮬레이션 / 테스트 주입)
+    - 없으면 .env 의 {env}_APP_KEY / {env}_APP_SECRET / {env}_ACCOUNT_NO / {env}_BASE_URL (URL 은 없으면 기본 계좌)
+    """
+    if account.get('auth') is not None: return account['auth']
+    env = account.get('env', f"KI_{account['name']}")
+    base = Config.KR_URL_BASE if account['market'] == "KR" else Config.US_URL_BASE
+    return AuthManager(
+        app_key=os.getenv(f"{env}_APP_KEY"),
+        app_secret=os.getenv(f"{env}_APP_SECRET"),
+        url_base=os.getenv(f"{env}_BASE_URL", base),
+        account_no=os.getenv(f"{env}_ACCOUNT_NO"),
+        mode=account.get('mode', "REAL"),
+        name=account['name'],
+    )
+
 
 class MainController:
-    def __init__(self):
+    # 장 시작 전 워밍업 구간 (토큰/휴장/일봉/지표 미리 준비 -> 장 시작 첫 사이클은 시세 + 신호만)
+    WARMUP = {
+        "KR": {"start": 850, "open": 900},
+        "US": {"start": 2320, "open": 2330},
+    }
+    # 정기 보고 (이름, 시장, 리포트 메서드, 설명, 시작 HHMM, 끝 HHMM(미포함), 토요일 포함) - 평일 1일 1회
+    REPORTS = (
+        ("KR Morning", "KR", "report_targets", "목표 포트폴리오", 830, 900, False),   # 장 시작 전 목표 보고
+        ("KR Closing", "KR", "report_balance", "마감 결산", 1545, 1600, False),      # 장 마감 후 결산 보고
+        ("US Morning", "US", "report_targets", "목표 포트폴리오", 2300, 2330, False),
+        ("US Closing", "US", "report_balance", "마감 결산", 605, 700, True),         # 미국장 마감 = 한국 토요일 아침 포함
+    )
+    US_HOLIDAY_RESET = (1300, 1305)  # 미국장 휴장 플래그 해제 구간
+    WAKEUP_HORIZON = 8 * 24 * 60  # next_wakeup 탐색 한도 (분)
+
+    def __init__(self, kr_auth=None, us_auth=None, accounts=None):
+        """
+        kr_auth / us_auth: 시뮬레이션 등에서 인증 관리자를 주입할 때 사용 (기본은 Config 기반 AuthManager)
+        accounts: 추가 계좌 설정 리스트 (None 이면 Config.ACCOUNTS) - 멀티 계좌 모드
+        """
         # 1. 한국장 인증 (모의투자)
-        self.kr_auth = AuthManager(
+        self.kr_auth = kr_auth or AuthManager(
             app_key=Config.KR_APP_KEY,
             app_secret=Config.KR_APP_SECRET,
             url_base=Config.KR_URL_BASE,
@@ -20,7 +67,7 @@ class MainController:
         )
         
         # 2. 미국장 인증 (실전투자)
-        self.us_auth = AuthManager(
+        self.us_auth = us_auth or AuthManager(
             app_key=Config.US_APP_KEY,
             app_secret=Config.US_APP_SECRET,
             url_base=Config.US_URL_BASE,
@@ -31,12 +78,20 @@ class MainController:
         # 3. 트레이더 생성
         self.kr_trader = KoreaTrader(self.kr_auth)
         self.us_trader = USTrader(self.us_auth)
+
+        # 4. 추가 계좌 (시장별 기본 계좌 뒤에 차례로 실행)
+        #    -> 계좌가 2개 이상인 시장은 공유 시세 계층 1개가 현재가/일봉을 종목당 1회만 조회
+        self.traders = {"KR": [self.kr_trader], "US": [self.us_trader]}
+        for account in (accounts if accounts is not None else getattr(Config, 'ACCOUNTS', [])):
+            self.add_account(account)
+        self.market_data = {}
+        for market, traders in self.traders.items():
+            if len(traders) < 2: continue
+            hub = self.market_data[market] = MarketDataHub(traders[0])
+            for trader in traders: trader.market_data = hub
         
-        # 보고서 플래그
-        self.last_kr_morning_report = None
-        self.last_kr_close_report = None
-        self.last_us_morning_report = None
-        self.last_us_close_report = None
+        # 보고서 플래그 (보고 이름 -> 마지막 전송 날짜)
+        self.last_report = {}
 
         # ✅ [추가] 휴장일 감지 플래그 (True면 오늘 하루 봇 정지)
         self.is_kr_holiday = False
@@ -45,9 +100,54 @@ class MainController:
         # 날짜 변경 감지용
         self.last_date = ""
 
-    def get_market_status(self):
-        
-        now = datetime.now(pytz.timezone('Asia/Seoul'))
+        # 워밍업을 마친 날짜 (시장별 1일 1회)
+        self.last_warmup = {"KR": None, "US": None}
+
+        # 3시간 정기 보고 타이머
+        self.last_kr_msg_time = 0
+        self.last_us_msg_time = 0
+
+    def add_account(self, account):
+        """
+        추가 계좌 트레이더 생성
+        :param account: {'name', 'market': 'KR'/'US', 'env' 또는 'auth', 'mode', 'targets': 타겟 파일 경로}
+        """
+        market = account['market']
+        trader = TRADER_CLASSES[market](account_auth(account), account=account['name'])
+        if account.get('targets'):
+            data_manager.TARGET_FILES[trader.label] = account['targets']
+        self.traders[market].append(trader)
+        log.info(f"👥 [{trader.label}] 추가 계좌 등록 (타겟: {data_manager.TARGET_FILES.get(trader.label, '기본 계좌와 공유')})")
+        return trader
+
+    def run_market(self, market):
+        """
+        시장 1사이클 - 계좌별 트레이더 차례로 실행 (현재가는 공유 시세 계층이 사이클당 1회 조회)
+        - 기본 계좌 결과(HOLIDAY 등)를 컨트롤러에 보고, 추가 계좌 에러는 기록 후 다음 계좌 진행
+        """
+        hub = self.market_data.get(market)
+        if hub is not None: hub.begin_cycle()
+        traders = self.traders[market]
+        result = traders[0].run()
+        for trader in traders[1:]:
+            try:
+                trader.run()
+            except Exception:
+                err_msg = traceback.format_exc()
+                log.error(f"🚨 [{trader.label}] 계좌 사이클 에러\n{err_msg}")
+                send_telegram_msg(f"🚨 [{trader.label}] 계좌 사이클 에러\n{err_msg[:200]}")
+        return result
+
+    def report_all(self, market, method):
+        """계좌별 리포트 텔레그램 전송 (report_targets / report_balance)"""
+        for trader in self.traders[market]:
+            msg = getattr(trader, method)()
+            if trader.account and msg: msg = f"👥 [{trader.label}]\n{msg}"
+            send_telegram_msg(msg)
+
+    def get_market_status(self, now=None):
+        """now: 판정할 시각 (None = 현재, next_wakeup 이 미래 시각을 미리 판정할 때 사용)"""
+        if now is None: now = clock.now(pytz.timezone('Asia/Seoul'))
         hm = int(now.strftime("%H%M"))
         if now.weekday() >= 5: # 토, 
             # 단, 토요일 새벽은 미국장이 열려있을 수 있으므로 아래 로직으로 넘어감
@@ -56,6 +156,12 @@ class MainController:
             else:
                 return "IDLE"
         
+        # 🌅 장 시작 전 워밍업 (평일)
+        if now.weekday() < 5:
+            for market, w in self.WARMUP.items():
+                if w["start"] <= hm < w["open"]:
+                    return f"{market}_WARMUP"
+
         if 900 <= hm <= 1530:
             #return "IDLE"
             return "KR_ACTIVE"
@@ -67,154 +173,196 @@ class MainController:
 
         #return "KR_ACTIVE"
 
-    def run(self):
-        print("🚀 [System] 하이브리드 트레이딩 봇 가동 (KR:Real / US:Real)")
-        send_telegram_msg("🤖 하이브리드 봇 실행 (KR:실전 / US:실전)")
+    def step(self):
+        """메인 루프 1회 (시간 확인 -> 리포트 -> 매매 -> 대기). 시뮬레이션은 이 함수를 가상 시계로 반복 호출"""
+        memory_monitor.poll()   # SIGUSR1 메모리 보고 요청 처리 (시그널 핸들러 밖에서)
+
+        now = clock.now(pytz.timezone('Asia/Seoul'))
+        today_str = now.strftime("%Y-%m-%d")
+        hm = int(now.strftime("%H%M"))
+        weekday = now.weekday() # 0:월 ~ 6:일
+
+        # 평일 확인 (월~금)
+        is_weekday = weekday < 5
 
-        last_kr_msg_time = 0
-        last_us_msg_time = 0
+        # 1. 날짜가 바뀌면 (00:00) -> 한국장 플래그 리셋
+        if today_str != self.last_date:
+            if self.is_kr_holiday:
+                log.info(f"📅 [System] 날짜 변경! KR 휴장 플래그 해제")
+                self.is_kr_holiday = False
+            self.last_date = today_str
+
+        # 2. 오후 1시 (13:00) -> 미국장 플래그 리셋 (핵심 ⭐)
+        # (새벽에 휴장 감지된 것이 오늘 밤 매매를 막지 않도록 오후에 풀어줌)
+        if self.US_HOLIDAY_RESET[0] <= hm < self.US_HOLIDAY_RESET[1] and self.is_us_holiday:
+            log.info(f"📅 [System] 오후 1시 경과 -> US 휴장 플래그 해제 (오늘 밤장 준비)")
+            self.is_us_holiday = False
+            send_telegram_msg("🇺🇸 [System] 미국장 휴장 모드 해제 (오늘 밤 매매 준비)")
         
-        while True:
-            try:
-                now = datetime.now(pytz.timezone('Asia/Seoul'))
-                today_str = now.strftime("%Y-%m-%d")
-                hm = int(now.strftime("%H%M"))
-                weekday = now.weekday() # 0:월 ~ 6:일
-
-                # 평일 확인 (월~금)
-                is_weekday = weekday < 5
-
-                # 1. 날짜가 바뀌면 (00:00) -> 한국장 플래그 리셋
-                if today_str != self.last_date:
-                    if self.is_kr_holiday:
-                        print(f"📅 [System] 날짜 변경! KR 휴장 플래그 해제")
-                        self.is_kr_holiday = False
-                    self.last_date = today_str
-
-                # 2. 오후 1시 (13:00) -> 미국장 플래그 리셋 (핵심 ⭐)
-                # (새벽에 휴장 감지된 것이 오늘 밤 매매를 막지 않도록 오후에 풀어줌)
-                if 1300 <= hm < 1305 and self.is_us_holiday:
-                    print(f"📅 [System] 오후 1시 경과 -> US 휴장 플래그 해제 (오늘 밤장 준비)")
-                    self.is_us_holiday = False
-                    send_telegram_msg("🇺🇸 [System] 미국장 휴장 모드 해제 (오늘 밤 매매 준비)")
-                
-                # ==========================================
-                # 🌅 [한국장] 장 시작 전 목표 보고 (08:30 ~ 08:59)
-                # ==========================================
-                if is_weekday and 830 <= hm < 900:
-                    if self.last_kr_morning_report != today_str:
-                        print("📨 [KR Morning] 목표 포트폴리오 리포트 전송 중...")
-                        msg = self.kr_trader.report_targets()
-                        send_telegram_msg(msg)
-                        self.last_kr_morning_report = today_str
-                        print("📨 [Done] 전송 완료")
-
-                # ==========================================
-                # 🌙 [한국장] 장 마감 후 결산 보고 (15:35 ~ 16:00)
-                # ==========================================
-                if is_weekday and 1545 <= hm < 1600:
-                    if self.last_kr_close_report != today_str:
-                        print("📨 [KR Closing] 마감 결산 리포트 전송 중...")
-                        msg = self.kr_trader.report_balance()
-                        send_telegram_msg(msg)
-                        self.last_kr_close_report = today_str
-                        print("📨 [Done] 전송 완료")
-
-                # =========================================================
-                # 🇺🇸 [미국장] 리포트링 장 시작 전 목표 보고 (23:00 ~ 23:29)
-                # =========================================================
-                if is_weekday and 2300 <= hm < 2330:
-                    if self.last_us_morning_report != today_str:
-                        print("📨 [US Morning] 목표 포트폴리오 리포트 전송 중...")
-                        msg = self.us_trader.report_targets()
-                        send_telegram_msg(msg)
-                        self.last_us_morning_report = today_str
-                        print("📨 [Done] 전송 완료")
-
-                # =========================================================
-                # 🇺🇸 [미국장] 리포트링 장 마감 후 결산 보고 (06:05 ~ 07:30)
-                # =========================================================
-                if (is_weekday or weekday == 5) and 605 <= hm < 700:
-                    if self.last_us_close_report != today_str:
-                        print("📨 [US Closing] 마감 결산 리포트 전송 중...")
-                        msg = self.us_trader.report_balance()
-                        send_telegram_msg(msg)
-                        self.last_us_close_report = today_str
-                        print("📨 [Done] 전송 완료")
-                    
-                # ==========================================
-                # 🚦 메인 매매 루프
-                # ==========================================
-                
-                status = self.get_market_status()
+        # ==========================================
+        # 📨 정기 보고 (한국장 08:30 목표 / 15:45 결산, 미국장 23:00 목표 / 06:05 결산)
+        # ==========================================
+        for name, market, method, title, start, end, saturday in self.REPORTS:
+            if not (is_weekday or (saturday and weekday == 5)) or not start <= hm < end: continue
+            if self.last_report.get(name) == today_str: continue
+            log.info(f"📨 [{name}] {title} 리포트 전송 중...")
+            self.report_all(market, method)
+            self.last_report[name] = today_str
+            log.info("📨 [Done] 전송 완료")
+            
+        # ==========================================
+        # 🚦 메인 매매 루프
+        # ==========================================
+        
+        status = self.get_market_status()
+        
+        if status == "KR_ACTIVE":
+            # ✅ [핵심] 휴장일이 아닐 때만 run() 실행
+            if not self.is_kr_holiday:
+                result = self.run_market("KR")
+
+                # 🚨 휴장일 보고를 받으면 플래그 세우기
+                if result == "HOLIDAY":
+                    log.info(f"⛔ [Circuit Breaker] 한국장 휴장일 감지 -> 오늘 KR 트레이딩 종료")
+                    self.is_kr_holiday = True
+                    send_telegram_msg("⛔ [한국장] 휴장일 감지! 오늘 매매를 종료합니다.")
                 
-                if status == "KR_ACTIVE":
-                    # ✅ [핵심] 휴장일이 아닐 때만 run() 실행
-                    if not self.is_kr_holiday:
-                        result = self.kr_trader.run()
-
-                        # 🚨 휴장일 보고를 받으면 플래그 세우기
-                        if result == "HOLIDAY":
-                            print(f"⛔ [Circuit Breaker] 한국장 휴장일 감지 -> 오늘 KR 트레이딩 종료")
-                            self.is_kr_holiday = True
-                            send_telegram_msg("⛔ [한국장] 휴장일 감지! 오늘 매매를 종료합니다.")
-                        
-                        time.sleep(2) # 정상 대기
-                    else:
-                        # 휴장일이면 그냥 대기 (API 호출 안 함)
-                        print(f"\r⛔ [KR] 휴장일 대기 중... ({now.strftime('%H:%M:%S')})", end='')
-                        time.sleep(60)
-
-                    if time.time() - last_kr_msg_time >= 10800:
-                        print(f"⏰ [알림] 3시간 정기 포트폴리오 보고 전송 중... ({now.strftime('%H:%M:%S')})")
-                        self.kr_trader.report_portfolio_status()
-                        last_kr_msg_time = time.time() # 타이머 리셋
-                    
-                    if not self.is_kr_holiday:
-                        print(f"\r [KR] 모니터링 중... ({now.strftime('%H:%M:%S')})", end='')
-                        time.sleep(3)
-                        
-                    else:
-                        time.sleep(60) # 휴장일엔 1분 대기
+                clock.sleep(2) # 정상 대기
+            else:
+                # 휴장일이면 그냥 대기 (API 호출 안 함)
+                log.info(f"⛔ [KR] 휴장일 대기 중... ({now.strftime('%H:%M:%S')})", extra={'rate_key': "kr_holiday_wait"})
+                clock.sleep(60)
+
+            if clock.time() - self.last_kr_msg_time >= 10800:
+                log.info(f"⏰ [알림] 3시간 정기 포트폴리오 보고 전송 중... ({now.strftime('%H:%M:%S')})")
+                for trader in self.traders["KR"]: trader.report_portfolio_status()
+                self.last_kr_msg_time = clock.time() # 타이머 리셋
+            
+            if not self.is_kr_holiday:
+                log.info(f"🇰🇷 [KR] 모니터링 중... ({now.strftime('%H:%M:%S')})", extra={'rate_key': "kr_monitor"})
+                clock.sleep(3)
                 
-                elif status == "US_ACTIVE":
-                    if not self.is_us_holiday:
-                        result = self.us_trader.run()
-
-                        if result == "HOLIDAY":
-                            print(f"⛔ [Circuit Breaker] 미국장 휴장일 감지 -> 오늘 US 트레이딩 종료")
-                            self.is_us_holiday = True
-                            send_telegram_msg("⛔ [미국장] 휴장일 감지! 오늘 매매를 종료합니다.")
-
-                        time.sleep(1)
-                    else:
-                        print(f"\r⛔ [US] 휴장일 대기 중... ({now.strftime('%H:%M:%S')})", end='')
-                        time.sleep(60)
-
-                    # 미국장 생존신고 로직 추가 (미국 타이머 last_us_msg_time 사용)
-                    if time.time() - last_us_msg_time >= 10800:
-                        print(f"⏰ [알림] 3시간 정기 포트폴리오 보고 전송 중... ({now.strftime('%H:%M:%S')})")
-                        self.us_trader.report_portfolio_status()            
-                        last_us_msg_time = time.time() # 미국 타이머 리셋
-                    
-                    # 대기 시간
-                    if not self.is_us_holiday:
-                        print(f"\r🇺🇸 [US] 모니터링 중... ({now.strftime('%H:%M:%S')})", end='')
-                        time.sleep(1)
-                    else:
-                        time.sleep(60) # 휴장일엔 1분 대기
-
-                # 💤 [휴장 시간]
-                else:
-                    print(f"\r💤 [대기] {now.strftime('%H:%M:%S')} (한국시장, 미국시장 대기 중...)", end='')
-                    time.sleep(60)
+            else:
+                clock.sleep(60) # 휴장일엔 1분 대기
+        
+        elif status == "US_ACTIVE":
+            if not self.is_us_holiday:
+                result = self.run_market("US")
+
+                if result == "HOLIDAY":
+                    log.info(f"⛔ [Circuit Breaker] 미국장 휴장일 감지 -> 오늘 US 트레이딩 종료")
+                    self.is_us_holiday = True
+                    send_telegram_msg("⛔ [미국장] 휴장일 감지! 오늘 매매를 종료합니다.")
+
+                clock.sleep(1)
+            else:
+                log.info(f"⛔ [US] 휴장일 대기 중... ({now.strftime('%H:%M:%S')})", extra={'rate_key': "us_holiday_wait"})
+                clock.sleep(60)
+
+            # 미국장 생존신고 로직 추가 (미국 타이머 self.last_us_msg_time 사용)
+            if clock.time() - self.last_us_msg_time >= 10800:
+                log.info(f"⏰ [알림] 3시간 정기 포트폴리오 보고 전송 중... ({now.strftime('%H:%M:%S')})")
+                for trader in self.traders["US"]: trader.report_portfolio_status()
+                self.last_us_msg_time = clock.time() # 미국 타이머 리셋
+            
+            # 대기 시간
+            if not self.is_us_holiday:
+                log.info(f"🇺🇸 [US] 모니터링 중... ({now.strftime('%H:%M:%S')})", extra={'rate_key': "us_monitor"})
+                clock.sleep(1)
+            else:
+                clock.sleep(60) # 휴장일엔 1분 대기
+
+        # 🌅 [장 시작 전] 워밍업 1회 -> 장 시작까지 연결 유지
+        elif status in ("KR_WARMUP", "US_WARMUP"):
+            self.warmup_step(status[:2], now, today_str)
+
+        # 💤 [휴장 시간]
+        else:
+            log.info(f"💤 [대기] {now.strftime('%H:%M:%S')} (한국시장, 미국시장 대기 중...)", extra={'rate_key': "idle"})
+            clock.sleep(60)
+
+    def has_work(self, when, today):
+        """
+        when 시각에 step() 이 대기 외에 할 일이 있는지 (장중 / 워밍업 / 미전송 보고 / 휴장 플래그 해제)
+        :param today: 현재 날짜 - KR 휴장 플래그는 오늘만 유효 (자정에 해제)
+        """
+        hm, weekday = when.hour * 100 + when.minute, when.weekday()
+        status = self.get_market_status(when)
+        if status in ("KR_ACTIVE", "KR_WARMUP"):
+            if not (self.is_kr_holiday and when.date() == today): return True
+        elif status in ("US_ACTIVE", "US_WARMUP"):
+            if not self.is_us_holiday: return True
+
+        day = when.strftime("%Y-%m-%d")
+        for name, _, _, _, start, end, saturday in self.REPORTS:
+            if (weekday < 5 or (saturday and weekday == 5)) and start <= hm < end and self.last_report.get(name) != day:
+                return True
+        return self.is_us_holiday and self.US_HOLIDAY_RESET[0] <= hm < self.US_HOLIDAY_RESET[1]
 
+    def next_wakeup(self):
+        """
+        [시뮬레이션] 다음으로 할 일이 생기는 시각 (KST naive, 분 단위) - 지금 할 일이 있으면 None
+        - 가상 시계가 빈 시간(야간/주말/휴장)을 60초씩 걷지 않고 바로 건너뛰는 데 사용
+        - 휴장 중 미국장 플래그는 13:00 해제 구간이 할 일로 잡혀 그 시각에 깨어남
+        """
+        now = clock.now(pytz.timezone('Asia/Seoul'))
+        if self.has_work(now, now.date()): return None
+        when = now.replace(second=0, microsecond=0)
+        for _ in range(self.WAKEUP_HORIZON):
+            when += timedelta(minutes=1)
+            if self.has_work(when, now.date()): return when.replace(tzinfo=None)
+        return when.replace(tzinfo=None)
+
+    def warmup_step(self, market, now, today_str):
+        trader = self.kr_trader if market == "KR" else self.us_trader
+        is_holiday = self.is_kr_holiday if market == "KR" else self.is_us_holiday
+
+        if not is_holiday and self.last_warmup[market] != today_str:
+            log.info(f"\n🌅 [{market} Warmup] 장 시작 전 준비 중... ({now.strftime('%H:%M:%S')})")
+            self.last_warmup[market] = today_str
+            if trader.warmup() == "HOLIDAY":
+                if market == "KR": self.is_kr_holiday = True
+                else: self.is_us_holiday = True
+                send_telegram_msg(f"⛔ [{market}] 휴장일 확인 (장 전 워밍업) -> 오늘 매매를 쉽니다.")
+            else:
+                self.warmup_accounts(market)
+        elif not is_holiday:
+            for t in self.traders[market]: t.keep_warm()
+            log.info(f"🌅 [{market}] 장 시작 대기 중 (워밍업 완료)... ({now.strftime('%H:%M:%S')})", extra={'rate_key': f"{market}_warmup_wait"})
+
+        # 장 시작 시각을 넘기지 않도록 대기 (기존 60초 대기 시 최대 1분 늦게 첫 사이클 시작)
+        open_hm = self.WARMUP[market]["open"]
+        now = clock.now(pytz.timezone('Asia/Seoul'))
+        until_open = (open_hm // 100 * 3600 + open_hm % 100 * 60) - (now.hour * 3600 + now.minute * 60 + now.second)
+        clock.sleep(max(1, min(trader.KEEPALIVE_INTERVAL, until_open)))
+
+    def warmup_accounts(self, market):
+        """추가 계좌 워밍업 (일봉은 기본 계좌가 조회한 공유 캐시 사용) + 공유 캐시에서 어느 계좌 타겟에도 없는 종목 제거"""
+        hub = self.market_data.get(market)
+        if hub is None: return
+        for trader in self.traders[market][1:]:
+            try:
+                trader.warmup()
+            except Exception as e:
+                log.error(f"🚨 [{trader.label} Warmup] 실패: {e}")
+        codes = set()
+        for trader in self.traders[market]:
+            codes |= data_manager.get_target_snapshot(trader.label)['codes']
+        hub.prune(codes)
+
+    def run(self):
+        log.info("🚀 [System] 하이브리드 트레이딩 봇 가동 (KR:Real / US:Real)")
+        send_telegram_msg("🤖 하이브리드 봇 실행 (KR:실전 / US:실전)")
+
+        while True:
+            try:
+                self.step()
             except KeyboardInterrupt:
-                print("\n🛑 프로그램 종료")
+                log.info("\n🛑 프로그램 종료")
                 send_telegram_msg("🛑 봇이 사용자에 의해 종료되었습니다.")
                 break
             except Exception as e:
                 err_msg = traceback.format_exc()
-                print(f"\n🚨 [Error] {err_msg}")
+                log.error(f"\n🚨 [Error] {err_msg}")
                 send_telegram_msg(f"🚨 [치명적 에러] 봇이 멈췄습니다!\n{err_msg[:200]}") 
-                time.sleep(60)
\ No newline at end of file
+                clock.sleep(60)
\ No newline at end of file
@@ -0,0 +1,64 @@
+import threading
+
+from src.memory_monitor import monitor as memory_monitor
+
+# =========================================================
+# 🛰️ [공유 시세 계층] 멀티 계좌 모드 - 종목당 1회 조회 후 계좌별 트레이더에 배포
+# =========================================================
+# - 시장별 1개: 기본 계좌 트레이더(source)의 세션/토큰/회로 차단기로 조회
+# - 현재가: 사이클 단위 공유 (컨트롤러가 사이클 시작마다 begin_cycle -> 계좌들이 차례로 같은 값 사용)
+# - 일봉: 시장 현지 날짜 단위 공유 (워밍업에서 기본 계좌가 조회 -> 나머지 계좌는 캐시 사용)
+# - 잔고 / 주문 / 타겟 / 지표 상태는 계좌별 (트레이더 인스턴스가 각자 보유)
+# -> 시세 요청 수 = 고유 종목 수 (계좌 수 x 종목 수 아님)
+
+
+class MarketDataHub:
+    def __init__(self, source):
+        """:param source: 실제 조회에 쓸 트레이더 (fetch_quote / fetch_daily / market_today)"""
+        self.source = source
+        self.quotes = {}   # code -> 현재가 dict (실패면 None, 이번 사이클 안에서는 재조회 안 함)
+        self.daily = {}    # code -> (시장 현지 날짜, 일봉 컬럼)
+        self.cycle = 0
+        self.stats = {"quote_requests": 0, "quote_shared": 0, "daily_requests": 0, "daily_shared": 0}
+        self._lock = threading.Lock()
+        memory_monitor.register(f"{source.label}.market_data", self)
+
+    def begin_cycle(self):
+        """새 사이클 -> 현재가 다시 조회"""
+        self.cycle += 1
+        self.quotes.clear()
+
+    def quote(self, target):
+        code = target['code']
+        with self._lock:
+            if code in self.quotes:
+                self.stats["quote_shared"] += 1
+                return self.quotes[code]
+        quote = self.source.fetch_quote(target)
+        with self._lock:
+            self.stats["quote_requests"] += 1
+            self.quotes[code] = quote
+        return quote
+
+    def daily_data(self, target):
+        """일봉 (오늘 이미 조회한 종목은 캐시, 실패한 조회는 저장하지 않음)"""
+        code, today = target['code'], self.source.market_today()
+        with self._lock:
+            cached = self.daily.get(code)
+            if cached is not None and cached[0] == today:
+                self.stats["daily_shared"] += 1
+                return cached[1]
+        data = self.source.fetch_daily(target)
+        with self._lock:
+            self.stats["daily_requests"] += 1
+            if data: self.daily[code] = (today, data)
+        return data
+
+    def prune(self, codes):
+        """어느 계좌 타겟에도 없는 종목 일봉 제거"""
+        with self._lock:
+            for code in [c for c in self.daily if c not in codes]:
+                del self.daily[code]
+
+    def memory_caches(self):
+        return {"quotes": self.quotes, "daily": self.daily}
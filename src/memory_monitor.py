@@ -0,0 +1,185 @@
+import os
+import sys
+import signal
+import weakref
+import threading
+import tracemalloc
+from collections import deque
+
+import numpy as np
+
+from config import Config
+from src.logger import get_logger
+from src.telegram_bot import register_command, send_telegram_msg
+
+try:
+    import psutil   # 선택 설치 (없으면 /proc 또는 resource)
+except ImportError:
+    psutil = None
+
+log = get_logger("memory")
+
+# =========================================================
+# 🧠 [메모리] 장기 실행 캐시 크기 + RSS + tracemalloc 텔레메트리
+# =========================================================
+# - 트레이더 등 캐시 보유 객체를 약한 참조로 등록 -> 보고 시점에만 크기 계산 (평소 비용 없음)
+#   보유 객체는 memory_caches() -> {캐시 이름: 컨테이너} 를 제공
+# - RSS: psutil -> /proc/self/statm -> resource (최대 RSS) 순으로 사용 가능한 것
+# - tracemalloc: 요청 시 시작, 이후 보고마다 직전 스냅샷 대비 증가 상위 위치 (시작 전에는 생략)
+# - 보고 요청: SIGUSR1 시그널 또는 텔레그램 /mem 명령 (main.py 에서 install)
+
+MAX_DEPTH = 4         # 크기 추정 시 컨테이너 재귀 깊이
+TOP_ALLOCATIONS = 10  # 보고서에 표시할 tracemalloc 상위 위치 수
+TRACE_FRAMES = 1      # tracemalloc 호출 스택 깊이 (깊을수록 오버헤드 큼)
+COMMAND = "/mem"
+
+
+def rss_bytes():
+    """현재 RSS (바이트, 알 수 없으면 None)"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss   # 현재값이 없으면 최대 RSS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def deep_size(obj, depth=0):
+    """컨테이너 포함 대략적인 바이트 (NumPy 배열은 nbytes, 공유 객체는 중복 집계)"""
+    if isinstance(obj, np.ndarray): return obj.nbytes
+    size = sys.getsizeof(obj)
+    if depth >= MAX_DEPTH: return size
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, depth + 1) + deep_size(v, depth + 1) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(deep_size(v, depth + 1) for v in obj)
+    return size
+
+
+def _mb(n):
+    return "?" if n is None else f"{n / 1024 / 1024:,.1f}MB"
+
+
+class MemoryMonitor:
+    def __init__(self):
+        self.owners = weakref.WeakValueDictionary()  # 라벨 -> 캐시 보유 객체 (사라지면 자동 제외)
+        self.last_snapshot = None
+        self._lock = threading.Lock()
+
+    def register(self, label, owner):
+        """owner.memory_caches() 를 보고 대상에 추가 (같은 라벨은 최신 객체로 교체)"""
+        self.owners[label] = owner
+
+    def cache_sizes(self):
+        """{'라벨.캐시': (항목 수, 대략 바이트)}"""
+        sizes = {}
+        for label, owner in sorted(self.owners.items()):
+            for name, container in owner.memory_caches().items():
+                sizes[f"{label}.{name}"] = (len(container), deep_size(container))
+        return sizes
+
+    def start_tracing(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            self.last_snapshot = tracemalloc.take_snapshot()
+
+    def stop_tracing(self):
+        if tracemalloc.is_tracing(): tracemalloc.stop()
+        self.last_snapshot = None
+
+    def top_growth(self, limit=TOP_ALLOCATIONS):
+        """직전 스냅샷 대비 증가 상위 위치 [(위치, 증가 바이트, 현재 바이트)] (추적 전이면 [])"""
+        if not tracemalloc.is_tracing(): return []
+        with self._lock:
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, "*tracemalloc.py"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            ))
+            stats = snapshot.compare_to(self.last_snapshot, "lineno") if self.last_snapshot else snapshot.statistics("lineno")
+            self.last_snapshot = snapshot
+        top = []
+        for stat in stats[:limit]:
+            frame = stat.traceback[0]
+            top.append((f"{os.path.relpath(frame.filename)}:{frame.lineno}", getattr(stat, 'size_diff', stat.size), stat.size))
+        return top
+
+    def sample(self):
+        """숫자만 (시뮬레이션 일별 기록용)"""
+        traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        return {"rss": rss_bytes(), "traced": traced,
+                "caches": {name: n for name, (n, _) in self.cache_sizes().items()}}
+
+    def report(self, top=TOP_ALLOCATIONS):
+        """텍스트 보고서 (로그 / 텔레그램 공용)"""
+        lines = [f"🧠 [Memory] RSS {_mb(rss_bytes())}"]
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            lines.append(f"   추적 중 할당: {_mb(current)} (최대 {_mb(peak)})")
+
+        lines.append("📦 캐시 (항목 / 대략 크기)")
+        for name, (count, size) in self.cache_sizes().items():
+            lines.append(f"   {name:<32} {count:>6} / {_mb(size)}")
+
+        growth = self.top_growth(top)
+        if growth:
+            lines.append("📈 직전 보고 대비 증가 상위")
+            for where, diff, size in growth:
+                lines.append(f"   {diff / 1024:+,.1f}KB ({size / 1024:,.1f}KB) {where}")
+        return "\n".join(lines)
+
+
+monitor = MemoryMonitor()
+
+
+_report_requested = threading.Event()  # SIGUSR1 -> 로그로 보고
+_reply_requested = threading.Event()   # 텔레그램 /mem -> 텔레그램 회신
+
+
+def _on_signal(signum, frame):
+    # 시그널 핸들러는 메인 쓰레드의 아무 지점에서나 끼어듦 (캐시 순회 중 / 로그 락 보유 중)
+    # -> 보고서는 여기서 만들지 않고 요청 표시만, 다음 MainController.step() 의 poll() 에서 작성
+    _report_requested.set()
+
+
+def poll():
+    """SIGUSR1 / 텔레그램 /mem 으로 요청된 보고서 작성 (메인 루프에서 매 스텝 호출 - 캐시를 바꾸는 쓰레드에서만 순회)"""
+    to_log, to_reply = _report_requested.is_set(), _reply_requested.is_set()
+    if not (to_log or to_reply): return
+    _report_requested.clear()
+    _reply_requested.clear()
+    report = monitor.report()
+    if to_log: log.info(report)
+    if to_reply: send_telegram_msg(report)
+
+
+def _on_command(args):
+    if args == "trace":
+        monitor.start_tracing()
+        return "🧠 [Memory] tracemalloc 추적 시작 (다음 /mem 부터 증가 상위 표시)"
+    if args == "stop":
+        monitor.stop_tracing()
+        return "🧠 [Memory] tracemalloc 추적 종료"
+    # 명령 수신 쓰레드에서 트레이더 캐시를 순회하면 메인 루프 변경과 충돌 -> 요청만 표시, 다음 스텝에서 회신
+    _reply_requested.set()
+    return None
+
+
+def install():
+    """
+    [기능] 보고 요청 연결 (main.py 에서 1회)
+    - SIGUSR1 (kill -USR1 <pid>) -> 다음 메인 루프 스텝에서 로그로 보고서
+    - 텔레그램 /mem -> 다음 메인 루프 스텝에서 보고서 회신 (/mem trace: 추적 시작, /mem stop: 추적 종료)
+    - Config.MEMORY_TRACE 가 True 면 시작부터 tracemalloc 추적
+    """
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, _on_signal)
+    register_command(COMMAND, _on_command)
+    if getattr(Config, 'MEMORY_TRACE', False):
+        monitor.start_tracing()
@@ -0,0 +1,86 @@
+import math
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from src import clock
+from src.logger import get_logger
+
+log = get_logger("orders")
+
+# =========================================================
+# 📮 [주문 디스패처] 사이클의 매수/매도 결정을 모아서 동시 전송
+# =========================================================
+# - 매매 루프는 주문을 바로 보내지 않고 결정만 모음 (타겟 파일 순서와 체결 지연 무관)
+# - 전송 순서: 매도 먼저 (현금 확보) -> 매수
+#   같은 구분 안에서는 타겟 'priority' (클수록 먼저) -> 신호 강도 (매수: 당일 상승률 큰 순 / 매도: 하락률 큰 순)
+# - 매수 현금은 전송 전에 우선순위대로 한 번에 예약 (동시 전송 중 현금 중복 사용 없음, 실패 주문은 예약 해제)
+# - 초당 주문 수 제한: 최근 1초 안 전송 수가 TPS 미만인 만큼 묶어 동시 전송 (기존 주문마다 sleep 0.5 / 0.2 제거)
+
+ORDER_TPS = {"REAL": 10, "PAPER": 2}  # 계좌 모드별 초당 주문 수 (Config.ORDER_TPS 로 변경 가능)
+
+
+def signal_strength(curr, prev):
+    """당일 등락률 (전일 종가 대비) - 값이 없으면 0"""
+    try:
+        change = curr['Close'] / prev['Close'] - 1
+    except (KeyError, TypeError, ZeroDivisionError):
+        return 0.0
+    return 0.0 if math.isnan(change) else change
+
+
+def order_sort_key(order):
+    """매도 -> 매수, 설정 우선순위 높은 순, 신호 강한 순 (같으면 입력 순서 유지)"""
+    strength = order.get('strength', 0.0)
+    score = strength if order['side'] == 'BUY' else -strength
+    return (order['side'] != 'SELL', -order.get('priority', 0), -score)
+
+
+class OrderDispatcher:
+    def __init__(self, submit, tps):
+        """
+        :param submit: 주문 1건 전송 함수 (order dict -> 주문번호 / 'HOLIDAY' / None)
+        :param tps: 초당 최대 주문 수
+        """
+        self.submit = submit
+        self.tps = max(1, int(tps))
+        self.sent_times = deque()  # 최근 1초 안 전송 시각
+        self.stats = {"batches": 0, "orders": 0, "waves": 0, "accepted": 0}
+
+    def _slots(self):
+        """지금 바로 보낼 수 있는 주문 수 (없으면 가장 오래된 전송이 1초를 넘길 때까지 대기)"""
+        now = clock.time()
+        while self.sent_times and now - self.sent_times[0] >= 1.0:
+            self.sent_times.popleft()
+        if len(self.sent_times) >= self.tps:
+            clock.sleep(1.0 - (now - self.sent_times[0]))
+            return self._slots()
+        return self.tps - len(self.sent_times)
+
+    def _submit_one(self, order):
+        try:
+            return self.submit(order)
+        except Exception as e:
+            log.warning(f"   ⚠️ [Dispatch Error] {order['code']} {order['side']}: {e}")
+            return None
+
+    def submit_all(self, orders):
+        """
+        [기능] 주문 묶음 동시 전송 (최근 1초 전송 수 TPS 이하)
+        :return: [(order, 결과)] - 입력 순서 그대로
+        """
+        if not orders: return []
+        self.stats["batches"] += 1
+        results = []
+        start = 0
+        while start < len(orders):
+            wave = orders[start:start + self._slots()]
+            start += len(wave)
+            now = clock.time()
+            self.sent_times.extend([now] * len(wave))
+            self.stats["waves"] += 1
+            with ThreadPoolExecutor(max_workers=len(wave)) as executor:
+                futures = [executor.submit(self._submit_one, o) for o in wave]
+                results.extend(f.result() for f in futures)
+        self.stats["orders"] += len(orders)
+        self.stats["accepted"] += sum(1 for r in results if r and r != 'HOLIDAY')
+        return list(zip(orders, results))
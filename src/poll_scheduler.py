@@ -0,0 +1,78 @@
+import math
+
+from src import clock
+
+# =========================================================
+# 📡 [폴링 스케줄러] 종목별 현재가 조회 주기 (트리거 거리 기반 우선순위)
+# =========================================================
+# - 진입/청산 선 근처(또는 선 정보 없음 / 주문 직후) 종목 = 매 사이클 조회
+# - 선에서 먼 종목 = POLL_TIERS 간격으로 조회 (멀수록 드물게)
+# - 사이클당 조회 수는 QUOTE_TPS x 직전 사이클 이후 경과 시간 이내 (TPS 예산)
+#   -> 예산을 넘으면 가까운 등급 -> 오래 기다린 순으로 선택, 나머지는 다음 사이클로
+# - MAX_STALE 초 넘게 조회 못 한 종목은 두 번째 등급으로 승격 (영구 누락 방지, 선 근처 종목보다는 뒤)
+
+QUOTE_TPS = 10       # 현재가 조회 예산 (초당, 잔고/주문 호출 여유를 남긴 값)
+POLL_TIERS = (       # (트리거까지 상대 거리 이하, 조회 간격 초)
+    (0.01, 0),
+    (0.03, 10),
+    (math.inf, 30),
+)
+MAX_STALE = 60       # 이 시간 넘게 못 본 종목은 우선순위 승격
+DEFAULT_WINDOW = 5   # 첫 사이클 예산 계산용 경과 시간 (초)
+MAX_WINDOW = 10      # 오래 쉬었다 돌아와도 한 사이클 예산은 이 시간만큼까지
+
+
+class PollScheduler:
+    def __init__(self, tps=QUOTE_TPS, tiers=POLL_TIERS):
+        self.tps = tps
+        self.tiers = tiers
+        self.last = {}          # code -> (마지막 조회 시각, 트리거 거리)
+        self.last_plan_time = None
+        self.stats = {"cycles": 0, "planned": 0, "deferred": 0}
+
+    def tier(self, distance):
+        """거리 -> 등급 번호 (0 = 매 사이클), 거리 None = 선 정보 없음 -> 0"""
+        if distance is None: return 0
+        for i, (limit, _) in enumerate(self.tiers):
+            if distance <= limit: return i
+        return len(self.tiers) - 1
+
+    def plan(self, codes):
+        """
+        [기능] 이번 사이클에 조회할 종목 선택
+        :param codes: 후보 종목 코드 (타겟 순서)
+        :return: 조회할 코드 set
+        """
+        now = clock.time()
+        window = DEFAULT_WINDOW if self.last_plan_time is None else now - self.last_plan_time
+        budget = max(1, int(self.tps * min(max(window, 1), MAX_WINDOW)))
+        self.last_plan_time = now
+
+        due = []
+        for code in codes:
+            rec = self.last.get(code)
+            if rec is None:
+                due.append((0, -math.inf, code))
+                continue
+            polled, distance = rec
+            tier = self.tier(distance)
+            waited = now - polled
+            if waited >= self.tiers[tier][1]:
+                due.append((min(tier, 1) if waited >= MAX_STALE else tier, -waited, code))
+
+        due.sort()
+        self.stats["cycles"] += 1
+        self.stats["planned"] += min(len(due), budget)
+        self.stats["deferred"] += max(0, len(due) - budget)
+        return {code for _, _, code in due[:budget]}
+
+    def record(self, code, distance):
+        """조회 완료 (distance: TriggerIndex.distance)"""
+        self.last[code] = (clock.time(), distance)
+
+    def mark_hot(self, code):
+        """주문 직후 / 취소 직후 -> 다음 사이클에 바로 조회"""
+        self.last.pop(code, None)
+
+    def forget(self, code):
+        self.last.pop(code, None)
@@ -0,0 +1,237 @@
+import io
+import os
+import glob
+import json
+
+import numpy as np
+
+from src.strategy import SMART_PRO_LEVELS, smart_pro_params
+from src.indicators import compute_indicators, required_indicators
+from src.kernels import Workspace
+from src.backtest.cross_market import market_of
+
+# =========================================================
+# 🔭 [유니버스 스캐너] 로컬 일봉 저장소 전체 -> 후보 순위 -> 타겟 파일 제안
+# =========================================================
+# - CSV 마다 마지막 LOOKBACK 줄만 읽어서 (종목 x 일자) 2차원 배열로 쌓음 (오른쪽 정렬, 짧은 종목은 앞쪽 NaN)
+# - 지표 / SMART_PRO 진입 필터 / 최근 성과를 종목 축 전체에 대해 한 번에 계산 (종목별 루프 없음)
+# - 진입 필터 (장 시작 전 기준, 마지막 완성 봉):
+#   20일선 위 / 20일선 우상향(Lv 4 미만) / 트레일링 스탑 구간 아님 / RSI 과열 아님 / 거래대금 충분
+# - 최근 성과: 최근 EVAL_DAYS 동안 SMART_PRO 목표가 돌파 시 (목표가 매수 -> 종가) 기대수익, 60일 모멘텀
+# - 레벨은 변동성 구간으로 배정 (3배 ETF 급 = Lv 5 ... 저변동 대형주 = Lv 1)
+
+LOOKBACK = 130      # 종목당 읽을 최근 일봉 수
+MIN_BARS = 80       # 이보다 짧은 종목은 제외 (SMA20 + 평가 구간)
+EVAL_DAYS = 60      # 최근 성과 평가 구간
+EXCLUDE = ("USDKRW",)   # 저장소에 같이 있는 비종목 파일
+
+# 시장별 최소 20일 평균 거래대금 (현지 통화)
+MIN_TRADED_VALUE = {"KR": 5e9, "US": 2e7}
+
+# 연율 변동성 -> SMART_PRO 레벨 (위에서부터 첫 번째로 넘는 구간)
+LEVEL_BY_VOL = ((0.80, 5), (0.55, 4), (0.40, 3), (0.25, 2), (0.0, 1))
+
+PRICE_FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+
+# =========================================================
+# 📂 로딩 (CSV 꼬리만 읽기)
+# =========================================================
+def _read_tail(path, n):
+    """CSV 마지막 n줄 -> (헤더 컬럼 튜플, 데이터 줄 리스트) - 파일 끝에서부터 필요한 만큼만 읽음"""
+    with open(path, "rb") as f:
+        header = tuple(f.readline().decode("utf-8-sig").strip().split(","))
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        chunk = min(size, (n + 2) * 160)
+        while True:
+            f.seek(size - chunk)
+            lines = f.read(chunk).decode("utf-8", "ignore").replace("\r", "").rstrip("\n").split("\n")
+            if len(lines) > n + 1 or chunk >= size: break
+            chunk = min(size, chunk * 2)
+    return header, [l for l in lines[1:][-n:] if l]   # 첫 줄 = 헤더(전체를 읽은 경우) 또는 잘린 줄
+
+
+def _parse_group(header, items, lookback):
+    """
+    헤더가 같은 종목들의 꼬리를 이어붙여 read_csv(C 파서) 1회로 변환 -> 종목별로 잘라 오른쪽 정렬
+    :param items: [(code, lines)]
+    :return: (last_dates, {필드: (종목 x lookback) 배열})
+    """
+    import pandas as pd
+    text = "\n".join("\n".join(lines) for _, lines in items)
+    fields = [f for f in PRICE_FIELDS if f in header]
+    df = pd.read_csv(io.StringIO(text), header=None, names=list(header), usecols=["Date"] + fields,
+                     dtype={f: float for f in fields})
+    counts = np.array([len(lines) for _, lines in items])
+    ends = np.cumsum(counts)
+    last_dates = df["Date"].to_numpy()[ends - 1].tolist()
+
+    # 행 번호 -> (종목, 열) 인덱스로 한 번에 배치
+    rows = np.repeat(np.arange(len(items)), counts)
+    cols = np.arange(len(df)) - np.repeat(ends - counts, counts) + np.repeat(lookback - counts, counts)
+    mats = {}
+    for f in fields:
+        mat = np.full((len(items), lookback), np.nan)
+        mat[rows, cols] = df[f].to_numpy()
+        mats[f] = mat
+    return last_dates, mats
+
+
+def load_panel(data_dir, lookback=LOOKBACK, markets=("KR", "US")):
+    """
+    [기능] 저장소 -> 시장별 패널
+    - 파일마다 꼬리만 읽고, 파싱은 (시장, 헤더) 그룹마다 1회
+    :return: { 시장: {'codes', 'last_date', 필드: (종목 x lookback) 배열} }
+    """
+    groups = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, "*.csv"))):
+        code = os.path.splitext(os.path.basename(path))[0]
+        if code in EXCLUDE: continue
+        market = market_of(code)
+        if market not in markets: continue
+        try:
+            header, lines = _read_tail(path, lookback)
+        except OSError as e:
+            print(f"⚠️ [Scan] {code} 읽기 실패: {e}")
+            continue
+        if not lines or any(f not in header for f in PRICE_FIELDS): continue
+        groups.setdefault((market, header), []).append((code, lines))
+
+    panels = {}
+    for (market, header), items in groups.items():
+        try:
+            last_dates, mats = _parse_group(header, items, lookback)
+        except ValueError as e:
+            print(f"⚠️ [Scan] {market} {len(items)}종목 파싱 실패: {e}")
+            continue
+        panel = panels.setdefault(market, {'codes': [], 'last_date': []})
+        panel['codes'] += [code for code, _ in items]
+        panel['last_date'] += last_dates
+        for f, mat in mats.items():
+            panel[f] = np.vstack((panel[f], mat)) if f in panel else mat
+    return panels
+
+
+# =========================================================
+# 🧮 2차원 지표 (indicators.compute_indicators 를 종목 x 일자 배열에 그대로 사용)
+# =========================================================
+SCAN_INDICATORS = required_indicators("SMART_PRO")
+
+
+def _shift(x, n=1):
+    out = np.full(x.shape, np.nan)
+    out[:, n:] = x[:, :-n]
+    return out
+
+
+def _level_params(levels):
+    """종목별 레벨 -> 파라미터 배열 {'gap_trigger': (n,), ...}"""
+    keys = next(iter(SMART_PRO_LEVELS.values())).keys()
+    return {k: np.array([smart_pro_params(int(lv))[k] for lv in levels], dtype=float) for k in keys}
+
+
+# =========================================================
+# 🔎 스캔
+# =========================================================
+def scan_panel(p, market, eval_days=EVAL_DAYS, min_bars=MIN_BARS, min_value=None, ws=None):
+    """
+    [기능] 시장 패널 1개 스캔
+    :return: 종목별 결과 리스트 (score 내림차순, 필터 통과 여부 포함)
+    """
+    ind = compute_indicators(p, SCAN_INDICATORS, ws)
+    o, h, c, v = p['Open'], p['High'], p['Close'], p['Volume']
+    n_bars = np.sum(~np.isnan(c), axis=1)
+    min_value = MIN_TRADED_VALUE.get(market, 0) if min_value is None else min_value
+
+    # 1. 변동성 -> 레벨
+    ret = c[:, 1:] / c[:, :-1] - 1
+    vol = np.nanstd(ret[:, -eval_days:], axis=1) * np.sqrt(252)
+    levels = np.select([vol >= t for t, _ in LEVEL_BY_VOL], [lv for _, lv in LEVEL_BY_VOL], default=1)
+    prm = _level_params(levels)
+    col = lambda a: a[:, None]   # 종목별 값 -> 일자 축 브로드캐스트
+
+    # 2. SMART_PRO 목표가 (smart_pro_target_price 와 같은 식, 일자 축 전체)
+    prev_c = _shift(c)
+    gap = (o - prev_c) / prev_c
+    k = np.where(np.isnan(ind['NoiseMA20']), 0.5, ind['NoiseMA20'])
+    k = np.where(gap >= col(prm['gap_trigger']), np.maximum(0.3, k - gap * col(prm['k_discount'])), k)
+    k = np.clip(k, 0.3, 0.7)
+    target = o + _shift(ind['Range']) * k   # prev['Range'] = 전전일 변동폭
+
+    # 3. 최근 성과: 목표가 돌파일에 목표가 매수 -> 종가 청산 기대수익 (bp)
+    window = slice(-eval_days, None)
+    hit = (h[:, window] > target[:, window]) & ~np.isnan(target[:, window])
+    pnl = np.where(hit, (c[:, window] - target[:, window]) / target[:, window], 0.0)
+    hit_rate = hit.mean(axis=1)
+    expectancy = pnl.mean(axis=1) * 10000
+    mom20 = c[:, -1] / c[:, -21] - 1
+    mom60 = c[:, -1] / c[:, -61] - 1
+    traded_value = np.nanmean((c * v)[:, -20:], axis=1)
+
+    # 4. 진입 필터 (마지막 봉 기준)
+    last, prev = -1, -2
+    recent_high = np.maximum(ind['High5'][:, last], h[:, last])
+    drop = np.where(ind['RSI'][:, last] >= prm['rsi_hot'], prm['drop_tight'], prm['drop_base'])
+    slope = ind['SMA20'][:, last] - ind['SMA20'][:, prev]
+    filters = {
+        'history': n_bars >= min_bars,
+        'bull': c[:, last] > ind['SMA20'][:, last],
+        'slope': (slope >= 0) | (levels >= 4),
+        'not_stopped': c[:, last] >= recent_high * drop,
+        'not_hot': ind['RSI'][:, last] < prm['rsi_hot'],
+        'liquid': traded_value >= min_value,
+    }
+    passed = np.logical_and.reduce(list(filters.values()))
+
+    # 5. 점수: 기대수익 / 모멘텀 백분위 평균 (통과 종목끼리 비교)
+    score = np.full(len(c), np.nan)
+    if passed.any():
+        def pct_rank(x):
+            r = np.argsort(np.argsort(x[passed]))
+            return r / max(1, passed.sum() - 1)
+        score[passed] = 0.6 * pct_rank(np.nan_to_num(expectancy)) + 0.4 * pct_rank(np.nan_to_num(mom60))
+
+    results = []
+    for i, code in enumerate(p['codes']):
+        results.append({
+            'code': code, 'market': market, 'last_date': p['last_date'][i], 'level': int(levels[i]),
+            'passed': bool(passed[i]), 'failed': [name for name, ok in filters.items() if not ok[i]],
+            'score': float(score[i]) if passed[i] else None,
+            'close': float(c[i, last]), 'vol': float(vol[i]), 'mom20': float(mom20[i]), 'mom60': float(mom60[i]),
+            'hit_rate': float(hit_rate[i]), 'expectancy_bp': float(expectancy[i]), 'traded_value': float(traded_value[i]),
+        })
+    results.sort(key=lambda r: (r['score'] is None, -(r['score'] or 0)))
+    return results
+
+
+def scan(data_dir, markets=("KR", "US"), lookback=LOOKBACK, eval_days=EVAL_DAYS, min_bars=MIN_BARS):
+    """저장소 전체 스캔 -> { 시장: 결과 리스트 }"""
+    panels = load_panel(data_dir, max(lookback, min_bars, eval_days + 21), markets)
+    ws = Workspace()
+    return {m: scan_panel(p, m, eval_days, min_bars, ws=ws) for m, p in panels.items()}
+
+
+def propose_targets(results, names=None, top_n=10, total_ratio=0.9, max_ratio=0.2, strategy="SMART_PRO"):
+    """
+    [기능] 상위 후보 -> 타겟 파일 형식 (data/targets_*.json 과 같은 스키마)
+    - 비중: total_ratio 를 동일 배분, 종목당 max_ratio 상한
+    """
+    picks = [r for r in results if r['passed']][:top_n]
+    if not picks: return []
+    ratio = round(min(max_ratio, total_ratio / len(picks)), 4)
+    names = names or {}
+    return [{
+        "code": r['code'], "name": names.get(r['code'], r['code']), "market": r['market'],
+        "target_ratio": ratio, "strategy": strategy, "setting": {"level": r['level']},
+    } for r in picks]
+
+
+def write_targets(targets, path):
+    """제안 타겟 저장 (라이브 타겟 파일은 건드리지 않도록 별도 경로 권장)"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(targets, f, ensure_ascii=False, indent=4)
+    os.replace(tmp, path)
+    return path
@@ -1,7 +1,15 @@
-import pandas as pd
-from datetime import datetime
-import pytz
-import numpy as np
+import logging
+
+from src.logger import get_logger
+
+# 라이브 경로 모듈 -> pandas 미사용 (시작 시간 단축, 값은 float / NumPy 스칼라 / None)
+log = get_logger("strategy")
+
+
+def isna(value):
+    """pd.isna 대체 (스칼라 전용): None 또는 NaN"""
+    return value is None or value != value
+
 
 def strat_macd_rsi(curr, prev, setting):
     """
@@ -30,7 +38,7 @@ def strat_macd_rsi_optimized(curr, prev, setting):
     - 승률을 높이고 잦은 매매를 줄임
     """
     # 데이터가 60일치도 안되면 계산 불가
-    if pd.isna(curr.get('SMA60')):
+    if isna(curr.get('SMA60')):
         return 'none', 'SMA60_데이터부족', 0
 
     rsi_buy = setting.get('rsi_buy', 40)  # 대형주는 30까지 잘 안 내려옴, 40으로 상향 추천
@@ -91,11 +99,11 @@ def strat_smart_momentum(curr, prev, setting):
     [전략] 스마트 모멘텀 (Final: 추세 추종 강화 + 휩소 방어)
     """
     # 0. 데이터 검증
-    if pd.isna(curr['SMA20']) or pd.isna(curr['Range']) or pd.isna(curr['Open']):
+    if isna(curr['SMA20']) or isna(curr['Range']) or isna(curr['Open']):
         return 'none', '데이터부족', 0
 
     # 1. 동적 K (노이즈 필터)
-    if 'NoiseMA20' in curr and not pd.isna(curr['NoiseMA20']):
+    if 'NoiseMA20' in curr and not isna(curr['NoiseMA20']):
         k = curr['NoiseMA20']
     else:
         k = setting.get('k', 0.5)
@@ -144,7 +152,7 @@ def strat_smart_momentum(curr, prev, setting):
     # -----------------------------------------------------------
     
     # 1. RSI 과열 익절 (기준 85로 상향 -> 더 비쌀 때 팜)
-    current_rsi = curr['RSI'] if 'RSI' in curr and not pd.isna(curr['RSI']) else 50
+    current_rsi = curr['RSI'] if 'RSI' in curr and not isna(curr['RSI']) else 50
 
     #if current_rsi > 85:
     #    return 'sell', f"RSI초과열({current_rsi:.0f})_익절", 0
@@ -166,30 +174,50 @@ def strat_smart_momentum(curr, prev, setting):
         
     return 'none', '', 0
 
+# [SMART_PRO 티어별 스탯 설정] (라이브 / 백테스트 공용)
+SMART_PRO_LEVELS = {
+    5: {"gap_trigger": 0.01, "k_discount": 5.0, "vol_ratio": 0.3, "drop_base": 0.90, "drop_tight": 0.95, "rsi_hot": 90},   # 🐲 드래곤 (3배 ETF)
+    4: {"gap_trigger": 0.02, "k_discount": 3.0, "vol_ratio": 0.5, "drop_base": 0.93, "drop_tight": 0.96, "rsi_hot": 85},   # 🥷 어쌔신 (급등주)
+    3: {"gap_trigger": 0.02, "k_discount": 2.0, "vol_ratio": 0.6, "drop_base": 0.94, "drop_tight": 0.97, "rsi_hot": 80},   # 🏹 헌터 (성장주)
+    2: {"gap_trigger": 0.03, "k_discount": 1.5, "vol_ratio": 0.8, "drop_base": 0.95, "drop_tight": 0.97, "rsi_hot": 80},   # ⚔️ 전사 (표준)
+    1: {"gap_trigger": 0.05, "k_discount": 1.0, "vol_ratio": 1.0, "drop_base": 0.97, "drop_tight": 0.985, "rsi_hot": 75},  # 🛡️ 탱커 (안전형)
+}
+
+def smart_pro_params(level):
+    """레벨별 파라미터 (정의되지 않은 레벨은 Lv 2 표준)"""
+    return SMART_PRO_LEVELS.get(level, SMART_PRO_LEVELS[2])
+
+def smart_pro_target_price(curr, prev, level):
+    """
+    SMART_PRO 돌파 목표가 (갭상승 K 할인 적용)
+    :return: (target_price, k)
+    """
+    params = smart_pro_params(level)
+    gap_start = (curr['Open'] - prev['Close']) / prev['Close']
+
+    k = curr.get('NoiseMA20', 0.5)
+    if isna(k): k = 0.5
+
+    # 갭상승 K 할인
+    if gap_start >= params['gap_trigger']:
+        k = max(0.3, k - (gap_start * params['k_discount']))
+    k = max(0.3, min(0.7, k))
+
+    return curr['Open'] + (prev['Range'] * k), k
+
 # ✅ 1. 신규 전략 추가 (PRO 버전)
-def strat_smart_momentum_pro(curr, prev, setting):
+def strat_smart_momentum_pro(curr, prev, setting, entry_price=None):
     """
     [전략] 스마트 모멘텀 PRO (5단계 레벨 + 가변형 트레일링 스탑)
+    :param entry_price: 추격 매수 제한을 판단할 매수가 (None = 현재가, 일봉 백테스트는 예상 체결가)
     """
     # 레벨 파싱 (기본값 Lv 2)
     level = setting.get('level', 2)
     
     # [티어별 스탯 설정]
-    if level == 5: # 🐲 드래곤 (3배 ETF)
-        gap_trigger = 0.01; k_discount = 5.0; vol_ratio = 0.3
-        drop_base = 0.90; drop_tight = 0.95; rsi_hot = 90
-    elif level == 4: # 🥷 어쌔신 (급등주)
-        gap_trigger = 0.02; k_discount = 3.0; vol_ratio = 0.5
-        drop_base = 0.93; drop_tight = 0.96; rsi_hot = 85
-    elif level == 3: # 🏹 헌터 (성장주)
-        gap_trigger = 0.02; k_discount = 2.0; vol_ratio = 0.6
-        drop_base = 0.94; drop_tight = 0.97; rsi_hot = 80
-    elif level == 1: # 🛡️ 탱커 (안전형)
-        gap_trigger = 0.05; k_discount = 1.0; vol_ratio = 1.0
-        drop_base = 0.97; drop_tight = 0.985; rsi_hot = 75
-    else: # ⚔️ 전사 (표준)
-        gap_trigger = 0.03; k_discount = 1.5; vol_ratio = 0.8
-        drop_base = 0.95; drop_tight = 0.97; rsi_hot = 80
+    params = smart_pro_params(level)
+    vol_ratio = params['vol_ratio']
+    drop_base = params['drop_base']; drop_tight = params['drop_tight']; rsi_hot = params['rsi_hot']
     
     # 🔴 [매도] 가변형 트레일링 스탑
     current_price = curr['Close']
@@ -225,16 +253,8 @@ def strat_smart_momentum_pro(curr, prev, setting):
         return 'none', "20일선_우하향_Pass", 0
 
 
-    # 🟢 [매수] 
-    k = curr.get('NoiseMA20', 0.5)
-    if pd.isna(k): k = 0.5
-    
-    # 갭상승 K 할인
-    if gap_start >= gap_trigger:
-        k = max(0.3, k - (gap_start * k_discount))
-    k = max(0.3, min(0.7, k))
-
-    target_price = curr['Open'] + (prev['Range'] * k)
+    # 🟢 [매수] (갭상승 K 할인 적용된 목표가)
+    target_price, k = smart_pro_target_price(curr, prev, level)
     
     is_bull = current_price > curr['SMA20']
     is_breakout = current_price > target_price
@@ -242,8 +262,9 @@ def strat_smart_momentum_pro(curr, prev, setting):
     
     # 🛡️ [NEW] 추격 매수 제한 (Target Price + 3% 이상이면 포기)
     # 목표가가 100불인데 현재 104불이면 -> "너무 올랐다, 보내주자"
+    # (일봉 백테스트의 Close 는 장 마감가 -> 돌파 시점 체결가로 판단해야 강한 돌파일을 버리지 않음)
     limit_cap = target_price * 1.03 
-    is_not_too_high = current_price <= limit_cap
+    is_not_too_high = (current_price if entry_price is None else entry_price) <= limit_cap
 
     # 조건에 is_not_too_high 추가
     if is_breakout and is_bull and is_vol_ok:
@@ -255,11 +276,20 @@ def strat_smart_momentum_pro(curr, prev, setting):
 
     return 'none', '', 0
 
-def get_signal(strategy_name, curr, prev, setting):
+def get_signal(strategy_name, curr, prev, setting, entry_price=None):
     """
     [Dispatcher] 전략 이름에 따라 알맞은 함수 호출
+    :param entry_price: 장중 필터(추격 매수 제한)에 쓸 매수가 (라이브 = None: 현재가, 일봉 백테스트 = 예상 체결가)
     :return: (Signal, Reason, Qty) -> Qty는 Trader 클래스에서 자금사정에 맞춰 계산하므로 여기선 0 리턴
     """
+    result = _dispatch(strategy_name, curr, prev, setting, entry_price)
+    # 🔍 종목별 판정 상세 (DEBUG 레벨이 꺼져 있으면 레벨 비교만)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("🔍 [%s] %s -> %s (%s)", strategy_name, curr.get('Close'), result[0], result[1])
+    return result
+
+
+def _dispatch(strategy_name, curr, prev, setting, entry_price=None):
     # 1. 변동성 돌파 (기본)
     if strategy_name == "VOLATILITY_BREAKOUT":
         return strat_volatility_breakout(curr, prev, setting)
@@ -274,7 +304,7 @@ def get_signal(strategy_name, curr, prev, setting):
     
     # [NEW] 신규 전략 연결
     if strategy_name == "SMART_PRO":
-        return strat_smart_momentum_pro(curr, prev, setting)
+        return strat_smart_momentum_pro(curr, prev, setting, entry_price)
     
     # 기본: MACD + RSI
     return strat_macd_rsi(curr, prev, setting)
\ No newline at end of file
@@ -5,6 +5,9 @@ import queue
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from config import Config
+from src.logger import get_logger
+
+log = get_logger("telegram")
 
 # =========================================================
 # ⚙️ [설정] 네트워크 세션 및 큐 초기화
@@ -17,7 +20,10 @@ session.mount('https://', HTTPAdapter(max_retries=retries))
 
 # 2. 메시지 대기열 (Queue) 생성
 # 메인 봇이 여기다 메시지를 던져넣고 바로 할 일을 하러 갑니다.
-msg_queue = queue.Queue()
+# (텔레그램 장애가 길어져도 메모리가 계속 늘지 않도록 상한, 넘치면 새 메시지 버림)
+MAX_QUEUE = 1000
+msg_queue = queue.Queue(maxsize=MAX_QUEUE)
+dropped = 0
 
 # =========================================================
 # 👷 [일꾼] 백그라운드 전송 담당자
@@ -62,7 +68,7 @@ def _telegram_worker():
                             elif resp.status_code == 429: # 도배 방지
                                 time.sleep(5)
                         except Exception as e:
-                            print(f"⚠️ [Telegram Worker] 전송 에러: {e}")
+                            log.warning(f"⚠️ [Telegram Worker] 전송 에러: {e}")
                             time.sleep(1)
             # --- 실제 전송 로직 끝 ---
             
@@ -73,7 +79,7 @@ def _telegram_worker():
             time.sleep(0.05) 
 
         except Exception as e:
-            print(f"🚨 [Telegram Worker] 치명적 오류: {e}")
+            log.error(f"🚨 [Telegram Worker] 치명적 오류: {e}")
 
 # 3. 봇 시작 시 일꾼(쓰레드) 채용 및 가동
 # daemon=True로 설정하면 메인 프로그램 종료 시 같이 사라짐
@@ -87,4 +93,75 @@ def send_telegram_msg(message):
     메시지를 큐에 넣기만 하고 즉시 리턴함 (Non-blocking)
     매매 로직에 전혀 영향을 주지 않음 (소요시간 0.00001초)
     """
-    msg_queue.put(message)
\ No newline at end of file
+    global dropped
+    try:
+        msg_queue.put_nowait(message)
+    except queue.Full:
+        dropped += 1
+        log.warning(f"⚠️ [Telegram] 대기열 가득 참 -> 메시지 버림 (누적 {dropped}건)", extra={'rate_key': "queue_full"})
+
+
+def reset_queue():
+    """
+    대기 중인 메시지를 전송하지 않고 모두 버림 (벤치마크/테스트용)
+    :return: 버린 메시지 수
+    """
+    cleared = 0
+    while True:
+        try:
+            msg_queue.get_nowait()
+        except queue.Empty:
+            return cleared
+        msg_queue.task_done()
+        cleared += 1
+
+
+# =========================================================
+# 📥 [명령] 텔레그램 명령 수신 (/mem 등)
+# =========================================================
+# - 별도 쓰레드가 getUpdates 롱폴링 -> 등록된 명령이면 핸들러 결과를 회신
+# - Config.TELEGRAM_ID 채팅에서 온 메시지만 처리
+COMMAND_POLL_TIMEOUT = 30  # 롱폴링 대기 (초)
+_commands = {}  # '/명령' -> handler(인자 문자열) -> 회신 텍스트
+_command_thread = None
+
+
+def register_command(name, handler):
+    _commands[name] = handler
+
+
+def _handle_update(update):
+    message = update.get('message') or {}
+    if str(message.get('chat', {}).get('id')) != str(Config.TELEGRAM_ID): return
+    name, _, args = (message.get('text') or '').strip().partition(' ')
+    handler = _commands.get(name.split('@')[0])
+    if handler is None: return
+    try:
+        reply = handler(args.strip())
+    except Exception as e:
+        reply = f"🚨 [Command] {name} 처리 실패: {e}"
+    if reply: send_telegram_msg(reply)
+
+
+def _command_worker():
+    command_session = requests.Session()   # 전송 쓰레드 세션과 분리
+    url = f"https://api.telegram.org/bot{Config.TELEGRAM_TOKEN}/getUpdates"
+    offset = None
+    while True:
+        try:
+            resp = command_session.get(url, params={"timeout": COMMAND_POLL_TIMEOUT, "offset": offset},
+                                       timeout=COMMAND_POLL_TIMEOUT + 10)
+            for update in resp.json().get('result', []):
+                offset = update['update_id'] + 1
+                _handle_update(update)
+        except Exception as e:
+            log.warning(f"⚠️ [Telegram Command] 수신 에러: {e}", extra={'rate_key': "command_error"})
+            time.sleep(5)
+
+
+def start_command_listener():
+    """명령 수신 쓰레드 시작 (토큰/채팅 ID 가 없으면 생략, 1회만)"""
+    global _command_thread
+    if _command_thread is not None or not (Config.TELEGRAM_TOKEN and Config.TELEGRAM_ID): return
+    _command_thread = threading.Thread(target=_command_worker, daemon=True)
+    _command_thread.start()
@@ -0,0 +1,223 @@
+import os
+import sqlite3
+import time
+import threading
+import queue
+import atexit
+from src import clock
+from config import Config
+from src.logger import get_logger
+
+log = get_logger("journal")
+
+# =========================================================
+# ⚙️ [설정] 매매 일지 (SQLite WAL + 백그라운드 기록)
+# =========================================================
+# 매매 루프는 큐에 이벤트를 넣기만 하고, 실제 디스크 기록은 일꾼 쓰레드가
+# 모아서(batch) 한 트랜잭션으로 처리합니다. (커밋마다 fsync)
+
+FLUSH_INTERVAL = 1.0   # 최대 1초 모아서 기록
+MAX_BATCH = 500        # 한 번에 기록할 최대 이벤트 수
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts       TEXT NOT NULL,
+    market   TEXT NOT NULL,
+    side     TEXT NOT NULL,
+    kind     TEXT,
+    code     TEXT NOT NULL,
+    name     TEXT,
+    price    REAL,
+    qty      INTEGER,
+    amount   REAL,
+    reason   TEXT,
+    odno     TEXT,
+    status   TEXT,
+    updated  TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_trades_market_ts ON trades (market, ts);
+CREATE INDEX IF NOT EXISTS idx_trades_code_ts ON trades (code, ts);
+CREATE INDEX IF NOT EXISTS idx_trades_odno ON trades (odno);
+"""
+
+# 기록 대기열 (메인 봇이 여기다 던져넣고 바로 리턴)
+_event_queue = queue.Queue()
+_worker_lock = threading.Lock()
+_worker_thread = None
+
+
+def _journal_path():
+    return getattr(Config, 'TRADE_JOURNAL_PATH', "data/trade_journal.db")
+
+
+def _connect(path):
+    folder = os.path.dirname(path)
+    if folder and not os.path.exists(folder): os.makedirs(folder)
+
+    conn = sqlite3.connect(path, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=FULL")  # 커밋 시 fsync (크래시 안전)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _write_batch(conn, batch):
+    """이벤트 묶음을 하나의 트랜잭션으로 기록"""
+    with conn:
+        for kind, payload in batch:
+            if kind == 'trade':
+                conn.execute(
+                    "INSERT INTO trades (ts, market, side, kind, code, name, price, qty, amount, reason, odno, status) "
+                    "VALUES (:ts, :market, :side, :kind, :code, :name, :price, :qty, :amount, :reason, :odno, :status)",
+                    payload)
+            elif kind == 'status':
+                # KIS 주문번호는 매일 다시 시작 -> 같은 번호의 지난 주문은 건드리지 않고 가장 최근 기록만 갱신
+                conn.execute(
+                    "UPDATE trades SET status = :status, updated = :ts WHERE id = "
+                    "(SELECT MAX(id) FROM trades WHERE odno = :odno AND market = :market)",
+                    payload)
+
+
+# =========================================================
+# 👷 [일꾼] 백그라운드 기록 담당자
+# =========================================================
+def _journal_worker():
+    conn = None
+    while True:
+        try:
+            first = _event_queue.get()
+            if first is None:  # 종료 신호
+                _event_queue.task_done()
+                break
+
+            # 최대 1초 동안 추가로 들어온 이벤트를 모아서 한 번에 기록
+            batch = [first]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            try:
+                while len(batch) < MAX_BATCH:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0: break
+                    item = _event_queue.get(timeout=remaining)
+                    if item is None:
+                        _event_queue.put(None)  # 종료 신호는 다음 루프에서 처리
+                        _event_queue.task_done()
+                        break
+                    batch.append(item)
+            except queue.Empty:
+                pass
+
+            try:
+                if conn is None: conn = _connect(_journal_path())
+                _write_batch(conn, batch)
+            except Exception as e:
+                log.error(f"🚨 [Journal Worker] 기록 실패 ({len(batch)}건): {e}")
+                conn = None
+            finally:
+                for _ in batch: _event_queue.task_done()
+
+        except Exception as e:
+            log.error(f"🚨 [Journal Worker] 치명적 오류: {e}")
+
+
+def _ensure_worker():
+    global _worker_thread
+    if _worker_thread is not None and _worker_thread.is_alive(): return
+    with _worker_lock:
+        if _worker_thread is None or not _worker_thread.is_alive():
+            _worker_thread = threading.Thread(target=_journal_worker, daemon=True)
+            _worker_thread.start()
+
+
+def flush():
+    """대기 중인 이벤트가 모두 디스크에 기록될 때까지 대기"""
+    if _worker_thread is not None and _worker_thread.is_alive():
+        _event_queue.join()
+
+
+# 프로그램 종료 시 남은 기록 마저 저장
+atexit.register(flush)
+
+
+# =========================================================
+# ✍️ [기록] 매매 루프에서 호출 (Non-blocking)
+# =========================================================
+def record_trade(market, side, code, name, price, qty, reason, odno=None, kind=None, status="SUBMITTED"):
+    """
+    주문 1건 기록 (큐에 넣고 즉시 리턴)
+    :param side: 'BUY' or 'SELL'
+    :param kind: 세부 유형 (예: "Sell(Rebalance)")
+    :param status: SUBMITTED / FILLED / CANCELED ...
+    """
+    _ensure_worker()
+    _event_queue.put(('trade', {
+        "ts": clock.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "market": market, "side": side, "kind": kind or side,
+        "code": code, "name": name,
+        "price": float(price), "qty": int(qty), "amount": float(price) * int(qty),
+        "reason": reason, "odno": str(odno) if odno else None, "status": status
+    }))
+
+
+def update_order_status(market, odno, status):
+    """주문번호 기준 체결 상태 갱신 (FILLED / CANCELED / TIMEOUT ...)"""
+    if not odno: return
+    _ensure_worker()
+    _event_queue.put(('status', {
+        "ts": clock.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "market": market, "odno": str(odno), "status": status
+    }))
+
+
+# =========================================================
+# 🔎 [조회] 리포트/분석용 (인덱스 사용)
+# =========================================================
+def query_trades(market=None, code=None, since=None, until=None, status=None):
+    """
+    매매 내역 조회
+    :param since/until: "YYYY-MM-DD" 또는 "YYYY-MM-DD HH:MM:SS"
+    :return: List[Dict] (시간 오름차순)
+    """
+    flush()
+    path = _journal_path()
+    if not os.path.exists(path): return []
+
+    where, args = [], []
+    if market: where.append("market = ?"); args.append(market)
+    if code: where.append("code = ?"); args.append(code)
+    if since: where.append("ts >= ?"); args.append(since)
+    if until: where.append("ts < ?"); args.append(until)
+    if status: where.append("status = ?"); args.append(status)
+
+    sql = "SELECT * FROM trades"
+    if where: sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY ts, id"
+
+    conn = sqlite3.connect(path, timeout=10)
+    try:
+        conn.row_factory = sqlite3.Row
+        return [dict(r) for r in conn.execute(sql, args)]
+    finally:
+        conn.close()
+
+
+def summarize_trades(market, since):
+    """
+    기간 내 매수/매도 건수 및 금액 요약
+    :return: { 'BUY': {'count', 'amount'}, 'SELL': {...} }
+    """
+    flush()
+    summary = {"BUY": {"count": 0, "amount": 0.0}, "SELL": {"count": 0, "amount": 0.0}}
+    path = _journal_path()
+    if not os.path.exists(path): return summary
+
+    conn = sqlite3.connect(path, timeout=10)
+    try:
+        rows = conn.execute(
+            "SELECT side, COUNT(*), COALESCE(SUM(amount), 0) FROM trades "
+            "WHERE market = ? AND ts >= ? GROUP BY side", (market, since))
+        for side, count, amount in rows:
+            summary[side] = {"count": count, "amount": amount}
+    finally:
+        conn.close()
+    return summary
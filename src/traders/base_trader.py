@@ -1,14 +1,59 @@
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-import pandas as pd
 import time
-from abc import ABC, abstractmethod
+import os
+import json
+import threading
+import pytz
 import numpy as np
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from src.data_manager import register_target_listener, get_target_snapshot
+from src import trade_journal
+from src import clock
+from src.traffic_recorder import wrap_session
+from src.trigger_index import TriggerIndex
+from src.poll_scheduler import PollScheduler
+from src.api_response import ApiResponse, decode
+from src.circuit_breaker import CircuitBreakers, CIRCUIT_OPEN
+from src.telegram_bot import send_telegram_msg
+from src.logger import get_logger
+from src.memory_monitor import monitor as memory_monitor
+from src.order_dispatcher import OrderDispatcher, ORDER_TPS, order_sort_key
+from config import Config
+from src.indicators import (PRICE_COLUMNS, build_indicator_frame, compute_indicators,
+                            prior_state, today_indicators, required_indicators)
+
+_token_locks = {}  # 토큰 파일 경로 -> 락 (같은 파일을 쓰는 트레이더/쓰레드끼리 재발급 직렬화)
+_token_locks_guard = threading.Lock()
+
+
+def _token_lock(path):
+    with _token_locks_guard:
+        return _token_locks.setdefault(path, threading.Lock())
+
 
 class BaseTrader(ABC):
-    def __init__(self, auth_manager):
+    MARKET = None  # 자식 클래스에서 "KR" / "US" 지정
+    LOGGER = "trader"  # 로거 이름 (Config.LOG_LEVELS 키)
+    TIMEZONE = 'Asia/Seoul'  # 시장 현지 시간대 (일봉 날짜 기준)
+    LOG_INDICATORS = ()  # 신호와 별개로 로그 출력용으로 계산할 지표
+    DAILY_WORKERS = 5  # 일봉 병렬 조회 쓰레드 수 (TPS 제한 고려)
+    DAILY_RETRY_INTERVAL = 300  # 일봉 조회 실패 종목 재시도 간격 (초, 매 사이클 재조회 방지)
+    KEEPALIVE_INTERVAL = 30  # 장 전 대기 중 연결 유지 요청 간격 (초)
+    PENDING_MAX = 200  # 미체결 대기열 상한 (넘으면 오래된 것부터 취소 후 제외)
+    PENDING_MAX_AGE = 3600  # 이 시간 넘게 남은 대기열 항목은 정리 (정상 흐름은 60초 타임아웃 취소)
+
+    def __init__(self, auth_manager, account=None):
+        """
+        :param account: 추가 계좌 이름 (멀티 계좌 모드, None = 시장 기본 계좌)
+            -> 라벨 'KR-이름' 이 타겟 파일 키 / 매매 일지 market / 로그 이름에 쓰임
+        """
         self.auth_manager = auth_manager
+        self.account = account
+        self.label = f"{self.MARKET or 'BOT'}-{account}" if account else (self.MARKET or "BOT")
+        self.log = get_logger(f"{self.LOGGER}.{account}" if account else self.LOGGER)
         # 자식 클래스(KoreaTrader, USTrader)가 이 변수들을 사용합니다.
         self.app_key = auth_manager.app_key
         self.app_secret = auth_manager.app_secret
@@ -19,17 +64,209 @@ class BaseTrader(ABC):
         # 토큰 초기화
         self.token = self.auth_manager.get_token()
 
-        # ✅ [핵심] 차트 데이터 캐싱 및 타이머 추가
-        self.market_data_cache = {}  # { 'CODE': DataFrame }
-        self.last_chart_update_time = 0 # 마지막으로 일봉을 갱신한 시간
-        self.CHART_REFRESH_INTERVAL = 600 # 10분 (600초)
+        # ✅ [핵심] 일봉 캐싱 + 전일까지 지표 상태 (장중에는 현재가만 조회)
+        self.market_data_cache = {}  # { 'CODE': 일봉 컬럼 {'Date', 'Open', ...: NumPy 배열} }
+        self.day_state = {}  # { 'CODE': 전일까지 지표 상태 (build_day_state) }
+        self.daily_failed = {}  # { 'CODE': 마지막 일봉 조회 실패 시각 } (DAILY_RETRY_INTERVAL 동안 재조회 안 함)
+        self.warm_date = None  # 워밍업을 마친 시장 현지 날짜
+        self.last_keepalive_time = 0
+        self.triggers = TriggerIndex()  # SMART_PRO 진입/청산 가격선 (구간 밖으로 나간 종목만 신호 계산)
+        self.poller = PollScheduler()  # 종목별 현재가 조회 주기 (트리거 근처 종목 우선)
+        self.breakers = CircuitBreakers()  # 엔드포인트별 회로 차단기 (장애 엔드포인트 반복 호출 방지)
+        order_tps = getattr(Config, 'ORDER_TPS', ORDER_TPS).get(self.mode, ORDER_TPS["PAPER"])
+        self.dispatcher = OrderDispatcher(self.submit_order, order_tps)  # 사이클 주문 동시 전송 (초당 주문 수 제한)
+        self.market_data = None  # 멀티 계좌 모드의 공유 시세 계층 (MarketDataHub, 없으면 직접 조회)
+
+        # ✅ [네트워크] 강력한 재시도 세션 생성 (TRAFFIC_MODE=RECORD 면 녹화 세션)
+        self.session = wrap_session(self._create_retry_session(), self.label)
+
+        # ✅ [타겟] 타겟 파일 변경 알림 등록 (제외된 종목 캐시 정리)
+        if self.MARKET:
+            register_target_listener(self.label, self.on_targets_changed)
 
-        # ✅ [네트워크] 강력한 재시도 세션 생성
-        self.session = self._create_retry_session()
+        # 🧠 [메모리] 캐시 크기 보고 대상 등록 (/mem, SIGUSR1)
+        memory_monitor.register(self.label, self)
     
+    def on_targets_changed(self, old_snapshot, new_snapshot):
+        """타겟 파일이 바뀌면 호출됨 (최초 로드 시 old_snapshot은 None)"""
+        if old_snapshot is None: return
+
+        added = new_snapshot['codes'] - old_snapshot['codes']
+        removed = old_snapshot['codes'] - new_snapshot['codes']
+
+        # 타겟에서 빠진 종목의 일봉 캐시는 더 이상 필요 없음
+        for code in removed:
+            self.forget_code(code)
+
+        if added or removed:
+            self.log.info(f"🔁 [{self.label}] 타겟 변경 감지 (추가: {sorted(added)}, 제외: {sorted(removed)})")
+
+    def forget_code(self, code):
+        """종목별 캐시 전부에서 제외"""
+        self.market_data_cache.pop(code, None)
+        self.day_state.pop(code, None)
+        self.daily_failed.pop(code, None)
+        self.triggers.drop_code(code)
+        self.poller.forget(code)
+        self.breakers.drop_cached(code)
+
+    # =========================================================
+    # 🧠 장기 실행 캐시 한도 (1일 1회 워밍업에서 정리)
+    # =========================================================
+    def memory_caches(self):
+        """{캐시 이름: 컨테이너} (MemoryMonitor 보고용)"""
+        return {"market_data_cache": self.market_data_cache, "day_state": self.day_state, "daily_failed": self.daily_failed,
+                "trigger_slots": self.triggers.slots, "poll_last": self.poller.last,
+                "breaker_cache": self.breakers.cached_entries(), "pending_orders": self.pending_orders}
+
+    def prune_caches(self, targets):
+        """
+        [정리] 현재 타겟에 없는 종목 캐시 / 만료된 차단기 캐시 / 오래된 미체결 대기열 제거
+        - 타겟 변경 알림을 놓친 경우(파일 교체 중 재시작 등)에도 캐시 크기가 타겟 수를 넘지 않음
+        :return: 제거한 항목 수
+        """
+        codes = {t['code'] for t in targets}
+        stale = (set(self.market_data_cache) | set(self.day_state) | set(self.daily_failed)
+                 | set(self.triggers.slots) | set(self.poller.last)) - codes
+        for code in stale:
+            self.forget_code(code)
+        self.breakers.prune()
+
+        cutoff = clock.time() - self.PENDING_MAX_AGE
+        expired = [o for o in self.pending_orders if o['time'] < cutoff]
+        if expired:
+            self.pending_orders[:] = [o for o in self.pending_orders if o['time'] >= cutoff]
+            self.evict_pending(expired, f"{self.PENDING_MAX_AGE // 60}분 넘게 미체결")
+        return len(stale) + len(expired)
+
+    def cancel_pending(self, order):
+        """대기열 항목 1건 브로커 취소 (시장별 cancel_order 인자가 다르면 재정의)"""
+        return self.cancel_order(order['odno'], order['code'])
+
+    def evict_pending(self, evicted, why):
+        """
+        [정리] 대기열 상한/만료로 빼는 주문 -> 브로커에 취소 후 제외 (말없이 버리지 않음)
+        - 취소 성공: 매매 일지 CANCELED
+        - 취소 실패 (이미 체결 / 조회 불가 등): 주문번호를 로그 + 텔레그램으로 알려 직접 확인
+        """
+        failed = []
+        for order in evicted:
+            if self.cancel_pending(order): self.update_trade_status(order['odno'], "CANCELED")
+            else: failed.append(order)
+        odnos = ", ".join(str(o['odno']) for o in evicted)
+        self.log.warning(f"🧹 [{self.label}] 미체결 대기열 {len(evicted)}건 정리 ({why}) - 주문번호 {odnos}")
+        msg = f"🧹 [{self.label}] 미체결 대기열 {len(evicted)}건 취소 후 정리 ({why})"
+        if failed:
+            msg += "\n⚠️ 취소 실패 (체결 여부 직접 확인): " + ", ".join(f"{o['name']} {o['type']} #{o['odno']}" for o in failed)
+        send_telegram_msg(msg)
+
+    def save_trade_log(self, kind, code, name, price, qty, reason, odno=None):
+        """매매 일지 기록 (백그라운드 쓰레드가 SQLite에 저장, Non-blocking)"""
+        side = 'BUY' if kind.upper().startswith('BUY') else 'SELL'
+        trade_journal.record_trade(self.label, side, code, name, price, qty, reason, odno=odno, kind=kind)
+
+    def update_trade_status(self, odno, status):
+        """주문번호 기준 체결 상태 갱신 (FILLED / CANCELED / TIMEOUT)"""
+        trade_journal.update_order_status(self.label, odno, status)
+
     def refresh_token(self):
         self.token = self.auth_manager.get_token()
 
+    def force_refresh_token(self, stale_token=None):
+        """
+        🚨 토큰 강제 갱신 (캐시 파일 삭제 후 재발급)
+        - 일봉 병렬 조회 / 주문 디스패처 쓰레드가 동시에 만료를 감지해도 재발급은 1회 (KIS 토큰 발급 횟수 제한)
+          락을 기다리는 동안 다른 쓰레드 / 같은 토큰 파일을 쓰는 트레이더가 이미 바꿨으면 그 토큰 사용
+        :param stale_token: 만료 응답을 받은 요청에 쓴 토큰 (None = 현재 토큰)
+        """
+        stale = self.token if stale_token is None else stale_token
+        file_name = getattr(self.auth_manager, 'token_path', f"data/token_{self.mode.lower()}.json")
+        with _token_lock(file_name):
+            if self.token != stale: return
+            fresh = self.auth_manager.get_token()
+            if fresh != stale:
+                self.token = fresh
+                return
+            try:
+                os.remove(file_name)
+            except FileNotFoundError:
+                pass
+            self.refresh_token()
+
+    # =========================================================
+    # 📡 API 호출 (응답 1회 파싱 + 토큰 만료 공통 처리)
+    # =========================================================
+    def _send(self, method, path, tr_id, params, body, timeout, extra_headers):
+        headers = {
+            "authorization": f"Bearer {self.token}",
+            "appkey": self.app_key,
+            "appsecret": self.app_secret,
+            "tr_id": tr_id
+        }
+        if extra_headers: headers.update(extra_headers)
+        data = None
+        if body is not None:
+            headers["hashkey"] = self.auth_manager.get_hashkey(body)
+            data = json.dumps(body)
+        res = self.session.request(method, f"{self.url_base}{path}", headers=headers,
+                                   params=params, data=data, timeout=timeout)
+        return decode(res)
+
+    def _call(self, method, path, tr_id, params=None, body=None, timeout=5, extra_headers=None, cache_key=None):
+        """
+        [공통] KIS API 호출 -> ApiResponse (본문은 여기서 한 번만 파싱)
+        - body 가 있으면 해시키 + JSON 본문 (주문/취소)
+        - 토큰 만료 응답이면 강제 갱신 후 조회(GET)만 1회 재시도 (주문은 중복 위험 -> 재전송 안 함)
+        - 엔드포인트 회로가 열려 있으면 보내지 않고 cache_key 의 최근 정상 응답 또는 차단 응답 (msg_cd CIRCUIT_OPEN)
+        - 네트워크 예외는 실패로 집계 후 그대로 올림 (호출부 except 에서 처리)
+        """
+        breaker = self.breakers.get(path)
+        if not breaker.allow():
+            return self._circuit_fallback(breaker, cache_key)
+
+        try:
+            token = self.token
+            res = self._send(method, path, tr_id, params, body, timeout, extra_headers)
+            if res.token_expired:
+                self.log.info(f"   🔑 [{self.label} Auth] 토큰 만료 감지 -> 강제 갱신 ({res.msg_cd or res.msg})")
+                self.force_refresh_token(token)
+                if method == "GET":
+                    res = self._send(method, path, tr_id, params, body, timeout, extra_headers)
+        except Exception as e:
+            self._circuit_failure(breaker, e)
+            raise
+
+        if res.server_error:
+            self._circuit_failure(breaker, f"HTTP {res.status} {res.msg_cd} {res.msg}".strip(), res.rate_limited)
+        else:
+            breaker.record_success()
+            if cache_key is not None and res.ok: breaker.store(cache_key, res)
+        return res
+
+    def _circuit_failure(self, breaker, error, rate_limited=False):
+        if not breaker.record_failure(error, rate_limited): return
+        msg = (f"🧯 [{self.label} Circuit] {breaker.path} 차단 ({breaker.kind}, "
+               f"{breaker.retry_in():.0f}초 후 재시도) - {breaker.last_error}")
+        self.log.info(f"   {msg}")
+        if breaker.kind == "order": send_telegram_msg(msg)  # 주문 차단은 즉시 알림
+
+    def _circuit_fallback(self, breaker, cache_key):
+        """차단 중: 캐시 허용 엔드포인트는 최근 정상 응답, 아니면 차단 응답"""
+        hit = breaker.cached(cache_key) if cache_key is not None else None
+        if hit:
+            res, age = hit
+            self.log.info(f"   ♻️ [{self.label} Circuit] {breaker.kind} 차단 중 -> {age:.0f}초 전 응답 사용")
+            return res
+        return ApiResponse(503, {'rt_cd': '1', 'msg_cd': CIRCUIT_OPEN,
+                                 'msg1': f"회로 차단 중 ({breaker.kind}, {breaker.retry_in():.0f}초 후 재시도)"})
+
+    def print_circuit_status(self):
+        """사이클 로그용: 정상이 아닌 엔드포인트만 한 줄씩"""
+        for b in self.breakers.unhealthy():
+            snap = b.snapshot()
+            self.log.info(f"   🧯 [Circuit] {b.path} {snap['state']} (차단 {snap['opened']}회, 거절 {snap['rejected']}건, "
+                  f"재시도 {snap['retry_in']:.0f}초 후) - {snap['last_error']}")
+
     @abstractmethod
     def get_balance(self):
         pass
@@ -43,6 +280,11 @@ class BaseTrader(ABC):
         """[NEW] 현재가 조회 (가벼운 API)"""
         pass
 
+    @abstractmethod
+    def get_quote(self, code):
+        """현재 시세 {'price', 'open', 'high', 'low', 'volume'} (신호 계산용, 실패 시 None)"""
+        pass
+
     @abstractmethod
     def send_order(self, code, side, price, qty):
         pass
@@ -64,57 +306,244 @@ class BaseTrader(ABC):
             connect=retries,
             backoff_factor=backoff_factor,
             status_forcelist=[500, 502, 503, 504], # 서버 에러 시 재시도
-            allowed_methods=["GET", "POST"] # 모든 요청에 적용
+            allowed_methods=["GET"] # 조회만 (주문 POST 재전송은 중복 체결 위험 -> 회로 차단기가 처리)
         )
         adapter = HTTPAdapter(max_retries=retry)
         session.mount("https://", adapter)
         session.mount("http://", adapter)
         return session
 
-    def calculate_indicators(self, data):
-        """지표 계산 (MACD, RSI, 변동성, +이동평균선)"""
-        # 데이터가 너무 적으면(20일 미만) 이평선 계산 불가하므로 빈 DF 리턴
-        if not data: return pd.DataFrame()
-        
-        df = pd.DataFrame(data)
-        
-        # 날짜 오름차순 정렬 (과거 -> 오늘)
-        if df.iloc[0]['Date'] > df.iloc[-1]['Date']:
-            df = df.iloc[::-1].reset_index(drop=True)
+    def calculate_indicators(self, data, required=None):
+        """
+        지표 계산 (공용 지표 엔진 사용)
+        :param required: 필요한 지표 집합 (None 이면 전체 - SMA/Noise/MACD/RSI/Range/High5)
+        """
+        return build_indicator_frame(data, required)
+
+    # =========================================================
+    # 🌅 장 시작 전 워밍업 (토큰 / 휴장 / 연결 / 일봉 / 전일 지표)
+    # =========================================================
+    def market_today(self):
+        """시장 현지 날짜 (YYYYMMDD, 일봉 Date 와 같은 형식)"""
+        return clock.now(pytz.timezone(self.TIMEZONE)).strftime("%Y%m%d")
+
+    def resolve_holiday(self):
+        """오늘 휴장 여부 (기본: 현지 주말만, 시장별로 재정의)"""
+        return clock.now(pytz.timezone(self.TIMEZONE)).weekday() >= 5
+
+    def fetch_daily(self, target):
+        """타겟 1개 일봉 조회 (시장별로 거래소 등 추가 인자가 필요하면 재정의)"""
+        return self.get_daily_data(target['code'])
+
+    def fetch_quote(self, target):
+        return self.get_quote(target['code'])
+
+    def load_daily(self, target):
+        """일봉 (멀티 계좌 모드면 공유 시세 계층 -> 종목당 1일 1회 조회)"""
+        if self.market_data is not None: return self.market_data.daily_data(target)
+        return self.fetch_daily(target)
+
+    def load_quote(self, target):
+        """현재가 (멀티 계좌 모드면 공유 시세 계층 -> 종목당 사이클 1회 조회)"""
+        if self.market_data is not None: return self.market_data.quote(target)
+        return self.fetch_quote(target)
+
+    def warmup(self):
+        """
+        [장 전 준비] 장 시작 첫 사이클이 현재가 + 신호 계산만 하도록 미리 처리
+        1. 토큰 갱신 2. 휴장 확인 3. 일봉 선로딩 + 전일까지 지표 상태 계산
+        (일봉 병렬 조회로 세션 커넥션 풀이 미리 열림 -> 이후 keep_warm 으로 유지)
+        :return: 'HOLIDAY' / 'READY'
+        """
+        started = time.perf_counter()
+        self.refresh_token()
+        if self.resolve_holiday():
+            self.log.info(f"⛔ [{self.label} Warmup] 오늘은 휴장일 -> 워밍업 생략")
+            return "HOLIDAY"
+
+        targets = get_target_snapshot(self.label)['targets']
+        self.prune_caches(targets)
+        self.refresh_daily_data(targets, force=True)
+        self.warm_date = self.market_today()
+        self.last_keepalive_time = clock.time()
+
+        ready = sum(1 for t in targets if t['code'] in self.day_state)
+        self.log.info(f"🌅 [{self.label} Warmup] 준비 완료: 일봉/지표 {ready}/{len(targets)}종목 ({time.perf_counter() - started:.1f}초)")
+        return "READY"
+
+    def keep_warm(self):
+        """장 전 대기 중 KEEPALIVE_INTERVAL 마다 가벼운 현재가 요청 1회 (HTTPS 연결 유지)"""
+        if clock.time() - self.last_keepalive_time < self.KEEPALIVE_INTERVAL: return
+        self.last_keepalive_time = clock.time()
+        targets = get_target_snapshot(self.label)['targets']
+        if targets: self.fetch_quote(targets[0])
+
+    def signal_indicators(self, strategy):
+        return required_indicators(strategy, extra=self.LOG_INDICATORS)
+
+    def _state_ready(self, target, today):
+        state = self.day_state.get(target['code'])
+        return state is not None and state['date'] == today and state['strategy'] == target.get('strategy')
+
+    def refresh_daily_data(self, targets, force=False):
+        """
+        [일봉] 병렬 조회 -> 캐시 + 지표 상태 갱신
+        - force=False: 오늘 상태가 없는 종목만 (워밍업 누락 / 장중 재시작 / 타겟 추가)
+          조회에 실패한 종목은 DAILY_RETRY_INTERVAL 이 지난 뒤에 다시 조회
+        :return: 조회한 종목 수
+        """
+        today = self.market_today()
+        now = clock.time()
+        if force:
+            todo = targets
         else:
-            df = df.sort_values(by="Date").reset_index(drop=True)
-            
-        # 1. 이동평균선 (SMA)
-        df['SMA5'] = df['Close'].rolling(window=5).mean()
-        df['SMA20'] = df['Close'].rolling(window=20).mean()
-        df['SMA60'] = df['Close'].rolling(window=60).mean()
-        
-        # 2. 노이즈 비율 계산 (동적 K)
-        range_size = df['High'] - df['Low']
-        body_size = (df['Open'] - df['Close']).abs()
-        safe_range = range_size.replace(0, 1)
-        df['Noise'] = 1 - (body_size / range_size.replace(0, 1)) 
-        df['NoiseMA20'] = df['Noise'].rolling(window=20).mean()
-
-        # 3. MACD
-        df['EMA12'] = df['Close'].ewm(span=12).mean()
-        df['EMA26'] = df['Close'].ewm(span=26).mean()
-        df['MACD'] = df['EMA12'] - df['EMA26']
-        df['Signal'] = df['MACD'].ewm(span=9).mean()
-        
-        # 4. RSI
-        delta = df['Close'].diff(1)
-        gain = delta.where(delta > 0, 0)
-        loss = -delta.where(delta < 0, 0)
-        rs = gain.rolling(14).mean() / loss.rolling(14).mean().replace(0, 1) # div 0 방지
-        df['RSI'] = 100 - (100 / (1 + rs))
-        
-        # 5. 변동성 (Range)
-        df['Range'] = df['High'].shift(1) - df['Low'].shift(1)
-
-        # 5일치 최고가를 미리 계산해서 'High5'라는 이름으로 저장
-        df['High5'] = df['High'].rolling(window=5).max()
-        df['High5'] = df['High5'].fillna(df['High'])
-
-        
-        return df
\ No newline at end of file
+            todo = [t for t in targets if not self._state_ready(t, today)
+                    and now - self.daily_failed.get(t['code'], 0) >= self.DAILY_RETRY_INTERVAL]
+        if not todo: return 0
+        if not force:
+            self.log.warning(f"\n⚠️ [Retry] 일봉 미준비 종목 조회 중... ({len(todo)}개)")
+
+        with ThreadPoolExecutor(max_workers=self.DAILY_WORKERS) as executor:
+            future_to_stock = {executor.submit(self.load_daily, t): t for t in todo}
+            for future in as_completed(future_to_stock):
+                t = future_to_stock[future]
+                try:
+                    data = future.result()
+                except Exception as e:
+                    self.log.warning(f"   ⚠️ [Error] {t['code']} 일봉 병렬 처리 중 에러: {e}")
+                    self.daily_failed[t['code']] = now
+                    continue
+                if data:
+                    self.market_data_cache[t['code']] = data
+                if data and self.build_day_state(t, data, today) is not None:
+                    self.daily_failed.pop(t['code'], None)
+                else:
+                    self.daily_failed[t['code']] = now  # 응답 없음 / 봉 부족
+        return len(todo)
+
+    def build_day_state(self, target, data, today):
+        """
+        일봉 컬럼 -> 전일까지 지표 상태 (오늘 봉은 제외, 장중에는 현재 시세로 오늘 지표만 계산)
+        :return: 상태 dict 또는 None (완성된 봉 2개 미만)
+        """
+        code, strategy = target['code'], target.get('strategy')
+        dates = data['Date']
+        done = np.flatnonzero(dates < today)
+        if len(done) < 2:
+            self.day_state.pop(code, None)
+            return None
+
+        order = done[np.argsort(dates[done], kind='stable')]  # API 는 최신순 -> 날짜 오름차순
+        cols = {c: data[c][order] for c in PRICE_COLUMNS}
+        required = self.signal_indicators(strategy)
+        daily = compute_indicators(cols, required)
+        prev = {name: values[-1] for name, values in daily.items()}
+        prev.update({c: cols[c][-1] for c in PRICE_COLUMNS})
+
+        state = {'date': today, 'strategy': strategy, 't': len(order),
+                 'prior': prior_state(cols, required), 'prev': prev}
+        self.day_state[code] = state
+        return state
+
+    def needs_signal(self, target, quote, held):
+        """
+        트리거 인덱스 확인 - False 면 이번 시세로는 신호가 'none' 으로 확정 (지표/신호 계산 생략)
+        - 선까지 거리를 폴링 스케줄러에 기록 (다음 조회 시점 결정)
+        """
+        evaluate = self.triggers.should_evaluate(target, self.day_state.get(target['code']), quote, held)
+        self.poller.record(target['code'], self.triggers.distance(target, quote, held))
+        return evaluate
+
+    def plan_quotes(self, targets):
+        """
+        [폴링] 이번 사이클에 현재가를 조회할 타겟 코드 (TPS 예산 + 트리거 거리 우선순위)
+        - 미체결 주문 종목은 이번 사이클 제외, 주문이 정리되면 바로 조회되도록 표시
+        """
+        pending = {p['code'] for p in self.pending_orders}
+        for code in pending: self.poller.mark_hot(code)
+        candidates = [t['code'] for t in targets if t['code'] not in pending]
+        due = self.poller.plan(candidates)
+        self.log.debug("   📡 [Poll] 현재가 조회 %d/%d종목 (미체결 %d종목 제외)", len(due), len(candidates), len(pending))
+        return due
+
+    # =========================================================
+    # 📮 주문 전송 (사이클 결정 모음 -> 우선순위 + 현금 예약 -> 동시 전송)
+    # =========================================================
+    def submit_order(self, order):
+        """주문 1건 전송 (디스패처 쓰레드에서 호출, 시장별로 거래소 등 추가 인자가 필요하면 재정의)"""
+        return self.send_order(order['code'], order['side'], order['price'], order['qty'])
+
+    def notify_order(self, order, odno):
+        """주문 접수 알림 (시장별 문구로 재정의)"""
+        send_telegram_msg(f"📮 [{self.label} 주문 접수] {order['name']} {order['side']} {order['qty']}주 ({order['reason']})")
+
+    def order_accepted(self, order, odno):
+        qty, price = order['qty'], order['price']
+        self.save_trade_log(order['kind'], order['code'], order['name'], price, qty, order['reason'], odno)
+        self.notify_order(order, odno)
+        self.pending_orders.append({'odno': odno, 'code': order['code'], 'name': order['name'], 'type': order['side'],
+                                    'qty': qty, 'price': price, 'amt': qty * price if order['side'] == 'BUY' else 0,
+                                    'orgno': order.get('orgno'), 'time': clock.time()})
+        if len(self.pending_orders) > self.PENDING_MAX:
+            evicted = self.pending_orders[:-self.PENDING_MAX]
+            del self.pending_orders[:-self.PENDING_MAX]
+            self.evict_pending(evicted, f"대기열 상한 {self.PENDING_MAX}건 초과")
+
+    def dispatch_orders(self, orders, investable_cash):
+        """
+        [기능] 이번 사이클 주문 결정 일괄 처리
+        :param orders: 결정 dict 리스트
+            공통 {'code', 'name', 'side', 'price', 'kind', 'reason', 'priority', 'strength'}
+            매도 {'qty', 'frees_cash': 매도 대금을 이번 사이클 매수에 쓸지} / 매수 {'needed': 목표까지 부족 금액}
+        :return: ('NORMAL' / 'HOLIDAY', 남은 가용 현금)
+        1. 매도 동시 전송 (접수된 매도 대금은 frees_cash 면 가용 현금에 합산)
+        2. 매수 수량을 우선순위대로 가용 현금에서 예약 (전송 전 확정) -> 동시 전송, 실패분은 예약 해제
+        """
+        if not orders: return "NORMAL", investable_cash
+        orders = sorted(orders, key=order_sort_key)
+        status = "NORMAL"
+
+        sells = [o for o in orders if o['side'] == 'SELL']
+        for order, odno in self.dispatcher.submit_all(sells):
+            if odno == 'HOLIDAY':
+                status = "HOLIDAY"
+            elif odno:
+                self.order_accepted(order, odno)
+                if order.get('frees_cash'): investable_cash += order['qty'] * order['price']
+        if status == "HOLIDAY": return status, investable_cash
+
+        batch = []
+        for order in (o for o in orders if o['side'] == 'BUY'):
+            qty = int(min(order['needed'], investable_cash) // order['price'])
+            if qty <= 0: continue
+            order['qty'] = qty
+            investable_cash -= qty * order['price']
+            self.log.info(f"   ⚡ [Buy Signal] {order['name']} {qty}주")
+            batch.append(order)
+
+        for order, odno in self.dispatcher.submit_all(batch):
+            if odno and odno != 'HOLIDAY':
+                self.order_accepted(order, odno)
+                continue
+            investable_cash += order['qty'] * order['price']  # 예약 해제
+            if odno == 'HOLIDAY': status = "HOLIDAY"
+        return status, investable_cash
+
+    def signal_rows(self, target, quote):
+        """
+        현재 시세 + 전일까지 상태 -> get_signal 입력 (curr, prev)
+        - 시가/고가/저가가 없는 응답이면 현재가로 대체
+        """
+        state = self.day_state.get(target['code'])
+        if state is None: return None, None
+
+        close = quote['price']
+        open_ = quote.get('open') or close
+        high = max(quote.get('high') or close, close)
+        low = min(quote.get('low') or close, close)
+        volume = quote.get('volume') or 0
+
+        today = today_indicators(state['prior'], state['t'], open_, high, low, close, volume)
+        curr = {name: float(value) for name, value in today.items()}
+        curr.update({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume})
+        return curr, state['prev']
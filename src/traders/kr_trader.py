@@ -1,94 +1,87 @@
-import requests
-import os
-import json
-import time
-from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed # ✅ 병렬 처리
+import logging
 
 from config import Config
 from src.traders.base_trader import BaseTrader
-from src.data_manager import load_target_stocks
+from src.data_manager import get_target_snapshot
 from src.strategy import get_signal
+from src.order_dispatcher import signal_strength
 from src.telegram_bot import send_telegram_msg
-import csv
+from src.api_response import columns, KR_DAILY
+from src.trade_journal import summarize_trades
+from src import clock
 
 class KoreaTrader(BaseTrader):
-    def __init__(self, auth_manager):
-        super().__init__(auth_manager)
+    MARKET = "KR"
+    LOGGER = "kr_trader"
+
+    def __init__(self, auth_manager, account=None):
+        super().__init__(auth_manager, account)
         self.mode = auth_manager.mode
         self.pending_orders = []
         
-        self.is_holiday_checked = False 
+        self.holiday_checked_date = None  # 휴장일 API 확인을 마친 날짜 (1일 1회)
         self.is_today_holiday = False
         self.last_holiday_log_time = 0
 
     # =========================================================
     # 🗓️ 휴장일 확인
     # =========================================================
+    def resolve_holiday(self):
+        """
+        오늘 휴장 여부 (워밍업 / 사이클 공용)
+        - PAPER: 주말만 / REAL: 휴장일 API (성공한 날은 다시 호출하지 않음, 에러 시 영업일 가정)
+        """
+        now = clock.now()
+        if self.mode == 'PAPER':
+            return now.weekday() >= 5  # (공휴일 하드코딩 생략)
+
+        today_date = now.strftime("%Y%m%d")
+        if self.holiday_checked_date == today_date:
+            return self.is_today_holiday
+
+        if not self.token: self.token = self.auth_manager.get_token()
+        try:
+            path = "/uapi/domestic-stock/v1/quotations/chk-holiday"
+            params = {
+                "BASS_DT": today_date, 
+                "CTX_AREA_NK": "", 
+                "CTX_AREA_FK": ""}
+            
+            # ✅ 세션 사용 (timeout 적용)
+            res = self._call("GET", path, "CTCA0903R", params=params, timeout=5,
+                             extra_headers={"content-type": "application/json; charset=utf-8", "custtype": "P"})
+            
+            if res.ok:
+                info = res['output'][0]
+                if info['opnd_yn'] == 'Y':
+                    self.log.info(f"   📅 [API] 오늘은 실전 영업일입니다. ({today_date})")
+                    self.is_today_holiday = False
+                else:
+                    self.log.info(f"   ⛔ [API] 오늘은 휴장일입니다. ({today_date})")
+                    send_telegram_msg(f"   ⛔ [API] 오늘은 휴장일입니다. ({today_date})")
+                    self.is_today_holiday = True
+                self.holiday_checked_date = today_date
+                return self.is_today_holiday
+        except:
+            pass
+        return False # 에러 시 영업일 가정
+
     def check_is_holiday(self):
         """오늘이 휴장일인지 확인 (3시간 단위 로그)"""
-        now = datetime.now()
-        today_date = now.strftime("%Y%m%d")
-        current_time = int(now.strftime("%H%M"))
+        current_time = int(clock.now().strftime("%H%M"))
 
         # 1. 시간 체크 (08:50 ~ 15:40)
         if current_time < 850 or current_time > 1540:
             return True
 
-        # 2. 휴장일 여부
-        is_holiday = False
-        
-        if self.mode == 'PAPER':
-            if now.weekday() >= 5: is_holiday = True
-            # (공휴일 하드코딩 생략)
-        else:
-            if self.is_holiday_checked:
-                is_holiday = self.is_today_holiday
-            else:
-                # API 호출 (1일 1회)
-                if not self.token: self.token = self.auth_manager.get_token()
-                
-                try:
-                    path = "/uapi/domestic-stock/v1/quotations/chk-holiday"
-                    headers = {
-                        "content-type": "application/json; charset=utf-8",
-                        "authorization": f"Bearer {self.token}",
-                        "appkey": self.app_key, 
-                        "appsecret": self.app_secret,
-                        "tr_id": "CTCA0903R", 
-                        "custtype": "P"
-                    }
-                    params = {
-                        "BASS_DT": today_date, 
-                        "CTX_AREA_NK": "", 
-                        "CTX_AREA_FK": ""}
-                    
-                    # ✅ 세션 사용 (timeout 적용)
-                    res = self.session.get(f"{self.url_base}{path}", headers=headers, params=params, timeout=5)
-                    data = res.json()
-                    
-                    if res.status_code == 200 and data['rt_cd'] == '0':
-                        info = data['output'][0]
-                        if info['opnd_yn'] == 'Y':
-                            print(f"   📅 [API] 오늘은 실전 영업일입니다. ({today_date})")
-                            self.is_today_holiday = False
-                            is_holiday = False
-                        else:
-                            print(f"   ⛔ [API] 오늘은 휴장일입니다. ({today_date})")
-                            send_telegram_msg(f"   ⛔ [API] 오늘은 휴장일입니다. ({today_date})")
-                            self.is_today_holiday = True
-                            is_holiday = True
-                        self.is_holiday_checked = True
-                    else:
-                        is_holiday = False # 에러 시 영업일 가정
-                except:
-                    is_holiday = False
+        # 2. 휴장일 여부 (워밍업에서 이미 확인했으면 API 호출 없음)
+        is_holiday = self.resolve_holiday()
 
         # 3. 로그 도배 방지
         if is_holiday:
-            if time.time() - self.last_holiday_log_time > 10800:
-                print(f"⛔ [Circuit Breaker] 오늘은 휴장일입니다. KR 트레이딩을 멈춥니다. (3시간 대기)")
-                self.last_holiday_log_time = time.time()
+            if clock.time() - self.last_holiday_log_time > 10800:
+                self.log.info(f"⛔ [Circuit Breaker] 오늘은 휴장일입니다. KR 트레이딩을 멈춥니다. (3시간 대기)")
+                self.last_holiday_log_time = clock.time()
             return True
 
         return False
@@ -108,13 +101,6 @@ class KoreaTrader(BaseTrader):
         path = "/uapi/domestic-stock/v1/trading/inquire-balance-rlz-pl"
         tr_id = "TTTC8494R" # 실전투자 전용 (모의투자는 미지원하므로 고정)
 
-        headers = {
-            "authorization": f"Bearer {self.token}", 
-            "appkey": self.app_key, 
-            "appsecret": self.app_secret, 
-            "tr_id": tr_id
-        }
-        
         # 실현손익조회 API 파라미터 (전체 조회: 00)
         params = {
                 "CANO": self.account_no,
@@ -132,16 +118,15 @@ class KoreaTrader(BaseTrader):
             }
 
         try:
-            res = self.session.get(f"{self.url_base}{path}", headers=headers, params=params, timeout=5)
-            data = res.json()
+            res = self._call("GET", path, tr_id, params=params, timeout=5, cache_key="balance")
 
-            if data['rt_cd'] != '0':
-                print(f"❌ [{self.mode}] 잔고 조회 실패: {data['msg1']}")
+            if not res.ok:
+                self.log.warning(f"❌ [{self.mode}] 잔고 조회 실패: {res.msg}")
                 return 0, 0, {}, {}, {}
             
-            elif data['rt_cd'] == '0':
-                out1 = data['output1'] # 종목별 상세 (보유 + 매매분)
-                out2 = data['output2'][0] # 계좌 합계
+            else:
+                out1 = res['output1'] # 종목별 상세 (보유 + 매매분)
+                out2 = res['output2'][0] # 계좌 합계
                 
                 # 1. 계좌 요약 데이터 파싱               
                 total_cash = float(out2.get('prvs_rcdl_excc_amt', 0)) # 2일 후 예수금
@@ -178,21 +163,15 @@ class KoreaTrader(BaseTrader):
                     }
                         
                 return total_asset, total_cash, holdings, details, balance_summary
-            else:
-                print(f"❌ [KR-Real] 잔고 조회 실패: {data['msg1']}")
-                return 0.0, 0.0, {}, {}, {}
                 
         except Exception as e:
-            print(f"⚠️ [KR-Real] 통합 잔고 에러: {e}")
+            self.log.warning(f"⚠️ [KR-Real] 통합 잔고 에러: {e}")
             return 0.0, 0.0, {}, {}, {}
         
     def _get_balance_paper(self):
         path = "/uapi/domestic-stock/v1/trading/inquire-balance"
         tr_id = "VTTC8434R" if self.mode == 'PAPER' else "TTTC8434R"
         
-        headers = {
-            "authorization": f"Bearer {self.token}", "appkey": self.app_key, "appsecret": self.app_secret, "tr_id": tr_id
-        }
         params = {
             "CANO": self.account_no, 
             "ACNT_PRDT_CD": "01", 
@@ -208,11 +187,10 @@ class KoreaTrader(BaseTrader):
         }
         
         try:
-            res = self.session.get(f"{self.url_base}{path}", headers=headers, params=params, timeout=5)
-            data = res.json()
+            res = self._call("GET", path, tr_id, params=params, timeout=5, cache_key="balance")
             
-            if data['rt_cd'] == '0':
-                out2 = data['output2'][0]
+            if res.ok:
+                out2 = res['output2'][0]
 
                 total_asset = float(out2.get('tot_evlu_amt', 0)) # 총 자산 (API 값 우선)
                 
@@ -226,7 +204,7 @@ class KoreaTrader(BaseTrader):
                 holdings = {}
                 details = {}
                 
-                for item in data['output1']:
+                for item in res['output1']:
                     qty = int(item['hldg_qty'])
                     if qty > 0:
                         code = item['pdno']
@@ -243,39 +221,45 @@ class KoreaTrader(BaseTrader):
                 real_cash = float(out2.get('dnca_tot_amt', 0))
                 return total_asset, real_cash, holdings, details, balance_summary
             else:
-                print(f"❌ [KR] 잔고 조회 실패: {data['msg1']}")
+                self.log.warning(f"❌ [KR] 잔고 조회 실패: {res.msg}")
                 return 0.0, 0.0, {}, {}, {}
         except Exception as e:
-            print(f"⚠️ [KR] 잔고 로직 에러: {e}")
+            self.log.warning(f"⚠️ [KR] 잔고 로직 에러: {e}")
             return 0.0, 0.0, {}, {}, {}
 
     def get_current_price(self, code):
         path = "/uapi/domestic-stock/v1/quotations/inquire-price"
-        headers = {
-            "authorization": f"Bearer {self.token}", 
-            "appkey": self.app_key, 
-            "appsecret": self.app_secret, 
-            "tr_id": "FHKST01010100"
-        }
         params = {"fid_cond_mrkt_div_code": "J", 
                   "fid_input_iscd": code}
         try:
-            res = self.session.get(f"{self.url_base}{path}", headers=headers, params=params, timeout=5)
-            if res.status_code == 200 and res.json()['rt_cd'] == '0':
-                return int(res.json()['output']['stck_prpr'])
+            res = self._call("GET", path, "FHKST01010100", params=params, timeout=5)
+            if res.ok:
+                return int(res['output']['stck_prpr'])
         except Exception as e:
-            print(f"⚠️ [Price Error] {code}: {e}")
+            self.log.warning(f"⚠️ [Price Error] {code}: {e}")
+        return None
+
+    def get_quote(self, code):
+        """[시세] 현재가 + 시가/고가/저가/누적거래량 (현재가 API 응답 그대로 사용, 추가 호출 없음)"""
+        path = "/uapi/domestic-stock/v1/quotations/inquire-price"
+        params = {"fid_cond_mrkt_div_code": "J", 
+                  "fid_input_iscd": code}
+        try:
+            res = self._call("GET", path, "FHKST01010100", params=params, timeout=5)
+            if res.ok:
+                out = res['output']
+                return {
+                    "price": int(out['stck_prpr']),
+                    "open": float(out.get('stck_oprc') or 0), "high": float(out.get('stck_hgpr') or 0),
+                    "low": float(out.get('stck_lwpr') or 0), "volume": int(out.get('acml_vol') or 0),
+                }
+        except Exception as e:
+            self.log.warning(f"⚠️ [Price Error] {code}: {e}")
         return None
 
     def get_daily_data(self, code):
-        """[일봉] 세션 적용 + 타임아웃 2초 (병렬 처리용)"""
+        """[일봉] 세션 적용 (병렬 처리용) -> 컬럼별 NumPy 배열 (최신순, 실패 시 {})"""
         path = "/uapi/domestic-stock/v1/quotations/inquire-daily-price"
-        headers = {
-            "authorization": f"Bearer {self.token}", 
-            "appkey": self.app_key, 
-            "appsecret": self.app_secret, 
-            "tr_id": "FHKST01010400"
-        }
         params = {
             "fid_cond_mrkt_div_code": "J", 
             "fid_input_iscd": code, 
@@ -284,136 +268,182 @@ class KoreaTrader(BaseTrader):
             "fid_period_div_code": "D"
         }
         try:
-            res = self.session.get(f"{self.url_base}{path}", headers=headers, params=params, timeout=5)
-            if res.status_code == 200 and res.json()['rt_cd'] == '0':
-                items = res.json().get('output', [])
+            res = self._call("GET", path, "FHKST01010400", params=params, timeout=5, cache_key=code)
+            if res.ok:
+                items = res.get('output') or []
                 if items:
-                    print(f"   📊 [Data] {code} 일봉 {len(items)}일치 수신")
-                    return [{
-                        "Date": r['stck_bsop_date'], "Close": float(r['stck_clpr']),
-                        "Open": float(r['stck_oprc']), "High": float(r['stck_hgpr']),
-                        "Low": float(r['stck_lwpr']), "Volume": int(r['acml_vol'])
-                    } for r in items]
+                    self.log.info(f"   📊 [Data] {code} 일봉 {len(items)}일치 수신")
+                    return columns(items, KR_DAILY)
             else:
                 # 🚨 실패 시 에러 메시지 출력
-                msg = res.json().get('msg1', 'Unknown Error')
-                print(f"   ❌ [Data Fail] {code} 조회 실패: {msg}")
-                return []
+                self.log.warning(f"   ❌ [Data Fail] {code} 조회 실패: {res.msg or 'Unknown Error'}")
         except Exception as e:
-            print(f"   ⚠️ [Data Error] {code}: {e}")
-            return []
+            self.log.warning(f"   ⚠️ [Data Error] {code}: {e}")
+        return {}
 
     # ==================================================================
     # [Order] 주문 및 취소
     # ==================================================================
     def send_order(self, code, side, price, qty):
         """[한국] 주문 전송 (성공 시 주문번호 반환)"""
+        odno, _ = self.place_order(code, side, qty)
+        return odno
+
+    def submit_order(self, order):
+        # 취소 주문에 필요한 거래소 전송 주문조직번호는 대기열 항목으로 함께 넘김 (order_accepted)
+        odno, order['orgno'] = self.place_order(order['code'], order['side'], order['qty'])
+        return odno
+
+    def place_order(self, code, side, qty):
+        """
+        [한국] 시장가 주문 전송
+        :return: (주문번호 ODNO / 'HOLIDAY' / None, 거래소 전송 주문조직번호)
+        """
         path = "/uapi/domestic-stock/v1/trading/order-cash"
         tr_id = ("VTTC0012U" if side == 'BUY' else "VTTC0011U") if self.mode == 'PAPER' else ("TTTC0012U" if side == 'BUY' else "TTTC0011U")
         
-        print(f"   📡 [Sending] {side} {code} {qty}주 (시장가)")
+        self.log.info(f"   📡 [Sending] {side} {code} {qty}주 (시장가)")
 
         data = {
             "CANO": self.account_no, "ACNT_PRDT_CD": "01", "PDNO": code,
             "ORD_DVSN": "01", "ORD_QTY": str(qty), "ORD_UNPR": "0"
         }
-        headers = {
-            "authorization": f"Bearer {self.token}", "appkey": self.app_key, "appsecret": self.app_secret,
-            "tr_id": tr_id, "hashkey": self.auth_manager.get_hashkey(data)
-        }
         
         try:
-            res = self.session.post(f"{self.url_base}{path}", headers=headers, data=json.dumps(data), timeout=2)
-            if res.status_code == 200 and res.json()['rt_cd'] == '0':
-                odno = res.json()['output']['KRX_FWDG_ORD_ORGNO'] # 주문번호
-                time.sleep(0.5) 
-                print(f"   ✅ [Accepted] 주문 접수 완료 (No: {odno})")
-                return odno # ✅ True 대신 주문번호 반환
+            res = self._call("POST", path, tr_id, body=data, timeout=2)
+            if res.ok:
+                odno = res['output']['ODNO'] # 주문번호 (체결 조회 / 취소 기준)
+                self.log.info(f"   ✅ [Accepted] 주문 접수 완료 (No: {odno})")
+                return odno, res['output'].get('KRX_FWDG_ORD_ORGNO', "")
             else:
-                msg = res.json().get('msg1', '')
                 # ✅ [핵심] 휴장일/영업일 에러 감지
-                if "영업일" in msg or "휴장" in msg or "장운영" in msg:
-                    print(f"   😴 [Holiday] 휴장일/장운영 시간 아님 감지!")
-                    return 'HOLIDAY'
-                print(f"   ❌ [Failed] 주문 실패: {res.json()['msg1']}")
-                return None
+                if res.market_closed:
+                    self.log.info(f"   😴 [Holiday] 휴장일/장운영 시간 아님 감지!")
+                    return 'HOLIDAY', None
+                self.log.warning(f"   ❌ [Failed] 주문 실패: {res.msg}")
+                return None, None
         except Exception as e:
-            print(f"   ⚠️ [API Error] {e}")
-            return None
+            self.log.warning(f"   ⚠️ [API Error] {e}")
+            return None, None
 
-    def cancel_order(self, order_no, code, qty):
-        """[한국] 미체결 주문 취소"""
-        print(f"   🗑️ [Canceling] 주문 {order_no} 취소 요청...")
+    def cancel_order(self, order_no, code, qty, orgno=""):
+        """[한국] 미체결 주문 취소 (orgno: 주문 응답의 거래소 전송 주문조직번호)"""
+        self.log.info(f"   🗑️ [Canceling] 주문 {order_no} 취소 요청...")
         
         path = "/uapi/domestic-stock/v1/trading/order-rvsecncl"
         tr_id = "VTTC0013U" if self.mode == 'PAPER' else "TTTC0013U" # 취소 주문 TR ID
 
         data = {
             "CANO": self.account_no, "ACNT_PRDT_CD": "01", 
-            "KRX_FWDG_ORD_ORGNO": order_no, # 원주문번호
-            "ORGN_ODNO": order_no,
+            "KRX_FWDG_ORD_ORGNO": orgno or "", # 주문조직번호
+            "ORGN_ODNO": order_no, # 원주문번호
             "ORD_DVSN": "00", # 00: 지정가 (취소는 보통 00 사용)
             "RVSE_CNCL_DVSN_CD": "02", # 02: 전량 취소
             "ORD_QTY": str(qty),
             "ORD_UNPR": "0",
             "QTY_ALL_ORD_YN": "Y" # 잔량 전량 취소 여부
         }
-        headers = {
-            "authorization": f"Bearer {self.token}", "appkey": self.app_key, "appsecret": self.app_secret,
-            "tr_id": tr_id, "hashkey": self.auth_manager.get_hashkey(data)
-        }
 
         try:
-            res = self.session.post(f"{self.url_base}{path}", headers=headers, data=json.dumps(data), timeout=2)
-            if res.status_code == 200 and res.json()['rt_cd'] == '0':
-                print(f"   ✅ [Canceled] 주문 취소 완료")
+            res = self._call("POST", path, tr_id, body=data, timeout=2)
+            if res.ok:
+                self.log.info(f"   ✅ [Canceled] 주문 취소 완료")
                 return True
             else:
-                print(f"   ❌ [Cancel Failed] 취소 실패: {res.json()['msg1']}")
+                self.log.warning(f"   ❌ [Cancel Failed] 취소 실패: {res.msg}")
                 return False
         except Exception as e:
-            print(f"   ⚠️ [Cancel Error] {e}")
+            self.log.warning(f"   ⚠️ [Cancel Error] {e}")
             return False
 
-    def save_trade_log(self, type, name, price, qty, reason):
-        file_path = "data/trade_history.csv"
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        if not os.path.exists(file_path):
-            with open(file_path, mode='w', encoding='utf-8-sig', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(['Time', 'Type', 'Name', 'Price', 'Qty', 'Total_Amt', 'Reason'])
-        with open(file_path, mode='a', encoding='utf-8-sig', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow([now, type, name, price, qty, price*qty, reason])
-            
-    # ✅ 대기열 관리 (타임아웃 시 자동 취소 추가)
+    def cancel_pending(self, order):
+        return self.cancel_order(order['odno'], order['code'], 0, order.get('orgno'))  # 0: 전량 취소
+
+    def notify_order(self, order, odno):
+        name, qty = order['name'], order['qty']
+        if order['kind'] == "Buy":
+            send_telegram_msg(f"🚀 [매수 체결] {name} {qty}주 (@ {order['price']:,}원), 이유 {order['reason']}")
+        elif order['kind'] == "Sell":
+            send_telegram_msg(f"💧 [매도 체결] {name} {qty}주 (전량), 이유 {order['reason']}")
+        elif order['kind'] == "Sell(Rebalance)":
+            send_telegram_msg(f"⚖️ [리밸런싱] {name} 매도: {qty}주")
+        else:
+            send_telegram_msg(f"🧹 [Cleanup] {name} 전량 매도 완료")
+
+    def get_order_results(self):
+        """
+        [API] 당일 주문체결조회 -> { 주문번호: {'qty', 'filled', 'remaining', 'canceled'} }
+        - 최신 주문부터 1페이지 (대기열은 최근 주문이라 충분)
+        :return: dict 또는 None (조회 실패 - 체결 여부 모름)
+        """
+        path = "/uapi/domestic-stock/v1/trading/inquire-daily-ccld"
+        tr_id = "VTTC8001R" if self.mode == 'PAPER' else "TTTC8001R"
+        today = clock.now().strftime("%Y%m%d")
+        params = {
+            "CANO": self.account_no, "ACNT_PRDT_CD": "01",
+            "INQR_STRT_DT": today, "INQR_END_DT": today,
+            "SLL_BUY_DVSN_CD": "00", "INQR_DVSN": "00", # 전체 / 역순
+            "PDNO": "", "CCLD_DVSN": "00", "ORD_GNO_BRNO": "", "ODNO": "",
+            "INQR_DVSN_3": "00", "INQR_DVSN_1": "", "CTX_AREA_FK100": "", "CTX_AREA_NK100": ""
+        }
+        try:
+            res = self._call("GET", path, tr_id, params=params, timeout=5)
+            if not res.ok:
+                self.log.warning(f"   ❌ [Fill Check] 주문체결조회 실패: {res.msg}")
+                return None
+            results = {}
+            for item in res.get('output1') or []:
+                results[str(item['odno'])] = {
+                    'qty': int(item.get('ord_qty') or 0), 'filled': int(item.get('tot_ccld_qty') or 0),
+                    'remaining': int(item.get('rmn_qty') or 0), 'canceled': int(item.get('cnc_cfrm_qty') or 0)}
+            return results
+        except Exception as e:
+            self.log.warning(f"   ⚠️ [Fill Check Error] {e}")
+            return None
+
+    # ✅ 대기열 관리 (체결 확인 + 타임아웃 시 자동 취소)
     def clean_pending_orders(self, holdings):
+        """
+        주문체결조회 결과로 대기열 정리 -> 매매 일지 상태 (FILLED / PARTIAL / CANCELED / TIMEOUT)
+        - 전량 체결 또는 잔량 없음(외부 취소 등): 결과대로 기록 후 제외
+        - 60초 경과 미체결: 취소 성공 시에만 TIMEOUT (실패하면 체결됐을 수 있으니 남겨두고 다음 사이클에 재확인)
+        """
         if not self.pending_orders: return
-        current_time = time.time()
+        results = self.get_order_results()
+        current_time = clock.time()
         for i in range(len(self.pending_orders) - 1, -1, -1):
             order = self.pending_orders[i]
-            
+            result = results.get(str(order['odno'])) if results is not None else None
+            filled = result['filled'] if result else 0
+
+            if result and (filled >= result['qty'] or result['remaining'] == 0):
+                status = 'FILLED' if filled >= result['qty'] else ('PARTIAL' if filled else 'CANCELED')
+                self.log.info(f"      🎉 [{status}] {order['code']} 주문 {order['odno']} 처리 완료 ({filled}/{result['qty']}주 체결)")
+                self.update_trade_status(order['odno'], status)
+                self.pending_orders.pop(i)
+                continue
+
             # 60초 경과 시 취소 시도
             if current_time - order['time'] > 60:
-                print(f"      ⏰ [Timeout] {order['code']} 60초 경과 -> 취소 시도")
-                # 주문번호(odno)가 있어야 취소 가능
-                if 'odno' in order and order['odno']:
-                    self.cancel_order(order['odno'], order['code'], 0) # 0은 전량취소
+                self.log.info(f"      ⏰ [Timeout] {order['code']} 60초 경과 -> 취소 시도")
+                if self.cancel_order(order['odno'], order['code'], 0, order.get('orgno')): # 0은 전량취소
+                    self.update_trade_status(order['odno'], 'PARTIAL' if filled else 'TIMEOUT')
                     send_telegram_msg(f"🗑️ [Timeout] {order['code']} 미체결 주문 취소")
-                
-                # 취소 여부와 상관없이 대기열에서는 삭제 (다음 사이클에 다시 시도하도록)
-                self.pending_orders.pop(i)
+                    self.pending_orders.pop(i) # 다음 사이클에 다시 판단
+                else:
+                    self.log.warning(f"      ⚠️ [Timeout] {order['code']} 주문 {order['odno']} 취소 실패 -> 다음 사이클 체결 재확인")
 
     # ==================================================================
     # [Report] 리포트 관련
     # ==================================================================
     def report_targets(self):
         """장 시작 전 목표 보고 (비중 0% 제외)"""
-        targets = load_target_stocks("KR")
+        snapshot = get_target_snapshot(self.label)
+        targets = snapshot['targets']
         if not targets: return "❌ [Error] 타겟 파일 로드 실패"
         
-        # 전체 목표 비중 계산
-        total_ratio = sum(t.get('target_ratio', 0) for t in targets)
+        # 전체 목표 비중 (로드 시 미리 계산됨)
+        total_ratio = snapshot['total_ratio']
         
         msg = f"☀️ **[오늘의 목표 포트폴리오 (KR)]**\n🎯 목표 비중: {total_ratio*100:.1f}%\n\n"
         
@@ -437,13 +467,17 @@ class KoreaTrader(BaseTrader):
         eval_profit = balance_summary.get('eval_profit', 0) 
         today_profit = realized + eval_profit
         
-        msg = "🌙 **[장 마감 결산 보고 (KR)]**\n"
+        msg = f"🌙 **[장 마감 결산 보고 ({self.label})]**\n"
         msg += f"💰 총 자산: {total_asset:,.0f}원\n"
         msg += f"💵 예수금: {total_cash:,.0f}원\n"
         msg += "-" * 28 + "\n"
         msg += f"💸 실현손익: {realized:+,.0f}원 (확정)\n"
         msg += f"📈 평가손익: {eval_profit:+,.0f}원 (미실현)\n"
         msg += f"🔥 **오늘수익: {today_profit:+,.0f}원** (종합)\n"
+
+        # 매매 일지 기준 금일 주문 요약
+        trades = summarize_trades(self.label, clock.now().strftime("%Y-%m-%d"))
+        msg += f"📝 금일 주문: 매수 {trades['BUY']['count']}건 ({trades['BUY']['amount']:,.0f}원) / 매도 {trades['SELL']['count']}건 ({trades['SELL']['amount']:,.0f}원)\n"
         msg += "-" * 28 + "\n"
         
         if details:
@@ -505,12 +539,11 @@ class KoreaTrader(BaseTrader):
         """3시간 주기 리포트 (수익률 순 정렬)"""
         total_asset, total_cash, holdings, details, _ = self.get_balance()
         if total_asset == 0:
-            print("⚠️ [Skip] 자산 조회 실패로 리포트 전송 생략")
+            self.log.warning("⚠️ [Skip] 자산 조회 실패로 리포트 전송 생략")
             return
         
-        # 타겟 정보를 딕셔너리로 변환 (검색 속도 향상)
-        targets = load_target_stocks("KR")
-        target_map = {t['code']: t['target_ratio'] for t in targets} if targets else {}
+        # 코드→타겟 맵 (로드 시 미리 계산됨)
+        target_map = get_target_snapshot(self.label)['target_map']
 
         msg = f"📊 **[중간 점검 (KR)]**\n"
         msg += f"💰 총 자산: {total_asset:,.0f}원\n"
@@ -525,7 +558,7 @@ class KoreaTrader(BaseTrader):
                 
                 # 정보 추가
                 info['code'] = code
-                info['target_ratio'] = target_map.get(code, 0)
+                info['target_ratio'] = target_map[code]['target_ratio'] if code in target_map else 0
                 info['current_ratio'] = (info['eval_amt'] / total_asset) * 100
                 active_stocks.append(info)
 
@@ -552,18 +585,20 @@ class KoreaTrader(BaseTrader):
         send_telegram_msg(msg)
     
     def print_portfolio_status(self, total_asset, total_cash, details, targets):
-        """콘솔 출력용 (수익률 순 정렬)"""
-        print(f"\n📊 [Portfolio Status] 자산: {total_asset:,.0f}원 | 현금: {total_cash:,.0f}원")
+        """콘솔 출력용 (수익률 순 정렬, DEBUG 레벨에서만 - 꺼져 있으면 계산도 생략)"""
+        if not self.log.isEnabledFor(logging.DEBUG): return
+        self.log.debug(f"\n📊 [Portfolio Status] 자산: {total_asset:,.0f}원 | 현금: {total_cash:,.0f}원")
         
         if not details: 
-            print("   보유 종목 없음")
+            self.log.debug("   보유 종목 없음")
             return
 
         # 🚨 [수정] 출력용 리스트 생성 및 정렬
         print_list = []
+        target_map = get_target_snapshot(self.label)['target_map']
         for code, info in details.items():
             if info['qty'] > 0:
-                target_r = next((t['target_ratio'] for t in targets if t['code'] == code), 0) * 100
+                target_r = (target_map[code]['target_ratio'] if code in target_map else 0) * 100
                 info['target_r_pct'] = target_r
                 info['real_ratio'] = (info['eval_amt'] / total_asset) * 100
                 print_list.append(info)
@@ -572,13 +607,13 @@ class KoreaTrader(BaseTrader):
         print_list.sort(key=lambda x: x['profit_rate'], reverse=True)
 
         if print_list:
-            print(f"   {'종목명':<10} | {'수익률':^8} | {'평가금액':^12} | {'비중':^6}")
-            print("-" * 50)
+            self.log.debug(f"   {'종목명':<10} | {'수익률':^8} | {'평가금액':^12} | {'비중':^6}")
+            self.log.debug("-" * 50)
             for info in print_list:
-                print(f"   {info['name']:<10} | {info['profit_rate']:>6.2f}% | {info['eval_amt']:>11,.0f}원 | {info['real_ratio']:>5.1f}% (목{info['target_r_pct']:.0f}%)")
+                self.log.debug(f"   {info['name']:<10} | {info['profit_rate']:>6.2f}% | {info['eval_amt']:>11,.0f}원 | {info['real_ratio']:>5.1f}% (목{info['target_r_pct']:.0f}%)")
         else:
-            print("   보유 종목 없음 (전량 매도 상태)")
-        print("-" * 50)
+            self.log.debug("   보유 종목 없음 (전량 매도 상태)")
+        self.log.debug("-" * 50)
 
     # ==================================================================
     # [Main Logic] 봇 실행
@@ -589,12 +624,14 @@ class KoreaTrader(BaseTrader):
         if self.check_is_holiday():
             return # 여기서 종료!
         
-        print("\n" + "="*50 + f"\n🚀 [KoreaTrader] 사이클 시작 ({datetime.now().strftime('%H:%M:%S')})\n" + "="*50)
+        self.log.info("\n" + "="*50 + f"\n🚀 [KoreaTrader] 사이클 시작 ({clock.now().strftime('%H:%M:%S')})\n" + "="*50)
         self.refresh_token()
+        self.print_circuit_status()  # 차단 중인 엔드포인트 (있을 때만)
         
-        targets = load_target_stocks("KR")
+        snapshot = get_target_snapshot(self.label)
+        targets = snapshot['targets']
         if not targets: 
-            print("🚨 [System] 타겟 종목 파일이 비어있거나 로드 실패.")
+            self.log.warning("🚨 [System] 타겟 종목 파일이 비어있거나 로드 실패.")
             return
         
         total_asset, total_cash, holdings, details, _ = self.get_balance()
@@ -621,71 +658,39 @@ class KoreaTrader(BaseTrader):
                 
                 # (보유액 + 대기액)이 목표액을 10% 초과하면 -> 대기 주문 취소!
                 if (current_amt + pending_amt) > (target_amt * 1.1):
-                    print(f"   🚨 [Overbuy Guard] {t['name']} 목표 비중 충족 예상 -> 미체결 매수 취소")
+                    self.log.warning(f"   🚨 [Overbuy Guard] {t['name']} 목표 비중 충족 예상 -> 미체결 매수 취소")
                     
-                    # 대기 중인 주문들 취소 실행
+                    # 대기 중인 주문들 취소 실행 (취소 실패 = 이미 체결 -> 대기열에 남겨 다음 체결 확인에서 기록)
+                    canceled = []
                     for order in pending_buys:
-                        if 'odno' in order:
-                            self.cancel_order(order['odno'], code, 0) # 0: 전량 취소
+                        if 'odno' in order and self.cancel_order(order['odno'], code, 0, order.get('orgno')): # 0: 전량 취소
+                            self.update_trade_status(order['odno'], 'CANCELED')
                             send_telegram_msg(f"🛡️ [과매수 방지] {t['name']} 미체결 취소 (목표 달성)")
+                            canceled.append(order)
                     
                     # 큐 정리
-                    self.pending_orders = [o for o in self.pending_orders if o not in pending_buys]
-                    time.sleep(0.5)
+                    self.pending_orders = [o for o in self.pending_orders if o not in canceled]
         # ==================================================================
 
+        # 이번 사이클 주문 결정 (루프가 끝난 뒤 dispatch_orders 로 한 번에 전송)
+        orders = []
+
         # 3. Cleanup
-        current_time = time.time()
-        target_codes = set([t['code'] for t in targets])
+        target_codes = snapshot['codes']
         for held_code, qty in holdings.items():
             if held_code not in target_codes:
                 if any(p['code'] == held_code for p in self.pending_orders): continue
                 clean_price = self.get_current_price(held_code)
                 if not clean_price: continue 
                 
-                print(f"🧹 [Cleanup] 제외된 종목 발견: {held_code} -> 전량 매도")
-                odno = self.send_order(held_code, 'SELL', clean_price, qty) # odno 반환됨
-                if odno:
-                    self.save_trade_log("Sell(Cleanup)", held_code, clean_price, qty, "타겟제외")
-                    send_telegram_msg(f"🧹 [Cleanup] {held_code} 전량 매도 완료")
-                    self.pending_orders.append({'code': held_code, 'type': 'SELL', 'time': time.time(), 'odno': odno})
-                    total_cash += (qty * clean_price) 
-                time.sleep(0.5)
+                self.log.info(f"🧹 [Cleanup] 제외된 종목 발견: {held_code} -> 전량 매도")
+                orders.append({'code': held_code, 'name': held_code, 'side': 'SELL', 'price': clean_price, 'qty': qty,
+                               'kind': "Sell(Cleanup)", 'reason': "타겟제외", 'frees_cash': True})
 
         # ------------------------------------------------------------------
-        # 4. [Parallel] 차트 데이터 갱신 (누락 종목 재시도 로직 강화)
+        # 4. 일봉 / 전일 지표 상태 (장 전 워밍업에서 준비됨 -> 누락 종목만 병렬 조회)
         # ------------------------------------------------------------------
-        is_regular_update = (current_time - self.last_chart_update_time) > self.CHART_REFRESH_INTERVAL
-        
-        # 갱신할 대상 선정
-        targets_to_fetch = []
-        if is_regular_update:
-            targets_to_fetch = targets
-        else:
-            for t in targets:
-                if t['code'] not in self.market_data_cache:
-                    targets_to_fetch.append(t)
-
-        # 병렬 요청
-        if targets_to_fetch:
-            if is_regular_update:
-                print(f"\n🔄 [Update] 차트 데이터 정기 갱신 중... (전체)")
-                self.last_chart_update_time = current_time 
-            else:
-                print(f"\n⚠️ [Retry] 데이터 누락 종목 재시도 중... ({len(targets_to_fetch)}개)")
-
-            def fetch_job(target):
-                return target['code'], self.get_daily_data(target['code'])
-
-            # 한국장은 TPS 제한이 있으므로 max_workers를 5 정도로 유지
-            with ThreadPoolExecutor(max_workers=5) as executor:
-                future_to_stock = {executor.submit(fetch_job, t): t for t in targets_to_fetch}
-                
-                for future in as_completed(future_to_stock):
-                    try:
-                        code, data = future.result()
-                        if data: self.market_data_cache[code] = data
-                    except: pass
+        self.refresh_daily_data(targets)
 
         # 5. 자금 관리
         min_cash_ratio = getattr(Config, 'MIN_CASH_RATIO', 0.01)
@@ -697,19 +702,22 @@ class KoreaTrader(BaseTrader):
         if investable_cash < 0: investable_cash = 0
 
         self.print_portfolio_status(total_asset, total_cash, details, targets)
-        print(f"   💰 [Money] 보유: {total_cash:,.0f}원 | 최소보유: {min_cash_needed:,.0f}원 | 👉 가용: {investable_cash:,.0f}원")
-        print("-" * 60)
+        self.log.info(f"   💰 [Money] 보유: {total_cash:,.0f}원 | 최소보유: {min_cash_needed:,.0f}원 | 👉 가용: {investable_cash:,.0f}원")
+        self.log.info("-" * 60)
 
-        # 6. 매매 루프
+        # 6. 매매 루프 (트리거 근처 종목은 매 사이클, 먼 종목은 간격을 두고 조회)
+        due = self.plan_quotes(targets)
         for t in targets:
             code = t['code']
             name = t['name']
             
             if any(p['code'] == code for p in self.pending_orders): continue
+            if code not in due: continue
             
-            # [Step 1] 현재가 조회
-            current_price = self.get_current_price(code)
-            if not current_price: continue 
+            # [Step 1] 시세 조회 (현재가 + 시가/고가/저가/거래량)
+            quote = self.load_quote(t)
+            if not quote: continue 
+            current_price = quote['price']
             
             # [Step 2] 리밸런싱
             qty_held = holdings.get(code, 0)
@@ -720,71 +728,38 @@ class KoreaTrader(BaseTrader):
                 excess_amt = current_amt - target_amt
                 sell_qty = int(excess_amt // current_price)
                 if sell_qty > 0:
-                    print(f"   ⚖️ [Rebalance] {name} 비중 초과 -> {sell_qty}주 매도")
-                    odno = self.send_order(code, 'SELL', current_price, sell_qty)
-                    if odno == 'HOLIDAY':
-                        print("   🛑 [Stop] 휴장일이므로 한국장 매매를 오늘 중단합니다.")
-                        return "HOLIDAY" # 컨트롤러에게 보고
-                    elif odno:
-                        self.save_trade_log("Sell(Rebalance)", name, current_price, sell_qty, "비중초과")
-                        send_telegram_msg(f"⚖️ [리밸런싱] {name} 매도: {sell_qty}주")
-                        self.pending_orders.append({'code': code, 'type': 'SELL', 'time': time.time(), 'amt': 0, 'odno': odno})
-                        total_cash += (sell_qty * current_price)
-                        investable_cash += (sell_qty * current_price)
-                        time.sleep(0.5)
+                    self.log.info(f"   ⚖️ [Rebalance] {name} 비중 초과 -> {sell_qty}주 매도")
+                    orders.append({'code': code, 'name': name, 'side': 'SELL', 'price': current_price, 'qty': sell_qty,
+                                   'kind': "Sell(Rebalance)", 'reason': "비중초과", 'frees_cash': True,
+                                   'priority': t.get('priority', 0)})
                     continue
             
-            # [Step 3] 차트 데이터 확인
-            if code not in self.market_data_cache: continue
-
-            chart_data = self.market_data_cache[code][:] 
-            chart_data[-1]['Close'] = float(current_price)
-            
-            df = self.calculate_indicators(chart_data)
-            if df.empty: continue
+            # [Step 3] 트리거 구간 안이면 신호 계산 생략 -> 오늘 지표 (전일까지 상태 + 현재 시세)
+            if not self.needs_signal(t, quote, qty_held > 0): continue
+            curr, prev = self.signal_rows(t, quote)
+            if curr is None: continue
             
-            signal, reason, _ = get_signal(t.get('strategy'), df.iloc[-1], df.iloc[-2], t.get('setting'))
+            signal, reason, _ = get_signal(t.get('strategy'), curr, prev, t.get('setting'))
             
-            # [B] 매수
+            # [B] 매수 (수량은 디스패처가 우선순위대로 가용 현금을 예약하며 결정)
             if signal == 'buy':
-                needed = target_amt - current_amt
-                amt = min(needed, investable_cash)
-                qty = int(amt // current_price)
-                
-                if qty > 0:
-                    print(f"   ⚡ [Buy Signal] {name} {qty}주")
-                    odno = self.send_order(code, 'BUY', current_price, qty)
-
-                    # ✅ [핵심] 휴장일 신호가 오면 즉시 리턴!
-                    if odno == 'HOLIDAY':
-                        print("   🛑 [Stop] 휴장일이므로 한국장 매매를 오늘 중단합니다.")
-                        return "HOLIDAY"  # 컨트롤러에게 보고
-                    
-                    elif odno:
-                        self.save_trade_log("Buy", name, current_price, qty, reason)
-                        send_telegram_msg(f"🚀 [매수 체결] {name} {qty}주 (@ {current_price:,}원), 이유 {reason}")
-                        # ✅ odno 추가 저장
-                        self.pending_orders.append({'code': code, 'type': 'BUY', 'time': time.time(), 'amt': qty*current_price, 'odno': odno})
-                        total_cash -= (qty * current_price)
-                        investable_cash -= (qty * current_price)
-                        time.sleep(0.5)
+                if target_amt - current_amt >= current_price:
+                    orders.append({'code': code, 'name': name, 'side': 'BUY', 'price': current_price,
+                                   'needed': target_amt - current_amt, 'kind': "Buy", 'reason': reason,
+                                   'priority': t.get('priority', 0), 'strength': signal_strength(curr, prev)})
 
             # [C] 매도
             elif signal == 'sell' and qty_held > 0:
-                print(f"   ⚡ [Sell Signal] {name} {qty_held}주")
-                odno = self.send_order(code, 'SELL', current_price, qty_held)
-
-                if odno == 'HOLIDAY':
-                    print("   🛑 [Stop] 휴장일이므로 한국장 매매를 오늘 중단합니다.")
-                    return "HOLIDAY" # 컨트롤러에게 보고
-                
-                elif odno:
-                    self.save_trade_log("Sell", name, current_price, qty_held, reason)
-                    send_telegram_msg(f"💧 [매도 체결] {name} {qty_held}주 (전량), 이유 {reason}")
-                    self.pending_orders.append({'code': code, 'type': 'SELL', 'time': time.time(), 'amt': 0, 'odno': odno})
-                    total_cash += (qty_held * current_price)
-                    investable_cash += (qty_held * current_price)
-                    time.sleep(0.5)
-
-        time.sleep(0.3)
+                self.log.info(f"   ⚡ [Sell Signal] {name} {qty_held}주")
+                orders.append({'code': code, 'name': name, 'side': 'SELL', 'price': current_price, 'qty': qty_held,
+                               'kind': "Sell", 'reason': reason, 'frees_cash': True,
+                               'priority': t.get('priority', 0), 'strength': signal_strength(curr, prev)})
+
+        # 7. 주문 일괄 전송 (매도 -> 매수, 우선순위 순, 초당 주문 수 제한 안에서 동시)
+        status, investable_cash = self.dispatch_orders(orders, investable_cash)
+        if status == "HOLIDAY":
+            self.log.info("   🛑 [Stop] 휴장일이므로 한국장 매매를 오늘 중단합니다.")
+            return "HOLIDAY"  # 컨트롤러에게 보고
+
+        clock.sleep(0.3)
         return "NORMAL"
\ No newline at end of file
@@ -1,20 +1,24 @@
-import requests
-import os
-import json
-import time
-from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed # ✅ 병렬 처리 필수 모듈
+import logging
+from datetime import timedelta
 
 from config import Config
 from src.traders.base_trader import BaseTrader
-from src.data_manager import load_target_stocks
+from src.data_manager import get_target_snapshot
 from src.strategy import get_signal
+from src.order_dispatcher import signal_strength
 from src.telegram_bot import send_telegram_msg
-import csv
+from src.api_response import columns, US_DAILY
+from src.trade_journal import summarize_trades
+from src import clock
 
 class USTrader(BaseTrader):
-    def __init__(self, auth_manager):
-        super().__init__(auth_manager)
+    MARKET = "US"
+    LOGGER = "us_trader"
+    TIMEZONE = 'America/New_York'
+    LOG_INDICATORS = ("RSI",)  # 사이클 로그에 RSI 출력
+
+    def __init__(self, auth_manager, account=None):
+        super().__init__(auth_manager, account)
         self.pending_orders = [] 
     
     def check_is_market_open(self):
@@ -24,7 +28,7 @@ class USTrader(BaseTrader):
         - 서머타임 적용 시: 22:30 ~ 05:00
         - 주말(토/일) 제외
         """
-        now = datetime.now()
+        now = clock.now()
         weekday = now.weekday() # 0:월 ~ 6:일
         current_time = int(now.strftime("%H%M")) # 예: 2330, 0500
 
@@ -39,7 +43,7 @@ class USTrader(BaseTrader):
         if 2200 <= current_time or current_time <= 630:
             return True
             
-        print(f"   💤 [Sleep] 미국장 운영 시간이 아닙니다. ({current_time})")
+        self.log.info(f"   💤 [Sleep] 미국장 운영 시간이 아닙니다. ({current_time})")
         return False
 
     # ==================================================================
@@ -51,7 +55,7 @@ class USTrader(BaseTrader):
         - 현금(예수금)과 보유 주식을 한 번에 정확하게 조회합니다.
         - 이전 코드의 '보유 주식 누락' 문제를 해결합니다.
         """
-        print("\n🔍 [System] 자산 현황 갱신 중 (통합 잔고 API)...")
+        self.log.info("\n🔍 [System] 자산 현황 갱신 중 (통합 잔고 API)...")
 
         # API 엔드포인트: 해외주식 체결기준현재잔고
         path = "/uapi/overseas-stock/v1/trading/inquire-present-balance"
@@ -62,13 +66,6 @@ class USTrader(BaseTrader):
         else:
             tr_id = "CTRP6504R" # ✅ 실전투자 필수 ID
 
-        headers = {
-            "authorization": f"Bearer {self.token}",
-            "appkey": self.app_key,
-            "appsecret": self.app_secret,
-            "tr_id": tr_id
-        }
-
         # 나스닥(NAS) 기준으로 조회하면 뉴욕/아멕스 종목도 다 나옵니다.
         params = {
             "CANO": self.account_no,
@@ -80,15 +77,14 @@ class USTrader(BaseTrader):
         }
 
         try:
-            res = self.session.get(f"{self.url_base}{path}", headers=headers, params=params, timeout=5)
-            data = res.json()
+            res = self._call("GET", path, tr_id, params=params, timeout=5, cache_key="balance")
 
-            if data['rt_cd'] != '0':
-                print(f"❌ [Balance] 조회 실패: {data.get('msg1')}")
+            if not res.ok:
+                self.log.warning(f"❌ [Balance] 조회 실패: {res.msg}")
                 return 0.0, 0.0, {}, {}
 
-            out1 = data.get('output1', []) # 보유 종목 리스트
-            out2 = data.get('output2', []) # 계좌 자산 현황
+            out1 = res.get('output1', []) # 보유 종목 리스트
+            out2 = res.get('output2', []) # 계좌 자산 현황
 
             # 헬퍼 함수: 빈 문자열 안전 변환
             def safe_float(val):
@@ -143,16 +139,16 @@ class USTrader(BaseTrader):
             total_asset = current_usd + total_stock_eval
             
             # 현금 비중 로그
-            print(f"   💰 [Total Asset] 총 자산: ${total_asset:,.2f}")
-            print(f"      (현금: ${current_usd:,.2f} = 예수금 ${deposit:,.2f} - 매수 ${today_buy:,.2f})")
+            self.log.info(f"   💰 [Total Asset] 총 자산: ${total_asset:,.2f}")
+            self.log.info(f"      (현금: ${current_usd:,.2f} = 예수금 ${deposit:,.2f} - 매수 ${today_buy:,.2f})")
             
             if holdings:
-                print(f"   📂 [Holdings] 보유 종목: {list(holdings.keys())}")
+                self.log.info(f"   📂 [Holdings] 보유 종목: {list(holdings.keys())}")
 
             return total_asset, current_usd, holdings, details
 
         except Exception as e:
-            print(f"⚠️ [Balance] 에러 발생: {e}")
+            self.log.warning(f"⚠️ [Balance] 에러 발생: {e}")
             return 0.0, 0.0, {}, {}
 
     def get_current_price(self, code, exchange="NASD"):
@@ -163,52 +159,57 @@ class USTrader(BaseTrader):
         elif ex_upper in ["AMEX", "AMS"]: lookup_exch = "AMS"
 
         path = "/uapi/overseas-price/v1/quotations/price"
-        headers = {
-            "authorization": f"Bearer {self.token}",
-            "appkey": self.app_key, 
-            "appsecret": self.app_secret,
-            "tr_id": "HHDFS00000300"
-        }
         params = {"AUTH": "", "EXCD": lookup_exch, "SYMB": code}
         
         try:
-            res = self.session.get(f"{self.url_base}{path}", headers=headers, params=params, timeout=2)
-            if res.status_code == 200:
-                data = res.json()
-                if data['rt_cd'] == '0':
-                    return float(data['output']['last'])
-                elif "만료" in data['msg1']:
-                    self.force_refresh_token()
-            return None
-        except Exception as e:
+            res = self._call("GET", path, "HHDFS00000300", params=params, timeout=2)
+            if res.ok:
+                return float(res['output']['last'])
             return None
-
         except Exception as e:
             # 세션이 재시도했음에도 실패한 경우
-            print(f"⚠️ [Price Error] {code}: {e}")
+            self.log.warning(f"⚠️ [Price Error] {code}: {e}")
             return None
     
-    def force_refresh_token(self):
-        """🚨 토큰 강제 갱신 헬퍼 함수"""
-        file_name = f"data/token_{self.mode.lower()}.json"
-        if os.path.exists(file_name):
-            os.remove(file_name)
-        self.refresh_token()
+    def get_quote(self, code, exchange="NASD"):
+        """[미국] 현재가 상세 (현재가 + 시가/고가/저가/누적거래량, 신호 계산용)"""
+        lookup_exch = "NAS"
+        ex_upper = exchange.upper()
+        if ex_upper in ["NYSE", "NYS", "NEWYORK"]: lookup_exch = "NYS"
+        elif ex_upper in ["AMEX", "AMS"]: lookup_exch = "AMS"
+
+        path = "/uapi/overseas-price/v1/quotations/price-detail"
+        params = {"AUTH": "", "EXCD": lookup_exch, "SYMB": code}
+
+        try:
+            res = self._call("GET", path, "HHDFS76200200", params=params, timeout=2)
+            if res.ok:
+                out = res['output']
+                price = float(out.get('last') or 0)
+                if not price: return None
+                return {
+                    "price": price,
+                    "open": float(out.get('open') or 0), "high": float(out.get('high') or 0),
+                    "low": float(out.get('low') or 0), "volume": int(float(out.get('tvol') or 0)),
+                }
+        except Exception as e:
+            self.log.warning(f"⚠️ [Price Error] {code}: {e}")
+        return None
+
+    def fetch_daily(self, target):
+        return self.get_daily_data(target['code'], target.get('exchange', 'NASD'))
+
+    def fetch_quote(self, target):
+        return self.get_quote(target['code'], target.get('exchange', 'NASD'))
 
     def get_daily_data(self, code, exchange="NASD"):
-        """[미국] 일봉 데이터 조회 (세션 & 타임아웃 적용)"""
+        """[미국] 일봉 데이터 조회 (세션 & 타임아웃 적용) -> 컬럼별 NumPy 배열 (최신순, 실패 시 {})"""
         lookup_exch = "NAS"
         ex_upper = exchange.upper()
         if ex_upper in ["NYSE", "NYS"]: lookup_exch = "NYS"
         elif ex_upper in ["AMEX", "AMS"]: lookup_exch = "AMS"
 
         path = "/uapi/overseas-price/v1/quotations/dailyprice"
-        headers = {
-            "authorization": f"Bearer {self.token}", 
-            "appkey": self.app_key, 
-            "appsecret": self.app_secret,
-            "tr_id": "HHDFS76240000"
-        }
         params = {
             "AUTH": "", 
             "EXCD": lookup_exch, 
@@ -219,18 +220,14 @@ class USTrader(BaseTrader):
         }
         
         try:
-            res = self.session.get(f"{self.url_base}{path}", headers=headers, params=params, timeout=2)
-            if res.status_code == 200 and res.json()['rt_cd'] == '0':
-                items = res.json().get('output2', [])
+            res = self._call("GET", path, "HHDFS76240000", params=params, timeout=2, cache_key=code)
+            if res.ok:
+                items = res.get('output2') or []
                 if items:
-                    return [{
-                        "Date": item['xymd'], "Close": float(item['clos']),
-                        "Open": float(item['open']), "High": float(item['high']),
-                        "Low": float(item['low']), "Volume": int(float(item['tvol']))
-                    } for item in items]
-            return []
+                    return columns(items, US_DAILY)
+            return {}
         except Exception as e:
-            return []
+            return {}
         
     # ==================================================================
     # [Order] 주문 실행
@@ -249,7 +246,7 @@ class USTrader(BaseTrader):
         else: limit_price = round(price * 0.995, 2)
 
         formatted_price = f"{limit_price:.2f}"
-        print(f"   📡 [Sending] {side} {code} {qty}주 @ ${formatted_price} (지정가/0.5%보정) (Exch: {target_exch})")
+        self.log.info(f"   📡 [Sending] {side} {code} {qty}주 @ ${formatted_price} (지정가/0.5%보정) (Exch: {target_exch})")
 
         path = "/uapi/overseas-stock/v1/trading/order"
 
@@ -271,45 +268,45 @@ class USTrader(BaseTrader):
             "ORD_DVSN": "00" #00 지정가
         }
         
-        headers = {
-            "authorization": f"Bearer {self.token}", 
-            "appkey": self.app_key, 
-            "appsecret": self.app_secret,
-            "tr_id": tr_id, 
-            "hashkey": self.auth_manager.get_hashkey(data)
-        }
-        
         try:
-            res = self.session.post(f"{self.url_base}{path}", headers=headers, data=json.dumps(data), timeout=5)
-            if res.status_code == 200 and res.json()['rt_cd'] == '0':
-                odno = res.json()['output']['ODNO']
-                print(f"   ✅ [Accepted] 주문 접수 완료 (No: {odno})")
+            res = self._call("POST", path, tr_id, body=data, timeout=5)
+            if res.ok:
+                odno = res['output']['ODNO']
+                self.log.info(f"   ✅ [Accepted] 주문 접수 완료 (No: {odno})")
                 return odno
             else:
-                msg = res.json().get('msg1', '')
-                if "휴장" in msg or "장운영" in msg or "Closed" in msg or "Holiday" in msg:
-                     print(f"   😴 [Holiday] 미국장 휴장 감지! ({msg})")
+                if res.market_closed:
+                     self.log.info(f"   😴 [Holiday] 미국장 휴장 감지! ({res.msg})")
                      return 'HOLIDAY'
-                elif "만료" in msg:
-                    self.force_refresh_token()
-                else:
-                    print(f"   ❌ [Failed] 주문 실패: {msg}")
+                elif not res.token_expired:  # 만료는 _call 에서 토큰 갱신 (주문은 다음 사이클에 재시도)
+                    self.log.warning(f"   ❌ [Failed] 주문 실패: {res.msg}")
                 return None
         except Exception as e:
-            print(f"   ⚠️ [API Error] {e}")
+            self.log.warning(f"   ⚠️ [API Error] {e}")
             return None
 
+    def submit_order(self, order):
+        return self.send_order(order['code'], order['side'], order['price'], order['qty'], order.get('exchange', 'NASD'))
+
+    def notify_order(self, order, odno):
+        name, qty, price = order['name'], order['qty'], order['price']
+        if order['kind'] == "Buy":
+            send_telegram_msg(f"🚀 [매수 접수] {name} {qty}주\n가격: ${price} (Limit)")  # ✅ [텔레그램] 매수 접수 알림
+        elif order['kind'] == "Sell":
+            send_telegram_msg(f"💧 [매도 접수] {name} {qty}주 (전량)\n이유: {order['reason']}")
+        elif order['kind'] == "Sell(Rebalance)":
+            send_telegram_msg(f"⚖️ [리밸런싱] {name} 비중 축소\n매도: {qty}주 (@ ${price})")
+        else:
+            send_telegram_msg(f"🇺🇸 [Cleanup] {name} 정리 매도 (주문: {odno})")
+
     def get_unfilled_orders(self):
-        """[API] 미체결 내역 조회"""
+        """
+        [API] 미체결 내역 조회
+        :return: 미체결 리스트 또는 None (조회 실패 - 빈 리스트로 돌려주면 전부 체결로 오인)
+        """
         path = "/uapi/overseas-stock/v1/trading/inquire-nccs"
         tr_id = "VTTS3018R" if self.mode == 'PAPER' else "TTTS3018R" 
         
-        headers = {
-            "authorization": f"Bearer {self.token}", 
-            "appkey": self.app_key, 
-            "appsecret": self.app_secret, 
-            "tr_id": tr_id
-        }
         params = {
             "CANO": self.account_no, 
             "ACNT_PRDT_CD": "01", 
@@ -320,28 +317,28 @@ class USTrader(BaseTrader):
         }
         
         try:
-            res = self.session.get(f"{self.url_base}{path}", headers=headers, params=params)
-            res_json = res.json()
+            res = self._call("GET", path, tr_id, params=params, timeout=None)
+            if not res.ok:
+                self.log.warning(f"   ❌ [Unfilled Check] 미체결 조회 실패: {res.msg}")
+                return None
             unfilled_list = []
-            
-            if res_json['rt_cd'] == '0':
-                for item in res_json.get('output', []):
-                    # 잔량(ord_qty - ccld_qty)이 있는 것만
-                    remain = int(item['ord_qty']) - int(item['ccld_qty'])
-                    if remain > 0:
-                        unfilled_list.append({
-                            "odno": item['odno'], 
-                            "code": item['pdno'], 
-                            "qty": remain
-                        })
+            for item in res.get('output') or []:
+                # 잔량(ord_qty - ccld_qty)이 있는 것만
+                remain = int(item['ord_qty']) - int(item['ccld_qty'])
+                if remain > 0:
+                    unfilled_list.append({
+                        "odno": item['odno'], 
+                        "code": item['pdno'], 
+                        "qty": remain
+                    })
             return unfilled_list
         except Exception as e:
-            print(f"⚠️ [Unfilled Check Error] {e}")
-            return []
+            self.log.warning(f"⚠️ [Unfilled Check Error] {e}")
+            return None
 
     def cancel_order(self, odno, code):
         """주문 취소"""
-        print(f"   🗑️ [Canceling] 주문 {odno} 취소 요청...")
+        self.log.info(f"   🗑️ [Canceling] 주문 {odno} 취소 요청...")
         path = "/uapi/overseas-stock/v1/trading/order-rvsecncl"
         tr_id = "VTTT1004U" if self.mode == 'PAPER' else "TTTS1004U"
         data = {
@@ -349,14 +346,10 @@ class USTrader(BaseTrader):
             "PDNO": code, "ORGN_ODNO": odno, "ORD_QTY": "0", "RVSE_CNCL_DVSN_CD": "02",
             "ORD_SVR_DVSN_CD": "0", "OVRS_ORD_UNPR": "0" 
         }
-        headers = {
-            "authorization": f"Bearer {self.token}", "appkey": self.app_key, "appsecret": self.app_secret,
-            "tr_id": tr_id, "hashkey": self.auth_manager.get_hashkey(data)
-        }
         try:
-            res = requests.post(f"{self.url_base}{path}", headers=headers, data=json.dumps(data))
-            if res.json()['rt_cd'] == '0':
-                print(f"   ✅ 취소 완료")
+            res = self._call("POST", path, tr_id, body=data, timeout=5)
+            if res.rt_cd == '0':
+                self.log.info(f"   ✅ 취소 완료")
                 return True
             return False
         except:
@@ -367,18 +360,23 @@ class USTrader(BaseTrader):
         if not self.pending_orders: return
         # 1. 미체결 내역(API) 조회
         unfilled_list = self.get_unfilled_orders() 
-        print(f"\n📋 [Queue] 주문 대기열 {len(self.pending_orders)}건 확인 중...")
+        self.log.info(f"\n📋 [Queue] 주문 대기열 {len(self.pending_orders)}건 확인 중...")
 
         # 리스트를 역순으로 순회하며 삭제 (pop 안전하게)
         for i in range(len(self.pending_orders) - 1, -1, -1):
             order = self.pending_orders[i]
             # (A) 타임아웃 체크 (60초)
-            if time.time() - order['time'] > 60:
-                print(f"      ⏰ [Timeout] {order['code']} 60초 경과 -> 취소 실행")
-                self.cancel_order(order['odno'], order['code']) # 취소 주문 전송
-                send_telegram_msg(f"🗑️ [취소] {order['name']} 미체결 취소 (Timeout)")
-                self.pending_orders.pop(i) # 대기열에서 삭제
-                continue
+            if clock.time() - order['time'] > 60:
+                self.log.info(f"      ⏰ [Timeout] {order['code']} 60초 경과 -> 취소 실행")
+                if self.cancel_order(order['odno'], order['code']): # 취소 주문 전송
+                    self.update_trade_status(order['odno'], 'TIMEOUT')
+                    send_telegram_msg(f"🗑️ [취소] {order['name']} 미체결 취소 (Timeout)")
+                    self.pending_orders.pop(i) # 대기열에서 삭제
+                    continue
+                # 취소 실패 = 방금 체결됐을 수 있음 -> 아래 미체결 확인으로 판단
+
+            # 미체결 조회 실패 -> 체결 여부를 모르므로 이번 사이클은 판단 보류 (다음 사이클 재확인)
+            if unfilled_list is None: continue
             
             # (B) 체결 여부 확인
             # 미체결 리스트에 내 주문번호(odno)가 있는가?
@@ -390,22 +388,24 @@ class USTrader(BaseTrader):
             
             # 미체결 리스트에 없으면 -> "체결됨" (또는 이미 취소됨)
             if not is_still_unfilled:
-                print(f"   🎉 [Filled] {order['name']} 주문 처리 완료 (체결/취소)")
+                self.log.info(f"   🎉 [Filled] {order['name']} 주문 처리 완료 (체결/취소)")
                 # 체결 알림 (취소가 아닐 경우에만.. 근데 구분 어려우니 일단 체결로 간주)
                 send_telegram_msg(f"🇺🇸 [체결 확인] {order['name']} {order['type']} 완료")
+                self.update_trade_status(order['odno'], 'FILLED')
                 self.pending_orders.pop(i) # 대기열에서 삭제
             else:
-                print(f"      ⏳ {order['name']} 아직 미체결 상태...")
+                self.log.debug("      ⏳ %s 아직 미체결 상태...", order['name'])
 
     # ==================================================================
     # [Report] 포트폴리오 보고서
     # ==================================================================
     def report_targets(self):
         """장 시작 전 보고 (목표 비중 0% 제외)"""
-        targets = load_target_stocks("US")
+        snapshot = get_target_snapshot(self.label)
+        targets = snapshot['targets']
         if not targets: return "❌ [Error] 타겟 파일 로드 실패"
         
-        total_ratio = sum(t.get('target_ratio', 0) for t in targets)
+        total_ratio = snapshot['total_ratio']
         msg = f"☀️ **[오늘의 목표 포트폴리오 (US)]**\n🎯 주식 비중: {total_ratio*100:.1f}%\n\n"
         
         # 🚨 [수정] 비중 0% 초과인 종목만 필터링
@@ -431,11 +431,16 @@ class USTrader(BaseTrader):
         total_eval_profit = sum(d['eval_amt'] - (d['avg_price'] * d['qty']) for d in details.values())
 
         # 3. 헤더 작성
-        msg = "🌙 **[장 마감 결산 보고 (US)]**\n"
+        msg = f"🌙 **[장 마감 결산 보고 ({self.label})]**\n"
         msg += f"💰 총 자산: ${total_asset:,.2f}\n"
         msg += f"💵 달러현금: ${total_usd:,.2f}\n"
         msg += "-" * 30 + "\n"
         msg += f"📈 총 평가손익: ${total_eval_profit:+,.2f}\n"
+
+        # 매매 일지 기준 최근 주문 요약 (미국장은 자정을 넘기므로 어제부터 집계)
+        since = (clock.now() - timedelta(days=1)).strftime("%Y-%m-%d 12:00:00")
+        trades = summarize_trades(self.label, since)
+        msg += f"📝 세션 주문: 매수 {trades['BUY']['count']}건 (${trades['BUY']['amount']:,.2f}) / 매도 {trades['SELL']['count']}건 (${trades['SELL']['amount']:,.2f})\n"
         msg += "-" * 30 + "\n"
         
         # 4. 종목별 상세
@@ -480,9 +485,8 @@ class USTrader(BaseTrader):
         msg += f"💰 자산: ${total_asset:,.2f} (현금 {cash_ratio:.1f}%)\n"
         msg += "-" * 30 + "\n"
 
-        # 타겟 로드 & 매핑
-        targets = load_target_stocks("US")
-        target_map = {t['code']: t.get('target_ratio', 0) for t in targets}
+        # 코드→타겟 맵 (로드 시 미리 계산됨)
+        target_map = get_target_snapshot(self.label)['target_map']
         
         # 4. 보유 종목 리스팅 (정렬 적용)
         active_stocks = []
@@ -492,7 +496,7 @@ class USTrader(BaseTrader):
                 if info['qty'] <= 0: continue
 
                 info['code'] = code
-                info['target_ratio'] = target_map.get(code, 0)
+                info['target_ratio'] = target_map[code]['target_ratio'] if code in target_map else 0
                 info['current_ratio'] = (info['eval_amt'] / total_asset) * 100
                 active_stocks.append(info)
 
@@ -518,22 +522,20 @@ class USTrader(BaseTrader):
         send_telegram_msg(msg)
 
     def print_portfolio_log(self, total_asset, details, targets):
-        """📝 [Log] 포트폴리오 비중 콘솔 출력 (수익률 순 정렬)"""
-        print("\n📊 [Portfolio Status]")
+        """📝 [Log] 포트폴리오 비중 콘솔 출력 (수익률 순 정렬, DEBUG 레벨에서만 - 꺼져 있으면 계산도 생략)"""
+        if not self.log.isEnabledFor(logging.DEBUG): return
+        self.log.debug("\n📊 [Portfolio Status]")
         
         # 출력할 리스트 만들기
         print_list = []
         
         # 보유 중인 종목만 추림 (details 기반)
+        target_map = get_target_snapshot(self.label)['target_map']
         if details:
             for code, info in details.items():
                 if info.get('qty', 0) > 0:
                     # 목표 비중 찾기
-                    t_ratio = 0
-                    for t in targets:
-                        if t['code'] == code:
-                            t_ratio = t.get('target_ratio', 0)
-                            break
+                    t_ratio = target_map[code]['target_ratio'] if code in target_map else 0
                     
                     info['name'] = info.get('name', code) # 이름 없으면 코드로
                     info['target_r_pct'] = t_ratio * 100
@@ -544,14 +546,14 @@ class USTrader(BaseTrader):
         print_list.sort(key=lambda x: x.get('profit_rate', 0), reverse=True)
 
         if print_list:
-            print(f"   {'종목명':<10} | {'수익률':^8} | {'평가금액($)':^12} | {'비중':^6}")
-            print("-" * 55)
+            self.log.debug(f"   {'종목명':<10} | {'수익률':^8} | {'평가금액($)':^12} | {'비중':^6}")
+            self.log.debug("-" * 55)
             for info in print_list:
-                print(f"   {info['name']:<10} | {info['profit_rate']:>6.2f}% | {info['eval_amt']:>11,.2f} | {info['curr_r_pct']:>5.1f}% (목{info['target_r_pct']:.0f}%)")
+                self.log.debug(f"   {info['name']:<10} | {info['profit_rate']:>6.2f}% | {info['eval_amt']:>11,.2f} | {info['curr_r_pct']:>5.1f}% (목{info['target_r_pct']:.0f}%)")
         else:
-            print("   보유 종목 없음")
+            self.log.debug("   보유 종목 없음")
             
-        print("-" * 55)
+        self.log.debug("-" * 55)
 
     # ==================================================================
     # [Main Logic] 봇 실행
@@ -561,14 +563,16 @@ class USTrader(BaseTrader):
         if not self.check_is_market_open():
             return "MARKET_CLOSED"
        
-        print("\n" + "="*50 + f"\n🚀 [USTrader] 사이클 시작 ({datetime.now().strftime('%H:%M:%S')})\n" + "="*50)
+        self.log.info("\n" + "="*50 + f"\n🚀 [USTrader] 사이클 시작 ({clock.now().strftime('%H:%M:%S')})\n" + "="*50)
         self.refresh_token()
+        self.print_circuit_status()  # 차단 중인 엔드포인트 (있을 때만)
         
         # 1. 자산/타겟 로드
         total_asset, total_cash, holdings, details = self.get_balance()
-        targets = load_target_stocks("US")
+        snapshot = get_target_snapshot(self.label)
+        targets = snapshot['targets']
         if not targets: 
-            print("🚨 [System] 타겟 종목 파일이 비어있거나 로드 실패.")
+            self.log.warning("🚨 [System] 타겟 종목 파일이 비어있거나 로드 실패.")
             return
 
         # 2. 미체결 주문 관리
@@ -595,75 +599,39 @@ class USTrader(BaseTrader):
                 # (보유액 + 대기액)이 목표액을 10% 이상 초과하면? -> 대기 주문 취소!
                 # (이미 체결된 게 있어서 목표를 채웠다면, 남은 주문은 잉여입니다)
                 if (current_amt + pending_amt) > (target_amt * 1.1):
-                    print(f"   🚨 [Overbuy Guard] {t['name']} 목표 비중 충족 예상 -> 미체결 매수 취소")
+                    self.log.warning(f"   🚨 [Overbuy Guard] {t['name']} 목표 비중 충족 예상 -> 미체결 매수 취소")
                     
-                    # 대기 중인 주문들 취소 실행
+                    # 대기 중인 주문들 취소 실행 (취소 실패 = 이미 체결 -> 대기열에 남겨 다음 체결 확인에서 기록)
+                    canceled = []
                     for order in pending_buys:
-                        self.cancel_order(order['odno'], code)
-                        # 리스트에서 제거 (역순 제거가 안전하지만, 여기선 pending_orders를 다시 로드하므로 pass)
-                        # 텔레그램 알림
-                        send_telegram_msg(f"🛡️ [과매수 방지] {t['name']} 미체결 주문 취소 (목표 달성)")
+                        if self.cancel_order(order['odno'], code):
+                            self.update_trade_status(order['odno'], 'CANCELED')
+                            send_telegram_msg(f"🛡️ [과매수 방지] {t['name']} 미체결 주문 취소 (목표 달성)")
+                            canceled.append(order)
                     
-                    # 큐 정리 (취소한 주문 제거)
-                    self.pending_orders = [o for o in self.pending_orders if o not in pending_buys]
-                    time.sleep(0.5)
+                    # 큐 정리 (취소한 주문만 제거)
+                    self.pending_orders = [o for o in self.pending_orders if o not in canceled]
         # ==================================================================
 
-        current_time = time.time()
+        # 이번 사이클 주문 결정 (루프가 끝난 뒤 dispatch_orders 로 한 번에 전송)
+        orders = []
 
         # 3. Cleanup (미관리 종목 정리)
-        target_codes = set([t['code'] for t in targets])
+        target_codes = snapshot['codes']
         for held_code, qty in holdings.items():
             if held_code not in target_codes:
                 if any(p['code'] == held_code for p in self.pending_orders): continue
                 exch = details.get(held_code, {}).get('exchange', 'NASD')
                 price = self.get_current_price(held_code, exch)
                 if price:
-                    print(f"🧹 [Cleanup] {held_code} 전량 매도")
-                    odno = self.send_order(held_code, 'SELL', price, qty, exch)
-                    if odno:
-                        send_telegram_msg(f"🇺🇸 [Cleanup] {held_code} 정리 매도 (주문: {odno})")
-                        self.pending_orders.append({'odno': odno, 'code': held_code, 'name': held_code, 'type': 'SELL', 'qty': qty, 'amt': 0, 'time': time.time()})
-                time.sleep(0.5)
+                    self.log.info(f"🧹 [Cleanup] {held_code} 전량 매도")
+                    orders.append({'code': held_code, 'name': held_code, 'side': 'SELL', 'price': price, 'qty': qty,
+                                   'exchange': exch, 'kind': "Sell(Cleanup)", 'reason': "타겟제외"})
 
         # ------------------------------------------------------------------
-        # 4. [Parallel] 차트 데이터 갱신 (누락 종목 재시도 로직 강화)
+        # 4. 일봉 / 전일 지표 상태 (장 전 워밍업에서 준비됨 -> 누락 종목만 병렬 조회)
         # ------------------------------------------------------------------
-        is_regular_update = (current_time - self.last_chart_update_time) > self.CHART_REFRESH_INTERVAL
-        
-        # (1) 갱신할 대상 선정
-        targets_to_fetch = targets if is_regular_update else [t for t in targets if t['code'] not in self.market_data_cache]
-
-        # (2) 대상이 있을 때만 병렬 요청 실행
-        if targets_to_fetch:
-            if is_regular_update:
-                print(f"\n🔄 [Update] 차트 데이터 정기 갱신 중... (전체)")
-                self.last_chart_update_time = current_time # 정기 갱신일 때만 타이머 리셋
-            else:
-                print(f"\n⚠️ [Retry] 데이터 누락 종목 재시도 중... ({len(targets_to_fetch)}개)")
-
-            # 병렬 작업 함수 정의
-            def fetch_job(target):
-                c = target['code']
-                e = target.get('exchange', 'NASD')
-                return c, self.get_daily_data(c, e)
-
-            # ThreadPoolExecutor로 동시 요청
-            with ThreadPoolExecutor(max_workers=5) as executor:
-                future_to_stock = {executor.submit(fetch_job, t): t for t in targets_to_fetch}
-                
-                for future in as_completed(future_to_stock):
-                    t = future_to_stock[future]
-                    try:
-                        code, data = future.result()
-                        if data:
-                            self.market_data_cache[code] = data
-                            # print(f"   ✅ {code} 수신 완료")
-                        else:
-                            # 실패 시 로그만 남기고 다음 루프에서 다시 시도됨
-                            pass
-                    except Exception as e:
-                        print(f"   ⚠️ [Error] {t['code']} 병렬 처리 중 에러: {e}")
+        self.refresh_daily_data(targets)
 
         # 5. 자금 계산
         min_cash_ratio = getattr(Config, 'MIN_CASH_RATIO', 0.01)
@@ -674,19 +642,22 @@ class USTrader(BaseTrader):
 
         # ✅ [포트폴리오 비중 콘솔 출력
         self.print_portfolio_log(total_asset, details, targets)
-        print(f"\n💰 [Money] 보유: ${total_cash:,.2f} | 대기: ${locked_cash:,.2f} | 가용: ${investable_cash:,.2f}")
+        self.log.info(f"\n💰 [Money] 보유: ${total_cash:,.2f} | 대기: ${locked_cash:,.2f} | 가용: ${investable_cash:,.2f}")
 
-        # 6. 매매 루프
+        # 6. 매매 루프 (트리거 근처 종목은 매 사이클, 먼 종목은 간격을 두고 조회)
+        due = self.plan_quotes(targets)
         for t in targets:
             code = t['code']
             exchange = t.get('exchange', 'NASD')
             if any(p['code'] == code for p in self.pending_orders): continue
+            if code not in due: continue
 
-            # [Step 1] 현재가 확인 (리밸런싱용)
-            curr_price = self.get_current_price(code, exchange)
-            if not curr_price: 
-                print(f"   ⚠️ {code} 현재가 조회 실패")
+            # [Step 1] 시세 확인 (현재가 + 시가/고가/저가/거래량)
+            quote = self.load_quote(t)
+            if not quote: 
+                self.log.warning("   ⚠️ %s 현재가 조회 실패", code, extra={'rate_key': f"quote_fail:{code}"})
                 continue
+            curr_price = quote['price']
 
             # [Step 2] 리밸런싱 (Rebalancing)
             qty_held = holdings.get(code, 0)
@@ -698,70 +669,47 @@ class USTrader(BaseTrader):
                 sell_qty = int(excess_amt // curr_price)
                 
                 if sell_qty > 0:
-                    print(f"   ⚖️ [Rebalance] {t['name']} 비중 초과 -> {sell_qty}주 매도")
-                    odno = self.send_order(code, 'SELL', curr_price, sell_qty, exchange)
-                    if odno == 'HOLIDAY':
-                        print("   🛑 [Stop] 휴장일이므로 미국장 매매를 오늘 중단합니다.")
-                        return "HOLIDAY"
-                    elif odno:
-                        # ✅ [텔레그램] 리밸런싱 알림
-                        send_telegram_msg(f"⚖️ [리밸런싱] {t['name']} 비중 축소\n매도: {sell_qty}주 (@ ${curr_price})")
-                        self.pending_orders.append({'odno': odno, 'code': code, 'name': t['name'], 'type': 'SELL', 'qty': sell_qty, 'amt': 0, 'time': time.time()})
-                        investable_cash += (sell_qty * curr_price) # 현금 확보 반영
-                        time.sleep(0.2)
+                    self.log.info(f"   ⚖️ [Rebalance] {t['name']} 비중 초과 -> {sell_qty}주 매도")
+                    orders.append({'code': code, 'name': t['name'], 'side': 'SELL', 'price': curr_price, 'qty': sell_qty,
+                                   'exchange': exchange, 'kind': "Sell(Rebalance)", 'reason': "비중초과",
+                                   'frees_cash': True, 'priority': t.get('priority', 0)})  # 현금 확보 반영
                     continue
             
-            # [Step 3] 차트 데이터 확인
-            if code not in self.market_data_cache: continue
-
-            # 지표 갱신
-            if code not in self.market_data_cache: continue
-            chart_data = self.market_data_cache[code][:]
-            chart_data[-1]['Close'] = curr_price
-            # 실시간 고가/저가 갱신
-            if curr_price > chart_data[-1]['High']: chart_data[-1]['High'] = curr_price
-            if curr_price < chart_data[-1]['Low']: chart_data[-1]['Low'] = curr_price
-            
-            df = self.calculate_indicators(chart_data)
-            if df.empty: continue
+            # [Step 3] 트리거 구간 안이면 신호 계산 생략 -> 오늘 지표 (전일까지 상태 + 현재 시세)
+            if not self.needs_signal(t, quote, qty_held > 0):
+                self.log.debug("   💤 %s(%s): $%s | 트리거 미도달 (대기)", t['name'], code, curr_price)
+                continue
+            curr, prev = self.signal_rows(t, quote)
+            if curr is None: continue
             
             # 신호 판단
-            signal, reason, _ = get_signal(t.get('strategy'), df.iloc[-1], df.iloc[-2], t.get('setting'))
-            current_rsi = df.iloc[-1].get('RSI', 0)
-            print(f"   🧐 {t['name']}({code}): ${curr_price} | RSI: {current_rsi:.1f} | Signal: {signal} ({reason})")
+            signal, reason, _ = get_signal(t.get('strategy'), curr, prev, t.get('setting'))
+            current_rsi = curr.get('RSI', 0)
+            self.log.debug("   🧐 %s(%s): $%s | RSI: %.1f | Signal: %s (%s)", t['name'], code, curr_price, current_rsi, signal, reason)
             # ------------------------------------------------------------------
             # [B] 매수 로직 (Buy)
             # ------------------------------------------------------------------
             if signal == 'buy':
-                needed = target_amt - current_amt
-                amt = min(needed, investable_cash)
-                qty = int(amt // curr_price)
-                
-                if qty > 0:
-                    print(f"   ⚡ [Buy Signal] {t['name']} {qty}주")
-                    odno = self.send_order(code, 'BUY', curr_price, qty, exchange)
-                    if odno == 'HOLIDAY':
-                        print("   🛑 [Stop] 휴장일이므로 미국장 매매를 오늘 중단합니다.")
-                        return "HOLIDAY"
-                    elif odno:
-                        # ✅ [텔레그램] 매수 접수 알림
-                        send_telegram_msg(f"🚀 [매수 접수] {t['name']} {qty}주\n가격: ${curr_price} (Limit)")
-                        self.pending_orders.append({'odno': odno, 'code': code, 'name': t['name'], 'type': 'BUY', 'qty': qty, 'price': curr_price, 'amt': qty*curr_price, 'time': time.time()})
-                        investable_cash -= (qty * curr_price)
+                if target_amt - current_amt >= curr_price:
+                    orders.append({'code': code, 'name': t['name'], 'side': 'BUY', 'price': curr_price,
+                                   'needed': target_amt - current_amt, 'exchange': exchange, 'kind': "Buy",
+                                   'reason': reason, 'priority': t.get('priority', 0),
+                                   'strength': signal_strength(curr, prev)})
 
             # ------------------------------------------------------------------
             # [C] 매도 로직 (Sell)
             # ------------------------------------------------------------------
             elif signal == 'sell' and qty_held > 0:
-                print(f"   ⚡ [Sell Signal] {t['name']} {qty_held}주")
-                odno = self.send_order(code, 'SELL', curr_price, qty_held, exchange)
-                if odno == 'HOLIDAY':
-                    print("   🛑 [Stop] 휴장일이므로 미국장 매매를 오늘 중단합니다.")
-                    return "HOLIDAY"
-                elif odno:
-                     # ✅ [텔레그램] 매도 접수 알림
-                     send_telegram_msg(f"💧 [매도 접수] {t['name']} {qty_held}주 (전량)\n이유: {reason}")
-                     self.pending_orders.append({'odno': odno, 'code': code, 'name': t['name'], 'type': 'SELL', 'qty': qty_held, 'amt': 0, 'time': time.time()})
+                self.log.info(f"   ⚡ [Sell Signal] {t['name']} {qty_held}주")
+                orders.append({'code': code, 'name': t['name'], 'side': 'SELL', 'price': curr_price, 'qty': qty_held,
+                               'exchange': exchange, 'kind': "Sell", 'reason': reason,
+                               'priority': t.get('priority', 0), 'strength': signal_strength(curr, prev)})
+
+        # 7. 주문 일괄 전송 (매도 -> 매수, 우선순위 순, 초당 주문 수 제한 안에서 동시)
+        status, investable_cash = self.dispatch_orders(orders, investable_cash)
+        if status == "HOLIDAY":
+            self.log.info("   🛑 [Stop] 휴장일이므로 미국장 매매를 오늘 중단합니다.")
+            return "HOLIDAY"
           
-        time.sleep(0.5)
+        clock.sleep(0.5)
         return "NORMAL"
\ No newline at end of file
@@ -0,0 +1,215 @@
+import os
+import gzip
+import json
+import time
+import threading
+from collections import deque
+from datetime import datetime
+from urllib.parse import urlsplit
+
+import requests
+from config import Config
+from src.logger import get_logger
+
+log = get_logger("recorder")
+
+# =========================================================
+# 🎥 [녹화/재생] 브로커 API 트래픽 기록
+# =========================================================
+# - RECORD: 트레이더 세션의 요청/응답을 gzip JSON Lines 파일로 저장
+# - REPLAY: 저장된 응답을 같은 순서로 돌려줌 (네트워크 없이 사이클 재현)
+# 파일 한 줄 = 요청 1건
+#   {"t": 녹화 시작 후 경과초, "ts": 벽시계, "dt": 응답 지연, "m": method, "p": path,
+#    "tr": tr_id, "q": params, "b": body, "s": status, "r": 응답 본문}
+
+# 인증 정보(authorization/appkey/appsecret)는 파일에 남기지 않음 (tr_id만 매칭용으로 저장)
+# 계좌번호(CANO/ACNT_PRDT_CD)는 요청 파라미터/본문에서 마스킹 (재생 매칭 키도 같은 마스킹)
+# ⚠️ 응답 본문은 그대로 저장 -> 잔고/보유 종목/주문 내역 등 계좌 데이터가 들어 있으니 파일 취급 주의
+
+ACCOUNT_FIELDS = ("CANO", "ACNT_PRDT_CD")
+MASK = "***"
+FLUSH_INTERVAL = 5  # 압축 스트림 flush 간격 (초) - 매 요청 flush 는 압축률/지연 손해, 비정상 종료 시 최대 이만큼 유실
+
+
+def _mask(fields):
+    """계좌 필드 마스킹한 사본 (해당 필드가 없으면 그대로)"""
+    if not fields or not any(k in fields for k in ACCOUNT_FIELDS): return fields
+    return {k: (MASK if k in ACCOUNT_FIELDS else v) for k, v in fields.items()}
+
+
+def _mask_body(body):
+    if not isinstance(body, str): return None
+    try: fields = json.loads(body)
+    except ValueError: return body
+    return json.dumps(_mask(fields), ensure_ascii=False) if isinstance(fields, dict) else body
+
+
+def _match_key(method, path, tr_id, params, body):
+    """재생 시 요청을 찾기 위한 키 (종목코드 등 파라미터 전체 포함, 계좌 필드는 마스킹)"""
+    fields = dict(params or {})
+    if body:
+        try: fields.update(json.loads(body))
+        except (TypeError, ValueError): pass
+    # 해시키/주문번호처럼 실행마다 달라지는 값은 제외
+    for volatile in ("hashkey", "ORGN_ODNO", "KRX_FWDG_ORD_ORGNO"):
+        fields.pop(volatile, None)
+    fields = _mask(fields)
+    return (method.upper(), path, tr_id or "", json.dumps(fields, sort_keys=True, ensure_ascii=False))
+
+
+def build_response(status, text, url=""):
+    """재생/가짜 브로커용 requests.Response 생성"""
+    res = requests.Response()
+    res.status_code = status
+    res._content = text.encode("utf-8")
+    res.encoding = "utf-8"
+    res.url = url
+    res.headers["content-type"] = "application/json; charset=utf-8"
+    return res
+
+
+class RecordingSession(requests.Session):
+    """요청/응답 쌍을 파일로 기록하는 세션 (기존 재시도 어댑터 그대로 사용)"""
+
+    def __init__(self, path):
+        super().__init__()
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder): os.makedirs(folder)
+        self.record_path = path
+        self._file = gzip.open(path, "at", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._t0 = time.time()
+        self._last_flush = time.monotonic()
+        log.info(f"🎥 [Recorder] API 트래픽 녹화 시작 -> {path}")
+
+    def request(self, method, url, params=None, data=None, headers=None, **kwargs):
+        start = time.time()
+        record = {
+            "t": round(start - self._t0, 4),
+            "ts": datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f"),
+            "m": method.upper(), "p": urlsplit(url).path,
+            "tr": (headers or {}).get("tr_id", ""),
+            "q": _mask(params) or {}, "b": _mask_body(data),
+        }
+        try:
+            res = super().request(method, url, params=params, data=data, headers=headers, **kwargs)
+        except Exception as e:
+            record.update({"dt": round(time.time() - start, 4), "e": f"{type(e).__name__}: {e}"})
+            self._write(record)
+            raise
+
+        record.update({"dt": round(time.time() - start, 4), "s": res.status_code, "r": res.text})
+        self._write(record)
+        return res
+
+    def _write(self, record):
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+            if time.monotonic() - self._last_flush >= FLUSH_INTERVAL:
+                self._file.flush()
+                self._last_flush = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed: self._file.close()
+        super().close()
+
+
+class ReplaySession:
+    """
+    녹화 파일의 응답을 결정적으로 돌려주는 가짜 세션
+    - 같은 요청(경로+tr_id+파라미터)은 녹화된 순서대로 응답
+    - speed: 1.0 = 녹화 당시 응답 지연 재현, 10.0 = 10배 빠르게, 0 = 지연 없음
+    """
+
+    def __init__(self, path, speed=0):
+        self.record_path = path
+        self.speed = speed
+        self._lock = threading.Lock()
+        self._queues = {}
+        self.total = 0
+        self.missed = 0
+
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            try:
+                for line in f:
+                    line = line.strip()
+                    if not line: continue
+                    try: rec = json.loads(line)
+                    except ValueError: continue  # 크래시로 잘린 마지막 줄
+                    key = _match_key(rec["m"], rec["p"], rec.get("tr"), rec.get("q"), rec.get("b"))
+                    self._queues.setdefault(key, deque()).append(rec)
+                    self.total += 1
+            except EOFError:
+                pass  # 비정상 종료로 압축 스트림 끝 표시가 없음 (마지막 flush 까지만 사용)
+
+        # 재생 시작 시점의 벽시계 (트레이더 시계를 맞출 때 사용)
+        first = min((q[0] for q in self._queues.values()), key=lambda r: r["t"], default=None)
+        self.start_time = datetime.strptime(first["ts"], "%Y-%m-%d %H:%M:%S.%f") if first else datetime.now()
+        log.info(f"▶️ [Replay] {self.total}건 로드 ({path}, 속도 x{speed or '∞'})")
+
+    def request(self, method, url, params=None, data=None, headers=None, **kwargs):
+        key = _match_key(method, urlsplit(url).path, (headers or {}).get("tr_id", ""), params, data)
+        with self._lock:
+            q = self._queues.get(key)
+            rec = q.popleft() if q else None
+            # 마지막 응답은 남겨둠 (녹화보다 사이클이 많아도 같은 응답 반복)
+            if q is not None and not q and rec is not None: q.append(rec)
+            if rec is None: self.missed += 1
+
+        if rec is None:
+            raise requests.ConnectionError(f"[Replay] 녹화되지 않은 요청: {key[0]} {key[1]} {key[2]}")
+
+        if self.speed and rec.get("dt"):
+            time.sleep(rec["dt"] / self.speed)
+
+        if "e" in rec:
+            raise requests.ConnectionError(f"[Replay] {rec['e']}")
+
+        return build_response(rec["s"], rec["r"], url)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        pass
+
+
+class OfflineAuthManager:
+    """재생/시뮬레이션용 인증 관리자 (토큰/해시키 네트워크 호출 없음)"""
+
+    def __init__(self, mode="REAL", account_no="00000000"):
+        self.app_key = "OFFLINE"
+        self.app_secret = "OFFLINE"
+        self.url_base = "https://offline.invalid"
+        self.account_no = account_no
+        self.mode = mode
+        self.access_token = "OFFLINE"
+
+    def get_token(self):
+        return self.access_token
+
+    def get_hashkey(self, datas):
+        return ""
+
+
+def wrap_session(session, market):
+    """
+    Config.TRAFFIC_MODE 에 따라 트레이더 세션 교체
+    - RECORD: 기존 세션의 어댑터(재시도 설정)를 그대로 옮긴 RecordingSession
+    - 그 외: 원래 세션 그대로
+    """
+    mode = (getattr(Config, 'TRAFFIC_MODE', None) or "").upper()
+    if mode != "RECORD":
+        return session
+
+    folder = getattr(Config, 'TRAFFIC_DIR', "data/traffic")
+    path = os.path.join(folder, f"{market}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl.gz")
+    recorder = RecordingSession(path)
+    for prefix, adapter in session.adapters.items():
+        recorder.mount(prefix, adapter)
+    return recorder
@@ -0,0 +1,133 @@
+import math
+
+import numpy as np
+
+from src.strategy import smart_pro_params
+
+# =========================================================
+# 🎯 [트리거 인덱스] SMART_PRO 진입/청산 가격선 (장중 비교 몇 번으로 신호 계산 생략)
+# =========================================================
+# - 시가가 정해지면 SMART_PRO 의 가격 조건은 현재가 하나로만 움직임
+#   (SMA20/RSI/목표가 모두 '전일까지 합계 + 현재가' 식 -> 현재가 기준 선으로 풀 수 있음)
+# - 진입 하한 = max(목표가 하한, 20일선 돌파선, 20일선 기울기 유지선) - 이 가격 이하면 매수 불가
+#   (목표가 하한: k 는 갭 할인 후 0.3 ~ 0.7 로 잘리므로 Open + 전일 Range * 0.3)
+# - 청산 상한 = max(최근 고가 * drop, SMA20 * 0.99 이탈선) - 이 가격 이상이면 매도 불가
+#   (최근 고가 = max(전 4일 고가, 당일 고가) -> 당일 고가만 장중에 바뀜, drop 은 RSI 와 무관하게 큰 쪽)
+# - 현재가가 (청산 상한, 진입 하한) 사이면 get_signal 결과는 항상 'none' -> 계산 생략
+#   경계는 보수적으로 (애매하면 계산), 다른 전략은 항상 계산
+# - 종목별 선은 슬롯 배열에 보관 (종목 수와 무관하게 시세 1건당 비교 2~3번)
+
+TRIGGER_STRATEGIES = ("SMART_PRO",)
+MIN_K = 0.3      # smart_pro_target_price 의 k 하한
+SMA_EXIT = 0.99  # 20일선 이탈 매도 버퍼
+_EPS = 1e-9      # 식 변형에 따른 부동소수 오차 여유
+
+
+class TriggerIndex:
+    def __init__(self, capacity=64):
+        self.slots = {}    # code -> 슬롯 번호
+        self.free = []     # 제외된 종목이 반납한 슬롯 (재사용 -> 타겟 교체가 반복돼도 배열 크기 고정)
+        self._armed = {}   # code -> (지표 상태, 시가) - 상태가 바뀌면(날짜/전략 변경) 다시 계산
+        self.entry = np.full(capacity, np.inf)       # 진입 하한 (현재가 > 이 값일 때만 매수 가능)
+        self.exit_base = np.full(capacity, -np.inf)  # 청산 상한 중 장중 고정 부분
+        self.drop = np.zeros(capacity)               # 당일 고가 x drop = 트레일링 청산선
+        self.stats = {"checked": 0, "evaluated": 0}
+
+    def _slot(self, code):
+        slot = self.slots.get(code)
+        if slot is None and self.free:
+            slot = self.slots[code] = self.free.pop()
+        elif slot is None:
+            slot = self.slots[code] = len(self.slots)
+            if slot >= len(self.entry):
+                grow = len(self.entry)
+                self.entry = np.concatenate((self.entry, np.full(grow, np.inf)))
+                self.exit_base = np.concatenate((self.exit_base, np.full(grow, -np.inf)))
+                self.drop = np.concatenate((self.drop, np.zeros(grow)))
+        return slot
+
+    def drop_code(self, code):
+        """타겟에서 빠진 종목 (슬롯 비활성화 후 반납)"""
+        self._armed.pop(code, None)
+        slot = self.slots.pop(code, None)
+        if slot is not None:
+            self.entry[slot], self.exit_base[slot], self.drop[slot] = np.inf, -np.inf, 0.0
+            self.free.append(slot)
+
+    def arm(self, target, state, open_):
+        """
+        [기능] 시가 확정 후 종목의 진입/청산 선 계산
+        :param state: BaseTrader.build_day_state 결과 (전일까지 지표 상태 + 전일 행)
+        """
+        code = target['code']
+        slot = self._slot(code)
+        self._armed[code] = (state, open_)
+
+        level = (target.get('setting') or {}).get('level', 2)
+        params = smart_pro_params(level)
+        prior, prev, t = state['prior'], state['prev'], state['t']
+        csum = prior['close_csum']
+        sum19 = csum[t] - csum[t - 19] if t >= 19 else math.nan   # 오늘 SMA20 = (sum19 + 현재가) / 20
+
+        # 🔴 청산 상한
+        drop = max(params['drop_base'], params['drop_tight'])
+        high4 = prior['high'][t - 4:t].max() if t >= 4 else -math.inf
+        exit_base = high4 * drop
+        if not math.isnan(sum19):
+            exit_base = max(exit_base, SMA_EXIT * sum19 / (20 - SMA_EXIT))   # p < 0.99 * (sum19 + p) / 20
+
+        # 🟢 진입 하한 (조건 하나라도 불가능하면 inf)
+        entry = math.inf
+        prev_close, prev_range = prev['Close'], prev.get('Range', math.nan)
+        gap = (open_ - prev_close) / prev_close
+        gap_blocked = gap < -0.02 and (level < 5 or gap < -0.04)
+        if not gap_blocked and not math.isnan(sum19) and not math.isnan(prev_range):
+            entry = max(open_ + prev_range * MIN_K, sum19 / 19)   # 목표가 하한 / p > (sum19 + p) / 20
+            prev_sma20 = prev.get('SMA20', math.nan)
+            if level < 4 and not math.isnan(prev_sma20):
+                entry = max(entry, 20 * prev_sma20 - sum19)       # SMA20 기울기 >= 0
+
+        self.entry[slot] = entry * (1 - _EPS)
+        self.exit_base[slot] = exit_base * (1 + _EPS)
+        self.drop[slot] = drop * (1 + _EPS)
+        return slot
+
+    def should_evaluate(self, target, state, quote, held):
+        """
+        [기능] 이번 시세로 get_signal 을 돌려야 하는지 (False 면 결과가 'none' 으로 확정)
+        :param held: 보유 중이면 청산선도 확인 (미보유면 매도 신호는 의미 없음)
+        """
+        if target.get('strategy') not in TRIGGER_STRATEGIES or state is None: return True
+        open_ = quote.get('open')
+        if not open_: return True   # 시가 없는 응답 -> 선을 정할 수 없음
+
+        code = target['code']
+        armed = self._armed.get(code)
+        if armed is None or armed[0] is not state or armed[1] != open_:
+            self.arm(target, state, open_)
+        slot = self.slots[code]
+
+        price = quote['price']
+        self.stats["checked"] += 1
+        hit = price >= self.entry[slot]
+        if held and not hit:
+            high = max(quote.get('high') or price, price)
+            hit = price <= max(self.exit_base[slot], high * self.drop[slot])
+        if hit: self.stats["evaluated"] += 1
+        return bool(hit)
+
+    def distance(self, target, quote, held):
+        """
+        현재가에서 가장 가까운 선까지 상대 거리 (0 = 이미 넘음, None = 선 없음 -> 항상 가까운 것으로 취급)
+        - 폴링 우선순위 (PollScheduler) 용
+        """
+        if target.get('strategy') not in TRIGGER_STRATEGIES: return None
+        armed = self._armed.get(target['code'])
+        if armed is None or armed[1] != quote.get('open'): return None
+        slot = self.slots[target['code']]
+        price = quote['price']
+        d = (self.entry[slot] - price) / price
+        if held:
+            high = max(quote.get('high') or price, price)
+            d = min(d, (price - max(self.exit_base[slot], high * self.drop[slot])) / price)
+        return max(0.0, float(d))
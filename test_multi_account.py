@@ -0,0 +1,131 @@
+import os
+import sys
+import json
+import tempfile
+from collections import Counter
+from datetime import datetime
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+
+from config import Config
+
+# 테스트 중에는 텔레그램/매매일지/녹화가 실제 데이터를 건드리지 않도록 격리
+Config.TELEGRAM_TOKEN = None
+Config.TRAFFIC_MODE = None
+Config.TRADE_JOURNAL_PATH = os.path.join(tempfile.mkdtemp(), "test_journal.db")
+
+from fake_broker import make_universe, make_targets, FakeBrokerSession
+from src import clock, data_manager, trade_journal
+from src.main_controller import MainController
+from src.traffic_recorder import OfflineAuthManager
+
+# 멀티 계좌 모드: 시세/일봉 요청 수가 '계좌 x 종목' 이 아니라 '고유 종목 수' 인지 확인
+# (pytest test_multi_account.py 또는 python test_multi_account.py)
+
+SESSION_TIME = datetime(2024, 3, 6, 10, 0)   # 수요일 10:00 (한국장)
+
+
+class CountingSession:
+    """경로별 요청 수 집계 (FakeBrokerSession 감싸기)"""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.paths = Counter()
+
+    def request(self, method, url, **kwargs):
+        self.paths[urlsplit(url).path.rsplit("/", 1)[-1]] += 1
+        return self.inner.request(method, url, **kwargs)
+
+
+def _write_targets(universe, codes):
+    path = os.path.join(tempfile.mkdtemp(), "targets.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(make_targets({c: universe[c] for c in codes}), f, ensure_ascii=False)
+    return path
+
+
+def _run_cycle():
+    universe = make_universe(10, 250, "KR")
+    codes = list(universe)
+    # 기본/C 계좌: 앞 8종목, B 계좌: 보유 종목(앞 2개) + 뒤 6종목 -> 고유 10종목
+    path_a = _write_targets(universe, codes[:8])
+    path_b = _write_targets(universe, codes[:2] + codes[4:])
+
+    saved = dict(data_manager.TARGET_FILES)
+    data_manager.TARGET_FILES["KR"] = path_a
+    clock.install(clock.VirtualClock(SESSION_TIME))
+    try:
+        controller = MainController(
+            kr_auth=OfflineAuthManager(), us_auth=OfflineAuthManager(),
+            accounts=[{'name': "B", 'market': "KR", 'auth': OfflineAuthManager(account_no="11111111"), 'targets': path_b},
+                      {'name': "C", 'market': "KR", 'auth': OfflineAuthManager(account_no="22222222")}])
+        sessions = []
+        for trader in controller.traders["KR"]:
+            trader.session = CountingSession(FakeBrokerSession(universe, "KR"))
+            sessions.append(trader.session)
+        controller.run_market("KR")
+        return controller, sessions, set(codes)
+    finally:
+        data_manager.TARGET_FILES.clear()
+        data_manager.TARGET_FILES.update(saved)
+        clock.uninstall()
+
+
+def test_market_data_requests_scale_with_symbols():
+    controller, sessions, distinct = _run_cycle()
+    total = sum((s.paths for s in sessions), Counter())
+
+    # 일봉 / 현재가: 고유 종목당 1회 (계좌 3개 x 8종목 = 24회가 아님), 기본 계좌 세션으로만 조회
+    assert total["inquire-daily-price"] == len(distinct)
+    assert total["inquire-price"] == len(distinct)
+    assert all(s.paths["inquire-price"] == 0 and s.paths["inquire-daily-price"] == 0 for s in sessions[1:])
+
+    hub = controller.market_data["KR"]
+    assert hub.stats["quote_requests"] == len(distinct)
+    assert hub.stats["quote_shared"] == 8 + 8 + 8 - len(distinct)
+
+
+def test_accounts_keep_own_balance_and_targets():
+    controller, sessions, _ = _run_cycle()
+    # 잔고는 계좌별 1회씩
+    assert [s.paths["inquire-balance-rlz-pl"] for s in sessions] == [1, 1, 1]
+
+    traders = controller.traders["KR"]
+    assert [t.label for t in traders] == ["KR", "KR-B", "KR-C"]
+    assert set(traders[1].day_state) != set(traders[0].day_state)     # B 는 자기 타겟 기준 상태
+    assert set(traders[2].day_state) == set(traders[0].day_state)     # C 는 기본 타겟 공유
+    assert "US" not in controller.market_data                         # 계좌 1개 시장은 직접 조회
+
+
+def test_balance_report_counts_own_account_trades():
+    controller, _, _ = _run_cycle()
+    traders = controller.traders["KR"]
+    today = SESSION_TIME.strftime("%Y-%m-%d")
+    before = {t.label: trade_journal.summarize_trades(t.label, today) for t in traders}
+
+    clock.install(clock.VirtualClock(SESSION_TIME))
+    try:
+        # B 계좌만 매수 2건, C 계좌만 매도 1건
+        traders[1].save_trade_log("Buy", "000001", "종목1", 1000, 3, "test", odno="B-1")
+        traders[1].save_trade_log("Buy", "000002", "종목2", 2000, 1, "test", odno="B-2")
+        traders[2].save_trade_log("Sell", "000003", "종목3", 500, 4, "test", odno="C-1")
+        reports = [trader.report_balance() for trader in traders]
+    finally:
+        clock.uninstall()
+
+    added = {"KR": (0, 0, 0, 0), "KR-B": (2, 5000, 0, 0), "KR-C": (0, 0, 1, 2000)}
+    for trader, msg in zip(traders, reports):
+        buys, buy_amt, sells, sell_amt = added[trader.label]
+        base = before[trader.label]
+        line = next(l for l in msg.splitlines() if l.startswith("📝"))
+        assert line == (f"📝 금일 주문: 매수 {base['BUY']['count'] + buys}건 ({base['BUY']['amount'] + buy_amt:,.0f}원) / "
+                        f"매도 {base['SELL']['count'] + sells}건 ({base['SELL']['amount'] + sell_amt:,.0f}원)")
+        assert f"({trader.label})" in msg.splitlines()[0]
+
+
+if __name__ == "__main__":
+    test_market_data_requests_scale_with_symbols()
+    test_accounts_keep_own_balance_and_targets()
+    test_balance_report_counts_own_account_trades()
+    print("✅ [Test] 멀티 계좌 시세 공유")
@@ -0,0 +1,251 @@
+import os
+import tempfile
+from datetime import datetime
+
+from config import Config
+
+# 테스트 중에는 텔레그램/매매일지/녹화가 실제 데이터를 건드리지 않도록 격리
+Config.TELEGRAM_TOKEN = None
+Config.TRAFFIC_MODE = None
+Config.TRADE_JOURNAL_PATH = os.path.join(tempfile.mkdtemp(), "test_journal.db")
+
+from src import clock, trade_journal
+from src.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN, POLICIES, RATE_LIMIT_BACKOFF
+from src.order_dispatcher import OrderDispatcher
+from src.traders.kr_trader import KoreaTrader
+from src.traders.us_trader import USTrader
+from src.traffic_recorder import OfflineAuthManager
+
+# 주문 경로 (현금 예약/해제, 초당 주문 수 제한, 회로 차단기 상태 전이)
+# (pytest test_order_path.py 또는 python test_order_path.py)
+
+SESSION_TIME = datetime(2024, 3, 6, 10, 0)   # 수요일 10:00 (한국장)
+
+
+class FakeSubmit:
+    """주문 전송 대역 - 종목별 결과 지정 (기본 접수), 전송 순서/가상 시각 기록"""
+
+    def __init__(self, results=None):
+        self.results = results or {}
+        self.sent = []
+
+    def __call__(self, order):
+        self.sent.append((order['code'], order['side'], clock.time()))
+        return self.results.get((order['code'], order['side']), f"ODNO-{order['code']}")
+
+
+def _trader(results=None):
+    trader = KoreaTrader(OfflineAuthManager())
+    trader.dispatcher.submit = FakeSubmit(results)
+    return trader
+
+
+def _buy(code, price, needed, priority=0):
+    return {'code': code, 'name': code, 'side': 'BUY', 'price': price, 'needed': needed,
+            'kind': "Buy", 'reason': "test", 'priority': priority}
+
+
+def _sell(code, price, qty):
+    return {'code': code, 'name': code, 'side': 'SELL', 'price': price, 'qty': qty,
+            'kind': "Sell", 'reason': "test", 'frees_cash': True}
+
+
+def _with_clock(func):
+    def wrapper():
+        clock.install(clock.VirtualClock(SESSION_TIME))
+        try:
+            return func()
+        finally:
+            clock.uninstall()
+    wrapper.__name__ = func.__name__
+    return wrapper
+
+
+# =========================================================
+# 💰 dispatch_orders: 현금 예약 / 해제
+# =========================================================
+@_with_clock
+def test_failed_buy_releases_reservation():
+    trader = _trader({("B", "BUY"): None})
+    status, cash = trader.dispatch_orders([_buy("A", 1000, 5000), _buy("B", 1000, 3000)], 10000)
+
+    assert status == "NORMAL"
+    assert cash == 10000 - 5000                      # B 실패 -> 3000원 예약 해제
+    assert [p['code'] for p in trader.pending_orders] == ["A"]
+
+
+@_with_clock
+def test_reservation_follows_priority():
+    trader = _trader()
+    orders = [_buy("LOW", 1000, 8000, priority=0), _buy("HIGH", 1000, 8000, priority=5)]
+    status, cash = trader.dispatch_orders(orders, 10000)
+
+    # 우선순위 높은 종목이 먼저 8주 예약 -> 나머지 2000원으로 2주
+    assert {o['code']: o['qty'] for o in orders} == {"HIGH": 8, "LOW": 2}
+    assert cash == 0
+    assert [code for code, _, _ in trader.dispatcher.submit.sent] == ["HIGH", "LOW"]
+
+
+@_with_clock
+def test_accepted_sell_frees_cash_for_buys():
+    trader = _trader()
+    status, cash = trader.dispatch_orders([_buy("A", 1000, 5000), _sell("S", 1000, 3)], 2000)
+
+    # 매도 먼저 전송 -> 3000원 합산 후 매수 5주 예약
+    assert [side for _, side, _ in trader.dispatcher.submit.sent] == ["SELL", "BUY"]
+    assert cash == 0
+
+
+@_with_clock
+def test_holiday_from_sell_stops_buys():
+    trader = _trader({("S", "SELL"): 'HOLIDAY'})
+    status, cash = trader.dispatch_orders([_sell("S", 1000, 3), _buy("A", 1000, 5000)], 10000)
+
+    assert status == "HOLIDAY"
+    assert cash == 10000
+    assert all(side == "SELL" for _, side, _ in trader.dispatcher.submit.sent)
+    assert trader.pending_orders == []
+
+
+@_with_clock
+def test_pending_overflow_cancels_evicted_orders():
+    trader = _trader()
+    trader.PENDING_MAX = 2
+    canceled = []
+    trader.cancel_order = lambda odno, code, qty, orgno="": canceled.append(odno) or odno != "ODNO-A"
+    trader.dispatch_orders([_buy(c, 1000, 1000, priority=p) for c, p in (("A", 3), ("B", 2), ("C", 1), ("D", 0))], 10000)
+
+    # 상한 초과분은 말없이 버리지 않고 브로커에 취소 요청 (A 는 취소 실패 -> 알림 대상)
+    assert canceled == ["ODNO-A", "ODNO-B"]
+    assert [p['code'] for p in trader.pending_orders] == ["C", "D"]
+
+
+@_with_clock
+def test_expired_pending_orders_are_canceled():
+    trader = _trader()
+    canceled = []
+    trader.cancel_order = lambda odno, code, qty, orgno="": canceled.append(odno) or True
+    trader.dispatch_orders([_buy("A", 1000, 1000)], 10000)
+    clock.sleep(trader.PENDING_MAX_AGE + 1)
+    trader.dispatch_orders([_buy("B", 1000, 1000)], 10000)
+    trader.prune_caches([{'code': "A"}, {'code': "B"}])
+
+    assert canceled == ["ODNO-A"]
+    assert [p['code'] for p in trader.pending_orders] == ["B"]
+
+
+@_with_clock
+def test_us_unfilled_lookup_failure_keeps_pending():
+    trader = USTrader(OfflineAuthManager())
+    trader.pending_orders = [{'odno': "1", 'code': "AAPL", 'name': "AAPL", 'type': 'BUY', 'qty': 1,
+                              'price': 100, 'amt': 100, 'time': clock.time()}]
+    statuses = []
+    trader.update_trade_status = lambda odno, status: statuses.append((odno, status))
+
+    # 조회 실패 (None) -> 체결로 오인하지 않고 대기열 유지
+    trader.get_unfilled_orders = lambda: None
+    trader.check_pending_orders()
+    assert statuses == [] and len(trader.pending_orders) == 1
+
+    # 조회 성공 + 미체결 목록에 없음 -> 체결
+    trader.get_unfilled_orders = lambda: []
+    trader.check_pending_orders()
+    assert statuses == [("1", 'FILLED')] and trader.pending_orders == []
+
+
+@_with_clock
+def test_status_update_touches_latest_order_only():
+    # KIS 주문번호는 날마다 다시 시작 -> 어제 같은 번호 주문의 상태는 그대로
+    trade_journal.record_trade("KR-J", 'BUY', "A", "A", 1000, 1, "test", odno="0000001", status='FILLED')
+    clock.sleep(24 * 3600)
+    trade_journal.record_trade("KR-J", 'BUY', "B", "B", 1000, 1, "test", odno="0000001")
+    trade_journal.update_order_status("KR-J", "0000001", 'TIMEOUT')
+
+    rows = trade_journal.query_trades(market="KR-J")
+    assert [(r['code'], r['status']) for r in rows] == [("A", 'FILLED'), ("B", 'TIMEOUT')]
+
+
+# =========================================================
+# 📮 OrderDispatcher: 초당 주문 수 제한
+# =========================================================
+@_with_clock
+def test_dispatcher_respects_tps_window():
+    submit = FakeSubmit()
+    dispatcher = OrderDispatcher(submit, tps=2)
+    results = dispatcher.submit_all([_sell(f"C{i}", 1000, 1) for i in range(5)])
+
+    assert [r for _, r in results] == [f"ODNO-C{i}" for i in range(5)]   # 입력 순서 유지
+    assert dispatcher.stats["waves"] == 3
+    times = sorted(t for _, _, t in submit.sent)
+    for i, t in enumerate(times):
+        assert sum(1 for u in times[i:] if u - t < 1.0) <= 2             # 어느 1초 창에도 2건 이하
+    assert times[-1] - times[0] >= 2.0
+
+
+# =========================================================
+# 🧯 CircuitBreaker: CLOSED -> OPEN -> HALF_OPEN (시험 1건) -> CLOSED / OPEN
+# =========================================================
+def _open_breaker():
+    breaker = CircuitBreaker("/uapi/domestic-stock/v1/trading/order-cash")
+    assert breaker.kind == "order"
+    for _ in range(POLICIES["order"]["fail_limit"]):
+        assert breaker.allow()
+        opened = breaker.record_failure("HTTP 500")
+    assert opened and breaker.state == OPEN
+    return breaker
+
+
+@_with_clock
+def test_breaker_rejects_while_open():
+    breaker = _open_breaker()
+    assert not breaker.allow()
+    assert breaker.stats["rejected"] == 1
+    assert breaker.retry_in() == POLICIES["order"]["base_backoff"]
+
+
+@_with_clock
+def test_half_open_allows_exactly_one_probe():
+    breaker = _open_breaker()
+    clock.sleep(POLICIES["order"]["base_backoff"])
+
+    assert breaker.allow()                     # 시험 호출 1건
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()                 # 시험 중 다른 호출은 거절
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.allow()
+
+
+@_with_clock
+def test_failed_probe_doubles_backoff():
+    breaker = _open_breaker()
+    clock.sleep(POLICIES["order"]["base_backoff"])
+    assert breaker.allow()
+    assert breaker.record_failure("HTTP 503")  # 시험 실패 1회로 바로 다시 차단
+    assert breaker.state == OPEN
+    assert breaker.retry_in() == POLICIES["order"]["base_backoff"] * 2
+
+
+@_with_clock
+def test_rate_limit_opens_with_short_backoff():
+    breaker = CircuitBreaker("/uapi/domestic-stock/v1/quotations/inquire-price")
+    for _ in range(POLICIES["quote"]["fail_limit"]):
+        breaker.record_failure("EGW00201", rate_limited=True)
+    assert breaker.state == OPEN
+    assert breaker.retry_in() == RATE_LIMIT_BACKOFF
+
+
+if __name__ == "__main__":
+    test_failed_buy_releases_reservation()
+    test_reservation_follows_priority()
+    test_accepted_sell_frees_cash_for_buys()
+    test_holiday_from_sell_stops_buys()
+    test_pending_overflow_cancels_evicted_orders()
+    test_expired_pending_orders_are_canceled()
+    test_us_unfilled_lookup_failure_keeps_pending()
+    test_status_update_touches_latest_order_only()
+    test_dispatcher_respects_tps_window()
+    test_breaker_rejects_while_open()
+    test_half_open_allows_exactly_one_probe()
+    test_failed_probe_doubles_backoff()
+    test_rate_limit_opens_with_short_backoff()
+    print("✅ [Test] 주문 경로 (현금 예약 / TPS / 회로 차단기)")
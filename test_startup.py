@@ -0,0 +1,55 @@
+import json
+import os
+import subprocess
+import sys
+
+# 라이브 시작 경로 (main.py import + MainController 생성) 시간 예산 / 무거운 모듈 미사용 확인
+# 장중 재시작 시 첫 사이클까지의 지연을 줄이기 위함 (pytest test_startup.py 또는 python test_startup.py)
+
+STARTUP_BUDGET = 1.5                       # 초 (측정값 약 0.3초, 느린 머신 여유 포함)
+HEAVY_MODULES = ("pandas", "matplotlib")   # 리포트 / 백테스트 전용
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# 새 인터프리터에서 측정 (이미 import 된 모듈 캐시 영향 없음)
+_PROBE = """
+import json, sys, time, io, contextlib
+started = time.perf_counter()
+out = io.StringIO()
+with contextlib.redirect_stdout(out):
+    import main
+    from src.traffic_recorder import OfflineAuthManager
+    controller = main.MainController(kr_auth=OfflineAuthManager('REAL'), us_auth=OfflineAuthManager('REAL'))
+elapsed = time.perf_counter() - started
+print(json.dumps({"elapsed": elapsed, "stdout": out.getvalue(), "modules": sorted(m for m in sys.modules if "." not in m)}))
+"""
+
+
+def _probe():
+    res = subprocess.run([sys.executable, "-c", _PROBE], cwd=ROOT, capture_output=True, text=True, timeout=60)
+    assert res.returncode == 0, res.stderr
+    return json.loads(res.stdout.strip().splitlines()[-1])
+
+
+def test_live_path_skips_heavy_modules():
+    loaded = set(_probe()["modules"])
+    heavy = [m for m in HEAVY_MODULES if m in loaded]
+    assert not heavy, f"라이브 시작 경로에서 로드됨: {heavy}"
+
+
+def test_import_is_silent():
+    """config / 모듈 import 시 출력 없음 (시작 안내는 로그 설정 후 main.py 에서)"""
+    assert _probe()["stdout"] == ""
+
+
+def test_startup_budget():
+    # 첫 실행은 .pyc 생성 / 디스크 캐시 영향 -> 최솟값 기준
+    elapsed = min(_probe()["elapsed"] for _ in range(3))
+    assert elapsed < STARTUP_BUDGET, f"시작 {elapsed:.2f}초 > 예산 {STARTUP_BUDGET}초"
+
+
+if __name__ == "__main__":
+    test_live_path_skips_heavy_modules()
+    test_import_is_silent()
+    test_startup_budget()
+    print("✅ [Test] 라이브 시작 경로 예산 통과")